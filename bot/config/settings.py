@@ -70,6 +70,41 @@ class Settings:
     # --- scheduler / time ---
     timezone: str = "UTC"
 
+    # --- delivery mode (webhook if WEBHOOK_URL is set, else long polling) ---
+    webhook_url: Optional[str] = None  # public base URL, e.g. https://bot.example.com
+    webhook_path: str = "/webhook"
+    webhook_secret: Optional[str] = None  # X-Telegram-Bot-Api-Secret-Token (required in webhook mode)
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 8080
+
+    # --- update processing ---
+    update_concurrency: int = 32  # max handlers running at once (per-user order is always kept)
+
+    # --- card rendering (Pillow runs off the event loop) ---
+    card_render_mode: str = "process"  # process | thread
+    card_render_workers: int = 2
+    card_render_queue: int = 32  # max pending renders before new ones are rejected
+    card_cache_dir: str = "./card_cache"  # rendered PNGs by content hash
+    card_cache_max_age_days: int = 7  # files unused this long are deleted (hourly)
+    card_cache_max_files: int = 5000  # then the least recently used beyond this
+
+    # --- weekly recap (private end-of-week card for every active user) ---
+    weekly_recap_enabled: bool = False
+
+    # --- daily progress ---
+    daily_actions_dual_write: bool = True  # keep writing legacy daily_actions rows during the migration
+
+    # --- spin cash prizes (global budget, 0 = no limit) ---
+    spin_cash_daily_budget_cents: int = 0
+    spin_cash_weekly_budget_cents: int = 0
+
+    # --- quiz ---
+    quiz_reveal_enabled: bool = False  # post yesterday's answer + distribution at UTC midnight
+
+    # --- screenshot duplicates (perceptual hash) ---
+    screenshot_dup_distance: int = 6  # max dHash bit difference flagged as near-duplicate
+    screenshot_dup_reject: bool = False  # auto-reject near-duplicates instead of flagging them
+
     # --- environment ---
     environment: str = "production"  # production | development
 
@@ -77,6 +112,10 @@ class Settings:
     def is_dev(self) -> bool:
         return self.environment.lower() in {"dev", "development", "local"}
 
+    @property
+    def use_webhook(self) -> bool:
+        return bool(self.webhook_url)
+
     @classmethod
     def load(cls) -> "Settings":
         """
@@ -106,6 +145,61 @@ class Settings:
         group_invite_link = (env.get("GROUP_INVITE_LINK") or "").strip() or None  # ✅ NEW
 
         timezone = (env.get("TIMEZONE") or "UTC").strip() or "UTC"
+
+        webhook_url = (env.get("WEBHOOK_URL") or "").strip().rstrip("/") or None
+        webhook_path = (env.get("WEBHOOK_PATH") or "/webhook").strip() or "/webhook"
+        if not webhook_path.startswith("/"):
+            webhook_path = "/" + webhook_path
+        webhook_secret = (env.get("WEBHOOK_SECRET") or "").strip() or None
+        if webhook_url and not webhook_secret:
+            # without it the webhook accepts unsigned POSTs (forged updates from any user id)
+            raise RuntimeError("WEBHOOK_SECRET is required when WEBHOOK_URL is set")
+        webhook_host = (env.get("WEBHOOK_HOST") or "0.0.0.0").strip() or "0.0.0.0"
+        webhook_port_raw = (env.get("WEBHOOK_PORT") or "").strip()
+        webhook_port = _to_int(webhook_port_raw, "WEBHOOK_PORT") if webhook_port_raw else 8080
+
+        update_concurrency_raw = (env.get("UPDATE_CONCURRENCY") or "").strip()
+        update_concurrency = (
+            _to_int(update_concurrency_raw, "UPDATE_CONCURRENCY") if update_concurrency_raw else 32
+        )
+
+        card_render_mode = (env.get("CARD_RENDER_MODE") or "process").strip().lower() or "process"
+        if card_render_mode not in {"process", "thread"}:
+            raise RuntimeError("CARD_RENDER_MODE must be 'process' or 'thread'")
+        card_render_workers_raw = (env.get("CARD_RENDER_WORKERS") or "").strip()
+        card_render_workers = (
+            _to_int(card_render_workers_raw, "CARD_RENDER_WORKERS") if card_render_workers_raw else 2
+        )
+        card_render_queue_raw = (env.get("CARD_RENDER_QUEUE") or "").strip()
+        card_render_queue = _to_int(card_render_queue_raw, "CARD_RENDER_QUEUE") if card_render_queue_raw else 32
+        card_cache_dir = (env.get("CARD_CACHE_DIR") or "./card_cache").strip() or "./card_cache"
+        card_cache_max_age_raw = (env.get("CARD_CACHE_MAX_AGE_DAYS") or "").strip()
+        card_cache_max_age_days = (
+            _to_int(card_cache_max_age_raw, "CARD_CACHE_MAX_AGE_DAYS") if card_cache_max_age_raw else 7
+        )
+        card_cache_max_files_raw = (env.get("CARD_CACHE_MAX_FILES") or "").strip()
+        card_cache_max_files = (
+            _to_int(card_cache_max_files_raw, "CARD_CACHE_MAX_FILES") if card_cache_max_files_raw else 5000
+        )
+
+        weekly_recap_enabled = (env.get("WEEKLY_RECAP_ENABLED") or "").strip().lower() in {"1", "true", "yes", "on"}
+        quiz_reveal_enabled = (env.get("QUIZ_REVEAL_ENABLED") or "").strip().lower() in {"1", "true", "yes", "on"}
+        daily_actions_dual_write = (env.get("DAILY_ACTIONS_DUAL_WRITE") or "").strip().lower() not in {"0", "false", "no", "off"}
+
+        spin_cash_daily_raw = (env.get("SPIN_CASH_DAILY_BUDGET_CENTS") or "").strip()
+        spin_cash_daily_budget_cents = (
+            _to_int(spin_cash_daily_raw, "SPIN_CASH_DAILY_BUDGET_CENTS") if spin_cash_daily_raw else 0
+        )
+        spin_cash_weekly_raw = (env.get("SPIN_CASH_WEEKLY_BUDGET_CENTS") or "").strip()
+        spin_cash_weekly_budget_cents = (
+            _to_int(spin_cash_weekly_raw, "SPIN_CASH_WEEKLY_BUDGET_CENTS") if spin_cash_weekly_raw else 0
+        )
+
+        screenshot_dup_distance_raw = (env.get("SCREENSHOT_DUP_DISTANCE") or "").strip()
+        screenshot_dup_distance = (
+            _to_int(screenshot_dup_distance_raw, "SCREENSHOT_DUP_DISTANCE") if screenshot_dup_distance_raw else 6
+        )
+        screenshot_dup_reject = (env.get("SCREENSHOT_DUP_REJECT") or "").strip().lower() in {"1", "true", "yes", "on"}
         environment = (env.get("ENVIRONMENT") or "production").strip() or "production"
 
         return cls(
@@ -117,5 +211,24 @@ class Settings:
             admin_review_chat_id=admin_review_chat_id,
             group_invite_link=group_invite_link,  # ✅ NEW
             timezone=timezone,
+            webhook_url=webhook_url,
+            webhook_path=webhook_path,
+            webhook_secret=webhook_secret,
+            webhook_host=webhook_host,
+            webhook_port=webhook_port,
+            update_concurrency=update_concurrency,
+            card_render_mode=card_render_mode,
+            card_render_workers=card_render_workers,
+            card_render_queue=card_render_queue,
+            card_cache_dir=card_cache_dir,
+            card_cache_max_age_days=card_cache_max_age_days,
+            card_cache_max_files=card_cache_max_files,
+            weekly_recap_enabled=weekly_recap_enabled,
+            quiz_reveal_enabled=quiz_reveal_enabled,
+            daily_actions_dual_write=daily_actions_dual_write,
+            spin_cash_daily_budget_cents=spin_cash_daily_budget_cents,
+            spin_cash_weekly_budget_cents=spin_cash_weekly_budget_cents,
+            screenshot_dup_distance=screenshot_dup_distance,
+            screenshot_dup_reject=screenshot_dup_reject,
             environment=environment,
         )
\ No newline at end of file
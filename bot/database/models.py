@@ -1,47 +0,0 @@
-# bot/database/models.py
-from __future__ import annotations
-
-from datetime import datetime
-from typing import List, Optional
-
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-
-from bot.database.base import Base
-
-class QuizSession(Base):
-    __tablename__ = "quiz_sessions"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(Integer, index=True)  # Telegram user id
-    quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"), index=True)
-
-    current_index: Mapped[int] = mapped_column(Integer, default=0)
-    score: Mapped[int] = mapped_column(Integer, default=0)
-
-    is_finished: Mapped[bool] = mapped_column(Boolean, default=False)
-    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
-
-    answers: Mapped[List["QuizAnswer"]] = relationship(
-        "QuizAnswer",
-        back_populates="session",
-        cascade="all, delete-orphan",
-    )
-
-class QuizAnswer(Base):
-    __tablename__ = "quiz_answers"
-    __table_args__ = (
-        UniqueConstraint("session_id", "question_id", name="uq_session_question"),
-    )
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    session_id: Mapped[int] = mapped_column(ForeignKey("quiz_sessions.id", ondelete="CASCADE"), index=True)
-
-    question_id: Mapped[int] = mapped_column(ForeignKey("quiz_questions.id", ondelete="CASCADE"), index=True)
-    option_id: Mapped[int] = mapped_column(ForeignKey("quiz_options.id", ondelete="CASCADE"), index=True)
-
-    is_correct: Mapped[bool] = mapped_column(Boolean, default=False)
-    answered_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-
-    session: Mapped["QuizSession"] = relationship("QuizSession", back_populates="answers")
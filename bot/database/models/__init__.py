@@ -2,14 +2,21 @@ from .user import User
 from .admin import Admin, AdminRole
 from .points import WeeklyUserStats, PointEvent, PointSource
 from .checkin import DailyCheckin 
-from .quiz import Quiz, QuizOption, QuizAttempt
+from .quiz import Quiz, QuizOption, QuizAttempt, QuizOptionCounter
+from .quiz_session import QuizSet, QuizSetQuestion, QuizSession, QuizAnswer
 from .poll import Poll, PollVote
-from .screenshot import ScreenshotSubmission, ScreenshotStatus
-from .spin import SpinHistory, SpinRewardType
+from .screenshot import ScreenshotSubmission, ScreenshotStatus, ScreenshotQueueCounter
+from .spin import SpinCashLedger, SpinHistory, SpinRewardType
 from .logs import AdminActionLog
-from .daily_action import DailyAction, DailyActionType
+from .daily_action import DAILY_ACTION_BITS, DailyAction, DailyActionType, DailyProgress
 from .weekly_winner import WeeklyWinner
 from .app_config import AppConfig
+from .pending_deletion import PendingDeletion
+from .media_file import MediaFile
+from .weekly_recap import WeeklyRecapRank, WeeklyRecapRun
+from .reviewer import ScreenshotReviewer
+from .screenshot_fingerprint import ScreenshotFingerprint
+from .referral import ReferralStats
 
 __all__ = [
     "User",
@@ -22,15 +29,31 @@ __all__ = [
     "Quiz",
     "QuizOption",
     "QuizAttempt",
+    "QuizOptionCounter",
+    "QuizSet",
+    "QuizSetQuestion",
+    "QuizSession",
+    "QuizAnswer",
     "Poll",
     "PollVote",
     "ScreenshotSubmission",
     "ScreenshotStatus",
+    "ScreenshotQueueCounter",
     "SpinHistory",
     "SpinRewardType",
+    "SpinCashLedger",
     "AdminActionLog",
     "DailyAction",
     "DailyActionType",
+    "DailyProgress",
+    "DAILY_ACTION_BITS",
     "WeeklyWinner",
     "AppConfig",
+    "PendingDeletion",
+    "MediaFile",
+    "WeeklyRecapRank",
+    "WeeklyRecapRun",
+    "ScreenshotReviewer",
+    "ScreenshotFingerprint",
+    "ReferralStats",
 ]
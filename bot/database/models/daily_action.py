@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import date, datetime
 from enum import Enum  # ✅ Python Enum
 
-from sqlalchemy import Date, DateTime, ForeignKey, Index, UniqueConstraint, func
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from bot.database.base import Base
@@ -17,6 +17,16 @@ class DailyActionType(str, Enum):
     POLL_VOTE = "poll_vote"  # completion when poll closes & points granted
 
 
+# Bit of each action in DailyProgress.mask (stored: never renumber, only append)
+DAILY_ACTION_BITS: dict[str, int] = {
+    DailyActionType.CHECKIN.value: 1 << 0,
+    DailyActionType.QUIZ.value: 1 << 1,
+    DailyActionType.SCREENSHOT.value: 1 << 2,
+    DailyActionType.SPIN.value: 1 << 3,
+    DailyActionType.POLL_VOTE.value: 1 << 4,
+}
+
+
 class DailyAction(Base):
     __tablename__ = "daily_actions"
     __table_args__ = (
@@ -34,3 +44,20 @@ class DailyAction(Base):
     action_type: Mapped[str] = mapped_column(index=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+
+
+class DailyProgress(Base):
+    """
+    One row per (user, UTC day): bitmask of completed DailyActionTypes (DAILY_ACTION_BITS).
+    Set with an atomic OR upsert, read with one primary-key lookup.
+    daily_actions is still dual-written during the migration period.
+    """
+    __tablename__ = "daily_progress"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    day_utc: Mapped[date] = mapped_column(Date, primary_key=True)
+    mask: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False), server_default=func.now(), onupdate=func.now()
+    )
@@ -0,0 +1,33 @@
+# bot/database/models/media_file.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class MediaFile(Base):
+    """
+    Uploaded generated media: content hash -> Telegram file_id.
+    Lets identical cards be re-sent by file_id instead of uploading the bytes again.
+    """
+    __tablename__ = "media_files"
+    __table_args__ = (
+        UniqueConstraint("content_hash", name="uq_media_files_content_hash"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    content_hash: Mapped[str] = mapped_column(String(64))  # sha256 hex
+    kind: Mapped[str] = mapped_column(String(32), default="photo")
+
+    file_id: Mapped[str] = mapped_column(String(256))
+    file_unique_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+
+    uses: Mapped[int] = mapped_column(Integer, default=1)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+    last_used_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
@@ -0,0 +1,30 @@
+# bot/database/models/pending_deletion.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, Index, Integer, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class PendingDeletion(Base):
+    """
+    Auto-delete queue (survives restarts).
+    Rows are removed once the message was deleted (or the delete failed for good).
+    """
+    __tablename__ = "pending_deletions"
+    __table_args__ = (
+        UniqueConstraint("chat_id", "message_id", name="uq_pending_deletions_chat_msg"),
+        Index("ix_pending_deletions_due", "due_at_utc"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    message_id: Mapped[int] = mapped_column(Integer)
+
+    due_at_utc: Mapped[datetime] = mapped_column(DateTime(timezone=False))
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
@@ -88,3 +88,16 @@ class QuizAttempt(Base):
     points_awarded: Mapped[int] = mapped_column(Integer, default=0)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+
+
+class QuizOptionCounter(Base):
+    """
+    Answers per (quiz, option), bumped by create_attempt_once in the attempt's transaction
+    (so stats never GROUP BY quiz_attempts).
+    Drift is corrected by reconcile_answer_counters() at day rollover.
+    """
+    __tablename__ = "quiz_option_counters"
+
+    quiz_id: Mapped[int] = mapped_column(ForeignKey("quizzes.id", ondelete="CASCADE"), primary_key=True)
+    option_index: Mapped[int] = mapped_column(Integer, primary_key=True)  # 0..n-1
+    n: Mapped[int] = mapped_column(Integer, default=0)
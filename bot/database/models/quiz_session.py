@@ -0,0 +1,102 @@
+# bot/database/models/quiz_session.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+    func,
+    Index,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from bot.database.base import Base
+
+
+class QuizSet(Base):
+    """
+    Multi-question quiz published by an admin (played once per user via /quizrun).
+    """
+    __tablename__ = "quiz_sets"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    title: Mapped[str] = mapped_column(String(200))
+
+    # active / closed
+    status: Mapped[str] = mapped_column(String(16), default="active", index=True)
+
+    created_by_admin_id: Mapped[int | None] = mapped_column(
+        ForeignKey("users.id", ondelete="SET NULL"),
+        nullable=True,
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+
+    questions: Mapped[list["QuizSetQuestion"]] = relationship(
+        "QuizSetQuestion",
+        back_populates="quiz_set",
+        cascade="all, delete-orphan",
+        order_by="QuizSetQuestion.position",
+    )
+
+
+class QuizSetQuestion(Base):
+    __tablename__ = "quiz_set_questions"
+    __table_args__ = (
+        UniqueConstraint("set_id", "position", name="uq_quiz_set_questions_set_position"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    set_id: Mapped[int] = mapped_column(ForeignKey("quiz_sets.id", ondelete="CASCADE"), index=True)
+
+    position: Mapped[int] = mapped_column(Integer)  # 0..n-1
+    question: Mapped[str] = mapped_column(String(512))
+    options_json: Mapped[str] = mapped_column(String(1500))  # JSON list of option texts
+    correct_index: Mapped[int] = mapped_column(Integer)  # 0..n-1
+    points: Mapped[int] = mapped_column(Integer, default=10)
+
+    quiz_set: Mapped["QuizSet"] = relationship("QuizSet", back_populates="questions")
+
+
+class QuizSession(Base):
+    """
+    One user's run through a QuizSet.
+    current_index/score are written in batches by QuizSessionEngine, not per click.
+    """
+    __tablename__ = "quiz_sessions"
+    __table_args__ = (
+        UniqueConstraint("set_id", "user_id", name="uq_quiz_sessions_set_user"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    set_id: Mapped[int] = mapped_column(ForeignKey("quiz_sets.id", ondelete="CASCADE"), index=True)
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+
+    current_index: Mapped[int] = mapped_column(Integer, default=0)  # next question to answer
+    score: Mapped[int] = mapped_column(Integer, default=0)  # points earned so far
+
+    is_finished: Mapped[bool] = mapped_column(Integer, default=0)  # sqlite bool
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+
+
+class QuizAnswer(Base):
+    __tablename__ = "quiz_answers"
+    __table_args__ = (
+        UniqueConstraint("session_id", "question_id", name="uq_quiz_answers_session_question"),
+        Index("ix_quiz_answers_question", "question_id"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    session_id: Mapped[int] = mapped_column(ForeignKey("quiz_sessions.id", ondelete="CASCADE"), index=True)
+    question_id: Mapped[int] = mapped_column(ForeignKey("quiz_set_questions.id", ondelete="CASCADE"))
+
+    chosen_index: Mapped[int] = mapped_column(Integer)
+    is_correct: Mapped[bool] = mapped_column(Integer, default=0)  # sqlite bool
+    answered_at: Mapped[datetime] = mapped_column(DateTime(timezone=False))
@@ -0,0 +1,35 @@
+# bot/database/models/referral.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class ReferralStats(Base):
+    """
+    Referral counters per referrer, maintained by /start and the referral join award
+    (so /ref, the cap check and /top_referrers never count point_events).
+    - pending: referred users who pressed Start but haven't joined the group yet
+    - successful: joins that earned the referrer a point (capped at REFERRAL_CAP)
+    - capped: joins that came in after the cap was reached (no point)
+    Rebuilt from users + the ledger by referral_repo.rebuild_referral_stats().
+    """
+    __tablename__ = "referral_stats"
+    __table_args__ = (
+        Index("ix_referral_stats_successful", "successful"),
+    )
+
+    referrer_user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+
+    successful: Mapped[int] = mapped_column(Integer, default=0)
+    pending: Mapped[int] = mapped_column(Integer, default=0)
+    capped: Mapped[int] = mapped_column(Integer, default=0)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
@@ -0,0 +1,29 @@
+# bot/database/models/reviewer.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Boolean, DateTime, ForeignKey, Integer, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class ScreenshotReviewer(Base):
+    """
+    Admins taking part in pushed screenshot review (/ss_on, /ss_off).
+    Submissions are dispatched to the least-loaded available reviewer by DM.
+    """
+    __tablename__ = "screenshot_reviewers"
+
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger)  # DM target
+
+    available: Mapped[bool] = mapped_column(Boolean, default=True, index=True)
+    max_open: Mapped[int] = mapped_column(Integer, default=3)  # open claims before we stop pushing
+
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=False),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
@@ -38,6 +38,8 @@ class ScreenshotSubmission(Base):
         UniqueConstraint("user_id", "day_utc", name="uq_screenshot_user_day"),
         Index("ix_screenshot_status_assigned", "status", "assigned_admin_user_id"),
         Index("ix_screenshot_day_status", "day_utc", "status"),
+        # claim reaper: next expiry / due expired claims
+        Index("ix_screenshot_status_expires", "status", "expires_at_utc"),
     )
 
     id: Mapped[int] = mapped_column(primary_key=True)
@@ -79,3 +81,17 @@ class ScreenshotSubmission(Base):
     decision_note: Mapped[str | None] = mapped_column(String(256), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+
+
+class ScreenshotQueueCounter(Base):
+    """
+    Submissions per status, maintained on every status change by screenshot_repo
+    (so queue stats never scan screenshot_submissions).
+    scope = "all" for the global totals, or the ISO day_utc ("2026-01-31").
+    Drift is corrected by reconcile_queue_counters().
+    """
+    __tablename__ = "screenshot_queue_counters"
+
+    scope: Mapped[str] = mapped_column(String(10), primary_key=True)
+    status: Mapped[str] = mapped_column(String(16), primary_key=True)
+    n: Mapped[int] = mapped_column(Integer, default=0)
@@ -0,0 +1,34 @@
+# bot/database/models/screenshot_fingerprint.py
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Integer, String, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class ScreenshotFingerprint(Base):
+    """
+    Duplicate-detection data of one submission (kept beside screenshot_submissions,
+    which has no migrations for new columns).
+    - file_unique_id: same Telegram file re-sent (exact duplicate)
+    - dhash: 64-bit difference hash, stored signed (near duplicates by Hamming distance)
+    """
+    __tablename__ = "screenshot_fingerprints"
+
+    submission_id: Mapped[int] = mapped_column(
+        ForeignKey("screenshot_submissions.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+
+    file_unique_id: Mapped[str] = mapped_column(String(64), index=True)
+    dhash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)  # None: download/decode failed
+
+    # closest earlier submission at check time (None = original)
+    dup_of_submission_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
+    dup_distance: Mapped[int | None] = mapped_column(Integer, nullable=True)  # 0 with same file
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
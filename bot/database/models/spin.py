@@ -54,3 +54,20 @@ class SpinHistory(Base):
     roll: Mapped[str | None] = mapped_column(String(64), nullable=True)
 
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+
+
+class SpinCashLedger(Base):
+    """
+    Cash prize budget ledger: one row per UTC day, weekly usage = SUM over week_start.
+    Cash wins are reserved with a single guarded upsert (see cash_budget_repo.reserve_cash).
+    """
+    __tablename__ = "spin_cash_ledger"
+
+    day_utc: Mapped[date] = mapped_column(Date, primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date, index=True)
+
+    reserved_cents: Mapped[int] = mapped_column(Integer, default=0)
+    wins: Mapped[int] = mapped_column(Integer, default=0)
+    downgraded: Mapped[int] = mapped_column(Integer, default=0)  # cash rolls paid as points (budget spent)
+
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
@@ -0,0 +1,58 @@
+# bot/database/models/weekly_recap.py
+from __future__ import annotations
+
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime, Integer, String, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from bot.database.base import Base
+
+
+class WeeklyRecapRun(Base):
+    """
+    Resumable cursor for the private weekly recap (one row per week).
+
+    Users are processed in user_id order, one small send batch (SEND_BATCH users) at a time:
+    - claimed_user_id: last user_id of the batch being sent (saved BEFORE sending)
+    - done_user_id:    last user_id of the last fully sent batch
+    After a restart, claimed > done means that batch was cut off mid-send;
+    it is skipped rather than resent.
+    """
+    __tablename__ = "weekly_recap_runs"
+    __table_args__ = (
+        UniqueConstraint("week_start", name="uq_weekly_recap_runs_week"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    week_start: Mapped[date] = mapped_column(Date)
+
+    status: Mapped[str] = mapped_column(String(16), default="running")  # running | done
+
+    claimed_user_id: Mapped[int] = mapped_column(Integer, default=0)
+    done_user_id: Mapped[int] = mapped_column(Integer, default=0)
+
+    sent: Mapped[int] = mapped_column(Integer, default=0)
+    failed: Mapped[int] = mapped_column(Integer, default=0)
+    skipped: Mapped[int] = mapped_column(Integer, default=0)
+
+    started_at: Mapped[datetime] = mapped_column(DateTime(timezone=False), server_default=func.now())
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=False), nullable=True)
+
+
+class WeeklyRecapRank(Base):
+    """
+    Final ranks of a week's active users, snapshotted once when its recap run starts.
+
+    The recap pages this table by (week_start, user_id) keyset, so every chunk is an
+    index range read instead of re-ranking the whole week. Rows are dropped when the
+    run finishes.
+    """
+    __tablename__ = "weekly_recap_ranks"
+
+    week_start: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    rank: Mapped[int] = mapped_column(Integer)
+    points: Mapped[int] = mapped_column(Integer)
+    streak: Mapped[int] = mapped_column(Integer, default=0)
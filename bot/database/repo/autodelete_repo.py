@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import PendingDeletion
+
+
+@dataclass(frozen=True, slots=True)
+class PendingRow:
+    chat_id: int
+    message_id: int
+    due_at_utc: datetime
+
+
+async def add_pending(session: AsyncSession, rows: list[PendingRow]) -> None:
+    """
+    Bulk insert; re-scheduling the same (chat_id, message_id) is a no-op.
+    """
+    if not rows:
+        return
+
+    stmt = sqlite_insert(PendingDeletion).values(
+        [
+            {"chat_id": r.chat_id, "message_id": r.message_id, "due_at_utc": r.due_at_utc}
+            for r in rows
+        ]
+    ).on_conflict_do_nothing(index_elements=["chat_id", "message_id"])
+    await session.execute(stmt)
+
+
+async def load_pending(session: AsyncSession) -> list[PendingRow]:
+    res = await session.execute(
+        select(
+            PendingDeletion.chat_id,
+            PendingDeletion.message_id,
+            PendingDeletion.due_at_utc,
+        ).order_by(PendingDeletion.due_at_utc.asc())
+    )
+    return [
+        PendingRow(chat_id=int(chat_id), message_id=int(message_id), due_at_utc=due)
+        for chat_id, message_id, due in res.all()
+    ]
+
+
+async def remove_pending(session: AsyncSession, *, chat_id: int, message_ids: list[int]) -> None:
+    if not message_ids:
+        return
+    await session.execute(
+        delete(PendingDeletion).where(
+            PendingDeletion.chat_id == chat_id,
+            PendingDeletion.message_id.in_(message_ids),
+        )
+    )
@@ -0,0 +1,116 @@
+# bot/database/repo/cash_budget_repo.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import SpinCashLedger
+
+
+@dataclass(frozen=True, slots=True)
+class CashReservation:
+    day_cents: int  # reserved today, including this win
+    day_wins: int
+    week_cents: int  # reserved this week, including this win
+
+
+@dataclass(frozen=True, slots=True)
+class BudgetUsage:
+    day_utc: date
+    week_start: date
+    day_cents: int
+    day_wins: int
+    day_downgraded: int
+    week_cents: int
+    week_wins: int
+    week_downgraded: int
+
+
+async def reserve_cash(
+    session: AsyncSession,
+    *,
+    day_utc: date,
+    week_start: date,
+    cents: int,
+    daily_limit_cents: int = 0,
+    weekly_limit_cents: int = 0,
+) -> CashReservation | None:
+    """
+    Reserves one cash win in a single statement: the day's ledger row is upserted only if
+    today's and this week's totals stay within the limits (0 = no limit). No row comes back
+    when the budget can't cover it. Caller's transaction also records the spin.
+    """
+    week_total = (
+        select(func.coalesce(func.sum(SpinCashLedger.reserved_cents), 0))
+        .where(SpinCashLedger.week_start == week_start)
+        .scalar_subquery()
+    )
+    day_total = (
+        select(func.coalesce(func.sum(SpinCashLedger.reserved_cents), 0))
+        .where(SpinCashLedger.day_utc == day_utc)
+        .scalar_subquery()
+    )
+    guards = []
+    if daily_limit_cents > 0:
+        guards.append(day_total + cents <= daily_limit_cents)
+    if weekly_limit_cents > 0:
+        guards.append(week_total + cents <= weekly_limit_cents)
+
+    src = select(literal(day_utc), literal(week_start), literal(cents), literal(1)).where(*guards or [literal(True)])
+    stmt = sqlite_insert(SpinCashLedger).from_select(["day_utc", "week_start", "reserved_cents", "wins"], src)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day_utc"],
+        set_={
+            "reserved_cents": SpinCashLedger.reserved_cents + stmt.excluded.reserved_cents,
+            "wins": SpinCashLedger.wins + 1,
+            "updated_at": func.now(),
+        },
+    ).returning(SpinCashLedger.reserved_cents, SpinCashLedger.wins, week_total)
+
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None
+    return CashReservation(day_cents=int(row[0]), day_wins=int(row[1]), week_cents=int(row[2]))
+
+
+async def record_downgrade(session: AsyncSession, *, day_utc: date, week_start: date) -> None:
+    stmt = sqlite_insert(SpinCashLedger).values(
+        day_utc=day_utc, week_start=week_start, reserved_cents=0, wins=0, downgraded=1
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day_utc"],
+        set_={"downgraded": SpinCashLedger.downgraded + 1, "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def get_budget_usage(session: AsyncSession, *, day_utc: date, week_start: date) -> BudgetUsage:
+    res = await session.execute(
+        select(
+            SpinCashLedger.day_utc,
+            SpinCashLedger.reserved_cents,
+            SpinCashLedger.wins,
+            SpinCashLedger.downgraded,
+        ).where(SpinCashLedger.week_start == week_start)
+    )
+    rows = res.all()
+    today = next((r for r in rows if r.day_utc == day_utc), None)
+    return BudgetUsage(
+        day_utc=day_utc,
+        week_start=week_start,
+        day_cents=int(today.reserved_cents) if today else 0,
+        day_wins=int(today.wins) if today else 0,
+        day_downgraded=int(today.downgraded) if today else 0,
+        week_cents=sum(int(r.reserved_cents) for r in rows),
+        week_wins=sum(int(r.wins) for r in rows),
+        week_downgraded=sum(int(r.downgraded) for r in rows),
+    )
+
+
+async def list_ledger_days(session: AsyncSession, *, limit: int = 14) -> list[SpinCashLedger]:
+    res = await session.execute(select(SpinCashLedger).order_by(SpinCashLedger.day_utc.desc()).limit(limit))
+    return list(res.scalars().all())
@@ -0,0 +1,61 @@
+# bot/database/repo/daily_progress_repo.py
+from __future__ import annotations
+
+from datetime import date
+
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import DAILY_ACTION_BITS, DailyAction, DailyProgress
+
+
+async def or_progress(session: AsyncSession, rows: dict[tuple[int, date], int]) -> None:
+    """
+    (user_id, day_utc) -> bits to set. One atomic upsert: mask = mask | bits.
+    """
+    if not rows:
+        return
+    stmt = sqlite_insert(DailyProgress).values(
+        [{"user_id": uid, "day_utc": day, "mask": bits} for (uid, day), bits in rows.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day_utc"],
+        set_={"mask": DailyProgress.mask.op("|")(stmt.excluded.mask), "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def get_progress_mask(session: AsyncSession, *, user_id: int, day_utc: date) -> int:
+    res = await session.execute(
+        select(DailyProgress.mask).where(DailyProgress.user_id == user_id, DailyProgress.day_utc == day_utc)
+    )
+    return int(res.scalar_one_or_none() or 0)
+
+
+async def has_daily_progress(session: AsyncSession) -> bool:
+    res = await session.execute(select(DailyProgress.user_id).limit(1))
+    return res.first() is not None
+
+
+async def backfill_daily_progress(session: AsyncSession, *, since: date | None = None) -> int:
+    """
+    Migration from daily_actions: ORs every legacy row (optionally only days >= since)
+    into daily_progress with one INSERT .. SELECT .. GROUP BY. Idempotent. Caller commits.
+    Returns how many (user, day) rows were written.
+    """
+    bit = case(DAILY_ACTION_BITS, value=DailyAction.action_type, else_=0)
+    q = select(DailyAction.user_id, DailyAction.day_utc, func.sum(bit)).group_by(
+        DailyAction.user_id, DailyAction.day_utc
+    )
+    if since is not None:
+        q = q.where(DailyAction.day_utc >= since)
+
+    # one (user, day, type) row per action (uq_daily_action_user_day_type): SUM of bits == OR
+    stmt = sqlite_insert(DailyProgress).from_select(["user_id", "day_utc", "mask"], q)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "day_utc"],
+        set_={"mask": DailyProgress.mask.op("|")(stmt.excluded.mask)},
+    )
+    res = await session.execute(stmt)
+    return int(res.rowcount or 0)
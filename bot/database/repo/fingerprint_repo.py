@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import ScreenshotFingerprint
+from bot.utils.image_hash import from_signed64, to_signed64
+
+
+@dataclass(frozen=True, slots=True)
+class FingerprintRow:
+    submission_id: int
+    user_id: int
+    file_unique_id: str
+    dhash: int | None  # unsigned 64-bit
+
+
+async def save_fingerprint(
+    session: AsyncSession,
+    *,
+    submission_id: int,
+    user_id: int,
+    file_unique_id: str,
+    dhash: int | None,
+    dup_of_submission_id: int | None,
+    dup_distance: int | None,
+) -> None:
+    session.add(
+        ScreenshotFingerprint(
+            submission_id=submission_id,
+            user_id=user_id,
+            file_unique_id=file_unique_id,
+            dhash=to_signed64(dhash) if dhash is not None else None,
+            dup_of_submission_id=dup_of_submission_id,
+            dup_distance=dup_distance,
+        )
+    )
+    await session.flush()
+
+
+async def dup_flags(session: AsyncSession, *, submission_ids: list[int]) -> dict[int, tuple[int, int]]:
+    """
+    submission_id -> (dup_of_submission_id, distance) for flagged submissions.
+    """
+    if not submission_ids:
+        return {}
+    res = await session.execute(
+        select(
+            ScreenshotFingerprint.submission_id,
+            ScreenshotFingerprint.dup_of_submission_id,
+            ScreenshotFingerprint.dup_distance,
+        ).where(
+            ScreenshotFingerprint.submission_id.in_(submission_ids),
+            ScreenshotFingerprint.dup_of_submission_id.is_not(None),
+        )
+    )
+    return {int(sid): (int(of), int(d or 0)) for sid, of, d in res.all()}
+
+
+async def iter_fingerprints(session: AsyncSession, *, batch: int = 5000) -> AsyncIterator[list[FingerprintRow]]:
+    """
+    All fingerprints in submission order, `batch` rows per round-trip (keyset).
+    """
+    after = 0
+    while True:
+        res = await session.execute(
+            select(
+                ScreenshotFingerprint.submission_id,
+                ScreenshotFingerprint.user_id,
+                ScreenshotFingerprint.file_unique_id,
+                ScreenshotFingerprint.dhash,
+            )
+            .where(ScreenshotFingerprint.submission_id > after)
+            .order_by(ScreenshotFingerprint.submission_id.asc())
+            .limit(batch)
+        )
+        rows = [
+            FingerprintRow(
+                submission_id=int(sid),
+                user_id=int(uid),
+                file_unique_id=fuid,
+                dhash=from_signed64(int(h)) if h is not None else None,
+            )
+            for sid, uid, fuid, h in res.all()
+        ]
+        if not rows:
+            return
+        yield rows
+        after = rows[-1].submission_id
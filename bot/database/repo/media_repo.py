@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import MediaFile
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True, slots=True)
+class MediaRow:
+    file_id: str
+    size_bytes: int
+
+
+async def get_media(session: AsyncSession, *, content_hash: str) -> MediaRow | None:
+    res = await session.execute(
+        select(MediaFile.file_id, MediaFile.size_bytes).where(MediaFile.content_hash == content_hash)
+    )
+    row = res.first()
+    if row is None:
+        return None
+    return MediaRow(file_id=row[0], size_bytes=int(row[1] or 0))
+
+
+async def save_file_id(
+    session: AsyncSession,
+    *,
+    content_hash: str,
+    file_id: str,
+    file_unique_id: str | None = None,
+    kind: str = "photo",
+    size_bytes: int = 0,
+) -> None:
+    """
+    Upsert: a re-upload (e.g. after the old file_id was rejected) replaces the row.
+    """
+    now = _utc_now_naive()
+    stmt = sqlite_insert(MediaFile).values(
+        content_hash=content_hash,
+        kind=kind,
+        file_id=file_id,
+        file_unique_id=file_unique_id,
+        size_bytes=size_bytes,
+        uses=1,
+        created_at=now,
+        last_used_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["content_hash"],
+        set_={
+            "file_id": stmt.excluded.file_id,
+            "file_unique_id": stmt.excluded.file_unique_id,
+            "size_bytes": stmt.excluded.size_bytes,
+            "last_used_at": now,
+        },
+    )
+    await session.execute(stmt)
+
+
+async def touch_file_id(session: AsyncSession, *, content_hash: str) -> None:
+    await session.execute(
+        update(MediaFile)
+        .where(MediaFile.content_hash == content_hash)
+        .values(uses=MediaFile.uses + 1, last_used_at=_utc_now_naive())
+    )
+
+
+async def forget_file_id(session: AsyncSession, *, content_hash: str) -> None:
+    await session.execute(delete(MediaFile).where(MediaFile.content_hash == content_hash))
@@ -3,7 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, timedelta
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,6 +25,70 @@ class AwardResult:
     week_start: date
 
 
+@dataclass(frozen=True, slots=True)
+class BulkAward:
+    user_id: int
+    day_utc: date
+    ref_id: int
+
+
+async def award_points_bulk(
+    session: AsyncSession,
+    *,
+    awards: list[BulkAward],
+    source: PointSource,
+    points: int,
+    ref_type: str,
+) -> set[int]:
+    """
+    award_points_once for many refs in two statements:
+    - one multi-row INSERT into point_events (duplicates skipped by uq_point_events_user_src_ref)
+    - one upsert into weekly_user_stats, summed per (week, user), for the rows actually inserted
+    Returns the ref_ids that were awarded now.
+    """
+    if points == 0 or not awards:
+        return set()
+
+    res = await session.execute(
+        sqlite_insert(PointEvent)
+        .values(
+            [
+                {
+                    "user_id": a.user_id,
+                    "week_start": week_start_utc(a.day_utc),
+                    "day_utc": a.day_utc,
+                    "source": source,
+                    "points": points,
+                    "ref_type": ref_type,
+                    "ref_id": a.ref_id,
+                }
+                for a in awards
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["user_id", "source", "ref_type", "ref_id"])
+        .returning(PointEvent.user_id, PointEvent.week_start, PointEvent.ref_id)
+    )
+    inserted = res.all()
+    if not inserted:
+        return set()
+
+    per_week_user: dict[tuple[date, int], int] = {}
+    for user_id, ws, _ in inserted:
+        key = (ws, int(user_id))
+        per_week_user[key] = per_week_user.get(key, 0) + points
+
+    stmt = sqlite_insert(WeeklyUserStats).values(
+        [{"week_start": ws, "user_id": uid, "points": pts} for (ws, uid), pts in per_week_user.items()]
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["week_start", "user_id"],
+        set_={"points": WeeklyUserStats.points + stmt.excluded.points, "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+    return {int(ref_id) for _, _, ref_id in inserted}
+
+
 async def award_points_once(
     session: AsyncSession,
     *,
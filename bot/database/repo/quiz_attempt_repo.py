@@ -3,12 +3,13 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from bot.database.models import Quiz, QuizAttempt
+from bot.database.models import Quiz, QuizAttempt, QuizOptionCounter
 
 
 @dataclass(frozen=True, slots=True)
@@ -19,6 +20,25 @@ class AttemptResult:
     chosen_index: int
 
 
+@dataclass(frozen=True, slots=True)
+class AnswerStats:
+    quiz_id: int
+    per_option: list[int]  # answers per option index
+    correct_index: int  # 0-based
+
+    @property
+    def total(self) -> int:
+        return sum(self.per_option)
+
+    @property
+    def correct(self) -> int:
+        return self.per_option[self.correct_index] if 0 <= self.correct_index < len(self.per_option) else 0
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.total if self.total else 0.0
+
+
 async def get_quiz_by_id(session: AsyncSession, quiz_id: int) -> Quiz | None:
     q = (
         select(Quiz)
@@ -38,7 +58,11 @@ async def get_attempt(session: AsyncSession, quiz_id: int, user_id: int) -> Quiz
 async def create_attempt_once(
     session: AsyncSession,
     *,
-    quiz: Quiz,
+    quiz_id: int,
+    option_count: int,
+    correct_index: int,
+    points_correct: int,
+    points_wrong: int,
     user_id: int,
     day_utc: date,
     chosen_index: int,
@@ -46,17 +70,17 @@ async def create_attempt_once(
     """
     Creates a QuizAttempt exactly once (unique constraint: quiz_id + user_id).
     If already attempted -> returns already_attempted=True.
+    Takes plain quiz fields so callers can validate from QuizCache without a read.
     """
     # quick bounds check
-    option_count = len(quiz.options or [])
     if chosen_index < 0 or chosen_index >= option_count:
         raise ValueError("Invalid option index")
 
-    is_correct = chosen_index == quiz.correct_option_index
-    points_awarded = quiz.points_correct if is_correct else quiz.points_wrong
+    is_correct = chosen_index == correct_index
+    points_awarded = points_correct if is_correct else points_wrong
 
     attempt = QuizAttempt(
-        quiz_id=quiz.id,
+        quiz_id=quiz_id,
         user_id=user_id,
         day_utc=day_utc,
         chosen_index=chosen_index,
@@ -67,9 +91,10 @@ async def create_attempt_once(
 
     try:
         await session.flush()  # may raise IntegrityError if duplicate attempt
+        await _bump_answer_counter(session, quiz_id=quiz_id, option_index=chosen_index)
     except IntegrityError:
         await session.rollback()
-        existing = await get_attempt(session, quiz.id, user_id)
+        existing = await get_attempt(session, quiz_id, user_id)
         # existing should exist; if not, treat as already attempted anyway
         if existing:
             return AttemptResult(
@@ -91,3 +116,69 @@ async def create_attempt_once(
         points_awarded=points_awarded,
         chosen_index=chosen_index,
     )
+
+
+
+async def _bump_answer_counter(session: AsyncSession, *, quiz_id: int, option_index: int) -> None:
+    stmt = sqlite_insert(QuizOptionCounter).values(quiz_id=quiz_id, option_index=option_index, n=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["quiz_id", "option_index"],
+        set_={"n": QuizOptionCounter.n + 1},
+    )
+    await session.execute(stmt)
+
+
+async def get_answer_stats(
+    session: AsyncSession,
+    *,
+    quiz_id: int,
+    option_count: int,
+    correct_index: int,
+) -> AnswerStats:
+    """
+    Reads the maintained counters (at most option_count rows by primary key).
+    """
+    res = await session.execute(
+        select(QuizOptionCounter.option_index, QuizOptionCounter.n).where(QuizOptionCounter.quiz_id == quiz_id)
+    )
+    per_option = [0] * option_count
+    for idx, n in res.all():
+        if 0 <= idx < option_count:
+            per_option[idx] = int(n)
+    return AnswerStats(quiz_id=quiz_id, per_option=per_option, correct_index=correct_index)
+
+
+async def reconcile_answer_counters(session: AsyncSession, *, quiz_ids: list[int]) -> int:
+    """
+    Recounts quiz_attempts for the given quizzes (one GROUP BY) and overwrites
+    counters that drifted. Returns how many counter cells were corrected. Caller commits.
+    """
+    if not quiz_ids:
+        return 0
+
+    res = await session.execute(
+        select(QuizAttempt.quiz_id, QuizAttempt.chosen_index, func.count())
+        .where(QuizAttempt.quiz_id.in_(quiz_ids))
+        .group_by(QuizAttempt.quiz_id, QuizAttempt.chosen_index)
+    )
+    actual = {(int(q), int(i)): int(n) for q, i, n in res.all()}
+
+    res = await session.execute(
+        select(QuizOptionCounter.quiz_id, QuizOptionCounter.option_index, QuizOptionCounter.n).where(
+            QuizOptionCounter.quiz_id.in_(quiz_ids)
+        )
+    )
+    stored = {(int(q), int(i)): int(n) for q, i, n in res.all()}
+
+    fixes = [
+        {"quiz_id": q, "option_index": i, "n": actual.get((q, i), 0)}
+        for q, i in set(actual) | set(stored)
+        if actual.get((q, i), 0) != stored.get((q, i))
+    ]
+    if not fixes:
+        return 0
+
+    stmt = sqlite_insert(QuizOptionCounter).values(fixes)
+    stmt = stmt.on_conflict_do_update(index_elements=["quiz_id", "option_index"], set_={"n": stmt.excluded.n})
+    await session.execute(stmt)
+    return len(fixes)
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import date
+from typing import Callable
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from bot.database.models import Quiz, QuizOption
+from bot.database.models import Quiz, QuizAttempt, QuizOption
+from bot.utils.quiz_parser import ParsedQuiz
+
+
+# Called with day_utc whenever that day's quiz is replaced/deleted (e.g. QuizCache.invalidate)
+_change_listeners: list[Callable[[date], None]] = []
+
+
+def add_quiz_change_listener(fn: Callable[[date], None]) -> None:
+    _change_listeners.append(fn)
+
+
+def remove_quiz_change_listener(fn: Callable[[date], None]) -> None:
+    if fn in _change_listeners:
+        _change_listeners.remove(fn)
+
+
+def _notify_change(day_utc: date) -> None:
+    for fn in _change_listeners:
+        fn(day_utc)
 
 
 async def get_quiz_for_day(session: AsyncSession, day_utc: date) -> Quiz | None:
@@ -53,4 +75,96 @@ async def replace_quiz_for_day(
 
     session.add_all([QuizOption(quiz_id=quiz.id, index=i, text=opt) for i, opt in enumerate(options)])
     await session.flush()
+    _notify_change(day_utc)
     return quiz
+
+
+async def delete_quiz_for_day(session: AsyncSession, day_utc: date) -> bool:
+    existing = await get_quiz_for_day(session, day_utc)
+    if not existing:
+        return False
+    await session.execute(delete(QuizOption).where(QuizOption.quiz_id == existing.id))
+    await session.execute(delete(Quiz).where(Quiz.id == existing.id))
+    _notify_change(day_utc)
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class QuizUpsertResult:
+    created: int
+    replaced: int
+
+
+async def days_with_attempts(session: AsyncSession, days: list[date]) -> set[date]:
+    """
+    Days whose quiz already has answers (replacing it would orphan them).
+    """
+    if not days:
+        return set()
+    res = await session.execute(
+        select(Quiz.day_utc)
+        .where(Quiz.day_utc.in_(days))
+        .where(select(QuizAttempt.id).where(QuizAttempt.quiz_id == Quiz.id).exists())
+    )
+    return set(res.scalars().all())
+
+
+async def upsert_quizzes(
+    session: AsyncSession,
+    quizzes: list[tuple[date, ParsedQuiz]],
+    *,
+    created_by_user_id: int | None = None,
+) -> QuizUpsertResult:
+    """
+    Set-wise create/replace of many days in the caller's transaction:
+    - one upsert into quizzes (ids are kept for days that already exist)
+    - one DELETE of their old options
+    - one bulk INSERT of all options
+    """
+    if not quizzes:
+        return QuizUpsertResult(created=0, replaced=0)
+
+    days = [d for d, _ in quizzes]
+    res = await session.execute(select(Quiz.day_utc).where(Quiz.day_utc.in_(days)))
+    existing = set(res.scalars().all())
+
+    stmt = sqlite_insert(Quiz)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["day_utc"],
+        set_={
+            "question": stmt.excluded.question,
+            "correct_option_index": stmt.excluded.correct_option_index,
+            "points_correct": stmt.excluded.points_correct,
+            "points_wrong": stmt.excluded.points_wrong,
+            "created_by_admin_id": stmt.excluded.created_by_admin_id,
+        },
+    ).returning(Quiz.id, Quiz.day_utc)
+    res = await session.execute(
+        stmt,
+        [
+            {
+                "day_utc": d,
+                "question": q.question,
+                "correct_option_index": q.correct_index - 1,
+                "points_correct": q.points,
+                "points_wrong": 0,
+                "created_by_admin_id": created_by_user_id,
+            }
+            for d, q in quizzes
+        ],
+    )
+    id_by_day = {day_utc: int(quiz_id) for quiz_id, day_utc in res.all()}
+
+    await session.execute(delete(QuizOption).where(QuizOption.quiz_id.in_(list(id_by_day.values()))))
+    await session.execute(
+        insert(QuizOption),
+        [
+            {"quiz_id": id_by_day[d], "index": i, "text": text}
+            for d, q in quizzes
+            for i, text in enumerate(q.options)
+        ],
+    )
+
+    for d in days:
+        _notify_change(d)
+    return QuizUpsertResult(created=len(set(days) - existing), replaced=len(existing))
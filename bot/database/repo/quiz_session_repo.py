@@ -0,0 +1,246 @@
+# bot/database/repo/quiz_session_repo.py
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import bindparam, func, insert, select, tuple_, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from bot.database.models import PointSource, QuizAnswer, QuizSession, QuizSet, QuizSetQuestion
+from bot.database.repo.points_repo import BulkAward, award_points_bulk
+from bot.utils.quiz_parser import ParsedQuiz
+
+ANSWER_INSERT_CHUNK = 1000  # 5 binds per row, well under SQLite's variable limit
+SESSION_UPSERT_CHUNK = 1000
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+@dataclass(frozen=True, slots=True)
+class SessionRow:
+    session_id: int
+    current_index: int
+    score: int
+    is_finished: bool
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerRow:
+    session_id: int
+    question_id: int
+    chosen_index: int
+    is_correct: bool
+    answered_at: datetime
+
+
+@dataclass(frozen=True, slots=True)
+class ProgressRow:
+    session_id: int
+    current_index: int
+    score: int
+
+
+@dataclass(frozen=True, slots=True)
+class FinishRow:
+    session_id: int
+    user_id: int
+    score: int
+
+
+@dataclass(frozen=True, slots=True)
+class SetSummary:
+    set_id: int
+    title: str
+    status: str
+    questions: int
+    started: int
+    finished: int
+
+
+async def create_quiz_set(
+    session: AsyncSession,
+    *,
+    title: str,
+    questions: list[ParsedQuiz],
+    created_by_user_id: int | None = None,
+) -> int:
+    res = await session.execute(
+        insert(QuizSet)
+        .values(title=title, status="active", created_by_admin_id=created_by_user_id)
+        .returning(QuizSet.id)
+    )
+    set_id = int(res.scalar_one())
+    await session.execute(
+        insert(QuizSetQuestion),
+        [
+            {
+                "set_id": set_id,
+                "position": i,
+                "question": q.question,
+                "options_json": json.dumps(q.options, ensure_ascii=False),
+                "correct_index": q.correct_index - 1,
+                "points": q.points,
+            }
+            for i, q in enumerate(questions)
+        ],
+    )
+    return set_id
+
+
+async def get_quiz_set(session: AsyncSession, set_id: int) -> QuizSet | None:
+    res = await session.execute(
+        select(QuizSet).where(QuizSet.id == set_id).options(selectinload(QuizSet.questions))
+    )
+    return res.scalar_one_or_none()
+
+
+async def close_quiz_set(session: AsyncSession, set_id: int) -> bool:
+    res = await session.execute(
+        update(QuizSet)
+        .where(QuizSet.id == set_id, QuizSet.status == "active")
+        .values(status="closed", closed_at=_utc_now_naive())
+    )
+    return (res.rowcount or 0) > 0
+
+
+async def list_quiz_sets(session: AsyncSession, *, active_only: bool = True, limit: int = 20) -> list[SetSummary]:
+    questions = (
+        select(func.count(QuizSetQuestion.id)).where(QuizSetQuestion.set_id == QuizSet.id).scalar_subquery()
+    )
+    started = select(func.count(QuizSession.id)).where(QuizSession.set_id == QuizSet.id).scalar_subquery()
+    finished = (
+        select(func.count(QuizSession.id))
+        .where(QuizSession.set_id == QuizSet.id, QuizSession.is_finished == 1)
+        .scalar_subquery()
+    )
+    q = select(QuizSet.id, QuizSet.title, QuizSet.status, questions, started, finished)
+    if active_only:
+        q = q.where(QuizSet.status == "active")
+    res = await session.execute(q.order_by(QuizSet.id.desc()).limit(limit))
+    return [
+        SetSummary(set_id=r[0], title=r[1], status=r[2], questions=r[3], started=r[4], finished=r[5])
+        for r in res.all()
+    ]
+
+
+async def get_or_create_sessions(
+    session: AsyncSession,
+    keys: list[tuple[int, int]],
+) -> dict[tuple[int, int], SessionRow]:
+    """
+    Starts/resumes many runs at once: keys are (set_id, user_id).
+    One INSERT .. ON CONFLICT DO NOTHING + one SELECT per chunk. Caller commits.
+    """
+    out: dict[tuple[int, int], SessionRow] = {}
+    for i in range(0, len(keys), SESSION_UPSERT_CHUNK):
+        chunk = keys[i : i + SESSION_UPSERT_CHUNK]
+        await session.execute(
+            sqlite_insert(QuizSession)
+            .values(
+                [
+                    {"set_id": set_id, "user_id": user_id, "current_index": 0, "score": 0, "is_finished": 0}
+                    for set_id, user_id in chunk
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["set_id", "user_id"])
+        )
+        res = await session.execute(
+            select(
+                QuizSession.set_id,
+                QuizSession.user_id,
+                QuizSession.id,
+                QuizSession.current_index,
+                QuizSession.score,
+                QuizSession.is_finished,
+            ).where(tuple_(QuizSession.set_id, QuizSession.user_id).in_(chunk))
+        )
+        for set_id, user_id, sid, idx, score, fin in res.all():
+            out[(int(set_id), int(user_id))] = SessionRow(
+                session_id=int(sid), current_index=int(idx), score=int(score), is_finished=bool(fin)
+            )
+    return out
+
+
+async def save_progress(
+    session: AsyncSession,
+    *,
+    answers: list[AnswerRow],
+    progress: list[ProgressRow],
+) -> None:
+    """
+    One multi-row INSERT for the buffered answers (re-flushes are no-ops thanks to
+    uq_quiz_answers_session_question) + one executemany UPDATE for session progress.
+    """
+    for i in range(0, len(answers), ANSWER_INSERT_CHUNK):
+        await session.execute(
+            sqlite_insert(QuizAnswer)
+            .values(
+                [
+                    {
+                        "session_id": a.session_id,
+                        "question_id": a.question_id,
+                        "chosen_index": a.chosen_index,
+                        "is_correct": 1 if a.is_correct else 0,
+                        "answered_at": a.answered_at,
+                    }
+                    for a in answers[i : i + ANSWER_INSERT_CHUNK]
+                ]
+            )
+            .on_conflict_do_nothing(index_elements=["session_id", "question_id"])
+        )
+    if progress:
+        now = _utc_now_naive()
+        t = QuizSession.__table__
+        await session.execute(
+            t.update()
+            .where(t.c.id == bindparam("b_id"), t.c.is_finished == 0)
+            .values(current_index=bindparam("b_index"), score=bindparam("b_score"), updated_at=now),
+            [{"b_id": p.session_id, "b_index": p.current_index, "b_score": p.score} for p in progress],
+        )
+
+
+async def finish_sessions(
+    session: AsyncSession,
+    *,
+    finals: list[FinishRow],
+    day_utc: date,
+) -> set[int]:
+    """
+    Marks runs finished (one UPDATE .. RETURNING) and credits their scores to the
+    points ledger once (award_points_bulk per distinct score). Progress must already
+    be saved. Returns the session ids finished now.
+    """
+    if not finals:
+        return set()
+
+    now = _utc_now_naive()
+    res = await session.execute(
+        update(QuizSession)
+        .where(QuizSession.id.in_([f.session_id for f in finals]), QuizSession.is_finished == 0)
+        .values(is_finished=1, finished_at=now, updated_at=now)
+        .returning(QuizSession.id)
+    )
+    done = {int(x) for x in res.scalars().all()}
+
+    by_score: dict[int, list[BulkAward]] = {}
+    for f in finals:
+        if f.session_id in done and f.score != 0:
+            by_score.setdefault(f.score, []).append(
+                BulkAward(user_id=f.user_id, day_utc=day_utc, ref_id=f.session_id)
+            )
+    for score, awards in by_score.items():
+        await award_points_bulk(
+            session,
+            awards=awards,
+            source=PointSource.QUIZ,
+            points=score,
+            ref_type="quiz_session",
+        )
+    return done
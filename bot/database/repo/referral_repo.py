@@ -0,0 +1,248 @@
+# bot/database/repo/referral_repo.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import case, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import PointEvent, PointSource, ReferralStats, User
+
+_UPSERT_CHUNK = 500  # rows per multi-row upsert (4 bound params each)
+
+
+@dataclass(frozen=True, slots=True)
+class ReferralCounts:
+    successful: int = 0
+    pending: int = 0
+    capped: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class JoinedUser:
+    user_id: int
+    telegram_id: int
+    referrer_user_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class ReferrerState:
+    user_id: int
+    telegram_id: int
+    counts: ReferralCounts
+
+
+@dataclass(frozen=True, slots=True)
+class TopReferrer:
+    user_id: int
+    telegram_id: int
+    username: str | None
+    successful: int
+    pending: int
+    capped: int
+
+
+@dataclass(frozen=True, slots=True)
+class TreeLevel:
+    depth: int  # 1 = direct referrals
+    users: int
+    joined: int  # referral_processed (joined the group, awarded or capped)
+
+
+async def note_referral_pending(session: AsyncSession, *, referrer_user_id: int) -> None:
+    """A referred user pressed Start (referred_by_user_id was just set)."""
+    stmt = sqlite_insert(ReferralStats).values(referrer_user_id=referrer_user_id, successful=0, pending=1, capped=0)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["referrer_user_id"],
+        set_={"pending": ReferralStats.pending + 1, "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def claim_joined_users(session: AsyncSession, *, telegram_ids: list[int]) -> list[JoinedUser]:
+    """
+    Marks the not yet processed users among telegram_ids as referral_processed in one
+    UPDATE ... RETURNING (a user is claimed by exactly one batch). Unknown and already
+    processed users are simply absent. Row order is arbitrary.
+    """
+    if not telegram_ids:
+        return []
+    res = await session.execute(
+        update(User)
+        .where(User.telegram_id.in_(telegram_ids), User.referral_processed.is_(False))
+        .values(referral_processed=True)
+        .returning(User.id, User.telegram_id, User.referred_by_user_id)
+    )
+    return [JoinedUser(int(uid), int(tg), int(ref) if ref is not None else None) for uid, tg, ref in res.all()]
+
+
+async def list_unprocessed_referred(session: AsyncSession, *, since: datetime, limit: int) -> list[int]:
+    """telegram_ids of referred users created since `since` whose join isn't processed yet (newest first)."""
+    res = await session.execute(
+        select(User.telegram_id)
+        .where(
+            User.referred_by_user_id.is_not(None),
+            User.referral_processed.is_(False),
+            User.created_at >= since,
+        )
+        .order_by(User.created_at.desc())
+        .limit(limit)
+    )
+    return [int(tg) for tg in res.scalars().all()]
+
+
+async def get_referrer_states(session: AsyncSession, *, user_ids: list[int]) -> dict[int, ReferrerState]:
+    """Referrers' telegram_id + current counters (users LEFT JOIN referral_stats), one read."""
+    if not user_ids:
+        return {}
+    res = await session.execute(
+        select(
+            User.id,
+            User.telegram_id,
+            func.coalesce(ReferralStats.successful, 0),
+            func.coalesce(ReferralStats.pending, 0),
+            func.coalesce(ReferralStats.capped, 0),
+        )
+        .outerjoin(ReferralStats, ReferralStats.referrer_user_id == User.id)
+        .where(User.id.in_(user_ids))
+    )
+    return {
+        int(uid): ReferrerState(int(uid), int(tg), ReferralCounts(int(s), int(p), int(c)))
+        for uid, tg, s, p, c in res.all()
+    }
+
+
+async def set_referral_counts(session: AsyncSession, counts: dict[int, ReferralCounts]) -> None:
+    """
+    Overwrites the counters of the given referrers (multi-row upsert). The caller must have
+    read them in the same write transaction (see referral_joins.process_referral_joins).
+    """
+    rows = [
+        {"referrer_user_id": uid, "successful": c.successful, "pending": c.pending, "capped": c.capped}
+        for uid, c in counts.items()
+    ]
+    for i in range(0, len(rows), _UPSERT_CHUNK):
+        stmt = sqlite_insert(ReferralStats).values(rows[i : i + _UPSERT_CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["referrer_user_id"],
+            set_={
+                "successful": stmt.excluded.successful,
+                "pending": stmt.excluded.pending,
+                "capped": stmt.excluded.capped,
+                "updated_at": func.now(),
+            },
+        )
+        await session.execute(stmt)
+
+
+async def get_referral_counts(session: AsyncSession, *, user_id: int) -> ReferralCounts:
+    row = (
+        await session.execute(
+            select(ReferralStats.successful, ReferralStats.pending, ReferralStats.capped).where(
+                ReferralStats.referrer_user_id == user_id
+            )
+        )
+    ).first()
+    if row is None:
+        return ReferralCounts()
+    return ReferralCounts(successful=int(row[0]), pending=int(row[1]), capped=int(row[2]))
+
+
+async def top_referrers(session: AsyncSession, *, limit: int = 20) -> list[TopReferrer]:
+    res = await session.execute(
+        select(
+            ReferralStats.referrer_user_id,
+            User.telegram_id,
+            User.username,
+            ReferralStats.successful,
+            ReferralStats.pending,
+            ReferralStats.capped,
+        )
+        .join(User, User.id == ReferralStats.referrer_user_id)
+        .where(ReferralStats.successful > 0)
+        .order_by(ReferralStats.successful.desc(), ReferralStats.referrer_user_id)
+        .limit(limit)
+    )
+    return [TopReferrer(*row) for row in res.all()]
+
+
+async def referral_tree_levels(session: AsyncSession, *, root_user_id: int, max_depth: int = 5) -> list[TreeLevel]:
+    """
+    Users referred by root, by their referrals, ... (one recursive CTE over
+    ix_users_referrer_processed). max_depth also stops referral cycles (A→B→A).
+    """
+    tree = (
+        select(User.id.label("id"), User.referral_processed.label("joined"), literal(1).label("depth"))
+        .where(User.referred_by_user_id == root_user_id)
+        .cte("referral_tree", recursive=True)
+    )
+    tree = tree.union_all(
+        select(User.id, User.referral_processed, tree.c.depth + 1)
+        .join(tree, User.referred_by_user_id == tree.c.id)
+        .where(tree.c.depth < max_depth)
+    )
+    res = await session.execute(
+        select(tree.c.depth, func.count(), func.sum(case((tree.c.joined, 1), else_=0)))
+        .group_by(tree.c.depth)
+        .order_by(tree.c.depth)
+    )
+    return [TreeLevel(depth=int(d), users=int(n), joined=int(j or 0)) for d, n, j in res.all()]
+
+
+async def list_direct_referrals(session: AsyncSession, *, referrer_user_id: int, limit: int = 20) -> list[User]:
+    res = await session.execute(
+        select(User).where(User.referred_by_user_id == referrer_user_id).order_by(User.id.desc()).limit(limit)
+    )
+    return list(res.scalars().all())
+
+
+async def has_referral_stats(session: AsyncSession) -> bool:
+    res = await session.execute(select(ReferralStats.referrer_user_id).limit(1))
+    return res.first() is not None
+
+
+async def rebuild_referral_stats(session: AsyncSession) -> int:
+    """
+    Recomputes every referrer's counters and overwrites the ones that drifted:
+    successful from the ledger, pending/joined from users; capped = joined - successful
+    (a user who joined before pressing a ref link also lands there: an upper bound).
+    Returns how many referrers were corrected. Caller commits.
+    """
+    res = await session.execute(
+        select(PointEvent.user_id, func.count())
+        .where(PointEvent.source == PointSource.REFERRAL)
+        .group_by(PointEvent.user_id)
+    )
+    successful = {int(uid): int(n) for uid, n in res.all()}
+
+    res = await session.execute(
+        select(
+            User.referred_by_user_id,
+            func.sum(case((User.referral_processed, 0), else_=1)),
+            func.sum(case((User.referral_processed, 1), else_=0)),
+        )
+        .where(User.referred_by_user_id.is_not(None))
+        .group_by(User.referred_by_user_id)
+    )
+    referred = {int(uid): (int(pending or 0), int(joined or 0)) for uid, pending, joined in res.all()}
+
+    actual: dict[int, ReferralCounts] = {}
+    for uid in successful.keys() | referred.keys():
+        pending, joined = referred.get(uid, (0, 0))
+        ok = successful.get(uid, 0)
+        actual[uid] = ReferralCounts(successful=ok, pending=pending, capped=max(0, joined - ok))
+
+    res = await session.execute(
+        select(
+            ReferralStats.referrer_user_id, ReferralStats.successful, ReferralStats.pending, ReferralStats.capped
+        )
+    )
+    stored = {int(uid): ReferralCounts(int(s), int(p), int(c)) for uid, s, p, c in res.all()}
+
+    fixes = {uid: c for uid, c in actual.items() if stored.get(uid) != c}
+    fixes.update({uid: ReferralCounts() for uid, c in stored.items() if uid not in actual and c != ReferralCounts()})
+    if fixes:
+        await set_referral_counts(session, fixes)
+    return len(fixes)
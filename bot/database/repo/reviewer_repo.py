@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import ScreenshotReviewer, ScreenshotStatus, ScreenshotSubmission, User
+
+
+@dataclass(frozen=True, slots=True)
+class ReviewerLoad:
+    user_id: int
+    telegram_id: int
+    username: str | None
+    available: bool
+    max_open: int
+    open_claims: int
+    decided: int  # decisions since `since`
+    avg_decision_s: float | None  # claim -> decision, since `since`
+
+
+@dataclass(frozen=True, slots=True)
+class QueueWait:
+    waiting: int  # undecided (PENDING/EXPIRED)
+    oldest_wait_s: float | None
+    decided: int  # since `since`
+    avg_wait_s: float | None  # submitted -> decided, since `since`
+
+
+def _seconds(a, b):
+    # SQLite: difference of two naive-UTC datetimes in seconds
+    return (func.julianday(a) - func.julianday(b)) * 86400.0
+
+
+async def set_reviewer(
+    session: AsyncSession,
+    *,
+    user_id: int,
+    telegram_id: int,
+    available: bool,
+) -> None:
+    stmt = sqlite_insert(ScreenshotReviewer).values(
+        user_id=user_id,
+        telegram_id=telegram_id,
+        available=available,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={"telegram_id": stmt.excluded.telegram_id, "available": stmt.excluded.available},
+    )
+    await session.execute(stmt)
+
+
+async def reviewer_loads(
+    session: AsyncSession,
+    *,
+    now: datetime,
+    since: datetime,
+    only_available: bool = True,
+) -> list[ReviewerLoad]:
+    """
+    Open (live) claims and recent decision speed per reviewer, in one query.
+    """
+    open_q = (
+        select(
+            ScreenshotSubmission.assigned_admin_user_id.label("uid"),
+            func.count().label("n"),
+        )
+        .where(
+            ScreenshotSubmission.status == ScreenshotStatus.PENDING,
+            ScreenshotSubmission.expires_at_utc > now,
+        )
+        .group_by(ScreenshotSubmission.assigned_admin_user_id)
+        .subquery()
+    )
+    speed_q = (
+        select(
+            ScreenshotSubmission.decided_by_admin_user_id.label("uid"),
+            func.count().label("n"),
+            func.avg(_seconds(ScreenshotSubmission.decided_at_utc, ScreenshotSubmission.assigned_at_utc)).label("avg_s"),
+        )
+        .where(
+            ScreenshotSubmission.decided_at_utc >= since,
+            ScreenshotSubmission.assigned_at_utc.is_not(None),
+        )
+        .group_by(ScreenshotSubmission.decided_by_admin_user_id)
+        .subquery()
+    )
+
+    q = (
+        select(
+            ScreenshotReviewer.user_id,
+            ScreenshotReviewer.telegram_id,
+            User.username,
+            ScreenshotReviewer.available,
+            ScreenshotReviewer.max_open,
+            func.coalesce(open_q.c.n, 0),
+            func.coalesce(speed_q.c.n, 0),
+            speed_q.c.avg_s,
+        )
+        .join(User, User.id == ScreenshotReviewer.user_id)
+        .outerjoin(open_q, open_q.c.uid == ScreenshotReviewer.user_id)
+        .outerjoin(speed_q, speed_q.c.uid == ScreenshotReviewer.user_id)
+    )
+    if only_available:
+        q = q.where(ScreenshotReviewer.available.is_(True))
+
+    res = await session.execute(q)
+    return [
+        ReviewerLoad(
+            user_id=int(uid),
+            telegram_id=int(tg_id),
+            username=username,
+            available=bool(available),
+            max_open=int(max_open or 0),
+            open_claims=int(open_n or 0),
+            decided=int(decided or 0),
+            avg_decision_s=float(avg_s) if avg_s is not None else None,
+        )
+        for uid, tg_id, username, available, max_open, open_n, decided, avg_s in res.all()
+    ]
+
+
+async def queue_wait(session: AsyncSession, *, now: datetime, since: datetime) -> QueueWait:
+    waiting_res = await session.execute(
+        select(func.count(), func.min(ScreenshotSubmission.created_at)).where(
+            ScreenshotSubmission.status.in_([ScreenshotStatus.PENDING, ScreenshotStatus.EXPIRED])
+        )
+    )
+    waiting, oldest = waiting_res.one()
+
+    decided_res = await session.execute(
+        select(
+            func.count(),
+            func.avg(_seconds(ScreenshotSubmission.decided_at_utc, ScreenshotSubmission.created_at)),
+        ).where(ScreenshotSubmission.decided_at_utc >= since)
+    )
+    decided, avg_wait = decided_res.one()
+
+    return QueueWait(
+        waiting=int(waiting or 0),
+        oldest_wait_s=(now - oldest).total_seconds() if oldest else None,
+        decided=int(decided or 0),
+        avg_wait_s=float(avg_wait) if avg_wait is not None else None,
+    )
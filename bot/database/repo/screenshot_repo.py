@@ -3,12 +3,16 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
+from typing import Callable
 from zoneinfo import ZoneInfo
 
 from sqlalchemy import func, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.database.models import ScreenshotSubmission, ScreenshotStatus, User
+from bot.database.models import ScreenshotQueueCounter, ScreenshotStatus, ScreenshotSubmission, User
+
+GLOBAL_SCOPE = "all"  # screenshot_queue_counters scope for totals over all days
 
 
 @dataclass(frozen=True, slots=True)
@@ -17,11 +21,104 @@ class SubmissionWithUser:
     user: User
 
 
+@dataclass(frozen=True, slots=True)
+class ExpiredClaim:
+    submission_id: int
+    admin_user_id: int | None  # who let the claim lapse
+    admin_chat_id: int | None
+    admin_message_id: int | None
+
+
+@dataclass(frozen=True, slots=True)
+class QueueItem:
+    submission_id: int
+    day_utc: date
+    username: str | None
+    status: ScreenshotStatus
+    assigned_admin_user_id: int | None
+    expires_at_utc: datetime | None
+    created_at: datetime
+
+
 def _utc_now_naive() -> datetime:
     # store in DB as naive UTC (timezone=False columns)
     return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
 
 
+# Called with the new expires_at_utc whenever a claim/assignment gets a deadline
+# (the claim reaper subscribes so it can wake up exactly then).
+_expiry_listeners: list[Callable[[datetime], None]] = []
+
+
+def add_expiry_listener(fn: Callable[[datetime], None]) -> None:
+    _expiry_listeners.append(fn)
+
+
+def remove_expiry_listener(fn: Callable[[datetime], None]) -> None:
+    if fn in _expiry_listeners:
+        _expiry_listeners.remove(fn)
+
+
+def _notify_expiry(expires_at_utc: datetime | None) -> None:
+    if expires_at_utc is None:
+        return
+    for fn in _expiry_listeners:
+        fn(expires_at_utc)
+
+
+# -------------------------------------------------
+# Status counters (screenshot_queue_counters)
+# -------------------------------------------------
+
+StatusMove = tuple[date, ScreenshotStatus | None, ScreenshotStatus]  # (day_utc, old, new); old=None: created
+
+
+async def _bump(session: AsyncSession, moves: list[StatusMove]) -> None:
+    """
+    Applies status moves to the global and per-day counters in one upsert
+    (same transaction as the status change itself).
+    """
+    deltas: dict[tuple[str, str], int] = {}
+    for day_utc, old, new in moves:
+        if old == new:
+            continue
+        for scope in (GLOBAL_SCOPE, day_utc.isoformat()):
+            if old is not None:
+                deltas[(scope, old.value)] = deltas.get((scope, old.value), 0) - 1
+            deltas[(scope, new.value)] = deltas.get((scope, new.value), 0) + 1
+
+    rows = [{"scope": scope, "status": status, "n": d} for (scope, status), d in deltas.items() if d]
+    if not rows:
+        return
+    stmt = sqlite_insert(ScreenshotQueueCounter).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope", "status"],
+        set_={"n": ScreenshotQueueCounter.n + stmt.excluded.n},
+    )
+    await session.execute(stmt)
+
+
+async def _reopen(session: AsyncSession, *, where: tuple, values: dict) -> list[tuple[int, date]]:
+    """
+    UPDATE ... SET status=PENDING for PENDING/EXPIRED rows matching `where`,
+    one statement per previous status so EXPIRED -> PENDING moves can be counted.
+    Returns (id, day_utc) of every updated row.
+    """
+    out: list[tuple[int, date]] = []
+    for old in (ScreenshotStatus.EXPIRED, ScreenshotStatus.PENDING):
+        res = await session.execute(
+            update(ScreenshotSubmission)
+            .where(*where, ScreenshotSubmission.status == old)
+            .values(status=ScreenshotStatus.PENDING, **values)
+            .returning(ScreenshotSubmission.id, ScreenshotSubmission.day_utc)
+        )
+        rows = [(int(sid), day_utc) for sid, day_utc in res.all()]
+        if old == ScreenshotStatus.EXPIRED:
+            await _bump(session, [(day_utc, old, ScreenshotStatus.PENDING) for _, day_utc in rows])
+        out += rows
+    return out
+
+
 async def get_submission_for_day(
     session: AsyncSession, *, user_id: int, day_utc: date
 ) -> ScreenshotSubmission | None:
@@ -62,6 +159,7 @@ async def create_submission_once(
     )
     session.add(sub)
     await session.flush()  # sub.id ready
+    await _bump(session, [(day_utc, None, ScreenshotStatus.PENDING)])
     return True, sub
 
 
@@ -89,25 +187,42 @@ async def assign_to_admin(
     expires_at_utc: datetime | None = None,
 ) -> bool:
     """
-    Assigns submission to an admin only if it's still PENDING and unassigned.
+    Assigns submission to an admin only if it's still PENDING (or EXPIRED) and unassigned.
     Returns True if assignment happened.
     """
-    stmt = (
-        update(ScreenshotSubmission)
-        .where(
+    taken = await _reopen(
+        session,
+        where=(
             ScreenshotSubmission.id == submission_id,
-            ScreenshotSubmission.status == ScreenshotStatus.PENDING,
             ScreenshotSubmission.assigned_admin_user_id.is_(None),
-        )
-        .values(
+        ),
+        values=dict(
             assigned_admin_user_id=admin_user_id,
             assigned_at_utc=_utc_now_naive(),
             admin_chat_id=admin_chat_id,
             admin_message_id=admin_message_id,
             expires_at_utc=expires_at_utc,
+        ),
+    )
+    ok = bool(taken)
+    if ok:
+        _notify_expiry(expires_at_utc)
+    return ok
+
+
+async def release_assignment(session: AsyncSession, *, submission_id: int, admin_user_id: int) -> bool:
+    """
+    Hands a still-undecided submission back to the queue (e.g. the reviewer couldn't be reached).
+    """
+    res = await session.execute(
+        update(ScreenshotSubmission)
+        .where(
+            ScreenshotSubmission.id == submission_id,
+            ScreenshotSubmission.status == ScreenshotStatus.PENDING,
+            ScreenshotSubmission.assigned_admin_user_id == admin_user_id,
         )
+        .values(assigned_admin_user_id=None, assigned_at_utc=None, expires_at_utc=None)
     )
-    res = await session.execute(stmt)
     return (res.rowcount or 0) > 0
 
 
@@ -138,9 +253,34 @@ async def decide_submission(
             decided_at_utc=_utc_now_naive(),
             decision_note=decision_note,
         )
+        .returning(ScreenshotSubmission.day_utc)
     )
     res = await session.execute(stmt)
-    return (res.rowcount or 0) > 0
+    days = res.scalars().all()
+    await _bump(session, [(d, ScreenshotStatus.PENDING, status) for d in days])
+    return bool(days)
+
+
+async def auto_reject_submission(session: AsyncSession, *, submission_id: int, note: str) -> bool:
+    """
+    Rejects a PENDING submission without a reviewer (e.g. exact duplicate).
+    """
+    res = await session.execute(
+        update(ScreenshotSubmission)
+        .where(
+            ScreenshotSubmission.id == submission_id,
+            ScreenshotSubmission.status == ScreenshotStatus.PENDING,
+        )
+        .values(
+            status=ScreenshotStatus.REJECTED,
+            decided_at_utc=_utc_now_naive(),
+            decision_note=note[:256],
+        )
+        .returning(ScreenshotSubmission.day_utc)
+    )
+    days = res.scalars().all()
+    await _bump(session, [(d, ScreenshotStatus.PENDING, ScreenshotStatus.REJECTED) for d in days])
+    return bool(days)
 
 
 async def set_admin_post_meta(
@@ -189,62 +329,313 @@ async def claim_submission(
     now = _utc_now_naive()
     expires = now + timedelta(minutes=ttl_minutes)
 
-    stmt = (
+    taken = await _reopen(
+        session,
+        where=(ScreenshotSubmission.id == submission_id, *_claimable(now)),
+        values=dict(assigned_admin_user_id=admin_user_id, assigned_at_utc=now, expires_at_utc=expires),
+    )
+    ok = bool(taken)
+    if ok:
+        _notify_expiry(expires)
+    return ok
+
+
+async def expire_assignments(session: AsyncSession) -> list[ExpiredClaim]:
+    """
+    Marks timed-out PENDING submissions as EXPIRED and clears assignment.
+    Returns the expired rows (for notifications / re-dispatch).
+    """
+    now = _utc_now_naive()
+    due = (
+        ScreenshotSubmission.status == ScreenshotStatus.PENDING,
+        ScreenshotSubmission.expires_at_utc.is_not(None),
+        ScreenshotSubmission.expires_at_utc <= now,
+    )
+
+    # read first: the previous assignee is cleared by the update
+    res = await session.execute(
+        select(
+            ScreenshotSubmission.id,
+            ScreenshotSubmission.assigned_admin_user_id,
+            ScreenshotSubmission.admin_chat_id,
+            ScreenshotSubmission.admin_message_id,
+        ).where(*due)
+    )
+    rows = res.all()
+    if not rows:
+        return []
+
+    ids = [int(r[0]) for r in rows]
+    res = await session.execute(
         update(ScreenshotSubmission)
+        .where(ScreenshotSubmission.id.in_(ids), *due)
+        .values(
+            status=ScreenshotStatus.EXPIRED,
+            assigned_admin_user_id=None,
+            assigned_at_utc=None,
+            expires_at_utc=None,
+        )
+        .returning(ScreenshotSubmission.id, ScreenshotSubmission.day_utc)
+    )
+    expired = res.all()
+    await _bump(session, [(d, ScreenshotStatus.PENDING, ScreenshotStatus.EXPIRED) for _, d in expired])
+    expired_ids = {int(sid) for sid, _ in expired}
+
+    return [
+        ExpiredClaim(
+            submission_id=int(sid),
+            admin_user_id=admin_user_id,
+            admin_chat_id=chat_id,
+            admin_message_id=msg_id,
+        )
+        for sid, admin_user_id, chat_id, msg_id in rows
+        if int(sid) in expired_ids
+    ]
+
+
+async def next_claim_expiry(session: AsyncSession) -> datetime | None:
+    """
+    Earliest deadline among PENDING claims (served by ix_screenshot_status_expires).
+    """
+    return await session.scalar(
+        select(func.min(ScreenshotSubmission.expires_at_utc)).where(
+            ScreenshotSubmission.status == ScreenshotStatus.PENDING,
+            ScreenshotSubmission.expires_at_utc.is_not(None),
+        )
+    )
+
+
+def _claimable(now: datetime):
+    # waiting for a reviewer: PENDING/EXPIRED and nobody holds a live claim
+    return (
+        ScreenshotSubmission.status.in_([ScreenshotStatus.PENDING, ScreenshotStatus.EXPIRED]),
+        (
+            ScreenshotSubmission.assigned_admin_user_id.is_(None)
+            | ScreenshotSubmission.expires_at_utc.is_(None)
+            | (ScreenshotSubmission.expires_at_utc < now)
+        ),
+    )
+
+
+async def list_open_submissions(
+    session: AsyncSession,
+    *,
+    after_id: int = 0,
+    limit: int = 10,
+) -> list[QueueItem]:
+    """
+    Keyset page over undecided submissions (PENDING/EXPIRED), oldest first.
+    Pass the last submission_id of the previous page as `after_id`.
+    """
+    res = await session.execute(
+        select(
+            ScreenshotSubmission.id,
+            ScreenshotSubmission.day_utc,
+            User.username,
+            ScreenshotSubmission.status,
+            ScreenshotSubmission.assigned_admin_user_id,
+            ScreenshotSubmission.expires_at_utc,
+            ScreenshotSubmission.created_at,
+        )
+        .join(User, User.id == ScreenshotSubmission.user_id)
         .where(
-            ScreenshotSubmission.id == submission_id,
             ScreenshotSubmission.status.in_([ScreenshotStatus.PENDING, ScreenshotStatus.EXPIRED]),
-            (
-                (ScreenshotSubmission.assigned_admin_user_id.is_(None))
-                | (ScreenshotSubmission.expires_at_utc.is_(None))
-                | (ScreenshotSubmission.expires_at_utc < now)
-            ),
+            ScreenshotSubmission.id > after_id,
         )
-        .values(
-            status=ScreenshotStatus.PENDING,
-            assigned_admin_user_id=admin_user_id,
-            assigned_at_utc=now,
+        .order_by(ScreenshotSubmission.id.asc())
+        .limit(limit)
+    )
+    return [
+        QueueItem(
+            submission_id=int(sid),
+            day_utc=day_utc,
+            username=username,
+            status=status,
+            assigned_admin_user_id=assigned,
             expires_at_utc=expires,
+            created_at=created,
         )
+        for sid, day_utc, username, status, assigned, expires, created in res.all()
+    ]
+
+
+async def next_claimable_ids(
+    session: AsyncSession,
+    *,
+    after_id: int = 0,
+    limit: int = 1,
+) -> list[int]:
+    """
+    Oldest submissions nobody is working on (keyset by id).
+    """
+    res = await session.execute(
+        select(ScreenshotSubmission.id)
+        .where(*_claimable(_utc_now_naive()), ScreenshotSubmission.id > after_id)
+        .order_by(ScreenshotSubmission.id.asc())
+        .limit(limit)
     )
-    res = await session.execute(stmt)
-    return (res.rowcount or 0) > 0
+    return [int(x) for x in res.scalars().all()]
+
+
+@dataclass(frozen=True, slots=True)
+class BatchItem:
+    submission_id: int
+    user_id: int
+    telegram_id: int
+    username: str | None
+    first_name: str | None
+    last_name: str | None
+    day_utc: date
+    image_file_id: str
 
 
-async def expire_assignments(session: AsyncSession) -> int:
+async def claim_batch(
+    session: AsyncSession,
+    *,
+    admin_user_id: int,
+    ttl_minutes: int,
+    limit: int,
+) -> list[BatchItem]:
     """
-    Marks timed-out PENDING submissions as EXPIRED and clears assignment.
+    Claims up to `limit` of the oldest claimable submissions (one UPDATE per previous status).
+    Rows taken concurrently by someone else simply drop out of the batch.
     """
     now = _utc_now_naive()
-    stmt = (
+    expires = now + timedelta(minutes=ttl_minutes)
+
+    oldest = await session.execute(
+        select(ScreenshotSubmission.id)
+        .where(*_claimable(now))
+        .order_by(ScreenshotSubmission.id.asc())
+        .limit(limit)
+    )
+    taken = await _reopen(
+        session,
+        where=(ScreenshotSubmission.id.in_(list(oldest.scalars().all())), *_claimable(now)),
+        values=dict(assigned_admin_user_id=admin_user_id, assigned_at_utc=now, expires_at_utc=expires),
+    )
+    ids = sorted(sid for sid, _ in taken)
+    if not ids:
+        return []
+    _notify_expiry(expires)
+
+    rows = await session.execute(
+        select(
+            ScreenshotSubmission.id,
+            User.id,
+            User.telegram_id,
+            User.username,
+            User.first_name,
+            User.last_name,
+            ScreenshotSubmission.day_utc,
+            ScreenshotSubmission.image_file_id,
+        )
+        .join(User, User.id == ScreenshotSubmission.user_id)
+        .where(ScreenshotSubmission.id.in_(ids))
+        .order_by(ScreenshotSubmission.id.asc())
+    )
+    return [
+        BatchItem(
+            submission_id=int(sid),
+            user_id=int(uid),
+            telegram_id=int(tg_id),
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            day_utc=day_utc,
+            image_file_id=file_id,
+        )
+        for sid, uid, tg_id, username, first_name, last_name, day_utc, file_id in rows.all()
+    ]
+
+
+async def decide_batch(
+    session: AsyncSession,
+    *,
+    submission_ids: list[int],
+    decided_by_admin_user_id: int,
+    status: ScreenshotStatus,  # APPROVED or REJECTED
+) -> set[int]:
+    """
+    Decides every submission that is still PENDING under a live claim of this admin.
+    Returns the ids actually decided (lapsed/reassigned ones are left alone).
+    """
+    if status not in (ScreenshotStatus.APPROVED, ScreenshotStatus.REJECTED):
+        raise ValueError("status must be APPROVED or REJECTED")
+    if not submission_ids:
+        return set()
+
+    now = _utc_now_naive()
+    res = await session.execute(
         update(ScreenshotSubmission)
         .where(
+            ScreenshotSubmission.id.in_(submission_ids),
             ScreenshotSubmission.status == ScreenshotStatus.PENDING,
-            ScreenshotSubmission.expires_at_utc.is_not(None),
-            ScreenshotSubmission.expires_at_utc < now,
+            ScreenshotSubmission.assigned_admin_user_id == decided_by_admin_user_id,
+            ScreenshotSubmission.expires_at_utc >= now,
         )
         .values(
-            status=ScreenshotStatus.EXPIRED,
-            assigned_admin_user_id=None,
-            assigned_at_utc=None,
-            expires_at_utc=None,
+            status=status,
+            decided_by_admin_user_id=decided_by_admin_user_id,
+            decided_at_utc=now,
         )
+        .returning(ScreenshotSubmission.id, ScreenshotSubmission.day_utc)
     )
-    res = await session.execute(stmt)
-    return int(res.rowcount or 0)
+    rows = res.all()
+    await _bump(session, [(d, ScreenshotStatus.PENDING, status) for _, d in rows])
+    return {int(sid) for sid, _ in rows}
 
 
 async def get_queue_counts(session: AsyncSession, *, day_utc: date | None = None) -> dict[str, int]:
     """
-    Quick queue stats (optionally filter by day_utc).
+    Quick queue stats (optionally for one day_utc), read from the maintained counters.
     """
-    base = select(ScreenshotSubmission.status, func.count()).group_by(ScreenshotSubmission.status)
-    if day_utc is not None:
-        base = base.where(ScreenshotSubmission.day_utc == day_utc)
-
-    res = await session.execute(base)
-    rows = res.all()
-    out = {s.value: int(c) for s, c in rows}
-    for k in ("pending", "approved", "rejected", "expired", "canceled"):
-        out.setdefault(k, 0)
+    scope = day_utc.isoformat() if day_utc is not None else GLOBAL_SCOPE
+    res = await session.execute(
+        select(ScreenshotQueueCounter.status, ScreenshotQueueCounter.n).where(ScreenshotQueueCounter.scope == scope)
+    )
+    out = {status: int(n) for status, n in res.all()}
+    for s in ScreenshotStatus:
+        out.setdefault(s.value, 0)
     return out
+
+
+async def has_queue_counters(session: AsyncSession) -> bool:
+    res = await session.execute(
+        select(ScreenshotQueueCounter.scope).where(ScreenshotQueueCounter.scope == GLOBAL_SCOPE).limit(1)
+    )
+    return res.first() is not None
+
+
+async def reconcile_queue_counters(session: AsyncSession) -> int:
+    """
+    Recounts screenshot_submissions (one GROUP BY) and overwrites counters that drifted.
+    Returns how many counter cells were corrected. Caller commits.
+    """
+    res = await session.execute(
+        select(ScreenshotSubmission.day_utc, ScreenshotSubmission.status, func.count()).group_by(
+            ScreenshotSubmission.day_utc, ScreenshotSubmission.status
+        )
+    )
+    actual: dict[tuple[str, str], int] = {}
+    for day_utc, status, n in res.all():
+        for scope in (GLOBAL_SCOPE, day_utc.isoformat()):
+            actual[(scope, status.value)] = actual.get((scope, status.value), 0) + int(n)
+
+    res = await session.execute(
+        select(ScreenshotQueueCounter.scope, ScreenshotQueueCounter.status, ScreenshotQueueCounter.n)
+    )
+    stored = {(scope, status): int(n) for scope, status, n in res.all()}
+
+    fixes = [
+        {"scope": scope, "status": status, "n": actual.get((scope, status), 0)}
+        for scope, status in set(actual) | set(stored)
+        if actual.get((scope, status), 0) != stored.get((scope, status))
+    ]
+    if not fixes:
+        return 0
+
+    stmt = sqlite_insert(ScreenshotQueueCounter).values(fixes)
+    stmt = stmt.on_conflict_do_update(index_elements=["scope", "status"], set_={"n": stmt.excluded.n})
+    await session.execute(stmt)
+    return len(fixes)
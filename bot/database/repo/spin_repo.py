@@ -0,0 +1,120 @@
+# bot/database/repo/spin_repo.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import case, exists, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import DailyProgress, SpinHistory, SpinRewardType
+
+_REWARD_TYPE = SpinHistory.__table__.c.reward_type.type
+
+
+@dataclass(frozen=True, slots=True)
+class SpinDraw:
+    """The reward decided before the insert (deterministic from the seed)."""
+    reward_type: SpinRewardType
+    reward_value: int
+    roll: float
+    weekly_cap: int = 0  # cash rolls: per-user weekly cap (0 = none); past it nothing is won
+
+
+@dataclass(frozen=True, slots=True)
+class SpinGateState:
+    mask: int
+    already: bool
+
+
+def _reward(value: SpinRewardType):
+    return literal(value, _REWARD_TYPE)
+
+
+async def insert_spin_gated(
+    session: AsyncSession,
+    *,
+    user_id: int,
+    day_utc: date,
+    week_start: date,
+    required_mask: int,
+    draw: SpinDraw,
+) -> tuple[SpinRewardType, int] | None:
+    """
+    The whole spin decision in one statement:
+    - gate: today's daily_progress mask must contain every required bit
+    - one spin per day: ON CONFLICT (user_id, day_utc) DO NOTHING
+    - the final reward, with the per-user weekly cash cap folded in as a CASE
+    Returns the recorded (reward_type, reward_value), or None when nothing was inserted
+    (locked or already spun: see spin_gate_state).
+    """
+    mask = (
+        select(DailyProgress.mask)
+        .where(DailyProgress.user_id == user_id, DailyProgress.day_utc == day_utc)
+        .scalar_subquery()
+    )
+    reward_type = _reward(draw.reward_type)
+    reward_value = literal(draw.reward_value)
+    if draw.weekly_cap > 0:  # cash rolls only
+        cash_wins = (
+            select(func.count())
+            .select_from(SpinHistory)
+            .where(
+                SpinHistory.user_id == user_id,
+                SpinHistory.week_start == week_start,
+                SpinHistory.reward_type == SpinRewardType.CASH,
+            )
+            .scalar_subquery()
+        )
+        under_cap = cash_wins < draw.weekly_cap
+        reward_type = case((under_cap, reward_type), else_=_reward(SpinRewardType.NONE))
+        reward_value = case((under_cap, reward_value), else_=literal(0))
+
+    src = select(
+        literal(user_id),
+        literal(day_utc),
+        literal(week_start),
+        reward_type,
+        reward_value,
+        literal(f"{draw.roll:.6f}"),
+    ).where(func.coalesce(mask, 0).op("&")(required_mask) == required_mask)
+
+    stmt = (
+        sqlite_insert(SpinHistory)
+        .from_select(["user_id", "day_utc", "week_start", "reward_type", "reward_value", "roll"], src)
+        .on_conflict_do_nothing(index_elements=["user_id", "day_utc"])
+        .returning(SpinHistory.reward_type, SpinHistory.reward_value)
+    )
+    row = (await session.execute(stmt)).first()
+    if row is None:
+        return None
+    return SpinRewardType(row[0]), int(row[1])
+
+
+async def spin_gate_state(session: AsyncSession, *, user_id: int, day_utc: date) -> SpinGateState:
+    """Why insert_spin_gated inserted nothing: today's mask + whether a spin exists (one read)."""
+    mask = (
+        select(DailyProgress.mask)
+        .where(DailyProgress.user_id == user_id, DailyProgress.day_utc == day_utc)
+        .scalar_subquery()
+    )
+    spun = exists().where(SpinHistory.user_id == user_id, SpinHistory.day_utc == day_utc)
+    row = (await session.execute(select(func.coalesce(mask, 0), spun))).one()
+    return SpinGateState(mask=int(row[0]), already=bool(row[1]))
+
+
+async def set_spin_reward(
+    session: AsyncSession,
+    *,
+    user_id: int,
+    day_utc: date,
+    reward_type: SpinRewardType,
+    reward_value: int,
+) -> None:
+    await session.execute(
+        update(SpinHistory)
+        .where(SpinHistory.user_id == user_id, SpinHistory.day_utc == day_utc)
+        .values(reward_type=reward_type, reward_value=reward_value)
+    )
+
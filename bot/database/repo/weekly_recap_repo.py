@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+
+from sqlalchemy import delete, desc, exists, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import PointEvent, User, WeeklyRecapRank, WeeklyRecapRun, WeeklyUserStats
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@dataclass(frozen=True, slots=True)
+class RecapRow:
+    user_id: int
+    telegram_id: int
+    username: str | None
+    first_name: str | None
+    last_name: str | None
+    points: int
+    rank: int
+    streak: int
+
+
+async def get_or_create_run(session: AsyncSession, *, week_start: date) -> WeeklyRecapRun:
+    await session.execute(
+        sqlite_insert(WeeklyRecapRun)
+        .values(week_start=week_start, status="running", started_at=_utc_now_naive())
+        .on_conflict_do_nothing(index_elements=["week_start"])
+    )
+    res = await session.execute(select(WeeklyRecapRun).where(WeeklyRecapRun.week_start == week_start))
+    return res.scalar_one()
+
+
+async def snapshot_recap_ranks(session: AsyncSession, *, week_start: date) -> int:
+    """
+    Ranks the week's active users (points > 0) once, into weekly_recap_ranks
+    (same ordering as get_user_rank_week: points desc, earliest update, user_id).
+    No-op when the week is already snapshotted (a resumed run keeps its ranks).
+    Returns how many users were ranked now.
+    """
+    done = await session.scalar(select(exists().where(WeeklyRecapRank.week_start == week_start)))
+    if done:
+        return 0
+
+    ranked = select(
+        WeeklyUserStats.week_start,
+        WeeklyUserStats.user_id,
+        func.row_number()
+        .over(
+            order_by=(
+                desc(WeeklyUserStats.points),
+                WeeklyUserStats.updated_at.asc(),
+                WeeklyUserStats.user_id.asc(),
+            )
+        )
+        .label("rank"),
+        WeeklyUserStats.points,
+        WeeklyUserStats.checkin_streak,
+    ).where(WeeklyUserStats.week_start == week_start, WeeklyUserStats.points > 0)
+
+    res = await session.execute(
+        insert(WeeklyRecapRank).from_select(["week_start", "user_id", "rank", "points", "streak"], ranked)
+    )
+    return int(res.rowcount or 0)
+
+
+async def fetch_recap_chunk(
+    session: AsyncSession,
+    *,
+    week_start: date,
+    after_user_id: int,
+    limit: int,
+) -> list[RecapRow]:
+    """
+    Next `limit` ranked users of the week in user_id order (keyset on the
+    weekly_recap_ranks primary key; run snapshot_recap_ranks first).
+    """
+    res = await session.execute(
+        select(
+            WeeklyRecapRank.user_id,
+            User.telegram_id,
+            User.username,
+            User.first_name,
+            User.last_name,
+            WeeklyRecapRank.points,
+            WeeklyRecapRank.rank,
+            WeeklyRecapRank.streak,
+        )
+        .join(User, User.id == WeeklyRecapRank.user_id)
+        .where(WeeklyRecapRank.week_start == week_start, WeeklyRecapRank.user_id > after_user_id)
+        .order_by(WeeklyRecapRank.user_id.asc())
+        .limit(limit)
+    )
+
+    return [
+        RecapRow(
+            user_id=int(user_id),
+            telegram_id=int(telegram_id),
+            username=username,
+            first_name=first_name,
+            last_name=last_name,
+            points=int(points or 0),
+            rank=int(rank),
+            streak=int(streak or 0),
+        )
+        for user_id, telegram_id, username, first_name, last_name, points, rank, streak in res.all()
+    ]
+
+
+async def best_days(
+    session: AsyncSession,
+    *,
+    week_start: date,
+    user_ids: list[int],
+) -> dict[int, tuple[date, int]]:
+    """
+    user_id -> (day_utc, points) of the user's best day in the week (ledger-based).
+    Ties go to the earlier day.
+    """
+    if not user_ids:
+        return {}
+
+    res = await session.execute(
+        select(PointEvent.user_id, PointEvent.day_utc, func.sum(PointEvent.points))
+        .where(PointEvent.week_start == week_start, PointEvent.user_id.in_(user_ids))
+        .group_by(PointEvent.user_id, PointEvent.day_utc)
+        .order_by(PointEvent.user_id.asc(), PointEvent.day_utc.asc())
+    )
+
+    out: dict[int, tuple[date, int]] = {}
+    for user_id, day_utc, points in res.all():
+        points = int(points or 0)
+        best = out.get(int(user_id))
+        if best is None or points > best[1]:
+            out[int(user_id)] = (day_utc, points)
+    return out
+
+
+async def claim_chunk(session: AsyncSession, *, run_id: int, last_user_id: int) -> None:
+    await session.execute(
+        update(WeeklyRecapRun).where(WeeklyRecapRun.id == run_id).values(claimed_user_id=last_user_id)
+    )
+
+
+async def complete_chunk(
+    session: AsyncSession,
+    *,
+    run_id: int,
+    last_user_id: int,
+    sent: int,
+    failed: int,
+) -> None:
+    await session.execute(
+        update(WeeklyRecapRun)
+        .where(WeeklyRecapRun.id == run_id)
+        .values(
+            done_user_id=last_user_id,
+            sent=WeeklyRecapRun.sent + sent,
+            failed=WeeklyRecapRun.failed + failed,
+        )
+    )
+
+
+async def skip_interrupted_chunk(session: AsyncSession, *, run_id: int, skipped: int) -> None:
+    await session.execute(
+        update(WeeklyRecapRun)
+        .where(WeeklyRecapRun.id == run_id)
+        .values(
+            done_user_id=WeeklyRecapRun.claimed_user_id,
+            skipped=WeeklyRecapRun.skipped + skipped,
+        )
+    )
+
+
+async def finish_run(session: AsyncSession, *, run_id: int, week_start: date) -> None:
+    await session.execute(
+        update(WeeklyRecapRun)
+        .where(WeeklyRecapRun.id == run_id)
+        .values(status="done", finished_at=_utc_now_naive())
+    )
+    await session.execute(delete(WeeklyRecapRank).where(WeeklyRecapRank.week_start == week_start))
+
+
+async def count_active_between(
+    session: AsyncSession,
+    *,
+    week_start: date,
+    after_user_id: int,
+    upto_user_id: int,
+) -> int:
+    return int(
+        await session.scalar(
+            select(func.count())
+            .select_from(WeeklyRecapRank)
+            .where(
+                WeeklyRecapRank.week_start == week_start,
+                WeeklyRecapRank.user_id > after_user_id,
+                WeeklyRecapRank.user_id <= upto_user_id,
+            )
+        )
+        or 0
+    )
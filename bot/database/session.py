@@ -1,14 +1,21 @@
 # bot/database/session.py
 from __future__ import annotations
 
+import asyncio
+import random
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import AsyncIterator, Awaitable, Callable, TypeVar
 
 from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from bot.database.base import Base
 
+T = TypeVar("T")
+
+BUSY_RETRIES = 5  # attempts of a busy-retried transaction (see run_retrying_busy)
+
 
 def _apply_sqlite_pragmas(dbapi_connection) -> None:
     cursor = dbapi_connection.cursor()
@@ -19,6 +26,29 @@ def _apply_sqlite_pragmas(dbapi_connection) -> None:
     cursor.close()
 
 
+def _create_missing_indexes(sync_conn) -> None:
+    # create_all() skips tables that already exist, so indexes added to an
+    # existing model later would never be created without this
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+
+# spin_history triggers of an earlier build: the spin's writes are explicit again
+# (SpinService.spin), so a leftover trigger would pay every spin twice
+_RETIRED_SQLITE_TRIGGERS = (
+    "trg_spin_history_progress",
+    "trg_spin_history_award",
+    "trg_spin_history_award_fallback",
+    "trg_spin_history_daily_action",
+)
+
+
+def _drop_retired_triggers(sync_conn) -> None:
+    for name in _RETIRED_SQLITE_TRIGGERS:
+        sync_conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {name}")
+
+
 class Database:
     def __init__(self, database_url: str) -> None:
         self.database_url = database_url
@@ -47,6 +77,9 @@ class Database:
         async with self.engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
             await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(_create_missing_indexes)
+            if self.engine.dialect.name == "sqlite":
+                await conn.run_sync(_drop_retired_triggers)
 
     async def close(self) -> None:
         await self.engine.dispose()
@@ -55,3 +88,34 @@ class Database:
     async def session(self) -> AsyncIterator[AsyncSession]:
         async with self.SessionLocal() as s:
             yield s
+
+
+def is_busy(exc: BaseException) -> bool:
+    """SQLite gave up waiting for the write lock (busy_timeout ran out)."""
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc)
+
+
+async def run_retrying_busy(
+    session: AsyncSession,
+    fn: Callable[[], Awaitable[T]],
+    *,
+    attempts: int = BUSY_RETRIES,
+    base_delay: float = 0.05,
+) -> T:
+    """
+    Runs fn() and commits; when SQLite reports the write lock busy, rolls back and runs
+    fn() again (jittered backoff). The busy handler is not fair, so under a burst of
+    writers one transaction can starve past busy_timeout; this turns that into a retry.
+    fn must only touch the session (no messages sent) before the commit.
+    """
+    for attempt in range(attempts):
+        try:
+            out = await fn()
+            await session.commit()
+            return out
+        except OperationalError as e:
+            await session.rollback()
+            if not is_busy(e) or attempt == attempts - 1:
+                raise
+            await asyncio.sleep(base_delay * (2**attempt) * (0.5 + random.random()))
+    raise AssertionError("unreachable")
@@ -0,0 +1,61 @@
+# bot/handlers/admin/cash_budget.py
+from __future__ import annotations
+
+from aiogram import F, Router
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.database.repo.cash_budget_repo import get_budget_usage, list_ledger_days
+from bot.handlers.admin.panel import require_admin_or_reply
+from bot.services.cash_budget import CashBudget
+from bot.utils.dates import utc_today, week_start_monday
+
+router = Router()
+
+
+def _money(cents: int) -> str:
+    return f"${cents / 100:,.2f}"
+
+
+def _budget_line(label: str, used: int, limit: int) -> str:
+    if not limit:
+        return f"• {label}: <b>{_money(used)}</b> (no limit)"
+    left = max(0, limit - used)
+    return f"• {label}: <b>{_money(used)}</b> / {_money(limit)} — {_money(left)} left"
+
+
+@router.message(F.text == "/cash_budget")
+async def cash_budget_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    cash_budget: CashBudget | None = None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    day_utc = utc_today()
+    usage = await get_budget_usage(session, day_utc=day_utc, week_start=week_start_monday(day_utc))
+    if cash_budget is not None:
+        cash_budget.note_usage(usage)  # re-sync the spin gate's cached totals
+
+    daily = cash_budget.daily_limit_cents if cash_budget else settings.spin_cash_daily_budget_cents
+    weekly = cash_budget.weekly_limit_cents if cash_budget else settings.spin_cash_weekly_budget_cents
+    lines = [
+        "💸 <b>Spin cash budget</b>",
+        "",
+        _budget_line(f"Today ({day_utc.isoformat()})", usage.day_cents, daily),
+        f"  wins {usage.day_wins} • downgraded to points {usage.day_downgraded}",
+        _budget_line(f"Week of {usage.week_start.isoformat()}", usage.week_cents, weekly),
+        f"  wins {usage.week_wins} • downgraded to points {usage.week_downgraded}",
+    ]
+
+    days = await list_ledger_days(session, limit=14)
+    if days:
+        lines += ["", "<b>Last days</b>"]
+        lines += [
+            f"{d.day_utc.isoformat()}: {_money(d.reserved_cents)} ({d.wins} wins, {d.downgraded} downgraded)"
+            for d in days
+        ]
+    await message.answer("\n".join(lines))
@@ -1,23 +1,35 @@
 from __future__ import annotations
 
+import html
+import io
 import logging
-from datetime import datetime
+from datetime import date, datetime
 from zoneinfo import ZoneInfo
 
-from aiogram import F, Router
-from aiogram.types import Message
+from aiogram import Bot, F, Router
+from aiogram.types import Document, Message
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete
 
 from bot.config.settings import Settings
-from bot.utils.quiz_parser import parse_quiz_set
-from bot.database.repo.quiz_repo import get_quiz_for_day, replace_quiz_for_day
+from bot.utils.quiz_parser import ImportLineError, iter_quiz_csv, iter_quiz_jsonl, parse_quiz_set
+from bot.database.repo.quiz_repo import (
+    days_with_attempts,
+    delete_quiz_for_day,
+    get_quiz_for_day,
+    replace_quiz_for_day,
+    upsert_quizzes,
+)
 from bot.services.auth import AuthService
-from bot.database.models import Quiz, QuizOption
+from bot.services.quiz_cache import QuizCache
+from bot.services.quiz_stats import format_answer_stats, quiz_answer_stats
+from bot.database.models import Quiz
 
 log = logging.getLogger(__name__)
 router = Router()
 
+IMPORT_MAX_BYTES = 5 * 1024 * 1024
+IMPORT_MAX_ERRORS_SHOWN = 20
+
 
 def _utc_today() -> datetime.date:
     return datetime.now(tz=ZoneInfo("UTC")).date()
@@ -82,6 +94,10 @@ async def quiz_admin_panel(message: Message, settings: Settings, session: AsyncS
         "Other commands:\n"
         "<code>/quiz_show</code> — show today's quiz\n"
         "<code>/quiz_clear</code> — delete today's quiz\n"
+        "<code>/quiz_stats [YYYY-MM-DD]</code> — answer distribution and accuracy\n"
+        "<code>/quiz_import</code> — send a .csv/.jsonl file with this caption "
+        "(or reply to one) to set many days at once\n"
+        "<code>/qs_new</code> · <code>/qs_list</code> · <code>/qs_close</code> — multi-question quizzes\n"
     )
 
     if quiz:
@@ -91,7 +107,12 @@ async def quiz_admin_panel(message: Message, settings: Settings, session: AsyncS
 
 
 @router.message(F.text.startswith("/quiz_set"))
-async def quiz_set_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+async def quiz_set_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_cache: QuizCache | None = None,
+) -> None:
     if not await require_admin_or_reply(message, settings, session):
         return
 
@@ -115,6 +136,8 @@ async def quiz_set_cmd(message: Message, settings: Settings, session: AsyncSessi
         created_by_user_id=None,
     )
     await session.commit()
+    if quiz_cache is not None:
+        quiz_cache.invalidate(today_utc)  # again after commit: a read may have raced the replace
 
     # ✅ re-fetch with options eagerly loaded (prevents MissingGreenlet)
     quiz = await get_quiz_for_day(session, today_utc)
@@ -139,19 +162,146 @@ async def quiz_show_cmd(message: Message, settings: Settings, session: AsyncSess
     await message.answer(_format_quiz(quiz))
 
 
+@router.message(F.text.startswith("/quiz_stats"))
+async def quiz_stats_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    parts = (message.text or "").split()
+    day_utc = _utc_today()
+    if len(parts) > 1:
+        try:
+            day_utc = date.fromisoformat(parts[1])
+        except ValueError:
+            await message.answer("Usage: /quiz_stats [YYYY-MM-DD]")
+            return
+
+    quiz = await get_quiz_for_day(session, day_utc)
+    if not quiz:
+        await message.answer(f"ℹ️ No quiz for {day_utc.isoformat()} (UTC).")
+        return
+
+    stats = await quiz_answer_stats(session, quiz)
+    await message.answer(format_answer_stats(quiz, stats, title="📊 <b>Quiz stats</b>"))
+
+
 @router.message(F.text == "/quiz_clear")
-async def quiz_clear_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+async def quiz_clear_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_cache: QuizCache | None = None,
+) -> None:
     if not await require_admin_or_reply(message, settings, session):
         return
 
     today_utc = _utc_today()
-    quiz = await get_quiz_for_day(session, today_utc)
-    if not quiz:
+    if not await delete_quiz_for_day(session, today_utc):
         await message.answer(f"ℹ️ No quiz to delete for today (UTC: {today_utc.isoformat()}).")
         return
 
-    await session.execute(delete(QuizOption).where(QuizOption.quiz_id == quiz.id))
-    await session.execute(delete(Quiz).where(Quiz.id == quiz.id))
     await session.commit()
+    if quiz_cache is not None:
+        quiz_cache.invalidate(today_utc)
 
     await message.answer("✅ Deleted today's quiz (UTC day).")
+
+
+def _import_document(message: Message) -> Document | None:
+    if message.document:
+        return message.document
+    if message.reply_to_message and message.reply_to_message.document:
+        return message.reply_to_message.document
+    return None
+
+
+@router.message(F.caption.startswith("/quiz_import") | F.text.startswith("/quiz_import"))
+async def quiz_import_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    bot: Bot,
+    quiz_cache: QuizCache | None = None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    doc = _import_document(message)
+    if doc is None:
+        await message.answer(
+            "Usage: send a .csv or .jsonl file with the caption <code>/quiz_import</code> "
+            "(or reply to the file with it).\n\n"
+            "CSV header: <code>day,question,correct,points,option1,option2,...</code>\n"
+            'JSONL line: <code>{"day": "2026-03-01", "question": "Q", "options": ["A", "B"], '
+            '"correct": 2, "points": 10}</code>'
+        )
+        return
+
+    name = (doc.file_name or "").lower()
+    if name.endswith(".csv"):
+        parse = iter_quiz_csv
+    elif name.endswith((".jsonl", ".ndjson", ".json")):
+        parse = iter_quiz_jsonl
+    else:
+        await message.answer("❌ Unsupported file type. Use .csv or .jsonl.")
+        return
+    if doc.file_size and doc.file_size > IMPORT_MAX_BYTES:
+        await message.answer(f"❌ File too large (max {IMPORT_MAX_BYTES // (1024 * 1024)} MB).")
+        return
+
+    buf = await bot.download(doc.file_id, destination=io.BytesIO())
+    if buf is None:
+        await message.answer("❌ Failed to download the file.")
+        return
+    buf.seek(0)
+
+    # ✅ stream line by line; nothing is written unless the whole file is valid
+    today_utc = _utc_today()
+    errors: list[ImportLineError] = []
+    seen: dict[date, int] = {}  # day -> first line
+    quizzes = []
+    try:
+        for item in parse(io.TextIOWrapper(buf, encoding="utf-8-sig", newline="")):
+            if isinstance(item, ImportLineError):
+                errors.append(item)
+            elif item.day_utc < today_utc:
+                errors.append(ImportLineError(line=item.line, message=f"{item.day_utc} is in the past"))
+            elif item.day_utc in seen:
+                errors.append(
+                    ImportLineError(line=item.line, message=f"{item.day_utc} already on line {seen[item.day_utc]}")
+                )
+            else:
+                seen[item.day_utc] = item.line
+                quizzes.append((item.day_utc, item.quiz))
+    except UnicodeDecodeError:
+        await message.answer("❌ File is not valid UTF-8.")
+        return
+
+    answered = await days_with_attempts(session, list(seen))
+    errors += [
+        ImportLineError(line=seen[d], message=f"{d} already has answers, replace it with /quiz_set on that day")
+        for d in sorted(answered)
+    ]
+
+    if errors:
+        errors.sort(key=lambda e: e.line)
+        lines = [f"❌ <b>Import rejected</b> — {len(errors)} error(s), nothing was saved.", ""]
+        lines += [f"line {e.line}: {html.escape(e.message)}" for e in errors[:IMPORT_MAX_ERRORS_SHOWN]]
+        if len(errors) > IMPORT_MAX_ERRORS_SHOWN:
+            lines.append(f"… and {len(errors) - IMPORT_MAX_ERRORS_SHOWN} more")
+        await message.answer("\n".join(lines))
+        return
+    if not quizzes:
+        await message.answer("ℹ️ The file has no quizzes.")
+        return
+
+    result = await upsert_quizzes(session, quizzes)
+    await session.commit()
+    if quiz_cache is not None and today_utc in seen:
+        quiz_cache.invalidate(today_utc)
+
+    days = sorted(seen)
+    await message.answer(
+        f"✅ Imported {len(quizzes)} quizzes ({days[0].isoformat()} … {days[-1].isoformat()}): "
+        f"{result.created} new, {result.replaced} replaced."
+    )
@@ -0,0 +1,115 @@
+# bot/handlers/admin/quiz_sessions.py
+from __future__ import annotations
+
+import html
+import logging
+
+from aiogram import F, Router
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.database.repo.quiz_session_repo import close_quiz_set, create_quiz_set, list_quiz_sets
+from bot.handlers.admin.panel import require_admin_or_reply
+from bot.handlers.admin.screenshot_queue import _admin_row
+from bot.services.quiz_sessions import QuizSessionEngine
+from bot.utils.quiz_parser import parse_quiz_line
+
+log = logging.getLogger(__name__)
+router = Router()
+
+MAX_QUESTIONS = 50
+
+USAGE = (
+    "Usage (one question per line, same format as /quiz_set):\n"
+    "<code>/qs_new Title\n"
+    '"Question 1" | "A" | "B" | "C" | correct=2 | points=10\n'
+    '"Question 2" | "A" | "B" | correct=1</code>'
+)
+
+
+@router.message(F.text.startswith("/qs_new"))
+async def qs_new_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    lines = (message.text or "").splitlines()
+    title = lines[0][len("/qs_new") :].strip()
+    question_lines = [(n, line.strip()) for n, line in enumerate(lines[1:], start=2) if line.strip()]
+    if not title or not question_lines:
+        await message.answer(USAGE)
+        return
+    if len(question_lines) > MAX_QUESTIONS:
+        await message.answer(f"❌ At most {MAX_QUESTIONS} questions per quiz.")
+        return
+
+    questions, errors = [], []
+    for n, line in question_lines:
+        try:
+            questions.append(parse_quiz_line(line))
+        except ValueError as e:
+            errors.append(f"line {n}: {html.escape(str(e))}")
+    if errors:
+        await message.answer("❌ Nothing was published:\n" + "\n".join(errors))
+        return
+
+    admin = await _admin_row(session, message.from_user.id)
+    set_id = await create_quiz_set(
+        session,
+        title=title[:200],
+        questions=questions,
+        created_by_user_id=admin.id if admin else None,
+    )
+    await session.commit()
+
+    total = sum(q.points for q in questions)
+    await message.answer(
+        f"✅ Published quiz <b>#{set_id}</b> “{html.escape(title)}” — {len(questions)} questions, "
+        f"up to {total} points.\nUsers play it with <code>/quizrun {set_id}</code>."
+    )
+
+
+@router.message(F.text == "/qs_list")
+async def qs_list_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    sets = await list_quiz_sets(session, active_only=False)
+    if not sets:
+        await message.answer("ℹ️ No multi-question quizzes yet. Create one with /qs_new.")
+        return
+
+    lines = ["🧩 <b>Multi-question quizzes</b>", ""]
+    for s in sets:
+        mark = "🟢" if s.status == "active" else "⚪️"
+        lines.append(
+            f"{mark} <b>#{s.set_id}</b> {html.escape(s.title)} — {s.questions} q • "
+            f"started {s.started} • finished {s.finished}"
+        )
+    await message.answer("\n".join(lines))
+
+
+@router.message(F.text.startswith("/qs_close"))
+async def qs_close_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_sessions: QuizSessionEngine | None = None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    parts = (message.text or "").split()
+    if len(parts) != 2 or not parts[1].isdigit():
+        await message.answer("Usage: /qs_close <quiz id>")
+        return
+    set_id = int(parts[1])
+
+    if not await close_quiz_set(session, set_id):
+        await message.answer(f"ℹ️ Quiz #{set_id} is not active.")
+        return
+    await session.commit()
+    if quiz_sessions is not None:
+        quiz_sessions.forget_set(set_id)
+
+    await message.answer(f"✅ Closed quiz #{set_id}. Unfinished runs earn nothing.")
@@ -0,0 +1,111 @@
+# bot/handlers/admin/referrals.py
+from __future__ import annotations
+
+import html
+
+from aiogram import F, Router
+from aiogram.types import Message
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.database.models import User
+from bot.database.repo.referral_repo import (
+    get_referral_counts,
+    list_direct_referrals,
+    referral_tree_levels,
+    top_referrers,
+)
+from bot.handlers.admin.panel import require_admin_or_reply
+
+router = Router()
+
+TOP_DEFAULT = 20
+TOP_MAX = 100
+TREE_DEPTH = 5
+TREE_DIRECT_SHOWN = 15
+
+
+def _who(telegram_id: int, username: str | None) -> str:
+    if username:
+        return f"@{html.escape(username)}"
+    return f"<code>{telegram_id}</code>"
+
+
+async def _find_user(session: AsyncSession, arg: str) -> User | None:
+    arg = arg.strip()
+    if arg.startswith("@"):
+        return await session.scalar(select(User).where(func.lower(User.username) == arg[1:].lower()))
+    try:
+        tg_id = int(arg)
+    except ValueError:
+        return None
+    return await session.scalar(select(User).where(User.telegram_id == tg_id))
+
+
+@router.message(F.text.startswith("/top_referrers"))
+async def top_referrers_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    parts = (message.text or "").split()
+    limit = TOP_DEFAULT
+    if len(parts) > 1:
+        try:
+            limit = max(1, min(int(parts[1]), TOP_MAX))
+        except ValueError:
+            await message.answer("Usage: /top_referrers [N]")
+            return
+
+    rows = await top_referrers(session, limit=limit)
+    if not rows:
+        await message.answer("ℹ️ No successful referrals yet.")
+        return
+
+    lines = [f"👥 <b>Top referrers</b> (top {limit})", ""]
+    lines += [
+        f"{i}. {_who(r.telegram_id, r.username)} — <b>{r.successful}</b> "
+        f"(pending {r.pending}, over cap {r.capped})"
+        for i, r in enumerate(rows, start=1)
+    ]
+    await message.answer("\n".join(lines))
+
+
+@router.message(F.text.startswith("/ref_tree"))
+async def ref_tree_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    parts = (message.text or "").split(maxsplit=1)
+    user = await _find_user(session, parts[1]) if len(parts) > 1 else None
+    if user is None:
+        await message.answer("Usage: /ref_tree <telegram_id | @username>")
+        return
+
+    counts = await get_referral_counts(session, user_id=user.id)
+    levels = await referral_tree_levels(session, root_user_id=user.id, max_depth=TREE_DEPTH)
+    direct = await list_direct_referrals(session, referrer_user_id=user.id, limit=TREE_DIRECT_SHOWN)
+
+    lines = [
+        f"🌳 <b>Referral tree of</b> {_who(user.telegram_id, user.username)}",
+        f"✅ successful {counts.successful} • ⏳ pending {counts.pending} • 🚫 over cap {counts.capped}",
+    ]
+    if user.referred_by_user_id:
+        parent = await session.get(User, user.referred_by_user_id)
+        if parent:
+            lines.append(f"⬆️ referred by {_who(parent.telegram_id, parent.username)}")
+
+    if not levels:
+        lines += ["", "No referred users."]
+        await message.answer("\n".join(lines))
+        return
+
+    lines += ["", f"<b>Levels</b> (up to {TREE_DEPTH})"]
+    lines += [f"• depth {lv.depth}: {lv.users} user(s), {lv.joined} joined" for lv in levels]
+
+    lines += ["", f"<b>Latest direct referrals</b> ({len(direct)} shown)"]
+    lines += [
+        f"• {_who(u.telegram_id, u.username)} — {'joined' if u.referral_processed else 'pending'}"
+        for u in direct
+    ]
+    await message.answer("\n".join(lines))
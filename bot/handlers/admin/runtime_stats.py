@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+from aiogram import F, Router
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.handlers.admin.panel import require_admin_or_reply
+
+router = Router()
+
+
+@router.message(F.text == "/bot_stats")
+async def bot_stats_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    bot,
+    update_mailbox=None,
+    callback_dedup=None,
+    card_renderer=None,
+    card_cache=None,
+    media_registry=None,
+    loop_monitor=None,
+    claim_reaper=None,
+    screenshot_dedup=None,
+    quiz_cache=None,
+    quiz_sessions=None,
+    cash_budget=None,
+    referral_joins=None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    lines = ["📈 <b>Runtime stats</b>", ""]
+
+    if update_mailbox is not None:
+        d = update_mailbox.stats()
+        lines += [
+            "📥 <b>Updates</b>",
+            f"• In flight: <b>{d.in_flight}</b> / {update_mailbox.max_concurrency}",
+            f"• Queued: <b>{d.queued}</b> (users: {d.active_keys})",
+            f"• Processed: <b>{d.processed}</b>",
+            f"• Wait avg/max: <b>{d.avg_wait_ms}</b> / {d.max_wait_ms} ms",
+            "",
+        ]
+
+    if callback_dedup is not None:
+        lines += [f"👆 <b>Coalesced double taps:</b> {callback_dedup.coalesced}", ""]
+
+    outbound = getattr(bot, "outbound", None)
+    if outbound is not None:
+        o = outbound.stats()
+        queued = ", ".join(f"{k}={v}" for k, v in o.queued.items())
+        lines += [
+            "📤 <b>Outbound</b>",
+            f"• Queued: {queued}",
+            f"• In flight: <b>{o.in_flight}</b>",
+            f"• Sent/failed: <b>{o.sent}</b> / {o.failed} (flood retries: {o.retries})",
+            f"• Wait avg/max: <b>{o.avg_wait_ms}</b> / {o.max_wait_ms} ms",
+            "",
+        ]
+
+    if card_renderer is not None:
+        r = card_renderer.stats()
+        lines += [
+            f"🖼 <b>Card renders</b> ({r.mode} ×{r.workers})",
+            f"• Pending: <b>{r.pending}</b> / {card_renderer.max_queue}",
+            f"• Rendered/failed/rejected: <b>{r.rendered}</b> / {r.failed} / {r.rejected}",
+            f"• Latency avg/max: <b>{r.avg_ms}</b> / {r.max_ms} ms",
+            "",
+        ]
+
+    if card_cache is not None:
+        c = card_cache.stats()
+        lines += [
+            "🗂 <b>Card cache</b>",
+            f"• Hits memory/disk: <b>{c.memory_hits}</b> / {c.disk_hits} (misses: {c.misses})",
+            f"• Cached PNGs in memory: {c.memory_items} (evicted from disk: {c.evicted})",
+            "",
+        ]
+
+    if media_registry is not None:
+        mr = media_registry.stats()
+        lines += [
+            "📎 <b>Media registry</b>",
+            f"• Hit rate: <b>{mr.hit_rate:.0%}</b> ({mr.hits} by file_id / {mr.misses} uploads)",
+            f"• Stale file_ids re-uploaded: {mr.stale}",
+            f"• Upload bytes saved: {mr.bytes_saved // 1024} KiB",
+            "",
+        ]
+
+    if loop_monitor is not None:
+        m = loop_monitor.stats()
+        lines += [
+            f"⏱ <b>Event loop blocked:</b> {m.blocked_ms_total} ms total, max {m.max_lag_ms} ms",
+            "",
+        ]
+
+    if claim_reaper is not None:
+        nxt = claim_reaper.next_due.strftime("%H:%M:%S") if claim_reaper.next_due else "—"
+        lines += [f"⌛ <b>Claim reaper:</b> next expiry {nxt} UTC, expired {claim_reaper.reaped}", ""]
+
+    if quiz_cache is not None:
+        q = quiz_cache.stats()
+        lines += [f"🧠 <b>Quiz cache:</b> {q.hits} hits / {q.misses} DB loads ({q.days} day(s) cached)", ""]
+
+    if quiz_sessions is not None:
+        qs = quiz_sessions.stats()
+        lines += [
+            f"🧩 <b>Quiz runs:</b> {qs.live} live, {qs.finished} finished, "
+            f"{qs.answers} answers in {qs.flushes} flushes ({qs.pending_answers} pending)",
+            "",
+        ]
+
+    if cash_budget is not None:
+        cb = cash_budget.stats()
+        lines += [
+            f"💸 <b>Cash budget:</b> {cb.reserved} reserved, {cb.refused} refused, "
+            f"{cb.skipped} downgraded from cache",
+            "",
+        ]
+
+    if referral_joins is not None:
+        rj = referral_joins.stats()
+        lines += [
+            f"👥 <b>Referral joins:</b> {rj.events} updates ({rj.coalesced} coalesced) in {rj.batches} batches, "
+            f"{rj.awarded} awarded, {rj.capped} over cap ({rj.pending} pending, "
+            f"{rj.reconciled} recovered at startup)",
+            "",
+        ]
+
+    if screenshot_dedup is not None:
+        d = screenshot_dedup.stats()
+        lines += [
+            f"🧬 <b>Screenshot dedup:</b> {d.stored} hashes, {d.matched}/{d.checked} matched, "
+            f"lookup avg {d.avg_lookup_us} µs",
+            "",
+        ]
+
+    autodelete = getattr(bot, "autodelete", None)
+    if autodelete is not None:
+        lines.append(f"🧹 <b>Pending auto-deletes:</b> {autodelete.pending}")
+
+    await message.answer("\n".join(lines).rstrip())
@@ -22,6 +22,7 @@ from bot.database.repo.screenshot_repo import (
 )
 from bot.services.auth import AuthService
 from bot.services.task_progress import TaskProgressService
+from bot.utils.outbound import SendPriority, send_priority
 
 log = logging.getLogger(__name__)
 router = Router()
@@ -84,12 +85,19 @@ def _admin_label(u: User) -> str:
     return _mention_html(u)
 
 
+def _refill(dispatcher) -> None:
+    # a decision frees reviewer capacity: hand out the next backlog item (in the background)
+    if dispatcher is not None:
+        dispatcher.request_fill()
+
+
 @router.callback_query(F.data.startswith("ss:"))
 async def screenshot_review_action(
     cb: CallbackQuery,
     settings: Settings,
     session: AsyncSession,
     bot,
+    screenshot_dispatcher=None,
 ) -> None:
     try:
         await cb.answer()
@@ -245,12 +253,13 @@ async def screenshot_review_action(
             )
 
             try:
-                m = await bot.send_photo(
-                    chat_id=main_group_id,
-                    photo=sub.image_file_id,
-                    caption=caption,
-                    parse_mode="HTML",
-                )
+                with send_priority(SendPriority.BROADCAST):
+                    m = await bot.send_photo(
+                        chat_id=main_group_id,
+                        photo=sub.image_file_id,
+                        caption=caption,
+                        parse_mode="HTML",
+                    )
 
                 # ✅ Save to DB so you have exact reference
                 await set_group_post_meta(
@@ -264,6 +273,7 @@ async def screenshot_review_action(
             except Exception:
                 log.exception("Failed to post approved screenshot to main group")
 
+        _refill(screenshot_dispatcher)
         return
 
     # -----------------------
@@ -296,6 +306,8 @@ async def screenshot_review_action(
             await bot.send_message(chat_id=user.telegram_id, text="❌ Your screenshot was rejected.")
         except Exception:
             log.exception("Failed to notify user rejection")
+
+        _refill(screenshot_dispatcher)
         return
 
     if cb.message:
@@ -0,0 +1,337 @@
+# bot/handlers/admin/screenshot_batch.py
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import secrets
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot, F, Router
+from aiogram.types import BufferedInputFile, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.database.models import PointSource, ScreenshotStatus, User
+from bot.database.repo.config_repo import get_config
+from bot.database.repo.fingerprint_repo import dup_flags
+from bot.database.repo.points_repo import BulkAward, award_points_bulk
+from bot.database.repo.screenshot_repo import (
+    BatchItem,
+    claim_batch,
+    decide_batch,
+    release_assignment,
+    set_group_post_meta,
+)
+from bot.handlers.admin.screenshot_admin import _admin_user, _refill
+from bot.handlers.admin.screenshot_queue import _admin_row, require_admin_or_reply
+from bot.services.task_progress import TaskProgressService
+from bot.utils.cards.contact_sheet import render_contact_sheet
+from bot.utils.cards.render_service import CardRenderService, RenderQueueFull
+from bot.utils.outbound import SendPriority, send_priority
+
+log = logging.getLogger(__name__)
+router = Router()
+
+BATCH_DEFAULT = 9
+BATCH_MAX = 12
+DOWNLOAD_CONCURRENCY = 4  # parallel getFile/downloads per sheet
+BUTTONS_PER_ROW = 6
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+@dataclass(slots=True)
+class _Batch:
+    admin_user_id: int
+    items: list[BatchItem]
+    expires_at: datetime
+    rejected: set[int] = field(default_factory=set)  # 0-based tile indexes
+
+
+# token -> open batch (claims lapse by themselves if the bot restarts)
+_batches: dict[str, _Batch] = {}
+
+
+def _prune() -> None:
+    now = _utc_now_naive()
+    for token in [t for t, b in _batches.items() if b.expires_at < now]:
+        _batches.pop(token, None)
+
+
+def _batch_kb(token: str, batch: _Batch) -> InlineKeyboardMarkup:
+    toggles = [
+        InlineKeyboardButton(
+            text=f"{i + 1} {'❌' if i in batch.rejected else '✅'}",
+            callback_data=f"ssb:{token}:t:{i}",
+        )
+        for i in range(len(batch.items))
+    ]
+    rows = [toggles[i : i + BUTTONS_PER_ROW] for i in range(0, len(toggles), BUTTONS_PER_ROW)]
+    rows.append(
+        [
+            InlineKeyboardButton(text="✔️ Submit", callback_data=f"ssb:{token}:go:0"),
+            InlineKeyboardButton(text="↩️ Release", callback_data=f"ssb:{token}:rel:0"),
+        ]
+    )
+    return InlineKeyboardMarkup(inline_keyboard=rows)
+
+
+def _caption(items: list[BatchItem], ttl: int, dups: dict[int, tuple[int, int]]) -> str:
+    lines = [f"🗂 <b>Screenshot batch</b> — {len(items)} items, decide within <b>{ttl}</b> min", ""]
+    for i, it in enumerate(items, start=1):
+        line = f"{i}. #{it.submission_id} @{it.username or 'unknown'} • {it.day_utc.isoformat()}"
+        dup = dups.get(it.submission_id)
+        if dup is not None:
+            line += f" • ⚠️ dup of #{dup[0]} (d={dup[1]})"
+        lines.append(line)
+    lines += ["", "Tap a number to flip it to ❌, then ✔️ Submit."]
+    return "\n".join(lines)
+
+
+async def _download_all(bot: Bot, file_ids: list[str]) -> list[bytes | None]:
+    slots = asyncio.Semaphore(DOWNLOAD_CONCURRENCY)
+
+    async def _one(file_id: str) -> bytes | None:
+        async with slots:
+            try:
+                buf = await bot.download(file_id, destination=io.BytesIO())
+                return buf.getvalue() if buf is not None else None
+            except Exception:
+                log.warning("Screenshot download failed file_id=%s", file_id)
+                return None
+
+    return list(await asyncio.gather(*(_one(f) for f in file_ids)))
+
+
+@router.message(F.text.startswith("/ss_batch"))
+async def ss_batch(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    bot: Bot,
+    card_renderer: CardRenderService | None = None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    parts = (message.text or "").split()
+    n = BATCH_DEFAULT
+    if len(parts) > 1:
+        if not parts[1].isdigit():
+            await message.answer(f"Usage: /ss_batch [1-{BATCH_MAX}]")
+            return
+        n = max(1, min(BATCH_MAX, int(parts[1])))
+
+    cfg = await get_config(session)
+    if not cfg.screenshot_enabled:
+        await message.answer("🚫 Screenshot review is currently disabled by admins.")
+        return
+    ttl = int(cfg.screenshot_claim_ttl_minutes)
+
+    admin = await _admin_row(session, message.from_user.id)
+    items = await claim_batch(session, admin_user_id=admin.id, ttl_minutes=ttl, limit=n)
+    await session.commit()
+    if not items:
+        await message.answer("ℹ️ Nothing left to review.")
+        return
+    dups = await dup_flags(session, submission_ids=[it.submission_id for it in items])
+
+    images = await _download_all(bot, [it.image_file_id for it in items])
+    sheet = None
+    if card_renderer is not None:
+        try:
+            sheet = await card_renderer.render(render_contact_sheet, images=images)
+        except RenderQueueFull:
+            pass  # the batch is already claimed: render it here rather than strand it
+    if sheet is None:
+        sheet = await asyncio.to_thread(render_contact_sheet, images)
+
+    _prune()
+    token = secrets.token_hex(4)
+    batch = _Batch(
+        admin_user_id=admin.id,
+        items=items,
+        expires_at=_utc_now_naive() + timedelta(minutes=ttl),
+    )
+    _batches[token] = batch
+
+    await message.answer_photo(
+        photo=BufferedInputFile(sheet, filename=f"batch_{token}.jpg"),
+        caption=_caption(items, ttl, dups),
+        reply_markup=_batch_kb(token, batch),
+    )
+
+
+async def _notify_and_post(
+    bot: Bot,
+    settings: Settings,
+    session: AsyncSession,
+    *,
+    approved: list[tuple[BatchItem, int]],
+    rejected: list[BatchItem],
+) -> None:
+    async def _dm(chat_id: int, text: str) -> None:
+        try:
+            await bot.send_message(chat_id=chat_id, text=text)
+        except Exception:
+            log.debug("Failed to notify user chat_id=%s", chat_id)
+
+    with send_priority(SendPriority.BROADCAST):
+        await asyncio.gather(
+            *(_dm(it.telegram_id, f"✅ Your screenshot was approved! +{pts} points.") for it, pts in approved),
+            *(_dm(it.telegram_id, "❌ Your screenshot was rejected.") for it in rejected),
+        )
+
+        if not settings.group_id:
+            return
+        for it, pts in approved:
+            name = " ".join([p for p in [it.first_name, it.last_name] if p and str(p).strip()]).strip() or "Unknown"
+            caption = (
+                "✅ <b>Approved Screenshot</b>\n\n"
+                f'👤 <b>User:</b> <a href="tg://user?id={it.telegram_id}">{name}</a>'
+                + (f"\n🔗 <b>Username:</b> @{it.username}" if it.username else "")
+                + f"\n⭐ <b>Points:</b> {pts}"
+                + f"\n🗓 <b>Day (UTC):</b> {it.day_utc.isoformat()}"
+            )
+            try:
+                m = await bot.send_photo(
+                    chat_id=settings.group_id,
+                    photo=it.image_file_id,
+                    caption=caption,
+                    parse_mode="HTML",
+                )
+                await set_group_post_meta(
+                    session,
+                    submission_id=it.submission_id,
+                    group_chat_id=m.chat.id,
+                    group_message_id=m.message_id,
+                )
+            except Exception:
+                log.exception("Failed to post approved screenshot to main group")
+        await session.commit()
+
+
+@router.callback_query(F.data.startswith("ssb:"))
+async def ss_batch_action(
+    cb: CallbackQuery,
+    settings: Settings,
+    session: AsyncSession,
+    bot: Bot,
+    screenshot_dispatcher=None,
+) -> None:
+    try:
+        await cb.answer()
+    except Exception:
+        pass
+    if not cb.data or not cb.message:
+        return
+
+    parts = cb.data.split(":")
+    if len(parts) != 4 or not parts[3].isdigit():
+        return
+    _, token, action, arg = parts
+
+    admin_user: User | None = await _admin_user(session, settings, cb)
+    if not admin_user:
+        return
+
+    batch = _batches.get(token)
+    if batch is None:
+        await cb.message.answer("⌛ This batch is gone (expired or already submitted). Run /ss_batch again.")
+        return
+    if batch.admin_user_id != admin_user.id:
+        await cb.message.answer("⚠️ This batch belongs to another admin.")
+        return
+
+    # -----------------------
+    # 1) TOGGLE one tile
+    # -----------------------
+    if action == "t":
+        i = int(arg)
+        if 0 <= i < len(batch.items):
+            batch.rejected ^= {i}
+            try:
+                await cb.message.edit_reply_markup(reply_markup=_batch_kb(token, batch))
+            except Exception:
+                pass
+        return
+
+    _batches.pop(token, None)
+    try:
+        await cb.message.edit_reply_markup(reply_markup=None)
+    except Exception:
+        pass
+
+    # -----------------------
+    # 2) RELEASE the whole batch
+    # -----------------------
+    if action == "rel":
+        for it in batch.items:
+            await release_assignment(session, submission_id=it.submission_id, admin_user_id=admin_user.id)
+        await session.commit()
+        await cb.message.answer(f"↩️ Released {len(batch.items)} submissions back to the queue.")
+        _refill(screenshot_dispatcher)
+        return
+
+    if action != "go":
+        return
+
+    # -----------------------
+    # 3) SUBMIT: two UPDATEs + one bulk ledger write, one commit
+    # -----------------------
+    cfg = await get_config(session)
+    points = int(cfg.screenshot_points)
+
+    to_approve = [it for i, it in enumerate(batch.items) if i not in batch.rejected]
+    to_reject = [it for i, it in enumerate(batch.items) if i in batch.rejected]
+
+    approved_ids = await decide_batch(
+        session,
+        submission_ids=[it.submission_id for it in to_approve],
+        decided_by_admin_user_id=admin_user.id,
+        status=ScreenshotStatus.APPROVED,
+    )
+    rejected_ids = await decide_batch(
+        session,
+        submission_ids=[it.submission_id for it in to_reject],
+        decided_by_admin_user_id=admin_user.id,
+        status=ScreenshotStatus.REJECTED,
+    )
+
+    approved = [it for it in to_approve if it.submission_id in approved_ids]
+    awarded = await award_points_bulk(
+        session,
+        awards=[BulkAward(user_id=it.user_id, day_utc=it.day_utc, ref_id=it.submission_id) for it in approved],
+        source=PointSource.SCREENSHOT,
+        points=points,
+        ref_type="screenshot",
+    )
+    await TaskProgressService.mark_done_many(
+        session,
+        items=[(it.user_id, it.day_utc) for it in approved],
+        action_type="screenshot",
+    )
+    await session.commit()
+
+    lapsed = len(batch.items) - len(approved_ids) - len(rejected_ids)
+    summary = f"✅ {len(approved_ids)} approved • ❌ {len(rejected_ids)} rejected"
+    if lapsed:
+        summary += f" • ⚠️ {lapsed} skipped (claim lapsed or taken over)"
+    try:
+        await cb.message.edit_caption(caption=(cb.message.caption or "") + f"\n\n{summary}")
+    except Exception:
+        await cb.message.answer(summary)
+
+    await _notify_and_post(
+        bot,
+        settings,
+        session,
+        approved=[(it, points if it.submission_id in awarded else 0) for it in approved],
+        rejected=[it for it in to_reject if it.submission_id in rejected_ids],
+    )
+    _refill(screenshot_dispatcher)
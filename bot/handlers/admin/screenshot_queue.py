@@ -1,15 +1,45 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
 from aiogram import F, Router
-from aiogram.types import Message
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config.settings import Settings
-from bot.database.repo.screenshot_repo import get_queue_counts
+from bot.database.models import ScreenshotStatus, User
+from bot.database.repo.config_repo import get_config
+from bot.database.repo.reviewer_repo import queue_wait, reviewer_loads, set_reviewer
+from bot.database.repo.screenshot_repo import (
+    claim_submission,
+    get_queue_counts,
+    get_submission_with_user,
+    list_open_submissions,
+    next_claimable_ids,
+)
 from bot.services.auth import AuthService
 
 router = Router()
 
+QUEUE_PAGE_SIZE = 10
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+def _fmt_s(seconds: float | None) -> str:
+    if seconds is None:
+        return "—"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m {seconds % 60:02d}s"
+    return f"{seconds // 3600}h {seconds % 3600 // 60:02d}m"
+
 
 async def require_admin_or_reply(message: Message, settings: Settings, session: AsyncSession) -> bool:
     tg = message.from_user
@@ -30,16 +60,210 @@ async def require_admin_or_reply(message: Message, settings: Settings, session:
     return True
 
 
+async def _admin_row(session: AsyncSession, telegram_id: int) -> User | None:
+    res = await session.execute(select(User).where(User.telegram_id == telegram_id))
+    return res.scalar_one_or_none()
+
+
+async def _queue_page(session: AsyncSession, *, after_id: int) -> tuple[str, InlineKeyboardMarkup]:
+    now = _utc_now_naive()
+    items = await list_open_submissions(session, after_id=after_id, limit=QUEUE_PAGE_SIZE)
+
+    lines = []
+    for it in items:
+        if it.assigned_admin_user_id and it.expires_at_utc and it.expires_at_utc > now:
+            state = f"🧑‍⚖️ claimed, {_fmt_s((it.expires_at_utc - now).total_seconds())} left"
+        else:
+            state = "🆓 free" if it.status == ScreenshotStatus.PENDING else "⌛ lapsed"
+        wait = _fmt_s((now - it.created_at).total_seconds()) if it.created_at else "—"
+        lines.append(f"#{it.submission_id} • @{it.username or 'unknown'} • waiting {wait} • {state}")
+
+    rows = [[InlineKeyboardButton(text="⏭ Take next", callback_data="ssq:next")]]
+    if len(items) == QUEUE_PAGE_SIZE:
+        rows.append(
+            [InlineKeyboardButton(text="Next page ▶", callback_data=f"ssq:page:{items[-1].submission_id}")]
+        )
+
+    body = "\n".join(lines) if lines else "ℹ️ Nothing waiting."
+    return body, InlineKeyboardMarkup(inline_keyboard=rows)
+
+
 @router.message(F.text == "/ss_queue")
 async def ss_queue(message: Message, settings: Settings, session: AsyncSession) -> None:
     if not await require_admin_or_reply(message, settings, session):
         return
 
     counts = await get_queue_counts(session)
+    body, kb = await _queue_page(session, after_id=0)
     await message.answer(
         "🗂 <b>Screenshot Queue</b>\n\n"
         f"⏳ Pending: <b>{counts['pending']}</b>\n"
         f"⌛ Expired: <b>{counts['expired']}</b>\n"
         f"✅ Approved: <b>{counts['approved']}</b>\n"
-        f"❌ Rejected: <b>{counts['rejected']}</b>\n"
+        f"❌ Rejected: <b>{counts['rejected']}</b>\n\n"
+        f"{body}",
+        reply_markup=kb,
+    )
+
+
+async def _take_next(
+    session: AsyncSession,
+    settings: Settings,
+    bot,
+    *,
+    admin: User,
+    chat_id: int,
+) -> str | None:
+    """
+    Claims the oldest free submission for `admin` and sends it to `chat_id`.
+    Returns an error text, or None on success.
+    """
+    cfg = await get_config(session)
+    if not cfg.screenshot_enabled:
+        return "🚫 Screenshot review is currently disabled by admins."
+
+    ttl = int(cfg.screenshot_claim_ttl_minutes)
+    after_id = 0
+    while True:
+        ids = await next_claimable_ids(session, after_id=after_id, limit=5)
+        if not ids:
+            return "ℹ️ Nothing left to review."
+        for sid in ids:
+            after_id = sid
+            if await claim_submission(session, submission_id=sid, admin_user_id=admin.id, ttl_minutes=ttl):
+                await session.commit()
+                pack = await get_submission_with_user(session, sid)
+                await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=pack.submission.image_file_id,
+                    caption=(
+                        "🖼 <b>Screenshot Review</b> (claimed by you)\n\n"
+                        f"👤 <b>User:</b> @{pack.user.username or 'unknown'}\n"
+                        f"🗓 <b>Day (UTC):</b> {pack.submission.day_utc.isoformat()}\n"
+                        f"🆔 <b>Submission ID:</b> {sid}\n"
+                        f"⏱ Decide within <b>{ttl}</b> min"
+                    ),
+                    reply_markup=InlineKeyboardMarkup(
+                        inline_keyboard=[
+                            [
+                                InlineKeyboardButton(text="✅ Approve", callback_data=f"ss:approve:{sid}"),
+                                InlineKeyboardButton(text="❌ Reject", callback_data=f"ss:reject:{sid}"),
+                            ]
+                        ]
+                    ),
+                )
+                return None
+            await session.rollback()  # lost the race: try the next one
+
+
+@router.message(F.text == "/ss_next")
+async def ss_next(message: Message, settings: Settings, session: AsyncSession, bot) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    admin = await _admin_row(session, message.from_user.id)
+    err = await _take_next(session, settings, bot, admin=admin, chat_id=message.chat.id)
+    if err:
+        await message.answer(err)
+
+
+@router.callback_query(F.data.startswith("ssq:"))
+async def ss_queue_cb(cb: CallbackQuery, settings: Settings, session: AsyncSession, bot) -> None:
+    try:
+        await cb.answer()
+    except Exception:
+        pass
+    if not cb.data or not cb.message or not cb.from_user:
+        return
+
+    auth = AuthService(settings)
+    authz = await auth.resolve_by_telegram(
+        session=session,
+        telegram_id=cb.from_user.id,
+        username=cb.from_user.username,
+        first_name=cb.from_user.first_name,
+        last_name=cb.from_user.last_name,
+    )
+    if not authz.is_admin:
+        return
+
+    parts = cb.data.split(":")
+    if parts[1] == "next":
+        admin = await _admin_row(session, cb.from_user.id)
+        err = await _take_next(session, settings, bot, admin=admin, chat_id=cb.message.chat.id)
+        if err:
+            await cb.message.answer(err)
+        return
+
+    if parts[1] == "page" and len(parts) == 3 and parts[2].isdigit():
+        body, kb = await _queue_page(session, after_id=int(parts[2]))
+        await cb.message.answer(f"🗂 <b>Screenshot Queue</b> (after #{parts[2]})\n\n{body}", reply_markup=kb)
+
+
+@router.message(F.text.in_({"/ss_on", "/ss_off"}))
+async def ss_duty(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    screenshot_dispatcher=None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    admin = await _admin_row(session, message.from_user.id)
+    on = message.text == "/ss_on"
+    await set_reviewer(session, user_id=admin.id, telegram_id=admin.telegram_id, available=on)
+    await session.commit()
+
+    if not on:
+        await message.answer("✅ You're off screenshot duty. Open claims stay yours until they expire.")
+        return
+
+    await message.answer(
+        "✅ You're on screenshot duty: submissions will be sent to you in private.\n"
+        "(Make sure you've started the bot in DM.)"
     )
+    if screenshot_dispatcher is not None:
+        screenshot_dispatcher.request_fill()
+
+
+@router.message(F.text == "/ss_stats")
+async def ss_stats(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    screenshot_dispatcher=None,
+) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    now = _utc_now_naive()
+    since = now - timedelta(hours=24)
+    loads = await reviewer_loads(session, now=now, since=since, only_available=False)
+    wait = await queue_wait(session, now=now, since=since)
+
+    lines = [
+        "📊 <b>Screenshot review (last 24h)</b>",
+        "",
+        f"⏳ Waiting: <b>{wait.waiting}</b> (oldest {_fmt_s(wait.oldest_wait_s)})",
+        f"✅ Decided: <b>{wait.decided}</b> • avg wait submit→decision {_fmt_s(wait.avg_wait_s)}",
+        "",
+        "🧑‍⚖️ <b>Reviewers</b>",
+    ]
+    if not loads:
+        lines.append("ℹ️ Nobody registered yet (/ss_on).")
+    for r in sorted(loads, key=lambda x: (-x.decided, x.user_id)):
+        name = f"@{r.username}" if r.username else f"#{r.user_id}"
+        duty = "🟢" if r.available else "⚪️"
+        lines.append(
+            f"{duty} {name} — {r.decided} decided, avg {_fmt_s(r.avg_decision_s)}, open {r.open_claims}/{r.max_open}"
+        )
+
+    if screenshot_dispatcher is not None:
+        lines += [
+            "",
+            f"📮 Dispatched: {screenshot_dispatcher.dispatched} • re-dispatched: {screenshot_dispatcher.redispatched}"
+            f" • DM failures: {screenshot_dispatcher.dm_failed}",
+        ]
+
+    await message.answer("\n".join(lines))
@@ -0,0 +1,87 @@
+# bot/handlers/admin/spin_sim.py
+from __future__ import annotations
+
+import asyncio
+import html
+import logging
+
+from aiogram import F, Router
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.handlers.admin.panel import require_admin_or_reply
+
+log = logging.getLogger(__name__)
+router = Router()
+
+MAX_DAYS = 180
+MAX_TRIALS = 2000
+
+# key -> (SpinParams field, parser)
+PARAM_KEYS = {
+    "cash": ("cash_chance", float),
+    "none": ("none_chance", float),
+    "min": ("points_min", int),
+    "max": ("points_max", int),
+    "cents": ("cash_cents", int),
+    "cap": ("cash_max_per_user_per_week", int),
+    "daybudget": ("cash_daily_budget_cents", int),
+    "weekbudget": ("cash_weekly_budget_cents", int),
+}
+
+USAGE = (
+    "Usage: <code>/spin_sim [cash=0.02] [none=0.1] [min=1] [max=8] [cents=500] [cap=1] "
+    "[daybudget=1000] [weekbudget=5000] [days=28] [trials=500]</code>\n"
+    "Unset values keep the current spin settings (budgets in cents, 0 = no limit). "
+    "Nothing is changed; this only reports."
+)
+
+
+@router.message(F.text.startswith("/spin_sim"))
+async def spin_sim_cmd(message: Message, settings: Settings, session: AsyncSession) -> None:
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    try:
+        from bot.services import spin_sim
+    except ImportError:
+        await message.answer("⚠️ The simulator needs numpy (pip install numpy).")
+        return
+
+    current = spin_sim.SpinParams.current(
+        daily_budget_cents=settings.spin_cash_daily_budget_cents,
+        weekly_budget_cents=settings.spin_cash_weekly_budget_cents,
+    )
+    changes: dict = {}
+    days, trials = 28, 500
+    try:
+        for arg in (message.text or "").split()[1:]:
+            key, sep, raw = arg.partition("=")
+            if not sep:
+                raise ValueError(f"expected key=value, got {arg!r}")
+            if key == "days":
+                days = max(7, min(int(raw), MAX_DAYS))
+            elif key == "trials":
+                trials = max(10, min(int(raw), MAX_TRIALS))
+            elif key in PARAM_KEYS:
+                field, parse = PARAM_KEYS[key]
+                changes[field] = parse(raw)
+            else:
+                raise ValueError(f"unknown key {key!r}")
+        proposed = current.replace(**changes)
+    except ValueError as e:
+        await message.answer(f"❌ {html.escape(str(e))}\n\n{USAGE}")
+        return
+
+    await message.answer("⏳ Simulating…")
+    inputs = await spin_sim.load_sim_inputs(session, days=days)
+    try:
+        report = await asyncio.to_thread(
+            spin_sim.simulate_report, inputs, proposed, current=current, trials=trials
+        )
+    except Exception:
+        log.exception("Spin simulation failed")
+        await message.answer("⚠️ Simulation failed. Check logs.")
+        return
+    await message.answer(f"<pre>{html.escape(report)}</pre>")
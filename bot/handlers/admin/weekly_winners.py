@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import logging
+
 from aiogram import F, Router
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -7,8 +10,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from bot.config.settings import Settings
 from bot.scheduler.jobs import post_weekly_winners
 from bot.services.auth import AuthService
+from bot.services.weekly_recap import run_weekly_recap
 
 router = Router()
+log = logging.getLogger(__name__)
+
+_recap_tasks: set[asyncio.Task] = set()
 
 
 async def require_admin_or_reply(message: Message, settings: Settings, session: AsyncSession) -> bool:
@@ -39,12 +46,14 @@ async def weekly_winners_post_cmd(
     session: AsyncSession,
     bot,
     db,
+    card_renderer=None,
+    media_registry=None,
 ) -> None:
     if not await require_admin_or_reply(message, settings, session):
         return
 
     await message.answer("⏳ Posting PREVIOUS week winners to the group...")
-    await post_weekly_winners(bot=bot, db=db, settings=settings, mode="previous")
+    await post_weekly_winners(bot=bot, db=db, settings=settings, mode="previous", renderer=card_renderer, media=media_registry)
     await message.answer("✅ Done.")
 
 
@@ -55,10 +64,52 @@ async def weekly_winners_post_current_cmd(
     session: AsyncSession,
     bot,
     db,
+    card_renderer=None,
+    media_registry=None,
 ) -> None:
     if not await require_admin_or_reply(message, settings, session):
         return
 
     await message.answer("⏳ Posting CURRENT week winners to the group (test)...")
-    await post_weekly_winners(bot=bot, db=db, settings=settings, mode="current")
+    await post_weekly_winners(bot=bot, db=db, settings=settings, mode="current", renderer=card_renderer, media=media_registry)
     await message.answer("✅ Done.")
+
+
+@router.message(F.text == "/weekly_recap_run")
+async def weekly_recap_run_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    bot,
+    db,
+    media_registry=None,
+) -> None:
+    """
+    Starts (or resumes) the private recap for the previous week in the background.
+    """
+    if not await require_admin_or_reply(message, settings, session):
+        return
+
+    chat_id = message.chat.id
+
+    async def _run() -> None:
+        try:
+            res = await run_weekly_recap(bot, db, settings, media=media_registry)
+        except Exception:
+            log.exception("Weekly recap run failed")
+            await bot.send_message(chat_id, "❌ Weekly recap failed (see logs).")
+            return
+        if res is None:
+            await bot.send_message(chat_id, "ℹ️ Weekly recap already finished or running.")
+            return
+        await bot.send_message(
+            chat_id,
+            f"✅ Weekly recap {res.week_start.isoformat()}: sent <b>{res.sent}</b>, "
+            f"failed {res.failed}, skipped {res.skipped}.",
+        )
+
+    task = asyncio.create_task(_run(), name="weekly-recap")
+    _recap_tasks.add(task)
+    task.add_done_callback(_recap_tasks.discard)
+
+    await message.answer("⏳ Weekly recap started (previous week). I'll report when it's done.")
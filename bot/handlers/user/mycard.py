@@ -0,0 +1,98 @@
+# bot/handlers/user/mycard.py
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import BufferedInputFile, Message
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import DailyActionType, WeeklyUserStats
+from bot.database.repo.leaderboard_repo import get_user_rank_week, week_start_utc
+from bot.services.task_progress import TaskProgressService
+from bot.utils.cards.card_cache import CardCache, card_key
+from bot.utils.cards.personal_card import CardTask, render_personal_card
+from bot.utils.cards.render_service import CardRenderService, RenderQueueFull
+from bot.utils.dates import utc_today
+from bot.utils.ensure_user import ensure_user
+from bot.utils.media_registry import MediaRegistry
+
+router = Router()
+
+MYCARD_TASKS = (
+    (DailyActionType.CHECKIN, "Check-in"),
+    (DailyActionType.QUIZ, "Quiz"),
+    (DailyActionType.POLL_VOTE, "Poll"),
+    (DailyActionType.SCREENSHOT, "Screenshot"),
+    (DailyActionType.SPIN, "Spin"),
+)
+
+
+def _display_name(username: str | None, first_name: str | None, last_name: str | None) -> str:
+    if username:
+        return f"@{username}"
+    name = " ".join([p for p in [first_name, last_name] if p])
+    return name.strip() or "User"
+
+
+@router.message(Command("mycard"))
+async def mycard_cmd(
+    message: Message,
+    session: AsyncSession,
+    card_cache: CardCache | None = None,
+    card_renderer: CardRenderService | None = None,
+    media_registry: MediaRegistry | None = None,
+) -> None:
+    user = await ensure_user(session, message)
+    today = utc_today()
+    ws = week_start_utc(today)
+
+    rank, points = await get_user_rank_week(session, ws, user.id)
+    streak = await session.scalar(
+        select(WeeklyUserStats.checkin_streak).where(
+            WeeklyUserStats.week_start == ws,
+            WeeklyUserStats.user_id == user.id,
+        )
+    )
+    done = await TaskProgressService.done_set(session, user_id=user.id, day_utc=today)
+
+    card_kwargs = dict(
+        name=_display_name(user.username, user.first_name, user.last_name),
+        week_start=ws,
+        week_end=ws + timedelta(days=6),
+        points=int(points or 0),
+        rank=rank,
+        streak=int(streak or 0),
+        tasks=[CardTask(label=label, done=t.value in done) for t, label in MYCARD_TASKS],
+    )
+    key = card_key("personal", day=today, **card_kwargs)
+
+    async def _render() -> bytes:
+        png = await card_cache.get(key) if card_cache is not None else None
+        if png is None:
+            if card_renderer is not None:
+                png = await card_renderer.render(render_personal_card, **card_kwargs)
+            else:
+                png = await asyncio.to_thread(render_personal_card, **card_kwargs)
+            if card_cache is not None:
+                await card_cache.put(key, png)
+        return png
+
+    try:
+        # Unchanged stats: resent by file_id (no render, no upload)
+        if media_registry is not None:
+            await media_registry.send_photo(
+                message.bot,
+                chat_id=message.chat.id,
+                key=key,
+                render=_render,
+                filename="mycard.png",
+            )
+            return
+
+        await message.answer_photo(photo=BufferedInputFile(await _render(), filename="mycard.png"))
+    except RenderQueueFull:
+        await message.answer("⏳ Cards are busy right now, try again in a few seconds.")
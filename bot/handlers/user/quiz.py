@@ -5,20 +5,17 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from aiogram import F, Router
-from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from aiogram.types import CallbackQuery, Message
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config.settings import Settings
 from bot.database.models import PointSource, User
 from bot.database.repo.points_repo import award_points_once
-from bot.database.repo.quiz_attempt_repo import (
-    create_attempt_once,
-    get_attempt,
-    get_quiz_by_id,
-)
+from bot.database.repo.quiz_attempt_repo import create_attempt_once, get_attempt
 from bot.database.repo.quiz_repo import get_quiz_for_day
 from bot.services.auth import AuthService
+from bot.services.quiz_cache import CachedQuiz, QuizCache
 from bot.services.task_progress import TaskProgressService
 from bot.utils.reply import reply_safe
 
@@ -30,13 +27,11 @@ def _utc_today():
     return datetime.now(tz=ZoneInfo("UTC")).date()
 
 
-def _quiz_keyboard(quiz_id: int, options: list[str]) -> InlineKeyboardMarkup:
-    rows = []
-    for idx, text in enumerate(options):
-        rows.append(
-            [InlineKeyboardButton(text=text, callback_data=f"quiz:{quiz_id}:{idx}")]
-        )
-    return InlineKeyboardMarkup(inline_keyboard=rows)
+async def _today_quiz(session: AsyncSession, quiz_cache: QuizCache | None, today_utc) -> CachedQuiz | None:
+    if quiz_cache is not None:
+        return await quiz_cache.get(today_utc)
+    quiz = await get_quiz_for_day(session, today_utc)
+    return CachedQuiz.from_model(quiz) if quiz else None
 
 
 async def _get_or_create_user(
@@ -60,14 +55,19 @@ async def _get_or_create_user(
 
 @router.message(F.text == "🧠 Quiz")
 @router.message(F.text == "/quiz")
-async def quiz_entry(message: Message, settings: Settings, session: AsyncSession) -> None:
+async def quiz_entry(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_cache: QuizCache | None = None,
+) -> None:
     user = await _get_or_create_user(session, settings, message.from_user)
     if not user:
         await reply_safe(message, "⚠️ Please try again.")
         return
 
     today_utc = _utc_today()
-    quiz = await get_quiz_for_day(session, today_utc)
+    quiz = await _today_quiz(session, quiz_cache, today_utc)
     if not quiz:
         await reply_safe(
             message,
@@ -75,7 +75,7 @@ async def quiz_entry(message: Message, settings: Settings, session: AsyncSession
         )
         return
 
-    existing = await get_attempt(session, quiz.id, user.id)
+    existing = await get_attempt(session, quiz.quiz_id, user.id)
     if existing:
         status = "✅ Correct" if int(existing.is_correct or 0) == 1 else "❌ Wrong"
         await reply_safe(
@@ -89,9 +89,6 @@ async def quiz_entry(message: Message, settings: Settings, session: AsyncSession
         )
         return
 
-    option_texts = [o.text for o in (quiz.options or [])]
-    kb = _quiz_keyboard(quiz.id, option_texts)
-
     # ✅ Inline keyboard is allowed in group
     await message.answer(
         (
@@ -99,14 +96,17 @@ async def quiz_entry(message: Message, settings: Settings, session: AsyncSession
             f"❓ {quiz.question}\n\n"
             "Choose one option:"
         ),
-        reply_markup=kb,
+        reply_markup=quiz.keyboard,
         parse_mode="HTML",
     )
 
 
 @router.callback_query(F.data.startswith("quiz:"))
 async def quiz_answer(
-    cb: CallbackQuery, settings: Settings, session: AsyncSession
+    cb: CallbackQuery,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_cache: QuizCache | None = None,
 ) -> None:
     try:
         await cb.answer()
@@ -131,12 +131,9 @@ async def quiz_answer(
 
     today_utc = _utc_today()
 
-    quiz = await get_quiz_by_id(session, quiz_id)
-    if not quiz:
-        await reply_safe(cb.message, "ℹ️ Quiz not found.")
-        return
-
-    if quiz.day_utc != today_utc:
+    # validated against the cached quiz of the day: no quiz read per click
+    quiz = await _today_quiz(session, quiz_cache, today_utc)
+    if quiz is None or quiz.quiz_id != quiz_id:
         try:
             await cb.message.edit_reply_markup(reply_markup=None)
         except Exception:
@@ -147,7 +144,11 @@ async def quiz_answer(
     try:
         result = await create_attempt_once(
             session,
-            quiz=quiz,
+            quiz_id=quiz.quiz_id,
+            option_count=len(quiz.options),
+            correct_index=quiz.correct_index,
+            points_correct=quiz.points_correct,
+            points_wrong=quiz.points_wrong,
             user_id=user.id,
             day_utc=today_utc,
             chosen_index=chosen_index,
@@ -182,7 +183,7 @@ async def quiz_answer(
             source=PointSource.QUIZ,
             points=awarded_points,
             ref_type="quiz",
-            ref_id=quiz.id,
+            ref_id=quiz.quiz_id,
         )
         if not award.awarded:
             await session.commit()
@@ -0,0 +1,155 @@
+# bot/handlers/user/quiz_run.py
+from __future__ import annotations
+
+import html
+import logging
+
+from aiogram import F, Router
+from aiogram.types import CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, Message
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.config.settings import Settings
+from bot.database.models import User
+from bot.database.repo.quiz_session_repo import list_quiz_sets
+from bot.handlers.user.quiz import _get_or_create_user
+from bot.services.quiz_sessions import AnswerStatus, LoadedSet, QuizSessionEngine, SessionState
+from bot.utils.reply import reply_safe
+
+log = logging.getLogger(__name__)
+router = Router()
+
+
+def _question_text(quiz_set: LoadedSet, state: SessionState, *, header: str = "") -> str:
+    q = quiz_set.questions[state.current_index]
+    return (
+        header
+        + f"🧩 <b>{html.escape(quiz_set.title)}</b> — question {state.current_index + 1}/{len(quiz_set.questions)}\n"
+        + f"⭐ Score so far: <b>{state.score}</b>\n\n"
+        + f"❓ {html.escape(q.text)}"
+    )
+
+
+def _final_text(quiz_set: LoadedSet, state: SessionState, *, header: str = "") -> str:
+    total = sum(q.points for q in quiz_set.questions)
+    return header + f"🏁 <b>{html.escape(quiz_set.title)}</b> finished!\n⭐ <b>Points:</b> {state.score} / {total}"
+
+
+async def _start_run(message: Message, engine: QuizSessionEngine, *, set_id: int, user_id: int) -> None:
+    run = await engine.begin(set_id, user_id)
+    if run is None:
+        await reply_safe(message, "ℹ️ This quiz is not available.")
+        return
+    quiz_set, state = run
+    if state.finished:
+        await reply_safe(message, _final_text(quiz_set, state, header="✅ You already completed this quiz.\n\n"))
+        return
+    await message.answer(_question_text(quiz_set, state), reply_markup=quiz_set.keyboard(state.current_index))
+
+
+@router.message(F.text.startswith("/quizrun"))
+async def quizrun_cmd(
+    message: Message,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_sessions: QuizSessionEngine | None = None,
+) -> None:
+    if quiz_sessions is None:
+        return
+    user = await _get_or_create_user(session, settings, message.from_user)
+    if not user:
+        await reply_safe(message, "⚠️ Please try again.")
+        return
+
+    parts = (message.text or "").split()
+    if len(parts) > 1 and parts[1].isdigit():
+        await session.commit()  # user row must exist for the run's FK
+        await _start_run(message, quiz_sessions, set_id=int(parts[1]), user_id=user.id)
+        return
+
+    sets = await list_quiz_sets(session, active_only=True, limit=10)
+    if not sets:
+        await reply_safe(message, "ℹ️ No multi-question quizzes are running right now.")
+        return
+    kb = InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(
+                    text=f"🧩 {s.title} ({s.questions} q)",
+                    callback_data=f"qsr:s:{s.set_id}",
+                )
+            ]
+            for s in sets
+        ]
+    )
+    await message.answer("🧩 <b>Pick a quiz</b>", reply_markup=kb)
+
+
+@router.callback_query(F.data.startswith("qsr:"))
+async def quizrun_callback(
+    cb: CallbackQuery,
+    settings: Settings,
+    session: AsyncSession,
+    quiz_sessions: QuizSessionEngine | None = None,
+) -> None:
+    try:
+        await cb.answer()
+    except Exception:
+        pass
+    if not cb.message or not cb.data or quiz_sessions is None:
+        return
+
+    parts = cb.data.split(":")
+    if not all(p.isdigit() for p in parts[2:]):
+        return
+
+    # -----------------------
+    # Start from the picker
+    # -----------------------
+    if parts[1] == "s" and len(parts) == 3:
+        user = await _get_or_create_user(session, settings, cb.from_user)
+        if not user:
+            return
+        await session.commit()
+        await _start_run(cb.message, quiz_sessions, set_id=int(parts[2]), user_id=user.id)
+        return
+
+    if parts[1] != "a" or len(parts) != 5:
+        return
+    set_id, position, chosen = int(parts[2]), int(parts[3]), int(parts[4])
+
+    # read-only lookup: answering writes nothing until the engine flushes
+    user_id = await session.scalar(select(User.id).where(User.telegram_id == cb.from_user.id))
+    if user_id is None:
+        return
+
+    out = await quiz_sessions.answer(set_id=set_id, user_id=user_id, position=position, chosen_index=chosen)
+
+    if out.status == AnswerStatus.STALE:
+        return  # double tap or an old message: the current question is already on screen
+    if out.status in (AnswerStatus.CLOSED, AnswerStatus.INVALID):
+        try:
+            await cb.message.edit_reply_markup(reply_markup=None)
+        except Exception:
+            pass
+        if out.status == AnswerStatus.CLOSED:
+            await reply_safe(cb.message, "ℹ️ This quiz is closed.")
+        return
+    if out.status == AnswerStatus.FINISHED:
+        try:
+            await cb.message.edit_text(_final_text(out.quiz_set, out.state), reply_markup=None)
+        except Exception:
+            pass
+        return
+
+    verdict = "✅ Correct!\n\n" if out.is_correct else "❌ Wrong.\n\n"
+    try:
+        if out.completed:
+            await cb.message.edit_text(_final_text(out.quiz_set, out.state, header=verdict), reply_markup=None)
+        else:
+            await cb.message.edit_text(
+                _question_text(out.quiz_set, out.state, header=verdict),
+                reply_markup=out.quiz_set.keyboard(out.state.current_index),
+            )
+    except Exception:
+        log.debug("Failed to edit quiz run message user_id=%s", user_id)
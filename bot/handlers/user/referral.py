@@ -2,8 +2,6 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
-from zoneinfo import ZoneInfo
 
 from aiogram import Router, F
 from aiogram.filters import Command
@@ -13,42 +11,30 @@ from aiogram.types import (
     InlineKeyboardMarkup,
     InlineKeyboardButton,
 )
-from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config.settings import Settings
-from bot.database.models import PointEvent, PointSource, User
-from bot.database.repo.points_repo import award_points_once
+from bot.database.repo.referral_repo import get_referral_counts
 from bot.keyboards.main import BTN_REFERRAL
+from bot.services.referral_joins import (
+    REFERRAL_CAP,
+    ReferralJoinProcessor,
+    notify_referrers,
+    process_referral_joins,
+)
 from bot.utils.ensure_user import ensure_user
 from bot.utils.reply import reply_safe
 
 log = logging.getLogger(__name__)
 router = Router()
 
-REFERRAL_CAP = 100  # lifetime successful referrals cap
-
-
-def _utc_today():
-    return datetime.now(tz=ZoneInfo("UTC")).date()
-
-
-async def _referral_count(session: AsyncSession, *, user_id: int) -> int:
-    """Counts successful referrals using the point ledger (source=referral)."""
-    count = await session.scalar(
-        select(func.count(PointEvent.id)).where(
-            PointEvent.user_id == user_id,
-            PointEvent.source == PointSource.REFERRAL,
-        )
-    )
-    return int(count or 0)
-
 
 async def _send_referral_info(message: Message, session: AsyncSession, settings: Settings) -> None:
     me = await ensure_user(session, message)
     link = f"https://t.me/{settings.bot_username}?start=ref_{me.telegram_id}"
 
-    total = await _referral_count(session, user_id=me.id)
+    counts = await get_referral_counts(session, user_id=me.id)
+    total = counts.successful
     remaining = max(0, REFERRAL_CAP - total)
 
     # ✅ Join main group button (Option A)
@@ -65,6 +51,7 @@ async def _send_referral_info(message: Message, session: AsyncSession, settings:
         "👥 <b>Your referral link</b>\n"
         f"{link}\n\n"
         f"✅ <b>Successful referrals:</b> {total}\n"
+        f"⏳ <b>Started, not joined yet:</b> {counts.pending}\n"
         f"🎯 <b>Remaining until cap ({REFERRAL_CAP}):</b> {remaining}\n\n"
         "✅ <b>How it works:</b>\n"
         "1️⃣ Share this referral link\n"
@@ -90,6 +77,7 @@ async def referral_join_award(
     event: ChatMemberUpdated,
     session: AsyncSession,
     settings: Settings,
+    referral_joins: ReferralJoinProcessor | None = None,
 ) -> None:
     # Must have group_id set
     if not settings.group_id:
@@ -107,70 +95,25 @@ async def referral_join_award(
     old = event.old_chat_member.status
     new = event.new_chat_member.status
 
-    # join detection (left/kicked -> member/admin/creator)
+    # join detection (left/kicked -> member/admin/creator), leave = the reverse
     joined = (old in ("left", "kicked")) and (new in ("member", "administrator", "creator"))
-    if not joined:
+    left = (old in ("member", "restricted")) and (new in ("left", "kicked"))
+    if not (joined or left):
         return
 
     tg_id = changed_user.id
-    log.info("Referral join update: tg_id=%s old=%s new=%s chat=%s", tg_id, old, new, event.chat.id)
-
-    user = await session.scalar(select(User).where(User.telegram_id == tg_id))
-    if not user:
-        log.info("Referral join: user not found in DB tg_id=%s", tg_id)
-        return
+    log.debug("Referral join update: tg_id=%s old=%s new=%s chat=%s", tg_id, old, new, event.chat.id)
 
-    # Already handled this user's referral join
-    if user.referral_processed:
-        log.info("Referral join: already processed tg_id=%s", tg_id)
+    # ✅ Batched: award (or cap/skip) happens in the processor's next flush
+    if referral_joins is not None:
+        referral_joins.note(tg_id, joined=joined)
         return
 
-    # No referrer attached
-    if not user.referred_by_user_id:
-        log.info("Referral join: no referrer tg_id=%s", tg_id)
-        user.referral_processed = True
-        await session.flush()
-        return
-
-    referrer = await session.scalar(select(User).where(User.id == user.referred_by_user_id))
-    if not referrer:
-        log.info("Referral join: referrer missing tg_id=%s referred_by_user_id=%s", tg_id, user.referred_by_user_id)
-        user.referral_processed = True
-        await session.flush()
-        return
-
-    # Cap check for referrer
-    current_count = await _referral_count(session, user_id=referrer.id)
-    log.info("Referral join: referrer=%s current_count=%s", referrer.telegram_id, current_count)
-
-    if current_count >= REFERRAL_CAP:
-        log.info("Referral join: cap reached referrer=%s", referrer.telegram_id)
-        user.referral_processed = True
-        await session.flush()
+    if not joined:
         return
-
-    # ✅ Award exactly once per referred user via ledger uniqueness
-    res = await award_points_once(
-        session,
-        user_id=referrer.id,
-        day_utc=_utc_today(),
-        source=PointSource.REFERRAL,
-        points=1,
-        ref_type="referral",
-        ref_id=user.id,
+    res = await process_referral_joins(session, [tg_id])
+    log.info(
+        "Referral join: tg_id=%s claimed=%s awarded=%s capped=%s",
+        tg_id, res.claimed, res.awarded, res.capped,
     )
-
-    # Mark processed regardless of duplicate attempt
-    user.referral_processed = True
-    await session.flush()
-
-    log.info("Referral award: awarded=%s referrer=%s referred_tg=%s", res.awarded, referrer.telegram_id, tg_id)
-
-    if res.awarded:
-        try:
-            await event.bot.send_message(
-                chat_id=referrer.telegram_id,
-                text="🎉 You earned +1 point from a referral join!",
-            )
-        except Exception:
-            pass
\ No newline at end of file
+    await notify_referrers(event.bot, res.per_referrer)
@@ -6,12 +6,14 @@ from bot.handlers.user.whoami import router as whoami_router
 from bot.handlers.user.checkin import router as checkin_router
 from bot.handlers.user.status import router as status_router
 from bot.handlers.user.quiz import router as quiz_router
+from bot.handlers.user.quiz_run import router as quiz_run_router
 from bot.handlers.user.menu_stub import router as menu_stub_router
 from bot.handlers.user.leaderboard import router as leaderboard_router
 from bot.handlers.user.screenshot import router as screenshot_router
 from .spin import router as spin_router
 from bot.handlers.user.poll import router as poll_user_router
 from bot.handlers.user.referral import router as referral_router
+from bot.handlers.user.mycard import router as mycard_router
 
 
 router = Router(name="user")
@@ -21,9 +23,11 @@ router.include_router(whoami_router)
 router.include_router(checkin_router)
 router.include_router(status_router)
 router.include_router(quiz_router)       
+router.include_router(quiz_run_router)
 router.include_router(menu_stub_router)
 router.include_router(leaderboard_router)
 router.include_router(screenshot_router)
 router.include_router(spin_router)
 router.include_router(poll_user_router)
-router.include_router(referral_router)
\ No newline at end of file
+router.include_router(referral_router)
+router.include_router(mycard_router)
\ No newline at end of file
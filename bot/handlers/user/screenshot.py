@@ -13,7 +13,7 @@ from sqlalchemy import select
 
 from bot.config.settings import Settings
 from bot.database.models import User
-from bot.database.repo.screenshot_repo import create_submission_once
+from bot.database.repo.screenshot_repo import auto_reject_submission, create_submission_once
 from bot.services.auth import AuthService
 from bot.database.repo.config_repo import get_config
 from bot.utils.reply import reply_safe
@@ -98,6 +98,9 @@ async def screenshot_receive_photo(
     settings: Settings,
     session: AsyncSession,
     bot,
+    screenshot_dispatcher=None,
+    screenshot_dedup=None,
+    card_renderer=None,
 ) -> None:
     user = await _ensure_user(session, settings, message)
     if not user:
@@ -128,6 +131,30 @@ async def screenshot_receive_photo(
     await session.commit()
     await state.clear()
 
+    # Duplicate check (same file / perceptual hash) before anyone reviews it
+    dup = None
+    if screenshot_dedup is not None:
+        dup = await screenshot_dedup.register(
+            bot,
+            session,
+            submission_id=sub.id,
+            user_id=user.id,
+            file_id=image_file_id,
+            file_unique_id=photo.file_unique_id,
+            renderer=card_renderer,
+        )
+        if dup is not None and (dup.same_file or settings.screenshot_dup_reject):
+            await auto_reject_submission(
+                session,
+                submission_id=sub.id,
+                note=f"duplicate of #{dup.submission_id} (distance {dup.distance})",
+            )
+            await session.commit()
+            log.info("Screenshot %s auto-rejected as duplicate of #%s", sub.id, dup.submission_id)
+            await reply_safe(message, "❌ This screenshot was already submitted before. Please send a new one next time.")
+            return
+        await session.commit()
+
     cfg = await get_config(session)
     if not cfg.screenshot_enabled:
         await reply_safe(message, "ℹ️ Screenshot task is currently disabled by admins.")
@@ -145,6 +172,9 @@ async def screenshot_receive_photo(
         f"🆔 <b>Submission ID:</b> {sub.id}\n"
         f"⭐ <b>Points on approve:</b> {cfg.screenshot_points}"
     )
+    if dup is not None:
+        same_user = " — same user" if dup.user_id == user.id else ""
+        caption += f"\n\n⚠️ <b>Possible duplicate</b> of #{dup.submission_id} (distance {dup.distance}{same_user})"
 
     try:
         m = await bot.send_photo(
@@ -166,4 +196,11 @@ async def screenshot_receive_photo(
     except Exception:
         log.exception("Failed to send screenshot to review chat")
 
+    # Push straight to the least-loaded reviewer on duty (if any)
+    if screenshot_dispatcher is not None:
+        try:
+            await screenshot_dispatcher.dispatch(sub.id)
+        except Exception:
+            log.exception("Failed to dispatch screenshot submission_id=%s", sub.id)
+
     await reply_safe(message, "✅ Screenshot submitted! It will be reviewed by admins.")
@@ -6,6 +6,8 @@ from aiogram.filters import Command
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from bot.database.session import run_retrying_busy
+from bot.services.cash_budget import CashBudget
 from bot.services.spin import SpinService
 from bot.utils.dates import utc_today
 from bot.utils.ensure_user import ensure_user
@@ -18,19 +20,26 @@ SPIN_BUTTON_TEXT = "🎰 Spin"
 
 @router.message(Command("spin"))
 @router.message(lambda m: (m.text or "").strip() == SPIN_BUTTON_TEXT)
-async def spin_cmd(message: Message, session: AsyncSession) -> None:
-    user = await ensure_user(session, message)
+async def spin_cmd(message: Message, session: AsyncSession, cash_budget: CashBudget | None = None) -> None:
     day_utc = utc_today()
 
     # Until poll is implemented
     require_poll = False
 
-    res = await SpinService.spin(
-        session,
-        user_id=user.id,
-        day_utc=day_utc,
-        require_poll=require_poll,
-    )
+    async def _spin():
+        user = await ensure_user(session, message)
+        return await SpinService.spin(
+            session,
+            user_id=user.id,
+            day_utc=day_utc,
+            require_poll=require_poll,
+            cash_budget=cash_budget,
+        )
+
+    # ✅ a write-lock timeout retries the whole spin instead of failing the user's /spin
+    res = await run_retrying_busy(session, _spin)
+    if cash_budget is not None and res.budget_note is not None:
+        res.budget_note.apply(cash_budget)  # only now: the reservation is committed
 
     await reply_safe(
         message,
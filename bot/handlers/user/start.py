@@ -8,6 +8,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config.settings import Settings
 from bot.database.models.user import User
+from bot.database.repo.referral_repo import note_referral_pending
 from bot.utils.ensure_user import ensure_user
 from bot.utils.reply import reply_safe
 
@@ -37,6 +38,8 @@ async def start_cmd(message: Message, session: AsyncSession, settings: Settings)
                 me.referred_by_user_id = referrer.id
                 # Do NOT set referral_processed here (only after group join)
                 await session.flush()
+                if not me.referral_processed:
+                    await note_referral_pending(session, referrer_user_id=referrer.id)
 
     # 1) Show join group link (inline button)
     if settings.group_invite_link:
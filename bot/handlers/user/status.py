@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from aiogram import Router
 from aiogram.filters import Command
+from aiogram.methods import SendMessage
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -10,7 +11,7 @@ from bot.database.models import DailyActionType
 from bot.services.task_progress import TaskProgressService
 from bot.utils.dates import utc_today
 from bot.utils.ensure_user import ensure_user
-from bot.utils.reply import reply_safe
+from bot.utils.reply import answer_fast
 
 router = Router()
 
@@ -19,7 +20,7 @@ STATUS_BUTTON_TEXT = "📌 Status"
 
 @router.message(Command("status"))
 @router.message(lambda m: (m.text or "").strip() == STATUS_BUTTON_TEXT)
-async def status_cmd(message: Message, session: AsyncSession) -> None:
+async def status_cmd(message: Message, session: AsyncSession) -> SendMessage | None:
     user = await ensure_user(session, message)
     day_utc = utc_today()
 
@@ -39,7 +40,7 @@ async def status_cmd(message: Message, session: AsyncSession) -> None:
         f"• spin: {ok(DailyActionType.SPIN)}\n"
     )
 
-    await reply_safe(
+    return await answer_fast(
         message,
         text,
         parse_mode="HTML",
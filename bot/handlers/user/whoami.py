@@ -3,11 +3,12 @@ from __future__ import annotations
 
 from aiogram import Router
 from aiogram.filters import Command
+from aiogram.methods import SendMessage
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.utils.ensure_user import ensure_user
-from bot.utils.reply import reply_safe
+from bot.utils.reply import answer_fast
 
 router = Router()
 
@@ -24,7 +25,7 @@ def _get_user_telegram_id(db_user: object, msg: Message) -> int:
 
 
 @router.message(Command("whoami"))
-async def whoami(message: Message, session: AsyncSession) -> None:
+async def whoami(message: Message, session: AsyncSession) -> SendMessage | None:
     u = await ensure_user(session, message)
 
     telegram_id = _get_user_telegram_id(u, message)
@@ -40,7 +41,7 @@ async def whoami(message: Message, session: AsyncSession) -> None:
         f"• Role: {role}\n"
     )
 
-    await reply_safe(
+    return await answer_fast(
         message,
         text,
         parse_mode="HTML",
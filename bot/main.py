@@ -2,6 +2,7 @@
 import asyncio
 import contextlib
 import logging
+from datetime import timedelta
 
 from aiogram import Dispatcher
 from aiogram.client.default import DefaultBotProperties
@@ -16,11 +17,30 @@ from bot.database.models import *  # noqa: F401,F403
 from bot.handlers import router as handlers_router
 from bot.scheduler import setup_scheduler
 from bot.services.poll_scheduler import poll_scheduler_loop
+from bot.database.repo.daily_progress_repo import backfill_daily_progress, has_daily_progress
+from bot.database.repo.referral_repo import has_referral_stats, rebuild_referral_stats
+from bot.database.repo.screenshot_repo import has_queue_counters, reconcile_queue_counters
+from bot.services.cash_budget import CashBudget
+from bot.services.quiz_cache import QuizCache
+from bot.services.quiz_sessions import QuizSessionEngine
+from bot.services.referral_joins import ReferralJoinProcessor
+from bot.services.screenshot_dedup import ScreenshotDedupIndex
+from bot.services.screenshot_dispatch import ScreenshotDispatcher
+from bot.services.screenshot_reaper import ScreenshotClaimReaper
+from bot.services.task_progress import TaskProgressService
+from bot.utils.dates import utc_today
+from bot.utils.callback_dedup import CallbackSingleFlightMiddleware
+from bot.utils.cards.card_cache import CardCache
+from bot.utils.cards.render_service import CardRenderService
+from bot.utils.loop_monitor import LoopLagMonitor
+from bot.utils.media_registry import MediaRegistry
+from bot.utils.mailbox import UserMailboxMiddleware
 from bot.utils.middleware import DbSessionMiddleware
 
 # ✅ NEW: auto-delete bot messages + delete user commands in main group
 from bot.utils.autodelete_bot import AutoDeleteBot
 from bot.utils.autodelete_commands_mw import AutoDeleteCommandsMiddleware
+from bot.utils.webhook import run_webhook
 
 
 def setup_logging(is_dev: bool) -> None:
@@ -59,6 +79,28 @@ async def main() -> None:
     await db.init_models()
     log.info("DB initialized")
 
+    # First start with maintained screenshot counters: seed them from the table once
+    async with db.session() as session:
+        if not await has_queue_counters(session):
+            await reconcile_queue_counters(session)
+            await session.commit()
+
+    # daily_actions -> daily_progress: everything on first start, then the last two days
+    # (covers rows written by an older build during the dual-write period)
+    TaskProgressService.dual_write = settings.daily_actions_dual_write
+    async with db.session() as session:
+        since = None if not await has_daily_progress(session) else utc_today() - timedelta(days=1)
+        n = await backfill_daily_progress(session, since=since)
+        await session.commit()
+        log.info("Daily progress backfilled: %s row(s)%s", n, "" if since is None else f" since {since}")
+
+    # First start with maintained referral counters: seed them from users + the ledger once
+    async with db.session() as session:
+        if not await has_referral_stats(session):
+            n = await rebuild_referral_stats(session)
+            await session.commit()
+            log.info("Referral stats seeded: %s referrer(s)", n)
+
     # ✅ IMPORTANT: use AutoDeleteBot (NOT aiogram.Bot)
     bot = AutoDeleteBot(
         token=settings.bot_token,
@@ -69,11 +111,67 @@ async def main() -> None:
     # ✅ sanity log: must print "AutoDeleteBot"
     log.info("Bot class: %s", bot.__class__.__name__)
 
+    # Restore pending auto-deletes + start the timer wheel
+    await bot.autodelete.start(db)
+
+    # Pillow card rendering runs in a worker pool, not on the event loop
+    card_renderer = CardRenderService(
+        mode=settings.card_render_mode,
+        workers=settings.card_render_workers,
+        max_queue=settings.card_render_queue,
+    )
+    card_cache = CardCache(
+        settings.card_cache_dir,
+        max_age_days=settings.card_cache_max_age_days,
+        max_files=settings.card_cache_max_files,
+    )
+    media_registry = MediaRegistry(db)  # content hash -> uploaded file_id
+    loop_monitor = LoopLagMonitor()
+    loop_monitor.start()
+
+    # Today's quiz in memory (invalidated on /quiz_set, re-warmed at UTC midnight)
+    quiz_cache = QuizCache(db)
+    quiz_cache.start()
+    await quiz_cache.warm()
+
+    # Multi-question quiz runs: progress in memory, answers flushed in batches
+    quiz_sessions = QuizSessionEngine(db)
+    quiz_sessions.start()
+
+    # Global spin cash budget: ledger totals cached for the spin gate
+    cash_budget = CashBudget(
+        daily_limit_cents=settings.spin_cash_daily_budget_cents,
+        weekly_limit_cents=settings.spin_cash_weekly_budget_cents,
+    )
+    await cash_budget.refresh(db)
+
+    # Main-group joins: referral awards in batches (flaps within a window collapse)
+    referral_joins = ReferralJoinProcessor(db, bot, group_id=settings.group_id)
+    referral_joins.start()
+
     dp = Dispatcher()
 
     # Inject workflow data
     dp.workflow_data["settings"] = settings
     dp.workflow_data["db"] = db
+    dp.workflow_data["card_renderer"] = card_renderer
+    dp.workflow_data["card_cache"] = card_cache
+    dp.workflow_data["media_registry"] = media_registry
+    dp.workflow_data["loop_monitor"] = loop_monitor
+    dp.workflow_data["quiz_cache"] = quiz_cache
+    dp.workflow_data["quiz_sessions"] = quiz_sessions
+    dp.workflow_data["cash_budget"] = cash_budget
+    dp.workflow_data["referral_joins"] = referral_joins
+
+    # Drop double-tapped inline buttons before they queue up behind the first tap
+    callback_dedup = CallbackSingleFlightMiddleware(linger_seconds=1.0)
+    dp.update.outer_middleware(callback_dedup)
+    dp.workflow_data["callback_dedup"] = callback_dedup
+
+    # Per-user ordering + global handler cap (outer: runs before the DB session is opened)
+    update_mailbox = UserMailboxMiddleware(max_concurrency=settings.update_concurrency)
+    dp.update.outer_middleware(update_mailbox)
+    dp.workflow_data["update_mailbox"] = update_mailbox
 
     # DB session per update
     dp.update.middleware(DbSessionMiddleware(db))
@@ -85,15 +183,44 @@ async def main() -> None:
     dp.include_router(handlers_router)
 
     # APScheduler (your existing)
-    scheduler = setup_scheduler(bot=bot, db=db, settings=settings)
+    scheduler = setup_scheduler(
+        bot=bot,
+        db=db,
+        settings=settings,
+        renderer=card_renderer,
+        media=media_registry,
+        quiz_cache=quiz_cache,
+        card_cache=card_cache,
+    )
     log.info("Scheduler started")
 
+    # Perceptual-hash index of every screenshot (near-duplicate check on submit)
+    screenshot_dedup = ScreenshotDedupIndex(radius=settings.screenshot_dup_distance)
+    await screenshot_dedup.load(db)
+    dp.workflow_data["screenshot_dedup"] = screenshot_dedup
+
+    # Screenshots are pushed to the least-loaded reviewer on duty
+    screenshot_dispatcher = ScreenshotDispatcher(bot, db, settings)
+    dp.workflow_data["screenshot_dispatcher"] = screenshot_dispatcher
+
+    # Screenshot claims expire exactly at their deadline (replaces the per-minute cron)
+    claim_reaper = ScreenshotClaimReaper(bot, db, settings, dispatcher=screenshot_dispatcher)
+    await claim_reaper.start()
+    dp.workflow_data["claim_reaper"] = claim_reaper
+
     # Poll scheduler loop
     poll_task = asyncio.create_task(poll_scheduler_loop(bot, db, interval_seconds=15))
     log.info("Poll scheduler loop started")
 
     try:
-        await dp.start_polling(bot)
+        if settings.use_webhook:
+            log.info("Delivery mode: webhook")
+            await run_webhook(dp, bot, settings)
+        else:
+            log.info("Delivery mode: long polling")
+            # getUpdates fails while a webhook is registered (e.g. after switching modes)
+            await bot.delete_webhook(drop_pending_updates=False)
+            await dp.start_polling(bot)
     except (asyncio.CancelledError, KeyboardInterrupt):
         pass
     except Exception:
@@ -114,6 +241,46 @@ async def main() -> None:
         except Exception:
             log.exception("Failed to shutdown scheduler")
 
+        # Stop claim reaper + backlog dispatch
+        try:
+            await claim_reaper.close()
+            await screenshot_dispatcher.close()
+        except Exception:
+            log.exception("Failed to stop claim reaper")
+
+        quiz_cache.close()
+
+        # Persist buffered quiz answers/progress
+        try:
+            await quiz_sessions.close()
+        except Exception:
+            log.exception("Failed to flush quiz sessions")
+
+        # Award joins still waiting for their batch
+        try:
+            await referral_joins.close()
+        except Exception:
+            log.exception("Failed to flush referral joins")
+
+        # Stop auto-delete wheel (persists not-yet-saved schedules)
+        try:
+            await bot.autodelete.close()
+        except Exception:
+            log.exception("Failed to close auto-delete engine")
+
+        # Drain outbound queue workers
+        try:
+            await bot.outbound.close()
+        except Exception:
+            log.exception("Failed to close outbound scheduler")
+
+        # Stop render pool + loop monitor
+        try:
+            card_renderer.close()
+            await loop_monitor.close()
+        except Exception:
+            log.exception("Failed to stop card renderer")
+
         # Close DB + bot session
         try:
             await db.close()
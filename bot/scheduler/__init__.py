@@ -6,9 +6,30 @@ from aiogram import Bot
 
 from bot.config.settings import Settings
 from bot.scheduler.jobs import build_scheduler
+from bot.services.quiz_cache import QuizCache
+from bot.utils.cards.card_cache import CardCache
+from bot.utils.cards.render_service import CardRenderService
+from bot.utils.media_registry import MediaRegistry
 
 
-def setup_scheduler(bot: Bot, db, settings: Settings) -> AsyncIOScheduler:
-    scheduler = build_scheduler(bot=bot, db=db, settings=settings)
+def setup_scheduler(
+    bot: Bot,
+    db,
+    settings: Settings,
+    *,
+    renderer: CardRenderService | None = None,
+    media: MediaRegistry | None = None,
+    quiz_cache: QuizCache | None = None,
+    card_cache: CardCache | None = None,
+) -> AsyncIOScheduler:
+    scheduler = build_scheduler(
+        bot=bot,
+        db=db,
+        settings=settings,
+        renderer=renderer,
+        media=media,
+        quiz_cache=quiz_cache,
+        card_cache=card_cache,
+    )
     scheduler.start()
     return scheduler
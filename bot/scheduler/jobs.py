@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from datetime import date, datetime, timedelta
 from zoneinfo import ZoneInfo
@@ -11,6 +12,7 @@ from apscheduler.triggers.cron import CronTrigger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.config.settings import Settings
+from bot.database.repo.screenshot_repo import reconcile_queue_counters
 from bot.database.repo.leaderboard_repo import (
     get_top_week,
     get_top_range,
@@ -20,9 +22,15 @@ from bot.database.repo.weekly_winners_repo import (
     save_snapshot,
     snapshot_exists,
 )
+from bot.utils.cards.card_cache import CardCache, card_key
+from bot.utils.cards.render_service import CardRenderService, RenderQueueFull
 from bot.utils.cards.weekly_winners_card import CardWinner, render_weekly_winners_card
-from bot.database.repo.screenshot_repo import expire_assignments
+from bot.services.quiz_cache import QuizCache
+from bot.services.quiz_stats import quiz_rollover
+from bot.services.weekly_recap import run_weekly_recap
 from bot.utils.leaderboard_window import resolve_leaderboard_window
+from bot.utils.media_registry import MediaRegistry
+from bot.utils.outbound import SendPriority, send_priority
 
 log = logging.getLogger(__name__)
 
@@ -57,6 +65,8 @@ async def post_weekly_winners(
     settings: Settings,
     *,
     mode: str | None = None,  # ✅ backward compatibility
+    renderer: CardRenderService | None = None,
+    media: MediaRegistry | None = None,
 ) -> None:
     """
     Posts winners into settings.group_id.
@@ -68,6 +78,8 @@ async def post_weekly_winners(
     NOTE:
     - `mode` is accepted for backward compatibility
     - Campaign logic ALWAYS takes precedence
+    - The card is rendered off the event loop (renderer pool, or a worker thread)
+    - With a media registry, re-posting an identical card re-uses its file_id
     """
 
     if mode:
@@ -145,14 +157,15 @@ async def post_weekly_winners(
     # -------------------------------------------------
 
     if not snap:
-        await bot.send_message(
-            chat_id=settings.group_id,
-            text=(
-                f"🏆 <b>{title}</b>\n"
-                f"📅 <b>Period (UTC):</b> {target_start.isoformat()} → {target_end.isoformat()}\n\n"
-                "ℹ️ No points were earned for this period."
-            ),
-        )
+        with send_priority(SendPriority.BROADCAST):
+            await bot.send_message(
+                chat_id=settings.group_id,
+                text=(
+                    f"🏆 <b>{title}</b>\n"
+                    f"📅 <b>Period (UTC):</b> {target_start.isoformat()} → {target_end.isoformat()}\n\n"
+                    "ℹ️ No points were earned for this period."
+                ),
+            )
         return
 
     # -------------------------------------------------
@@ -166,36 +179,73 @@ async def post_weekly_winners(
             CardWinner(rank=row.rank, name=name, points=row.points)
         )
 
-    png_bytes = render_weekly_winners_card(
+    card_kwargs = dict(
         week_start=target_start,
         week_end=target_end,
         winners=winners_for_card,
         title=title,
     )
 
-    photo = BufferedInputFile(
-        png_bytes,
-        filename=f"winners_{target_start.isoformat()}.png",
-    )
+    async def _render() -> bytes:
+        if renderer is not None:
+            try:
+                return await renderer.render(render_weekly_winners_card, **card_kwargs)
+            except RenderQueueFull:
+                pass  # the weekly post must go out: render it here instead
+        return await asyncio.to_thread(render_weekly_winners_card, **card_kwargs)
 
+    filename = f"winners_{target_start.isoformat()}.png"
     caption = (
         f"🏆 <b>{title}</b>\n"
         f"📅 <b>Period (UTC):</b> {target_start.isoformat()} → {target_end.isoformat()}\n\n"
         "🔥 Keep grinding!"
     )
 
-    await bot.send_photo(
-        chat_id=settings.group_id,
-        photo=photo,
-        caption=caption,
-    )
+    with send_priority(SendPriority.BROADCAST):
+        if media is not None:
+            await media.send_photo(
+                bot,
+                chat_id=settings.group_id,
+                key=card_key("weekly_winners", **card_kwargs),
+                render=_render,
+                filename=filename,
+                caption=caption,
+            )
+        else:
+            await bot.send_photo(
+                chat_id=settings.group_id,
+                photo=BufferedInputFile(await _render(), filename=filename),
+                caption=caption,
+            )
+
+
+# -------------------------------------------------
+# Screenshot queue counters: drift correction
+# -------------------------------------------------
+
+async def reconcile_screenshot_counters(db) -> int:
+    async with db.session() as session:
+        fixed = await reconcile_queue_counters(session)
+        await session.commit()
+    if fixed:
+        log.warning("Screenshot queue counters drifted: %s cell(s) corrected", fixed)
+    return fixed
 
 
 # -------------------------------------------------
 # Scheduler setup
 # -------------------------------------------------
 
-def build_scheduler(bot: Bot, db, settings: Settings) -> AsyncIOScheduler:
+def build_scheduler(
+    bot: Bot,
+    db,
+    settings: Settings,
+    *,
+    renderer: CardRenderService | None = None,
+    media: MediaRegistry | None = None,
+    quiz_cache: QuizCache | None = None,
+    card_cache: CardCache | None = None,
+) -> AsyncIOScheduler:
     """
     Creates and returns an AsyncIOScheduler with our jobs registered.
     """
@@ -205,42 +255,71 @@ def build_scheduler(bot: Bot, db, settings: Settings) -> AsyncIOScheduler:
     scheduler.add_job(
         post_weekly_winners,
         trigger=CronTrigger(day_of_week="sun", hour=0, minute=5, timezone="UTC"),
-        kwargs={"bot": bot, "db": db, "settings": settings},
+        kwargs={"bot": bot, "db": db, "settings": settings, "renderer": renderer, "media": media},
         id="post_weekly_winners",
         replace_existing=True,
         coalesce=True,
         misfire_grace_time=300,
     )
 
+    # ✅ UTC midnight: load the new day's quiz before the first click
+    if quiz_cache is not None:
+        scheduler.add_job(
+            quiz_cache.warm,
+            trigger=CronTrigger(hour=0, minute=0, second=2, timezone="UTC"),
+            id="warm_quiz_cache",
+            replace_existing=True,
+            coalesce=True,
+            misfire_grace_time=300,
+        )
+
+    # ✅ UTC midnight: recount yesterday's quiz answers (+ optional reveal post)
     scheduler.add_job(
-        expire_screenshot_assignments,
-        trigger=CronTrigger(minute="*/1", timezone="UTC"),
-        kwargs={"db": db},
-        id="expire_screenshot_assignments",
+        quiz_rollover,
+        trigger=CronTrigger(hour=0, minute=0, second=30, timezone="UTC"),
+        kwargs={"bot": bot, "db": db, "settings": settings},
+        id="quiz_rollover",
         replace_existing=True,
         coalesce=True,
-        misfire_grace_time=60,
+        max_instances=1,
+        misfire_grace_time=3600,
     )
 
-    return scheduler
-
+    # ✅ Hourly: trim the on-disk card cache (keys change daily, files would pile up)
+    if card_cache is not None:
+        scheduler.add_job(
+            card_cache.evict,
+            trigger=CronTrigger(minute=17, timezone="UTC"),
+            id="evict_card_cache",
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=3600,
+        )
 
-# -------------------------------------------------
-# Screenshot expiry
-# -------------------------------------------------
+    # ✅ Daily 03:20 UTC: recount screenshot statuses, fix counter drift
+    scheduler.add_job(
+        reconcile_screenshot_counters,
+        trigger=CronTrigger(hour=3, minute=20, timezone="UTC"),
+        kwargs={"db": db},
+        id="reconcile_screenshot_counters",
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=3600,
+    )
 
-async def expire_screenshot_assignments(db) -> None:
-    async def _run(session: AsyncSession):
-        n = await expire_assignments(session)
-        if n:
-            await session.commit()
+    # ✅ Opt-in: private recap for every active user of the finished week
+    if settings.weekly_recap_enabled:
+        scheduler.add_job(
+            run_weekly_recap,
+            trigger=CronTrigger(day_of_week="sun", hour=0, minute=30, timezone="UTC"),
+            kwargs={"bot": bot, "db": db, "settings": settings, "media": media},
+            id="weekly_recap",
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1,
+            misfire_grace_time=3600,
+        )
 
-    if callable(getattr(db, "session", None)):
-        async with db.session() as session:
-            await _run(session)
-    else:
-        sessionmaker = getattr(db, "sessionmaker", None) or getattr(db, "async_sessionmaker", None)
-        if sessionmaker is None:
-            raise RuntimeError("Database object has no session() or sessionmaker/async_sessionmaker")
-        async with sessionmaker() as session:
-            await _run(session)
+    return scheduler
@@ -0,0 +1,88 @@
+# bot/scripts/bench_cards.py
+"""
+Card render timings (cold = first call in the process, warm = cached fonts + base image),
+plus event-loop blocking while rendering inline vs through CardRenderService.
+Run:  python -m bot.scripts.bench_cards
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from datetime import date
+
+from bot.utils.cards.render_service import CardRenderService
+from bot.utils.cards.weekly_winners_card import CardWinner, render_weekly_winners_card
+from bot.utils.loop_monitor import LoopLagMonitor
+
+N = 30
+
+WINNERS = [
+    CardWinner(rank=1, name="@alice", points=120),
+    CardWinner(rank=2, name="Bob Smith", points=95),
+    CardWinner(rank=3, name="@carol", points=64),
+]
+
+
+def _render() -> bytes:
+    return render_weekly_winners_card(
+        week_start=date(2026, 1, 4),
+        week_end=date(2026, 1, 10),
+        winners=WINNERS,
+    )
+
+
+async def _loop_blocking(name: str, renderer: CardRenderService | None) -> None:
+    monitor = LoopLagMonitor(interval=0.01, warn_ms=10_000)
+    monitor.start()
+    await asyncio.sleep(0.05)
+    monitor.reset()
+
+    kwargs = dict(week_start=date(2026, 1, 4), week_end=date(2026, 1, 10), winners=WINNERS)
+    t0 = time.perf_counter()
+    if renderer is None:
+        for _ in range(N):
+            render_weekly_winners_card(**kwargs)
+            await asyncio.sleep(0)
+    else:
+        await asyncio.gather(*(renderer.render(render_weekly_winners_card, **kwargs) for _ in range(N)))
+    wall_ms = (time.perf_counter() - t0) * 1000
+
+    await asyncio.sleep(0.05)
+    await monitor.close()
+    m = monitor.stats()
+    line = f"{name:8s} {N} cards wall={wall_ms:7.1f}ms  loop blocked={m.blocked_ms_total:7.1f}ms max={m.max_lag_ms:6.1f}ms"
+    if renderer is not None:
+        r = renderer.stats()
+        line += f"  render avg={r.avg_ms}ms max={r.max_ms}ms"
+    print(line)
+
+
+async def _bench_pools() -> None:
+    await _loop_blocking("inline", None)
+    for mode in ("thread", "process"):
+        renderer = CardRenderService(mode=mode, workers=2, max_queue=N)
+        # spin up workers outside the measurement (render stats include these warm-ups)
+        await asyncio.gather(*(renderer.render(_render) for _ in range(renderer.workers)))
+        await _loop_blocking(mode, renderer)
+        renderer.close()
+
+
+def main() -> None:
+    t0 = time.perf_counter()
+    png = _render()
+    cold_ms = (time.perf_counter() - t0) * 1000
+
+    warm: list[float] = []
+    for _ in range(N):
+        t0 = time.perf_counter()
+        _render()
+        warm.append((time.perf_counter() - t0) * 1000)
+
+    print(f"weekly_winners_card: size={len(png)}B cold={cold_ms:.1f}ms warm median={statistics.median(warm):.1f}ms")
+
+    asyncio.run(_bench_pools())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# bot/scripts/bench_dedup.py
+"""
+Screenshot duplicate lookup at scale: HammingIndex vs a linear scan,
+plus dHash cost and how it reacts to re-encoding / small edits.
+Run:  python -m bot.scripts.bench_dedup
+"""
+from __future__ import annotations
+
+import io
+import random
+import time
+
+from PIL import Image, ImageDraw
+
+from bot.utils.hamming_index import HammingIndex
+from bot.utils.image_hash import dhash, hamming
+
+N = 100_000
+QUERIES = 2_000
+RADIUS = 6
+
+
+def _screenshot(seed: int) -> Image.Image:
+    rnd = random.Random(seed)
+    im = Image.new("RGB", (1080, 2340), (rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)))
+    d = ImageDraw.Draw(im)
+    for _ in range(40):
+        x, y = rnd.randrange(1080), rnd.randrange(2340)
+        d.rectangle((x, y, x + rnd.randrange(50, 600), y + rnd.randrange(20, 300)), fill=tuple(rnd.randrange(256) for _ in range(3)))
+    return im
+
+
+def _jpeg(im: Image.Image, quality: int = 90) -> bytes:
+    bio = io.BytesIO()
+    im.save(bio, format="JPEG", quality=quality)
+    return bio.getvalue()
+
+
+def bench_hash() -> None:
+    original = _screenshot(1)
+    raw = _jpeg(original)
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        h = dhash(raw)
+    print(f"dhash: {(time.perf_counter() - t0) / 20 * 1000:.1f} ms per 1080x2340 JPEG")
+
+    edited = original.resize((720, 1560))
+    ImageDraw.Draw(edited).rectangle((0, 0, 720, 40), fill=(0, 0, 0))  # status bar changed
+    variants = {
+        "re-encoded q=60": _jpeg(original, 60),
+        "resized + status bar": _jpeg(edited, 75),
+        "different screenshot": _jpeg(_screenshot(2)),
+    }
+    for name, data in variants.items():
+        print(f"  {name:22s} distance={hamming(h, dhash(data))}")
+
+
+def bench_lookup() -> None:
+    rnd = random.Random(7)
+    hashes = [rnd.getrandbits(64) for _ in range(N)]
+
+    idx: HammingIndex[int] = HammingIndex(radius=RADIUS)
+    t0 = time.perf_counter()
+    for i, h in enumerate(hashes):
+        idx.add(h, i)
+    print(f"\nindex build: {N} hashes in {(time.perf_counter() - t0) * 1000:.0f} ms")
+
+    queries = []
+    for _ in range(QUERIES):
+        q = hashes[rnd.randrange(N)]
+        for b in rnd.sample(range(64), rnd.randrange(RADIUS + 1)):
+            q ^= 1 << b
+        queries.append(q)
+
+    t0 = time.perf_counter()
+    found = sum(1 for q in queries if idx.find(q))
+    t_idx = (time.perf_counter() - t0) / QUERIES * 1000
+    print(f"HammingIndex: {t_idx:.3f} ms/lookup ({found}/{QUERIES} found)")
+
+    t0 = time.perf_counter()
+    for q in queries[:50]:
+        [i for i, h in enumerate(hashes) if (h ^ q).bit_count() <= RADIUS]
+    t_scan = (time.perf_counter() - t0) / 50 * 1000
+    print(f"linear scan:  {t_scan:.3f} ms/lookup")
+
+
+if __name__ == "__main__":
+    bench_hash()
+    bench_lookup()
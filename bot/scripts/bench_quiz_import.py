@@ -0,0 +1,82 @@
+# bot/scripts/bench_quiz_import.py
+"""
+Quiz calendar import: a year of quizzes parsed (CSV + JSONL) and upserted
+set-wise into a throwaway SQLite DB, then re-imported over itself (replace path).
+Run:  python -m bot.scripts.bench_quiz_import
+"""
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+
+from bot.database.repo.quiz_repo import upsert_quizzes
+from bot.database.session import Database
+from bot.utils.quiz_parser import ImportedQuiz, iter_quiz_csv, iter_quiz_jsonl
+
+DAYS = 366
+OPTIONS = 4
+
+
+def _rows(start: date) -> list[dict]:
+    return [
+        {
+            "day": (start + timedelta(days=i)).isoformat(),
+            "question": f"Question number {i}: what does R:R mean?",
+            "options": [f"Answer {i}.{k}" for k in range(OPTIONS)],
+            "correct": i % OPTIONS + 1,
+            "points": 10,
+        }
+        for i in range(DAYS)
+    ]
+
+
+def _jsonl(rows: list[dict]) -> str:
+    return "\n".join(json.dumps(r) for r in rows)
+
+
+def _csv(rows: list[dict]) -> str:
+    out = io.StringIO()
+    w = csv.writer(out)
+    w.writerow(["day", "question", "correct", "points"] + [f"option{k + 1}" for k in range(OPTIONS)])
+    for r in rows:
+        w.writerow([r["day"], r["question"], r["correct"], r["points"], *r["options"]])
+    return out.getvalue()
+
+
+def _parse(fn, text: str) -> list:
+    items = list(fn(io.StringIO(text)))
+    assert all(isinstance(it, ImportedQuiz) for it in items), "bench data must be valid"
+    return [(it.day_utc, it.quiz) for it in items]
+
+
+async def main() -> None:
+    rows = _rows(date.today())
+    for name, fn, text in (("jsonl", iter_quiz_jsonl, _jsonl(rows)), ("csv", iter_quiz_csv, _csv(rows))):
+        t0 = time.perf_counter()
+        _parse(fn, text)
+        print(f"parse {name:5s}: {(time.perf_counter() - t0) * 1000:.1f} ms for {DAYS} quizzes ({len(text) // 1024} KiB)")
+
+    quizzes = _parse(iter_quiz_jsonl, _jsonl(rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await db.init_models()
+        for label in ("insert", "replace"):
+            t0 = time.perf_counter()
+            async with db.session() as session:
+                res = await upsert_quizzes(session, quizzes)
+                await session.commit()
+            print(
+                f"upsert {label:7s}: {(time.perf_counter() - t0) * 1000:.1f} ms "
+                f"({res.created} new, {res.replaced} replaced, {DAYS * OPTIONS} options)"
+            )
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
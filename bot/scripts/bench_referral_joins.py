@@ -0,0 +1,297 @@
+# bot/scripts/bench_referral_joins.py
+"""
+Replays a join storm against the referral award path, twice on copies of one throwaway
+SQLite DB: one transaction per chat_member update (no processor) vs ReferralJoinProcessor
+batches. Reports statements, commits, wall time, the latency of a /ref-style read running
+alongside, and checks the referral invariants after each run.
+
+The storm is a JSONL recording (one update per line: {"t": 12.5, "user": 1001, "old": "left",
+"new": "member"}, t in seconds) or, without --replay, a synthetic one: joins spread over
+--duration seconds, with flapping users (join/leave/join), re-sent updates, users unknown to
+the bot and one referrer far past the cap.
+
+Run:  python -m bot.scripts.bench_referral_joins [--replay storm.jsonl] [--save storm.jsonl] [--speed 30]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from bot.database.models import PointEvent, PointSource, ReferralStats, User, WeeklyUserStats
+from bot.database.repo.referral_repo import get_referral_counts, rebuild_referral_stats
+from bot.database.session import Database
+from bot.services.referral_joins import REFERRAL_CAP, ReferralJoinProcessor, process_referral_joins
+
+UNKNOWN_BASE = 9_000_000  # synthetic telegram ids >= this never pressed Start (no users row)
+REFERRER_BASE = 1
+USER_BASE = 1_000
+CONCURRENCY = 32  # UPDATE_CONCURRENCY default
+PROBE_EVERY = 0.01  # seconds between interactive reads
+
+
+@dataclass(frozen=True, slots=True)
+class Update:
+    t: float
+    user: int
+    old: str
+    new: str
+
+    @property
+    def joined(self) -> bool:
+        return self.old in ("left", "kicked") and self.new in ("member", "administrator", "creator")
+
+    @property
+    def left(self) -> bool:
+        return self.old in ("member", "restricted") and self.new in ("left", "kicked")
+
+
+def synth_storm(*, users: int, duration: float, flap: float, resend: float, unknown: float, seed: int) -> list[Update]:
+    rng = random.Random(seed)
+    out: list[Update] = []
+    for i in range(users):
+        tg = UNKNOWN_BASE + i if rng.random() < unknown else USER_BASE + i
+        t = rng.uniform(0, duration)
+        out.append(Update(t, tg, "left", "member"))
+        if rng.random() < resend:  # same update delivered twice
+            out.append(Update(t + rng.uniform(0, 0.05), tg, "left", "member"))
+        if rng.random() < flap:
+            for _ in range(rng.randint(1, 3)):
+                t += rng.uniform(0.2, 3.0)
+                out.append(Update(t, tg, "member", "left"))
+                t += rng.uniform(0.2, 3.0)
+                out.append(Update(t, tg, "left", "member"))
+    out.sort(key=lambda u: u.t)
+    return out
+
+
+def load_storm(path: str) -> list[Update]:
+    with open(path, encoding="utf-8") as f:
+        out = [Update(**json.loads(line)) for line in f if line.strip()]
+    out.sort(key=lambda u: u.t)
+    return out
+
+
+def save_storm(path: str, storm: list[Update]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for u in storm:
+            f.write(json.dumps(asdict(u)) + "\n")
+
+
+async def _setup(path: str, storm: list[Update], *, referrers: int, seed: int) -> None:
+    """users for everyone in the storm (except UNKNOWN_BASE ids); one referrer gets ~30%."""
+    rng = random.Random(seed)
+    db = Database(f"sqlite+aiosqlite:///{path}")
+    await db.init_models()
+    known = sorted({u.user for u in storm if u.user < UNKNOWN_BASE})
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": REFERRER_BASE + i} for i in range(referrers)])
+        await session.execute(insert(User), [{"telegram_id": tg} for tg in known])
+        ids = dict((await session.execute(select(User.telegram_id, User.id))).all())
+        rows = []
+        for tg in known:
+            r = rng.random()
+            if r < 0.05:
+                continue  # joined via plain invite link, no referrer
+            ref = 0 if r < 0.35 else rng.randrange(referrers)
+            rows.append({"id": ids[tg], "referred_by_user_id": ids[REFERRER_BASE + ref]})
+        await session.execute(update(User), rows)  # bulk UPDATE by primary key
+        await rebuild_referral_stats(session)  # pending per referrer, as /start would have left it
+        await session.commit()
+    await db.close()
+
+
+class Meter:
+    def __init__(self, db: Database) -> None:
+        self.statements = 0
+        self.commits = 0
+        event.listen(db.engine.sync_engine, "before_cursor_execute", self._on_execute)
+        event.listen(db.engine.sync_engine, "commit", self._on_commit)
+
+    def _on_execute(self, *_args) -> None:
+        self.statements += 1
+
+    def _on_commit(self, *_args) -> None:
+        self.commits += 1
+
+
+async def _probe(db: Database, stop: asyncio.Event, samples: list[float], referrer_ids: list[int]) -> None:
+    rng = random.Random(1)
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        async with db.session() as session:
+            await get_referral_counts(session, user_id=rng.choice(referrer_ids))
+        samples.append((time.perf_counter() - t0) * 1000)
+        await asyncio.sleep(PROBE_EVERY)
+
+
+async def _replay(storm: list[Update], speed: float, handle) -> None:
+    t0 = time.perf_counter()
+    for u in storm:
+        delay = u.t / speed - (time.perf_counter() - t0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        handle(u)
+
+
+async def _run_mode(path: str, storm: list[Update], *, batched: bool, speed: float, window: float) -> dict:
+    db = Database(f"sqlite+aiosqlite:///{path}")
+    reader = Database(f"sqlite+aiosqlite:///{path}")  # own engine: the meter counts the award path only
+    meter = Meter(db)
+    async with reader.session() as session:
+        referrer_ids = list((await session.execute(select(ReferralStats.referrer_user_id))).scalars().all())
+
+    stop = asyncio.Event()
+    samples: list[float] = []
+    probe = asyncio.create_task(_probe(reader, stop, samples, referrer_ids or [1]))
+    t0 = time.perf_counter()
+
+    if batched:
+        proc = ReferralJoinProcessor(db, None, window_seconds=window / speed)
+        proc.start()
+        await _replay(storm, speed, lambda u: (u.joined or u.left) and proc.note(u.user, joined=u.joined))
+        await proc.close()
+        st = proc.stats()
+        extra = f"{st.batches} batches, {st.coalesced} updates coalesced"
+    else:
+        gate = asyncio.Semaphore(CONCURRENCY)
+        tasks: list[asyncio.Task] = []
+
+        async def one(tg: int) -> None:
+            async with gate:
+                async with db.session() as session:
+                    await process_referral_joins(session, [tg])
+                    await session.commit()
+
+        await _replay(storm, speed, lambda u: u.joined and tasks.append(asyncio.create_task(one(u.user))))
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        assert all(isinstance(e, OperationalError) and "locked" in str(e) for e in errors), errors[:1]
+        extra = f"{len(tasks)} transactions, lock timeouts: {len(errors)}"
+
+    dt = time.perf_counter() - t0
+    stop.set()
+    await probe
+    n_statements, n_commits = meter.statements, meter.commits
+    awarded = await _check(db)
+    await reader.close()
+    await db.close()
+
+    samples.sort()
+    return {
+        "mode": "batched" if batched else "per update",
+        "seconds": dt,
+        "statements": n_statements,
+        "commits": n_commits,
+        "awarded": awarded,
+        "extra": extra,
+        "probe_p50": statistics.median(samples) if samples else 0.0,
+        "probe_p99": samples[int(len(samples) * 0.99) - 1] if samples else 0.0,
+        "probe_max": samples[-1] if samples else 0.0,
+    }
+
+
+async def _check(db: Database) -> int:
+    """referral_stats vs users + ledger; cap; one award per referred user; weekly totals."""
+    async with db.session() as session:
+        ledger = dict(
+            (
+                await session.execute(
+                    select(PointEvent.user_id, func.count())
+                    .where(PointEvent.source == PointSource.REFERRAL)
+                    .group_by(PointEvent.user_id)
+                )
+            ).all()
+        )
+        rows, distinct_refs, ledger_points = (
+            await session.execute(
+                select(func.count(), func.count(func.distinct(PointEvent.ref_id)), func.coalesce(func.sum(PointEvent.points), 0))
+                .where(PointEvent.source == PointSource.REFERRAL)
+            )
+        ).one()
+        weekly = await session.scalar(select(func.coalesce(func.sum(WeeklyUserStats.points), 0)))
+        stats = (await session.execute(select(ReferralStats))).scalars().all()
+        processed = dict(
+            (
+                await session.execute(
+                    select(User.referred_by_user_id, func.count())
+                    .where(User.referred_by_user_id.is_not(None), User.referral_processed.is_(True))
+                    .group_by(User.referred_by_user_id)
+                )
+            ).all()
+        )
+
+    assert rows == distinct_refs, "a referred user was awarded twice"
+    assert ledger_points == weekly, (ledger_points, weekly)
+    for s in stats:
+        uid = s.referrer_user_id
+        assert s.successful == ledger.get(uid, 0) <= REFERRAL_CAP, (uid, s.successful, ledger.get(uid))
+        assert s.successful + s.capped == processed.get(uid, 0), (uid, s.successful, s.capped, processed.get(uid))
+    return int(rows)
+
+
+def _print(r: dict) -> None:
+    print(
+        f"{r['mode']:>10s}: {r['seconds']:6.2f} s, {r['statements']:6d} statements, {r['commits']:5d} commits, "
+        f"{r['awarded']} awarded ({r['extra']})"
+    )
+    print(
+        f"{'':>10s}  /ref read alongside: p50 {r['probe_p50']:.2f} ms, p99 {r['probe_p99']:.2f} ms, "
+        f"max {r['probe_max']:.2f} ms"
+    )
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--replay", help="recorded storm (JSONL) instead of a synthetic one")
+    ap.add_argument("--save", help="write the storm that was used to this JSONL file")
+    ap.add_argument("--users", type=int, default=3000, help="synthetic: users joining")
+    ap.add_argument("--referrers", type=int, default=40)
+    ap.add_argument("--duration", type=float, default=300.0, help="synthetic: storm length in seconds")
+    ap.add_argument("--flap", type=float, default=0.15, help="synthetic: share of users leaving and rejoining")
+    ap.add_argument("--resend", type=float, default=0.05, help="synthetic: share of duplicated join updates")
+    ap.add_argument("--unknown", type=float, default=0.03, help="synthetic: share of users without /start")
+    ap.add_argument("--speed", type=float, default=30.0, help="replay speed-up over the recorded timeline")
+    ap.add_argument("--window", type=float, default=2.0, help="processor window, in storm seconds")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    if args.replay:
+        storm = load_storm(args.replay)
+    else:
+        storm = synth_storm(
+            users=args.users, duration=args.duration, flap=args.flap,
+            resend=args.resend, unknown=args.unknown, seed=args.seed,
+        )
+    if args.save:
+        save_storm(args.save, storm)
+
+    joins = sum(1 for u in storm if u.joined)
+    span = storm[-1].t - storm[0].t if storm else 0.0
+    print(
+        f"storm: {len(storm)} updates ({joins} joins, {len({u.user for u in storm})} users) over {span:.0f} s, "
+        f"replayed at {args.speed:g}x (~{joins / max(span, 1) * 60:.0f} joins/min)"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, "template.db")
+        await _setup(template, storm, referrers=args.referrers, seed=args.seed)
+        for batched in (False, True):
+            path = os.path.join(tmp, f"run_{int(batched)}.db")
+            shutil.copy(template, path)
+            _print(await _run_mode(path, storm, batched=batched, speed=args.speed, window=args.window))
+    print("invariants ✔ (stats = ledger, cap, one award per user, weekly totals)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
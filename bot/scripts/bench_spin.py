@@ -0,0 +1,207 @@
+# bot/scripts/bench_spin.py
+"""
+/spin path: statements per outcome, sequential throughput, and concurrency checks
+(many simultaneous spins per user must still record exactly one spin per day, with
+the points ledger and weekly totals matching spin_history), on a throwaway SQLite DB.
+Run:  python -m bot.scripts.bench_spin
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import timedelta
+
+from sqlalchemy import event, func, insert, select
+
+from bot.database.models import (
+    DAILY_ACTION_BITS,
+    DailyProgress,
+    PointEvent,
+    PointSource,
+    SpinCashLedger,
+    SpinHistory,
+    SpinRewardType,
+    User,
+    WeeklyUserStats,
+)
+from bot.database.session import Database, run_retrying_busy
+from bot.services.cash_budget import CashBudget
+from bot.services.spin import SpinService
+from bot.utils.dates import utc_today, week_start_monday
+
+USERS = 1_000
+RACE_USERS = 200
+RACE_ATTEMPTS = 5  # concurrent /spin per user
+RACE_CONCURRENCY = 32  # UPDATE_CONCURRENCY default
+ALL_TASKS = sum(DAILY_ACTION_BITS[t] for t in ("checkin", "quiz", "screenshot"))
+
+
+class StatementCounter:
+    def __init__(self, db: Database) -> None:
+        self.n = 0
+        event.listen(db.engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *_args) -> None:
+        self.n += 1
+
+
+async def _setup(db: Database, days, users: int) -> None:
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 10_000 + i} for i in range(users)])
+        await session.execute(
+            insert(DailyProgress),
+            [{"user_id": uid, "day_utc": d, "mask": ALL_TASKS} for d in days for uid in range(1, users + 1)],
+        )
+        await session.commit()
+
+
+async def _spin(db: Database, user_id: int, day, budget: CashBudget | None = None):
+    async with db.session() as session:
+        res = await run_retrying_busy(
+            session,
+            lambda: SpinService.spin(session, user_id=user_id, day_utc=day, require_poll=False, cash_budget=budget),
+        )
+    if budget is not None and res.budget_note is not None:
+        res.budget_note.apply(budget)
+    return res
+
+
+async def _statements(db: Database, counter: StatementCounter, day) -> None:
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 1}, {"telegram_id": 2}])
+        await session.commit()
+
+    seen: dict[str, int] = {}
+    for uid in range(1, USERS + 1):
+        kind = SpinService.draw(user_id=uid, day_utc=day).reward_type.value
+        if kind in seen:
+            continue
+        counter.n = 0
+        await _spin(db, uid, day)
+        seen[kind] = counter.n
+        counter.n = 0
+        await _spin(db, uid, day)
+        seen.setdefault("already", counter.n)
+        if {"points", "none", "cash"} <= seen.keys():
+            break
+
+    async with db.session() as session:
+        uid = await session.scalar(select(User.id).where(User.telegram_id == 1))
+    counter.n = 0
+    await _spin(db, uid, day)
+    seen["locked"] = counter.n
+
+    print("statements per /spin (excluding BEGIN/COMMIT):")
+    for kind in ("points", "none", "cash", "already", "locked"):
+        if kind in seen:
+            print(f"  {kind:8s}: {seen[kind]}")
+
+
+async def _throughput(db: Database, day) -> None:
+    t0 = time.perf_counter()
+    for uid in range(1, USERS + 1):
+        await _spin(db, uid, day)
+    dt = time.perf_counter() - t0
+    print(f"sequential: {USERS} spins in {dt:.2f} s ({USERS / dt:,.0f}/s, {dt / USERS * 1000:.2f} ms each)")
+
+
+async def _weekly_points(db: Database, week) -> int:
+    async with db.session() as session:
+        return int(
+            await session.scalar(
+                select(func.coalesce(func.sum(WeeklyUserStats.points), 0)).where(WeeklyUserStats.week_start == week)
+            )
+        )
+
+
+async def _race(db: Database, day) -> None:
+    """
+    Same-user attempts run in parallel here (the bot's per-user mailbox would queue them),
+    with the bot's default handler cap. A write-lock timeout is retried (run_retrying_busy,
+    like the /spin handler): no attempt may fail, none may leave a partial spin.
+    """
+    budget = CashBudget(daily_limit_cents=SpinService.CASH_CENTS * 2)
+    gate = asyncio.Semaphore(RACE_CONCURRENCY)
+    week = week_start_monday(day)
+    weekly_before = await _weekly_points(db, week)
+
+    async def attempt(uid: int):
+        async with gate:
+            return await _spin(db, uid, day, budget)
+
+    tasks = [attempt(uid) for _ in range(RACE_ATTEMPTS) for uid in range(1, RACE_USERS + 1)]
+    t0 = time.perf_counter()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    dt = time.perf_counter() - t0
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    ok = [r for r in results if not isinstance(r, BaseException)]
+    outcomes = Counter("already" if r.already else r.reward_type.value for r in ok)
+    print(
+        f"concurrent: {len(tasks)} spins ({RACE_ATTEMPTS} per user, {RACE_CONCURRENCY} at once) in {dt:.2f} s "
+        f"-> {dict(outcomes)}, failed: {len(errors)}"
+    )
+    assert not errors, errors[:1]
+
+    weekly_points = await _weekly_points(db, week) - weekly_before
+    async with db.session() as session:
+        per_user = (
+            await session.execute(
+                select(SpinHistory.user_id, func.count())
+                .where(SpinHistory.day_utc == day)
+                .group_by(SpinHistory.user_id)
+            )
+        ).all()
+        spin_points = await session.scalar(
+            select(func.coalesce(func.sum(SpinHistory.reward_value), 0)).where(
+                SpinHistory.day_utc == day, SpinHistory.reward_type == SpinRewardType.POINTS
+            )
+        )
+        ledger_points, ledger_rows = (
+            await session.execute(
+                select(func.coalesce(func.sum(PointEvent.points), 0), func.count()).where(
+                    PointEvent.day_utc == day, PointEvent.source == PointSource.SPIN
+                )
+            )
+        ).one()
+        cash_rows = await session.scalar(
+            select(func.count()).where(SpinHistory.day_utc == day, SpinHistory.reward_type == SpinRewardType.CASH)
+        )
+        reserved = await session.scalar(
+            select(func.coalesce(func.sum(SpinCashLedger.reserved_cents), 0)).where(SpinCashLedger.day_utc == day)
+        )
+
+    assert len(per_user) == RACE_USERS and all(n == 1 for _, n in per_user), "more than one spin per user/day"
+    assert sum(1 for r in ok if not r.already) == RACE_USERS, "winners != users"
+    assert spin_points == ledger_points == weekly_points, (spin_points, ledger_points, weekly_points)
+    assert ledger_rows == outcomes.get("points", 0)
+    assert reserved == cash_rows * SpinService.CASH_CENTS <= budget.daily_limit_cents
+    print(f"  one spin per user/day ✔  points: history {spin_points} = ledger {ledger_points} = weekly {weekly_points} ✔")
+    print(f"  cash: {cash_rows} win(s), {reserved} cents reserved (limit {budget.daily_limit_cents}) ✔")
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        await db.init_models()
+        counter = StatementCounter(db)
+        day = utc_today()
+        prev_day, race_day = day - timedelta(days=1), day + timedelta(days=1)
+
+        await _setup(db, (prev_day, day, race_day), USERS)
+        SpinService.CASH_CHANCE = 0.05  # so the statement count sees a cash roll quickly
+        await _statements(db, counter, prev_day)
+        SpinService.CASH_CHANCE = 0.01
+        await _throughput(db, day)
+
+        # a fresh day with a high cash chance so the budget is contended too
+        SpinService.CASH_CHANCE = 0.2
+        await _race(db, race_day)
+        await db.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+# bot/scripts/bench_webhook.py
+"""
+Local latency check: webhook (reply in HTTP response) vs polling-style processing.
+
+No Telegram traffic: Bot API calls go to a fake session that sleeps API_RTT seconds.
+Run:  python -m bot.scripts.bench_webhook
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import time
+from datetime import datetime, timezone
+from typing import Any
+
+from aiogram import Dispatcher, F
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendMessage, TelegramMethod
+from aiogram.types import Chat, Message, Update
+from aiohttp import ClientSession, web
+
+from bot.config.settings import Settings
+from bot.utils.autodelete_bot import AutoDeleteBot
+from bot.utils.reply import answer_fast
+from bot.utils.webhook import build_webhook_app
+
+API_RTT = 0.05  # simulated Bot API round-trip (s)
+N = 50
+SECRET = "bench-secret"
+HOST, PORT = "127.0.0.1", 8089
+
+
+class FakeSession(BaseSession):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    async def close(self) -> None:
+        pass
+
+    async def make_request(self, bot, method: TelegramMethod[Any], timeout: int | None = None) -> Any:
+        self.calls += 1
+        await asyncio.sleep(API_RTT)
+        if isinstance(method, SendMessage):
+            return Message(
+                message_id=self.calls,
+                date=datetime.now(tz=timezone.utc),
+                chat=Chat(id=int(method.chat_id), type="private"),
+                text=method.text,
+            )
+        return True
+
+    async def stream_content(self, *args: Any, **kwargs: Any):  # pragma: no cover
+        yield b""
+
+
+def _update(i: int) -> dict:
+    return {
+        "update_id": i,
+        "message": {
+            "message_id": i,
+            "date": int(time.time()),
+            "chat": {"id": 1000 + i, "type": "private"},
+            "from": {"id": 1000 + i, "is_bot": False, "first_name": "Bench"},
+            "text": "/ping",
+        },
+    }
+
+
+def _build() -> tuple[Dispatcher, AutoDeleteBot, FakeSession]:
+    session = FakeSession()
+    settings = Settings(bot_token="123456:BENCH", bot_username="bench", webhook_secret=SECRET)
+    bot = AutoDeleteBot(token=settings.bot_token, settings=settings, session=session)
+    dp = Dispatcher()
+
+    @dp.message(F.text == "/ping")
+    async def ping(message: Message):
+        return await answer_fast(message, "pong", reply_markup=None)
+
+    return dp, bot, session
+
+
+async def bench_polling() -> list[float]:
+    dp, bot, session = _build()
+    out = []
+    for i in range(N):
+        t0 = time.perf_counter()
+        # what start_polling does per update (returned methods are executed via the API)
+        await dp._process_update(bot=bot, update=Update.model_validate(_update(i)), call_answer=True)
+        out.append(time.perf_counter() - t0)
+    print(f"polling: api_calls={session.calls}")
+    await bot.outbound.close()
+    return out
+
+
+async def bench_webhook() -> list[float]:
+    dp, bot, session = _build()
+    settings = Settings(bot_token="123456:BENCH", bot_username="bench", webhook_secret=SECRET)
+    runner = web.AppRunner(build_webhook_app(dp, bot, settings))
+    await runner.setup()
+    await web.TCPSite(runner, HOST, PORT).start()
+
+    url = f"http://{HOST}:{PORT}{settings.webhook_path}"
+    out = []
+    async with ClientSession() as http:
+        async with http.post(url, json=_update(0)) as r:
+            assert r.status == 401, "unsigned request must be rejected"
+
+        for i in range(N):
+            t0 = time.perf_counter()
+            async with http.post(url, json=_update(i), headers={"X-Telegram-Bot-Api-Secret-Token": SECRET}) as r:
+                body = await r.text()  # multipart/form-data carrying method=sendMessage
+            out.append(time.perf_counter() - t0)
+            assert "sendMessage" in body, body
+
+    print(f"webhook: api_calls={session.calls}")
+    await runner.cleanup()
+    await bot.outbound.close()
+    return out
+
+
+def _report(name: str, xs: list[float]) -> None:
+    xs_ms = sorted(x * 1000 for x in xs)
+    p95 = xs_ms[int(len(xs_ms) * 0.95) - 1]
+    print(f"{name:8s} median={statistics.median(xs_ms):7.2f}ms  p95={p95:7.2f}ms")
+
+
+async def main() -> None:
+    _report("polling", await bench_polling())
+    _report("webhook", await bench_webhook())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,4 +1,12 @@
 # bot/scripts/seed_today_quiz.py
+"""
+Seeds (or replaces) today's quiz directly in the DB, from a separate process.
+
+A running bot never hears about this write (its QuizCache listener lives in the bot
+process): a new quiz shows up within QuizCache.no_quiz_ttl (60 s), but REPLACING a quiz
+the bot already served keeps the old one cached — restart the bot, or use
+/quiz_set (in-process, invalidates the cache) instead.
+"""
 from __future__ import annotations
 
 import asyncio
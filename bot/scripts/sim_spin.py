@@ -0,0 +1,106 @@
+# bot/scripts/sim_spin.py
+"""
+Spin economy simulator: current SpinService settings vs proposed ones, replayed
+over the real spin_history seeds and forecast for one week.
+Run:  python -m bot.scripts.sim_spin --cash 0.02 --cap 2 --max 8
+      python -m bot.scripts.sim_spin --synthetic 100000   # no DB, 28 days × N users
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from datetime import timedelta
+
+import numpy as np
+
+from bot.config import settings
+from bot.database.session import Database
+from bot.services.spin_sim import (
+    EPOCH_ORDINAL,
+    SimInputs,
+    SpinDraws,
+    SpinParams,
+    evaluate,
+    load_sim_inputs,
+    replay_draws,
+    simulate_report,
+)
+from bot.utils.dates import utc_today
+
+
+def _params(args: argparse.Namespace) -> SpinParams:
+    cur = SpinParams.current()
+    return SpinParams(
+        cash_chance=cur.cash_chance if args.cash is None else args.cash,
+        none_chance=cur.none_chance if args.none is None else args.none,
+        points_min=cur.points_min if args.min is None else args.min,
+        points_max=cur.points_max if args.max is None else args.max,
+        cash_cents=cur.cash_cents if args.cents is None else args.cents,
+        cash_max_per_user_per_week=cur.cash_max_per_user_per_week if args.cap is None else args.cap,
+    )
+
+
+def _synthetic(users: int, days: int, seed: int) -> tuple[SimInputs, SpinDraws]:
+    """Users with a spread of participation rates; recorded rewards come from the current settings."""
+    rng = np.random.default_rng(seed)
+    today = utc_today()
+    first = today.toordinal() - days - EPOCH_ORDINAL
+    rates = rng.beta(2, 3, size=users)
+    spun = rng.random((users, days)) < rates[:, None]
+    u, d = np.nonzero(spun)
+
+    t0 = time.perf_counter()
+    draws = replay_draws(u + 1, d + first, workers=os.cpu_count() or 1)
+    out = evaluate(draws, SpinParams.current())
+    print(f"replayed {len(draws):,} user-days in {time.perf_counter() - t0:.1f} s")
+
+    return SimInputs(
+        since=today - timedelta(days=days),
+        days=days,
+        spin_user_id=draws.user_id,
+        spin_day=draws.day,
+        spin_reward=out.reward,
+        spin_value=out.value,
+        user_ids=np.arange(1, users + 1, dtype=np.int64),
+        rates=spun.sum(axis=1) / days,
+        active_days=np.full(users, days, dtype=np.float64),
+        base_points=rng.gamma(2.0, 40.0, size=users),
+    ), draws
+
+
+async def _from_db(days: int) -> SimInputs:
+    db = Database(settings.database_url)
+    try:
+        async with db.session() as session:
+            return await load_sim_inputs(session, days=days)
+    finally:
+        await db.close()
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    p.add_argument("--cash", type=float, help="cash chance (0..1)")
+    p.add_argument("--none", type=float, help="no-reward chance (0..1)")
+    p.add_argument("--min", type=int, help="points min")
+    p.add_argument("--max", type=int, help="points max")
+    p.add_argument("--cents", type=int, help="cash prize in cents")
+    p.add_argument("--cap", type=int, help="cash wins per user per week (0 = no cap)")
+    p.add_argument("--days", type=int, default=28, help="history window (default 28)")
+    p.add_argument("--trials", type=int, default=500, help="forecast trials (default 500)")
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--synthetic", type=int, metavar="USERS", help="skip the DB, simulate USERS users")
+    args = p.parse_args()
+
+    proposed = _params(args)
+    draws = None
+    if args.synthetic:
+        inputs, draws = _synthetic(args.synthetic, args.days, args.seed or 0)
+    else:
+        inputs = asyncio.run(_from_db(args.days))
+    print(simulate_report(inputs, proposed, trials=args.trials, seed=args.seed, draws=draws))
+
+
+if __name__ == "__main__":
+    main()
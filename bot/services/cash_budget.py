@@ -0,0 +1,104 @@
+# bot/services/cash_budget.py
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from bot.database.repo.cash_budget_repo import BudgetUsage, CashReservation, get_budget_usage
+from bot.utils.dates import utc_today, week_start_monday
+
+
+@dataclass(frozen=True, slots=True)
+class CashBudgetStats:
+    daily_limit_cents: int
+    weekly_limit_cents: int
+    day_cents: int | None  # None until known (first reservation or refresh)
+    week_cents: int | None
+    reserved: int
+    refused: int
+    skipped: int  # cash rolls downgraded from memory, without a DB attempt
+
+
+class CashBudget:
+    """
+    Global spin cash budget (per UTC day and per Monday week, 0 = no limit).
+
+    The spin_cash_ledger upsert (reserve_cash) is the authority; this keeps the latest
+    known totals in memory so a spent budget is detected without touching the DB.
+    Totals only grow within a period, so a cached "spent" is always right; a stale
+    cached value just costs one refused reservation.
+    """
+
+    def __init__(self, *, daily_limit_cents: int = 0, weekly_limit_cents: int = 0) -> None:
+        self.daily_limit_cents = max(0, int(daily_limit_cents))
+        self.weekly_limit_cents = max(0, int(weekly_limit_cents))
+
+        self._day: date | None = None
+        self._day_cents: int | None = None
+        self._week: date | None = None
+        self._week_cents: int | None = None
+
+        self.reserved = 0
+        self.refused = 0
+        self.skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.daily_limit_cents > 0 or self.weekly_limit_cents > 0
+
+    # ---------- cache ----------
+    def _known(self, day_utc: date, week_start: date) -> tuple[int | None, int | None]:
+        day_cents = self._day_cents if self._day == day_utc else None
+        week_cents = self._week_cents if self._week == week_start else None
+        return day_cents, week_cents
+
+    def can_cover(self, *, day_utc: date, week_start: date, cents: int) -> bool:
+        """False only when the cached totals already rule the win out."""
+        day_cents, week_cents = self._known(day_utc, week_start)
+        if self.daily_limit_cents and day_cents is not None and day_cents + cents > self.daily_limit_cents:
+            return False
+        if self.weekly_limit_cents and week_cents is not None and week_cents + cents > self.weekly_limit_cents:
+            return False
+        return True
+
+    def note_skip(self) -> None:
+        self.skipped += 1
+
+    def note_reserved(self, *, day_utc: date, week_start: date, res: CashReservation) -> None:
+        self.reserved += 1
+        self._set(day_utc, week_start, res.day_cents, res.week_cents)
+
+    def note_usage(self, usage: BudgetUsage, *, refused: bool = False) -> None:
+        if refused:
+            self.refused += 1
+        self._set(usage.day_utc, usage.week_start, usage.day_cents, usage.week_cents)
+
+    def _set(self, day_utc: date, week_start: date, day_cents: int, week_cents: int) -> None:
+        # never move backwards: an older transaction may report after a newer one
+        if self._day == day_utc and self._day_cents is not None:
+            day_cents = max(day_cents, self._day_cents)
+        if self._week == week_start and self._week_cents is not None:
+            week_cents = max(week_cents, self._week_cents)
+        self._day, self._day_cents = day_utc, day_cents
+        self._week, self._week_cents = week_start, week_cents
+
+    async def refresh(self, db) -> BudgetUsage:
+        day_utc = utc_today()
+        async with db.session() as session:
+            usage = await get_budget_usage(session, day_utc=day_utc, week_start=week_start_monday(day_utc))
+        self._day = self._week = None  # reload wins over whatever was cached
+        self.note_usage(usage)
+        return usage
+
+    def stats(self) -> CashBudgetStats:
+        day_utc = utc_today()
+        day_cents, week_cents = self._known(day_utc, week_start_monday(day_utc))
+        return CashBudgetStats(
+            daily_limit_cents=self.daily_limit_cents,
+            weekly_limit_cents=self.weekly_limit_cents,
+            day_cents=day_cents,
+            week_cents=week_cents,
+            reserved=self.reserved,
+            refused=self.refused,
+            skipped=self.skipped,
+        )
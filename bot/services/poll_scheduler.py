@@ -10,11 +10,15 @@ from aiogram import Bot
 
 from bot.database import Database
 from bot.services.polls import PollService
+from bot.utils.outbound import SendPriority, set_task_priority
 
 log = logging.getLogger("bot.poll_scheduler")
 
 
 async def poll_scheduler_loop(bot: Bot, db: Database, *, interval_seconds: int = 15) -> None:
+    # runs in its own task: everything posted from here is scheduler traffic
+    set_task_priority(SendPriority.NORMAL)
+
     while True:
         now = datetime.utcnow()
 
@@ -0,0 +1,146 @@
+# bot/services/quiz_cache.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.database.models import Quiz
+from bot.database.repo.quiz_repo import (
+    add_quiz_change_listener,
+    get_quiz_for_day,
+    remove_quiz_change_listener,
+)
+
+log = logging.getLogger("bot.quiz_cache")
+
+NO_QUIZ_TTL_SECONDS = 60.0  # "no quiz set" is re-read after this (quiz seeded by another process)
+
+
+def _utc_today() -> date:
+    return datetime.now(tz=ZoneInfo("UTC")).date()
+
+
+def quiz_keyboard(quiz_id: int, options: list[str] | tuple[str, ...]) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [InlineKeyboardButton(text=text, callback_data=f"quiz:{quiz_id}:{idx}")]
+            for idx, text in enumerate(options)
+        ]
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class CachedQuiz:
+    quiz_id: int
+    day_utc: date
+    question: str
+    options: tuple[str, ...]
+    correct_index: int  # 0-based
+    points_correct: int
+    points_wrong: int
+    keyboard: InlineKeyboardMarkup
+
+    @classmethod
+    def from_model(cls, quiz: Quiz) -> "CachedQuiz":
+        options = tuple(o.text for o in (quiz.options or []))
+        return cls(
+            quiz_id=quiz.id,
+            day_utc=quiz.day_utc,
+            question=quiz.question,
+            options=options,
+            correct_index=int(quiz.correct_option_index),
+            points_correct=int(quiz.points_correct or 0),
+            points_wrong=int(quiz.points_wrong or 0),
+            keyboard=quiz_keyboard(quiz.id, options),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class QuizCacheStats:
+    days: int
+    hits: int
+    misses: int
+
+
+class QuizCache:
+    """
+    The day's quiz (question, options, answer, ready-made keyboard) kept in memory.
+
+    - get(day): one DB read per day; "no quiz set" is only kept for `no_quiz_ttl`
+      seconds, so a quiz written by another process (seed_today_quiz) shows up
+    - invalidate(day): on replace/delete (repo listener + explicit call after commit);
+      another process replacing a quiz that is already cached needs a bot restart
+    - warm(): loads today at UTC midnight and drops older days
+    A per-day generation counter stops a load that raced an invalidation from
+    storing the old quiz.
+    """
+
+    def __init__(self, db, *, no_quiz_ttl: float = NO_QUIZ_TTL_SECONDS) -> None:
+        self._db = db
+        self.no_quiz_ttl = float(no_quiz_ttl)
+        self._entries: dict[date, CachedQuiz | None] = {}
+        self._no_quiz_until: dict[date, float] = {}  # monotonic expiry of cached None entries
+        self._gen: dict[date, int] = {}
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def start(self) -> None:
+        add_quiz_change_listener(self.invalidate)
+
+    def close(self) -> None:
+        remove_quiz_change_listener(self.invalidate)
+
+    def invalidate(self, day_utc: date) -> None:
+        self._entries.pop(day_utc, None)
+        self._no_quiz_until.pop(day_utc, None)
+        self._gen[day_utc] = self._gen.get(day_utc, 0) + 1
+
+    def _fresh(self, day_utc: date) -> bool:
+        if day_utc not in self._entries:
+            return False
+        if self._entries[day_utc] is None:
+            return time.monotonic() < self._no_quiz_until.get(day_utc, 0.0)
+        return True
+
+    async def get(self, day_utc: date) -> CachedQuiz | None:
+        if self._fresh(day_utc):
+            self.hits += 1
+            return self._entries[day_utc]
+
+        async with self._lock:  # single flight: concurrent misses share one read
+            if self._fresh(day_utc):
+                self.hits += 1
+                return self._entries[day_utc]
+
+            self.misses += 1
+            gen = self._gen.get(day_utc, 0)
+            async with self._db.session() as session:
+                quiz = await get_quiz_for_day(session, day_utc)
+                entry = CachedQuiz.from_model(quiz) if quiz else None
+
+            if self._gen.get(day_utc, 0) == gen:
+                self._entries[day_utc] = entry
+                if entry is None:
+                    self._no_quiz_until[day_utc] = time.monotonic() + self.no_quiz_ttl
+            return entry
+
+    async def warm(self, day_utc: date | None = None) -> CachedQuiz | None:
+        day_utc = day_utc or _utc_today()
+        for d in [d for d in self._entries if d < day_utc - timedelta(days=1)]:
+            self._entries.pop(d, None)
+            self._no_quiz_until.pop(d, None)
+            self._gen.pop(d, None)
+        self.invalidate(day_utc)
+        entry = await self.get(day_utc)
+        log.info("Quiz cache warmed for %s (%s)", day_utc, "quiz set" if entry else "no quiz")
+        return entry
+
+    def stats(self) -> QuizCacheStats:
+        return QuizCacheStats(days=len(self._entries), hits=self.hits, misses=self.misses)
@@ -0,0 +1,389 @@
+# bot/services/quiz_sessions.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from zoneinfo import ZoneInfo
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.database.repo.quiz_session_repo import (
+    AnswerRow,
+    FinishRow,
+    ProgressRow,
+    finish_sessions,
+    get_or_create_sessions,
+    get_quiz_set,
+    save_progress,
+)
+
+log = logging.getLogger("bot.quiz_sessions")
+
+
+def _utc_now() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC"))
+
+
+@dataclass(frozen=True, slots=True)
+class SetQuestion:
+    question_id: int
+    text: str
+    options: tuple[str, ...]
+    correct_index: int  # 0-based
+    points: int
+
+
+@dataclass(frozen=True, slots=True)
+class LoadedSet:
+    set_id: int
+    title: str
+    is_active: bool
+    questions: tuple[SetQuestion, ...]
+
+    def keyboard(self, position: int) -> InlineKeyboardMarkup:
+        q = self.questions[position]
+        return InlineKeyboardMarkup(
+            inline_keyboard=[
+                [InlineKeyboardButton(text=text, callback_data=f"qsr:a:{self.set_id}:{position}:{idx}")]
+                for idx, text in enumerate(q.options)
+            ]
+        )
+
+
+@dataclass(slots=True)
+class SessionState:
+    session_id: int
+    set_id: int
+    user_id: int
+    current_index: int
+    score: int
+    finished: bool
+    touched: float  # monotonic, for idle eviction
+
+
+class AnswerStatus(str, Enum):
+    OK = "ok"
+    STALE = "stale"  # button of an already answered question (double tap / old message)
+    INVALID = "invalid"
+    FINISHED = "finished"  # run already completed
+    CLOSED = "closed"  # set closed or gone
+
+
+@dataclass(frozen=True, slots=True)
+class AnswerOutcome:
+    status: AnswerStatus
+    quiz_set: LoadedSet | None = None
+    state: SessionState | None = None
+    is_correct: bool = False
+    completed: bool = False  # this answer completed the run
+
+
+@dataclass(frozen=True, slots=True)
+class QuizSessionStats:
+    live: int
+    pending_answers: int
+    answers: int
+    flushes: int
+    finished: int
+
+
+class QuizSessionEngine:
+    """
+    Multi-question quiz runs with progress kept in memory.
+
+    - one SessionState (index + score) per live run; concurrent first starts share one
+      quiz_sessions upsert
+    - each answer is appended to a buffer; a background task flushes answers (one multi-row
+      INSERT) and progress (one executemany UPDATE) every `flush_seconds`
+    - the last answer of a run wakes the flusher and waits for that commit, which credits
+      the score to the ledger once (group commit across runs finishing together)
+    - runs idle for `idle_seconds` are dropped from memory and reloaded from quiz_sessions
+    A restart loses at most one unflushed interval; the DB rows stay consistent with each
+    other, so those users are simply asked the same question again.
+    """
+
+    def __init__(
+        self,
+        db,
+        *,
+        flush_seconds: float = 2.0,
+        max_pending: int = 2000,
+        idle_seconds: float = 1800.0,
+    ) -> None:
+        self._db = db
+        self.flush_seconds = float(flush_seconds)
+        self.max_pending = int(max_pending)
+        self.idle_seconds = float(idle_seconds)
+
+        self._sets: dict[int, LoadedSet | None] = {}
+        self._set_loads: dict[int, asyncio.Task] = {}
+        self._states: dict[tuple[int, int], SessionState] = {}
+        self._starting: dict[tuple[int, int], asyncio.Future] = {}
+        self._start_task: asyncio.Task | None = None
+
+        self._answers: list[AnswerRow] = []
+        self._dirty: dict[int, SessionState] = {}
+        self._finishing: dict[int, SessionState] = {}
+        self._commit_waiters: list[asyncio.Future] = []
+
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        self.answered = 0
+        self.flushes = 0
+        self.finished = 0
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="quiz-session-flush")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    # ---------- sets ----------
+    async def get_set(self, set_id: int) -> LoadedSet | None:
+        if set_id in self._sets:
+            return self._sets[set_id]
+        task = self._set_loads.get(set_id)
+        if task is None:  # single flight: concurrent misses share one read
+            task = asyncio.create_task(self._fetch_set(set_id))
+            self._set_loads[set_id] = task
+            task.add_done_callback(lambda _t: self._set_loads.pop(set_id, None))
+        return await asyncio.shield(task)
+
+    async def _fetch_set(self, set_id: int) -> LoadedSet | None:
+        async with self._db.session() as session:
+            row = await get_quiz_set(session, set_id)
+            loaded = None
+            if row is not None and row.questions:
+                loaded = LoadedSet(
+                    set_id=row.id,
+                    title=row.title,
+                    is_active=row.status == "active",
+                    questions=tuple(
+                        SetQuestion(
+                            question_id=q.id,
+                            text=q.question,
+                            options=tuple(json.loads(q.options_json)),
+                            correct_index=int(q.correct_index),
+                            points=int(q.points or 0),
+                        )
+                        for q in row.questions
+                    ),
+                )
+        self._sets[set_id] = loaded
+        return loaded
+
+    def forget_set(self, set_id: int) -> None:
+        """Call after closing/changing a set (next access reloads it)."""
+        self._sets.pop(set_id, None)
+
+    # ---------- runs ----------
+    async def begin(self, set_id: int, user_id: int) -> tuple[LoadedSet, SessionState] | None:
+        """Starts or resumes the user's run. None if the set is closed or missing."""
+        loaded = await self.get_set(set_id)
+        if loaded is None:
+            return None
+        state = self._states.get((set_id, user_id))
+        if state is None:
+            if not loaded.is_active:
+                return None
+            state = await self._load_state(set_id, user_id)
+        return loaded, state
+
+    async def _load_state(self, set_id: int, user_id: int) -> SessionState:
+        key = (set_id, user_id)
+        fut = self._starting.get(key)
+        if fut is None:
+            fut = asyncio.get_running_loop().create_future()
+            self._starting[key] = fut
+            if self._start_task is None:
+                self._start_task = asyncio.create_task(self._start_batches(), name="quiz-session-start")
+        return await asyncio.shield(fut)
+
+    async def _start_batches(self) -> None:
+        """
+        Coalesces concurrent first starts: everyone waiting in the same loop tick
+        (and while the previous batch was writing) shares one upsert + commit.
+        """
+        try:
+            await asyncio.sleep(0)
+            while self._starting:
+                batch, self._starting = self._starting, {}
+                try:
+                    async with self._db.session() as session:
+                        rows = await get_or_create_sessions(session, list(batch))
+                        await session.commit()
+                except Exception as e:
+                    log.exception("Quiz session start failed (batch=%s)", len(batch))
+                    for fut in batch.values():
+                        if not fut.done():
+                            fut.set_exception(e)
+                    continue
+
+                now = time.monotonic()
+                for key, fut in batch.items():
+                    row = rows[key]
+                    state = self._states.setdefault(
+                        key,
+                        SessionState(
+                            session_id=row.session_id,
+                            set_id=key[0],
+                            user_id=key[1],
+                            current_index=row.current_index,
+                            score=row.score,
+                            finished=row.is_finished,
+                            touched=now,
+                        ),
+                    )
+                    if not fut.done():
+                        fut.set_result(state)
+        finally:
+            self._start_task = None
+
+    async def answer(self, *, set_id: int, user_id: int, position: int, chosen_index: int) -> AnswerOutcome:
+        loaded = await self.get_set(set_id)
+        if loaded is None:
+            return AnswerOutcome(status=AnswerStatus.CLOSED)
+
+        state = self._states.get((set_id, user_id))
+        if state is None:
+            if not loaded.is_active:
+                return AnswerOutcome(status=AnswerStatus.CLOSED, quiz_set=loaded)
+            state = await self._load_state(set_id, user_id)
+
+        # ✅ no awaits from here until the state is updated: double taps see the new index
+        if state.finished:
+            return AnswerOutcome(status=AnswerStatus.FINISHED, quiz_set=loaded, state=state)
+        if not loaded.is_active:
+            return AnswerOutcome(status=AnswerStatus.CLOSED, quiz_set=loaded, state=state)
+        if position != state.current_index:
+            return AnswerOutcome(status=AnswerStatus.STALE, quiz_set=loaded, state=state)
+        q = loaded.questions[position]
+        if chosen_index < 0 or chosen_index >= len(q.options):
+            return AnswerOutcome(status=AnswerStatus.INVALID, quiz_set=loaded, state=state)
+
+        is_correct = chosen_index == q.correct_index
+        state.current_index += 1
+        if is_correct:
+            state.score += q.points
+        state.touched = time.monotonic()
+        self._answers.append(
+            AnswerRow(
+                session_id=state.session_id,
+                question_id=q.question_id,
+                chosen_index=chosen_index,
+                is_correct=is_correct,
+                answered_at=_utc_now().replace(tzinfo=None),
+            )
+        )
+        self._dirty[state.session_id] = state
+        self.answered += 1
+
+        completed = state.current_index >= len(loaded.questions)
+        if completed:
+            state.finished = True
+            self._finishing[state.session_id] = state
+            # credit now, not on the next tick; completions arriving together share one commit
+            waiter = asyncio.get_running_loop().create_future()
+            self._commit_waiters.append(waiter)
+            self._wake.set()
+            await waiter
+        elif len(self._answers) >= self.max_pending:
+            self._wake.set()
+
+        return AnswerOutcome(
+            status=AnswerStatus.OK,
+            quiz_set=loaded,
+            state=state,
+            is_correct=is_correct,
+            completed=completed,
+        )
+
+    # ---------- persistence ----------
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not (self._answers or self._dirty or self._finishing):
+                return 0
+
+            # snapshot before the first await; answers arriving meanwhile go to the next flush
+            answers, self._answers = self._answers, []
+            dirty, self._dirty = self._dirty, {}
+            finishing, self._finishing = self._finishing, {}
+            waiters, self._commit_waiters = self._commit_waiters, []
+            progress = [
+                ProgressRow(session_id=s.session_id, current_index=s.current_index, score=s.score)
+                for s in dirty.values()
+            ]
+            finals = [FinishRow(session_id=s.session_id, user_id=s.user_id, score=s.score) for s in finishing.values()]
+
+            try:
+                async with self._db.session() as session:
+                    await save_progress(session, answers=answers, progress=progress)
+                    await finish_sessions(session, finals=finals, day_utc=_utc_now().date())
+                    await session.commit()
+            except Exception:
+                log.exception("Quiz session flush failed (answers=%s), will retry", len(answers))
+                self._answers[:0] = answers
+                for sid, s in dirty.items():
+                    self._dirty.setdefault(sid, s)
+                for sid, v in finishing.items():
+                    self._finishing.setdefault(sid, v)
+                self._release(waiters)  # the answer stands in memory; the ledger write is retried
+                return 0
+
+            for s in finishing.values():
+                self._states.pop((s.set_id, s.user_id), None)
+            self.flushes += 1
+            self.finished += len(finals)
+            self._evict_idle()
+            self._release(waiters)
+            return len(answers)
+
+    @staticmethod
+    def _release(waiters: list[asyncio.Future]) -> None:
+        for w in waiters:
+            if not w.done():
+                w.set_result(None)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - self.idle_seconds
+        stale = [
+            key
+            for key, s in self._states.items()
+            if s.touched < cutoff and s.session_id not in self._dirty and s.session_id not in self._finishing
+        ]
+        for key in stale:
+            self._states.pop(key, None)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Quiz session flush loop failed")
+                await asyncio.sleep(5)
+
+    def stats(self) -> QuizSessionStats:
+        return QuizSessionStats(
+            live=len(self._states),
+            pending_answers=len(self._answers),
+            answers=self.answered,
+            flushes=self.flushes,
+            finished=self.finished,
+        )
@@ -0,0 +1,77 @@
+# bot/services/quiz_stats.py
+from __future__ import annotations
+
+import html
+import logging
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+
+from bot.config.settings import Settings
+from bot.database.models import Quiz
+from bot.database.repo.quiz_attempt_repo import AnswerStats, get_answer_stats, reconcile_answer_counters
+from bot.database.repo.quiz_repo import get_quiz_for_day
+from bot.utils.outbound import SendPriority, send_priority
+
+log = logging.getLogger("bot.quiz_stats")
+
+BAR_WIDTH = 10
+
+
+def _utc_today() -> date:
+    return datetime.now(tz=ZoneInfo("UTC")).date()
+
+
+async def quiz_answer_stats(session, quiz: Quiz) -> AnswerStats:
+    return await get_answer_stats(
+        session,
+        quiz_id=quiz.id,
+        option_count=len(quiz.options or []),
+        correct_index=int(quiz.correct_option_index),
+    )
+
+
+def format_answer_stats(quiz: Quiz, stats: AnswerStats, *, title: str) -> str:
+    lines = [
+        f"{title}",
+        f"📅 <b>Day (UTC):</b> {quiz.day_utc.isoformat()}",
+        f"❓ {html.escape(quiz.question)}",
+        "",
+    ]
+    total = stats.total
+    for o in quiz.options or []:
+        n = stats.per_option[o.index] if o.index < len(stats.per_option) else 0
+        share = n / total if total else 0.0
+        filled = round(share * BAR_WIDTH)
+        marker = "✅" if o.index == stats.correct_index else "▫️"
+        lines.append(f"{marker} <b>{o.index + 1}.</b> {html.escape(o.text)}")
+        lines.append(f"    {'█' * filled}{'░' * (BAR_WIDTH - filled)} {share:.0%} ({n})")
+    lines += ["", f"👥 <b>Answers:</b> {total} • 🎯 <b>Accuracy:</b> {stats.accuracy:.0%}"]
+    return "\n".join(lines)
+
+
+async def quiz_rollover(bot: Bot, db, settings: Settings) -> None:
+    """
+    UTC midnight: recount the finished day's answers (fixes counter drift), then
+    post the answer reveal to the main group when QUIZ_REVEAL_ENABLED is set.
+    """
+    day = _utc_today() - timedelta(days=1)
+    async with db.session() as session:
+        quiz = await get_quiz_for_day(session, day)
+        if quiz is None:
+            return
+        fixed = await reconcile_answer_counters(session, quiz_ids=[quiz.id])
+        await session.commit()
+        if fixed:
+            log.warning("Quiz answer counters drifted for %s: %s cell(s) corrected", day, fixed)
+        stats = await quiz_answer_stats(session, quiz)
+
+    if not settings.quiz_reveal_enabled or not settings.group_id:
+        return
+    text = format_answer_stats(quiz, stats, title="🧠 <b>Yesterday's quiz — the answer</b>")
+    with send_priority(SendPriority.BROADCAST):
+        try:
+            await bot.send_message(chat_id=settings.group_id, text=text)
+        except Exception:
+            log.exception("Failed to post quiz reveal for %s", day)
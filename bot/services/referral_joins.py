@@ -0,0 +1,306 @@
+# bot/services/referral_joins.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from bot.database.models import PointSource
+from bot.database.repo.points_repo import BulkAward, award_points_bulk
+from bot.database.repo.referral_repo import (
+    ReferralCounts,
+    claim_joined_users,
+    get_referrer_states,
+    list_unprocessed_referred,
+    set_referral_counts,
+)
+from bot.utils.dates import utc_today
+from bot.utils.outbound import SendPriority, set_task_priority
+
+log = logging.getLogger("bot.referral_joins")
+
+REFERRAL_CAP = 100  # lifetime successful referrals cap
+REFERRAL_POINTS = 1
+
+RECONCILE_LOOKBACK = timedelta(days=2)  # startup re-check: referred users created this recently
+RECONCILE_LIMIT = 2000  # ... at most this many (one getChatMember each)
+_MEMBER_STATUSES = ("member", "administrator", "creator")  # same as the join detection
+
+
+@dataclass(slots=True)
+class JoinBatchResult:
+    claimed: int = 0  # users marked referral_processed by this batch
+    no_referrer: int = 0
+    awarded: int = 0
+    capped: int = 0
+    per_referrer: dict[int, int] = field(default_factory=dict)  # referrer telegram_id -> points awarded
+
+
+@dataclass(frozen=True, slots=True)
+class ReferralJoinStats:
+    pending: int
+    events: int
+    coalesced: int  # join/leave updates folded into an already pending user
+    batches: int
+    claimed: int
+    awarded: int
+    capped: int
+    reconciled: int  # joins found by the startup membership re-check
+
+
+async def process_referral_joins(
+    session,
+    telegram_ids: list[int],
+    *,
+    day_utc: date | None = None,
+    cap: int = REFERRAL_CAP,
+) -> JoinBatchResult:
+    """
+    Referral awards for users who joined the main group, set-wise (same result as handling
+    them one by one in telegram_ids order):
+    1. claim the unprocessed users (UPDATE users ... RETURNING; this also makes the
+       transaction the writer, so the counters read next can't change under us)
+    2. referrers + their counters in one read
+    3. walk the joins in order: award while the referrer is under the cap, else capped
+    4. one bulk ledger write (point_events + weekly_user_stats) and one counters upsert
+    Caller commits.
+    """
+    out = JoinBatchResult()
+    joined = await claim_joined_users(session, telegram_ids=telegram_ids)
+    if not joined:
+        return out
+    out.claimed = len(joined)
+
+    order = {tg: i for i, tg in enumerate(telegram_ids)}
+    joined.sort(key=lambda j: order.get(j.telegram_id, len(order)))
+
+    referred = [j for j in joined if j.referrer_user_id is not None]
+    out.no_referrer = len(joined) - len(referred)
+    referrers = await get_referrer_states(session, user_ids=sorted({j.referrer_user_id for j in referred}))
+
+    successful = {uid: r.counts.successful for uid, r in referrers.items()}
+    settled: dict[int, int] = {}
+    capped: dict[int, int] = {}
+    awards: list[BulkAward] = []
+    day_utc = day_utc or utc_today()
+    for j in referred:
+        uid = j.referrer_user_id
+        if uid not in referrers:  # FK sets it NULL on delete; just in case
+            continue
+        settled[uid] = settled.get(uid, 0) + 1
+        if successful[uid] >= cap:
+            capped[uid] = capped.get(uid, 0) + 1
+            continue
+        successful[uid] += 1
+        awards.append(BulkAward(user_id=uid, day_utc=day_utc, ref_id=j.user_id))
+
+    awarded_refs = await award_points_bulk(
+        session,
+        awards=awards,
+        source=PointSource.REFERRAL,
+        points=REFERRAL_POINTS,
+        ref_type="referral",
+    )
+    awarded: dict[int, int] = {}
+    for a in awards:
+        if a.ref_id in awarded_refs:  # not there: the ledger already had it
+            awarded[a.user_id] = awarded.get(a.user_id, 0) + 1
+
+    counts = {}
+    for uid in settled:
+        c = referrers[uid].counts
+        counts[uid] = ReferralCounts(
+            successful=c.successful + awarded.get(uid, 0),
+            pending=max(0, c.pending - settled[uid]),
+            capped=c.capped + capped.get(uid, 0),
+        )
+    if counts:
+        await set_referral_counts(session, counts)
+
+    out.awarded = sum(awarded.values())
+    out.capped = sum(capped.values())
+    out.per_referrer = {referrers[uid].telegram_id: n for uid, n in awarded.items()}
+    return out
+
+
+async def notify_referrers(bot, per_referrer: dict[int, int]) -> None:
+    for tg_id, n in per_referrer.items():
+        text = (
+            "🎉 You earned +1 point from a referral join!"
+            if n == 1
+            else f"🎉 You earned +{n} points from {n} referral joins!"
+        )
+        try:
+            await bot.send_message(chat_id=tg_id, text=text)
+        except Exception:
+            pass
+
+
+class ReferralJoinProcessor:
+    """
+    Main-group joins are buffered and awarded in batches instead of one transaction per
+    chat_member update.
+
+    - note() only records the user's latest membership in memory; repeated join/leave
+      flaps of one user within a window collapse into one entry
+    - every `window_seconds` (or once `max_batch` users are waiting) the users whose last
+      update was a join are processed together (process_referral_joins, one commit)
+    - a user who left again before the flush is dropped; their next join is handled then
+      (referral_processed stays False until a batch claims them)
+    Referrer notifications go out after the commit, at NORMAL send priority.
+
+    The buffer is memory only: close() flushes it, but a crash loses the joins noted
+    since the last flush (up to `window_seconds`, plus a batch waiting on a failed
+    commit). start() therefore re-checks group membership (getChatMember) of referred
+    users created within RECONCILE_LOOKBACK that are still unprocessed and feeds the
+    members back in. An older referred user who joined inside the crash window is only
+    awarded on their next join.
+    """
+
+    def __init__(
+        self,
+        db,
+        bot=None,
+        *,
+        group_id: int | None = None,
+        window_seconds: float = 2.0,
+        max_batch: int = 500,
+    ) -> None:
+        self._db = db
+        self._bot = bot
+        self.group_id = group_id
+        self.window_seconds = float(window_seconds)
+        self.max_batch = int(max_batch)
+
+        self._pending: dict[int, bool] = {}  # telegram_id -> joined (insertion = first seen)
+        self._flush_lock = asyncio.Lock()
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._reconcile_task: asyncio.Task | None = None
+        self._notify_tasks: set[asyncio.Task] = set()
+
+        self.events = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.claimed = 0
+        self.awarded = 0
+        self.capped = 0
+        self.reconciled = 0
+
+    # ---------- lifecycle ----------
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name="referral-joins")
+        if self._bot is not None and self.group_id:
+            self._reconcile_task = asyncio.create_task(self.reconcile(), name="referral-joins-reconcile")
+
+    async def close(self) -> None:
+        if self._reconcile_task is not None:
+            self._reconcile_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._reconcile_task
+            self._reconcile_task = None
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+        if self._notify_tasks:
+            await asyncio.gather(*self._notify_tasks, return_exceptions=True)
+
+    # ---------- intake ----------
+    def note(self, telegram_id: int, *, joined: bool) -> None:
+        self.events += 1
+        if telegram_id in self._pending:
+            self.coalesced += 1
+            self._pending[telegram_id] = joined
+        elif joined:  # a leave only matters for a join still waiting here
+            self._pending[telegram_id] = True
+        if len(self._pending) >= self.max_batch:
+            self._wake.set()
+
+    async def reconcile(self, *, lookback: timedelta = RECONCILE_LOOKBACK, limit: int = RECONCILE_LIMIT) -> int:
+        """
+        Notes a join for every recent, still unprocessed referred user who is a member of
+        the group now (joins a crash dropped from the buffer). Returns how many were found.
+        """
+        since = datetime.now(timezone.utc).replace(tzinfo=None) - lookback
+        async with self._db.session() as session:
+            telegram_ids = await list_unprocessed_referred(session, since=since, limit=limit)
+
+        found = 0
+        for tg in telegram_ids:
+            try:
+                member = await self._bot.get_chat_member(chat_id=self.group_id, user_id=tg)
+            except Exception as e:
+                log.debug("Referral reconcile: no membership for tg_id=%s: %s", tg, e)
+                continue
+            if member.status in _MEMBER_STATUSES and tg not in self._pending:
+                self.note(tg, joined=True)
+                found += 1
+
+        self.reconciled += found
+        if telegram_ids:
+            log.info("Referral reconcile: %s of %s unprocessed referred user(s) are members", found, len(telegram_ids))
+        return found
+
+    # ---------- processing ----------
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, {}
+            telegram_ids = [tg for tg, joined in batch.items() if joined]
+            if not telegram_ids:
+                return 0
+
+            try:
+                async with self._db.session() as session:
+                    res = await process_referral_joins(session, telegram_ids)
+                    await session.commit()
+            except Exception:
+                log.exception("Referral join batch failed (users=%s), will retry", len(telegram_ids))
+                merged = dict(batch)
+                merged.update(self._pending)  # updates that came in meanwhile are newer
+                self._pending = merged
+                return 0
+
+            self.batches += 1
+            self.claimed += res.claimed
+            self.awarded += res.awarded
+            self.capped += res.capped
+            log.info(
+                "Referral joins: %s user(s), %s claimed, %s awarded, %s over cap, %s without referrer",
+                len(telegram_ids), res.claimed, res.awarded, res.capped, res.no_referrer,
+            )
+            if res.per_referrer and self._bot is not None:
+                task = asyncio.create_task(notify_referrers(self._bot, res.per_referrer))
+                self._notify_tasks.add(task)
+                task.add_done_callback(self._notify_tasks.discard)
+            return len(telegram_ids)
+
+    async def _run(self) -> None:
+        set_task_priority(SendPriority.NORMAL)
+        while True:
+            self._wake.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=self.window_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Referral join loop failed")
+                await asyncio.sleep(5)
+
+    def stats(self) -> ReferralJoinStats:
+        return ReferralJoinStats(
+            pending=len(self._pending),
+            events=self.events,
+            coalesced=self.coalesced,
+            batches=self.batches,
+            claimed=self.claimed,
+            awarded=self.awarded,
+            capped=self.capped,
+            reconciled=self.reconciled,
+        )
@@ -0,0 +1,145 @@
+# bot/services/screenshot_dedup.py
+from __future__ import annotations
+
+import asyncio
+import io
+import logging
+import time
+from dataclasses import dataclass
+
+from aiogram import Bot
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.repo.fingerprint_repo import iter_fingerprints, save_fingerprint
+from bot.utils.cards.render_service import CardRenderService
+from bot.utils.hamming_index import HammingIndex
+from bot.utils.image_hash import dhash
+
+log = logging.getLogger("bot.screenshot_dedup")
+
+
+@dataclass(frozen=True, slots=True)
+class DupMatch:
+    submission_id: int  # earlier submission
+    user_id: int
+    distance: int  # Hamming distance of the dHashes (0 for the same file)
+    same_file: bool  # identical Telegram file_unique_id
+
+
+@dataclass(frozen=True, slots=True)
+class DedupStats:
+    stored: int
+    checked: int
+    matched: int
+    avg_lookup_us: float
+
+
+def _dhash_or_none(raw: bytes) -> int | None:
+    try:
+        return dhash(raw)
+    except Exception:
+        return None
+
+
+class ScreenshotDedupIndex:
+    """
+    In-memory duplicate index over every screenshot ever submitted.
+
+    - exact: file_unique_id -> first submission (same file re-sent)
+    - near:  dHash in a HammingIndex, matched within `radius` bits
+    Loaded from screenshot_fingerprints at startup; new submissions are added as they arrive.
+    """
+
+    def __init__(self, *, radius: int = 6) -> None:
+        self.radius = int(radius)
+        self._by_file: dict[str, tuple[int, int]] = {}
+        self._hashes: HammingIndex[tuple[int, int]] = HammingIndex(radius=self.radius)
+
+        self._checked = 0
+        self._matched = 0
+        self._lookup_s = 0.0
+
+    async def load(self, db) -> int:
+        n = 0
+        async with db.session() as session:
+            async for rows in iter_fingerprints(session):
+                for r in rows:
+                    self._add(r.submission_id, r.user_id, r.file_unique_id, r.dhash)
+                n += len(rows)
+                await asyncio.sleep(0)  # large tables: let other startup work run
+        log.info("Screenshot dedup index loaded: %s fingerprints", n)
+        return n
+
+    def _add(self, submission_id: int, user_id: int, file_unique_id: str, h: int | None) -> None:
+        self._by_file.setdefault(file_unique_id, (submission_id, user_id))
+        if h is not None:
+            self._hashes.add(h, (submission_id, user_id))
+
+    def check(self, *, file_unique_id: str, h: int | None) -> DupMatch | None:
+        t0 = time.perf_counter()
+        self._checked += 1
+        try:
+            same = self._by_file.get(file_unique_id)
+            if same is not None:
+                self._matched += 1
+                return DupMatch(submission_id=same[0], user_id=same[1], distance=0, same_file=True)
+            if h is None:
+                return None
+
+            hits = self._hashes.find(h, self.radius)
+            if not hits:
+                return None
+            self._matched += 1
+            d, (sid, uid) = hits[0]
+            return DupMatch(submission_id=sid, user_id=uid, distance=d, same_file=False)
+        finally:
+            self._lookup_s += time.perf_counter() - t0
+
+    async def register(
+        self,
+        bot: Bot,
+        session: AsyncSession,
+        *,
+        submission_id: int,
+        user_id: int,
+        file_id: str,
+        file_unique_id: str,
+        renderer: CardRenderService | None = None,
+    ) -> DupMatch | None:
+        """
+        Downloads + hashes the photo (off the event loop), checks it against all
+        earlier submissions, stores the fingerprint and adds it to the index.
+        Caller commits.
+        """
+        h = None
+        try:
+            buf = await bot.download(file_id, destination=io.BytesIO())
+            raw = buf.getvalue() if buf is not None else b""
+            if raw:
+                if renderer is not None:
+                    h = await renderer.render(_dhash_or_none, raw=raw)
+                else:
+                    h = await asyncio.to_thread(_dhash_or_none, raw)
+        except Exception:
+            log.warning("Screenshot hash failed submission_id=%s", submission_id)
+
+        match = self.check(file_unique_id=file_unique_id, h=h)
+        await save_fingerprint(
+            session,
+            submission_id=submission_id,
+            user_id=user_id,
+            file_unique_id=file_unique_id,
+            dhash=h,
+            dup_of_submission_id=match.submission_id if match else None,
+            dup_distance=match.distance if match else None,
+        )
+        self._add(submission_id, user_id, file_unique_id, h)
+        return match
+
+    def stats(self) -> DedupStats:
+        return DedupStats(
+            stored=len(self._hashes),
+            checked=self._checked,
+            matched=self._matched,
+            avg_lookup_us=round(self._lookup_s / self._checked * 1e6, 1) if self._checked else 0.0,
+        )
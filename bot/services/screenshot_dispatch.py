@@ -0,0 +1,216 @@
+# bot/services/screenshot_dispatch.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.config.settings import Settings
+from bot.database.repo.config_repo import get_config
+from bot.database.repo.fingerprint_repo import dup_flags
+from bot.database.repo.reviewer_repo import ReviewerLoad, reviewer_loads, set_reviewer
+from bot.database.repo.screenshot_repo import (
+    assign_to_admin,
+    get_submission_with_user,
+    next_claimable_ids,
+    release_assignment,
+)
+from bot.utils.outbound import SendPriority, set_task_priority
+
+log = logging.getLogger("bot.screenshot_dispatch")
+
+DEFAULT_DECISION_S = 120.0  # assumed speed for reviewers without recent decisions
+SPEED_WINDOW = timedelta(days=7)
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+def _decide_kb(submission_id: int) -> InlineKeyboardMarkup:
+    return InlineKeyboardMarkup(
+        inline_keyboard=[
+            [
+                InlineKeyboardButton(text="✅ Approve", callback_data=f"ss:approve:{submission_id}"),
+                InlineKeyboardButton(text="❌ Reject", callback_data=f"ss:reject:{submission_id}"),
+            ],
+        ]
+    )
+
+
+def pick_reviewer(loads: list[ReviewerLoad], *, exclude: set[int] | frozenset[int] = frozenset()) -> ReviewerLoad | None:
+    """
+    Least expected time to get through one more item:
+    (open claims + 1) x recent average decision time. Full reviewers are skipped.
+    """
+    known = [x.avg_decision_s for x in loads if x.avg_decision_s]
+    fallback = sorted(known)[len(known) // 2] if known else DEFAULT_DECISION_S
+
+    candidates = [x for x in loads if x.user_id not in exclude and x.open_claims < x.max_open]
+    if not candidates:
+        return None
+    return min(
+        candidates,
+        key=lambda x: ((x.open_claims + 1) * (x.avg_decision_s or fallback), x.open_claims, x.user_id),
+    )
+
+
+class ScreenshotDispatcher:
+    """
+    Pushes pending screenshots to the least-loaded available reviewer (by DM)
+    instead of letting every admin race for "Claim" in the review chat.
+
+    - dispatch(): assign one submission (used on submit and on claim expiry)
+    - fill():     assign the oldest unclaimed backlog while reviewers have capacity
+    - request_fill(): run fill() in the background (handlers), one pass at a time
+    Reviewers opt in with /ss_on; with nobody available the review chat flow is unchanged.
+    """
+
+    def __init__(self, bot: Bot, db, settings: Settings) -> None:
+        self._bot = bot
+        self._db = db
+        self._settings = settings
+
+        self._fill_task: asyncio.Task | None = None
+        self._fill_again = False
+
+        self.dispatched = 0
+        self.redispatched = 0
+        self.dm_failed = 0
+
+    async def close(self) -> None:
+        if self._fill_task is not None:
+            self._fill_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._fill_task
+            self._fill_task = None
+
+    async def dispatch(
+        self,
+        submission_id: int,
+        *,
+        exclude_admin_ids: set[int] | frozenset[int] = frozenset(),
+        redispatch: bool = False,
+    ) -> ReviewerLoad | None:
+        exclude = set(exclude_admin_ids)
+
+        while True:
+            async with self._db.session() as session:
+                cfg = await get_config(session)
+                if not cfg.screenshot_enabled:
+                    return None
+
+                now = _utc_now_naive()
+                loads = await reviewer_loads(session, now=now, since=now - SPEED_WINDOW)
+                reviewer = pick_reviewer(loads, exclude=exclude)
+                if reviewer is None:
+                    return None
+
+                pack = await get_submission_with_user(session, submission_id)
+                if pack is None:
+                    return None
+                sub, user = pack.submission, pack.user
+                dup = (await dup_flags(session, submission_ids=[submission_id])).get(submission_id)
+
+                ttl = int(cfg.screenshot_claim_ttl_minutes)
+                ok = await assign_to_admin(
+                    session,
+                    submission_id=submission_id,
+                    admin_user_id=reviewer.user_id,
+                    admin_chat_id=sub.admin_chat_id,
+                    admin_message_id=sub.admin_message_id,
+                    expires_at_utc=now + timedelta(minutes=ttl),
+                )
+                if not ok:
+                    # decided or claimed meanwhile
+                    await session.rollback()
+                    return None
+                await session.commit()
+
+            caption = (
+                "🖼 <b>Screenshot Review</b> (assigned to you)\n\n"
+                f"👤 <b>User:</b> @{user.username or 'unknown'}\n"
+                f"🗓 <b>Day (UTC):</b> {sub.day_utc.isoformat()}\n"
+                f"🆔 <b>Submission ID:</b> {sub.id}\n"
+                f"⭐ <b>Points on approve:</b> {cfg.screenshot_points}\n"
+                f"⏱ Decide within <b>{ttl}</b> min"
+            )
+            if dup is not None:
+                caption += f"\n\n⚠️ <b>Possible duplicate</b> of #{dup[0]} (distance {dup[1]})"
+            try:
+                await self._bot.send_photo(
+                    chat_id=reviewer.telegram_id,
+                    photo=sub.image_file_id,
+                    caption=caption,
+                    reply_markup=_decide_kb(sub.id),
+                )
+            except Exception:
+                # reviewer never opened a DM with the bot (or blocked it): take them off duty
+                log.warning("Cannot DM reviewer user_id=%s, marking unavailable", reviewer.user_id)
+                self.dm_failed += 1
+                async with self._db.session() as session:
+                    await release_assignment(session, submission_id=submission_id, admin_user_id=reviewer.user_id)
+                    await set_reviewer(
+                        session,
+                        user_id=reviewer.user_id,
+                        telegram_id=reviewer.telegram_id,
+                        available=False,
+                    )
+                    await session.commit()
+                exclude.add(reviewer.user_id)
+                continue
+
+            if redispatch:
+                self.redispatched += 1
+            else:
+                self.dispatched += 1
+            log.info("Submission %s dispatched to reviewer user_id=%s", submission_id, reviewer.user_id)
+            return reviewer
+
+    async def fill(self, *, limit: int = 50) -> int:
+        """
+        Hands out unclaimed backlog (oldest first) until reviewers are full.
+        """
+        n = 0
+        after_id = 0
+        while n < limit:
+            async with self._db.session() as session:
+                ids = await next_claimable_ids(session, after_id=after_id, limit=10)
+            if not ids:
+                break
+
+            for sid in ids:
+                after_id = sid
+                if await self.dispatch(sid) is None:
+                    return n  # nobody has capacity left (or it was taken meanwhile; next fill retries)
+                n += 1
+                if n >= limit:
+                    break
+        return n
+
+    def request_fill(self) -> None:
+        """
+        Schedules fill() without waiting for it (up to `limit` assignments + DMs).
+        Only one fill runs at a time; requests made meanwhile fold into one more pass.
+        """
+        if self._fill_task is not None and not self._fill_task.done():
+            self._fill_again = True
+            return
+        self._fill_again = False
+        self._fill_task = asyncio.create_task(self._fill_loop(), name="screenshot-fill")
+
+    async def _fill_loop(self) -> None:
+        set_task_priority(SendPriority.NORMAL)
+        while True:
+            try:
+                await self.fill()
+            except Exception:
+                log.exception("Screenshot backlog dispatch failed")
+            if not self._fill_again:
+                return
+            self._fill_again = False
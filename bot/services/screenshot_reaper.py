@@ -0,0 +1,167 @@
+# bot/services/screenshot_reaper.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from bot.config.settings import Settings
+from bot.database.repo.screenshot_repo import (
+    ExpiredClaim,
+    add_expiry_listener,
+    expire_assignments,
+    next_claim_expiry,
+    remove_expiry_listener,
+)
+from bot.services.screenshot_dispatch import ScreenshotDispatcher
+
+log = logging.getLogger("bot.screenshot_reaper")
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+class ScreenshotClaimReaper:
+    """
+    Expires lapsed screenshot claims right when they lapse (no per-minute polling).
+
+    - keeps the earliest PENDING expires_at_utc and sleeps until then
+    - claim_submission / assign_to_admin nudge it through the repo expiry hook
+    - after each reap, re-reads the next deadline (one index lookup) and keeps it only if
+      no earlier deadline was nudged: hooks fire before the caller commits, so the read
+      may not see that claim yet
+    - a lapsed claim is re-dispatched to another reviewer when a dispatcher is set,
+      and announced in the review chat (with a Claim button if nobody took it)
+    `resync_seconds` bounds the sleep so out-of-band DB edits are picked up too.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        db,
+        settings: Settings,
+        *,
+        dispatcher: ScreenshotDispatcher | None = None,
+        resync_seconds: float = 600.0,
+    ) -> None:
+        self._bot = bot
+        self._db = db
+        self._settings = settings
+        self._dispatcher = dispatcher
+        self.resync_seconds = float(resync_seconds)
+
+        self._next_due: datetime | None = None
+        self._nudged: datetime | None = None  # earliest hooked deadline, maybe not committed yet
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.reaped = 0
+
+    @property
+    def next_due(self) -> datetime | None:
+        return self._next_due
+
+    async def start(self) -> None:
+        add_expiry_listener(self.nudge)
+        async with self._db.session() as session:
+            self._next_due = await next_claim_expiry(session)
+        self._task = asyncio.create_task(self._run(), name="screenshot-claim-reaper")
+
+    async def close(self) -> None:
+        remove_expiry_listener(self.nudge)
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def nudge(self, expires_at_utc: datetime) -> None:
+        if self._nudged is None or expires_at_utc < self._nudged:
+            self._nudged = expires_at_utc
+        if self._next_due is None or expires_at_utc < self._next_due:
+            self._next_due = expires_at_utc
+            self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            timeout = self.resync_seconds
+            if self._next_due is not None:
+                timeout = min(timeout, max(0.0, (self._next_due - _utc_now_naive()).total_seconds()))
+
+            self._wake.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+                continue  # earlier deadline arrived: recompute the sleep
+
+            try:
+                await self._reap()
+            except Exception:
+                log.exception("Screenshot claim reaper failed")
+                await asyncio.sleep(5)
+
+    async def _reap(self) -> None:
+        started = _utc_now_naive()
+        async with self._db.session() as session:
+            expired = await expire_assignments(session)
+            if expired:
+                await session.commit()
+            due = await next_claim_expiry(session)
+
+        # a nudged deadline that already passed was covered by this pass (or rolled back);
+        # a future one may still sit in an uncommitted transaction the read above missed
+        if self._nudged is not None and self._nudged <= started:
+            self._nudged = None
+        if self._nudged is not None and (due is None or self._nudged < due):
+            due = self._nudged
+        self._next_due = due
+
+        if not expired:
+            return
+
+        self.reaped += len(expired)
+        log.info("Expired %s screenshot claim(s)", len(expired))
+        for item in expired:
+            reviewer = None
+            if self._dispatcher is not None:
+                exclude = {item.admin_user_id} if item.admin_user_id else set()
+                try:
+                    reviewer = await self._dispatcher.dispatch(
+                        item.submission_id, exclude_admin_ids=exclude, redispatch=True
+                    )
+                except Exception:
+                    log.exception("Re-dispatch failed submission_id=%s", item.submission_id)
+            label = None
+            if reviewer is not None:
+                label = f"@{reviewer.username}" if reviewer.username else f"admin #{reviewer.user_id}"
+            await self._announce(item, reassigned_to=label)
+
+    async def _announce(self, item: ExpiredClaim, *, reassigned_to: str | None = None) -> None:
+        chat_id = item.admin_chat_id or self._settings.admin_review_chat_id
+        if not chat_id:
+            return
+
+        kb = None
+        if reassigned_to is None:
+            text = f"⌛ Claim on submission <b>#{item.submission_id}</b> lapsed — free to claim again."
+            kb = InlineKeyboardMarkup(
+                inline_keyboard=[
+                    [InlineKeyboardButton(text="🧑‍⚖️ Claim", callback_data=f"ss:claim:{item.submission_id}")]
+                ]
+            )
+        else:
+            text = f"⌛ Claim on submission <b>#{item.submission_id}</b> lapsed — reassigned to {reassigned_to}."
+        try:
+            await self._bot.send_message(
+                chat_id=chat_id,
+                text=text,
+                reply_to_message_id=item.admin_message_id if item.admin_chat_id else None,
+                reply_markup=kb,
+                allow_sending_without_reply=True,
+            )
+        except Exception:
+            log.exception("Failed to announce lapsed claim submission_id=%s", item.submission_id)
@@ -5,22 +5,41 @@ from dataclasses import dataclass
 from datetime import date
 from random import Random
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.database.models import (
-    DailyActionType,
-    PointSource,
-    SpinHistory,
-    SpinRewardType,
+from bot.database.models import DailyActionType, PointSource, SpinRewardType
+from bot.database.repo.cash_budget_repo import (
+    BudgetUsage,
+    CashReservation,
+    get_budget_usage,
+    record_downgrade,
+    reserve_cash,
 )
-from bot.database.tx import transactional
-from bot.services.points import PointsService
-from bot.services.task_progress import TaskProgressService
+from bot.database.repo.points_repo import BulkAward, award_points_bulk
+from bot.database.repo.spin_repo import SpinDraw, insert_spin_gated, set_spin_reward, spin_gate_state
+from bot.services.cash_budget import CashBudget
+from bot.services.task_progress import TaskProgressService, action_bit
 from bot.utils.dates import week_start_monday
 
 
+@dataclass(frozen=True, slots=True)
+class SpinBudgetNote:
+    """What a spin tells the in-memory CashBudget; applied by the caller once the spin is committed."""
+    day_utc: date
+    week_start: date
+    reservation: CashReservation | None = None
+    refused_usage: BudgetUsage | None = None  # totals read when reserve_cash refused the win
+    downgraded: bool = False
+
+    def apply(self, cash_budget: CashBudget) -> None:
+        if self.reservation is not None:
+            cash_budget.note_reserved(day_utc=self.day_utc, week_start=self.week_start, res=self.reservation)
+        elif self.refused_usage is not None:
+            cash_budget.note_usage(self.refused_usage, refused=True)
+        elif self.downgraded:
+            cash_budget.note_skip()
+
+
 @dataclass(frozen=True, slots=True)
 class SpinResult:
     ok: bool
@@ -29,6 +48,7 @@ class SpinResult:
     message: str
     reward_type: SpinRewardType | None = None
     reward_value: int = 0
+    budget_note: SpinBudgetNote | None = None  # apply to the CashBudget after commit
 
 
 class SpinService:
@@ -48,6 +68,36 @@ class SpinService:
     CASH_CENTS = 500  # $5
     CASH_MAX_PER_USER_PER_WEEK = 1
 
+    @staticmethod
+    def draw(*, user_id: int, day_utc: date, cash_available: bool = True) -> SpinDraw:
+        """
+        The reward from the seed alone (deterministic per user/day for audit). A cash roll
+        carries its fallbacks: no reward past the per-user weekly cap, and the normal points
+        roll when the global budget is known to be spent (cash_available=False).
+        """
+        rng = Random(f"{user_id}:{day_utc.isoformat()}")
+        roll = rng.random()
+
+        if roll < SpinService.CASH_CHANCE:
+            if cash_available:
+                reward_type, reward_value = SpinRewardType.CASH, SpinService.CASH_CENTS
+            else:
+                reward_type = SpinRewardType.POINTS
+                reward_value = rng.randint(SpinService.POINTS_MIN, SpinService.POINTS_MAX)
+            return SpinDraw(
+                reward_type=reward_type,
+                reward_value=reward_value,
+                roll=roll,
+                weekly_cap=SpinService.CASH_MAX_PER_USER_PER_WEEK,
+            )
+        if roll < SpinService.CASH_CHANCE + SpinService.NONE_CHANCE:
+            return SpinDraw(reward_type=SpinRewardType.NONE, reward_value=0, roll=roll)
+        return SpinDraw(
+            reward_type=SpinRewardType.POINTS,
+            reward_value=rng.randint(SpinService.POINTS_MIN, SpinService.POINTS_MAX),
+            roll=roll,
+        )
+
     @staticmethod
     async def spin(
         session: AsyncSession,
@@ -55,21 +105,46 @@ class SpinService:
         user_id: int,
         day_utc: date,
         require_poll: bool,
+        cash_budget: CashBudget | None = None,
     ) -> SpinResult:
-        # 1) Gatekeeping
-        done = await TaskProgressService.done_set(session, user_id=user_id, day_utc=day_utc)
-
-        required = {
-            DailyActionType.CHECKIN.value,
-            DailyActionType.QUIZ.value,
-            DailyActionType.SCREENSHOT.value,
-        }
+        """
+        1) gate + one-spin-per-day + final reward: one INSERT .. SELECT (insert_spin_gated)
+        2) the spin's writes: points ledger + weekly total, progress bit; no reads, no savepoints
+        A cash roll adds the budget reservation; a locked/repeated spin one read to explain why.
+        Caller commits (the /spin handler through run_retrying_busy), then applies
+        result.budget_note to cash_budget: a rolled-back spin must not move the cached totals.
+        """
+        required = [DailyActionType.CHECKIN, DailyActionType.QUIZ, DailyActionType.SCREENSHOT]
         if require_poll:
-            required.add(DailyActionType.POLL_VOTE.value)
+            required.append(DailyActionType.POLL_VOTE)
+        required_mask = 0
+        for t in required:
+            required_mask |= action_bit(t)
+
+        week_start = week_start_monday(day_utc)
+        cash_available = cash_budget is None or cash_budget.can_cover(
+            day_utc=day_utc, week_start=week_start, cents=SpinService.CASH_CENTS
+        )
+        draw = SpinService.draw(user_id=user_id, day_utc=day_utc, cash_available=cash_available)
 
-        missing = [x for x in sorted(required) if x not in done]
-        if missing:
-            pretty = ", ".join(missing)
+        recorded = await insert_spin_gated(
+            session,
+            user_id=user_id,
+            day_utc=day_utc,
+            week_start=week_start,
+            required_mask=required_mask,
+            draw=draw,
+        )
+        if recorded is None:
+            gate = await spin_gate_state(session, user_id=user_id, day_utc=day_utc)
+            if gate.already:
+                return SpinResult(
+                    ok=True,
+                    locked=False,
+                    already=True,
+                    message="🎰 <b>You already used your spin today (UTC).</b>\nCome back tomorrow!",
+                )
+            pretty = ", ".join(sorted(t.value for t in required if not gate.mask & action_bit(t)))
             return SpinResult(
                 ok=False,
                 locked=True,
@@ -81,93 +156,41 @@ class SpinService:
                     "Run /status to see progress."
                 ),
             )
+        reward_type, reward_value = recorded
 
-        week_start = week_start_monday(day_utc)
-
-        # 2) One spin per day (idempotent insert)
-        try:
-            async with transactional(session):
-                session.add(
-                    SpinHistory(
-                        user_id=user_id,
-                        day_utc=day_utc,
-                        week_start=week_start,
-                        reward_type=SpinRewardType.NONE,  # will update after roll
-                        reward_value=0,
-                    )
-                )
-                await session.flush()
-        except IntegrityError:
-            await session.rollback()
-            return SpinResult(
-                ok=True,
-                locked=False,
-                already=True,
-                message="🎰 <b>You already used your spin today (UTC).</b>\nCome back tomorrow!",
-            )
-
-        # 3) Roll reward (deterministic per user/day for audit; no external RNG needed)
-        seed = f"{user_id}:{day_utc.isoformat()}"
-        rng = Random(seed)
-        roll = rng.random()
-
-        reward_type: SpinRewardType
-        reward_value: int
-
-        # 4) Cash cap per user/week
-        can_cash = True
-        if SpinService.CASH_MAX_PER_USER_PER_WEEK > 0:
-            res = await session.execute(
-                select(SpinHistory.id).where(
-                    SpinHistory.user_id == user_id,
-                    SpinHistory.week_start == week_start,
-                    SpinHistory.reward_type == SpinRewardType.CASH,
-                )
+        # Cash roll: reserve from the global budget (one guarded upsert), else pay points
+        reservation: CashReservation | None = None
+        refused = False
+        if reward_type == SpinRewardType.CASH:
+            reservation = await reserve_cash(
+                session,
+                day_utc=day_utc,
+                week_start=week_start,
+                cents=reward_value,
+                daily_limit_cents=cash_budget.daily_limit_cents if cash_budget else 0,
+                weekly_limit_cents=cash_budget.weekly_limit_cents if cash_budget else 0,
             )
-            cash_wins = len(res.all())
-            can_cash = cash_wins < SpinService.CASH_MAX_PER_USER_PER_WEEK
-
-        if roll < SpinService.CASH_CHANCE and can_cash:
-            reward_type = SpinRewardType.CASH
-            reward_value = SpinService.CASH_CENTS
-        elif roll < SpinService.CASH_CHANCE + SpinService.NONE_CHANCE:
-            reward_type = SpinRewardType.NONE
-            reward_value = 0
-        else:
-            reward_type = SpinRewardType.POINTS
-            reward_value = rng.randint(SpinService.POINTS_MIN, SpinService.POINTS_MAX)
-
-        # 5) Persist reward + award points if needed
-        async with transactional(session):
-            # Update history row for today
-            # (we re-fetch the row to update it safely)
-            hist = await session.scalar(
-                select(SpinHistory).where(
-                    SpinHistory.user_id == user_id,
-                    SpinHistory.day_utc == day_utc,
+            if reservation is None:
+                refused = True
+                fallback = SpinService.draw(user_id=user_id, day_utc=day_utc, cash_available=False)
+                reward_type, reward_value = fallback.reward_type, fallback.reward_value
+                await set_spin_reward(
+                    session, user_id=user_id, day_utc=day_utc, reward_type=reward_type, reward_value=reward_value
                 )
+        # a cash roll paid as points: refused above, or the budget was already known to be spent
+        downgraded = draw.roll < SpinService.CASH_CHANCE and reward_type == SpinRewardType.POINTS
+        if downgraded:
+            await record_downgrade(session, day_utc=day_utc, week_start=week_start)
+
+        # Round-trip 2: the spin's writes (same transaction; the caller's commit covers all)
+        if reward_type == SpinRewardType.POINTS and reward_value > 0:
+            await award_points_bulk(
+                session,
+                awards=[BulkAward(user_id=user_id, day_utc=day_utc, ref_id=int(day_utc.strftime("%Y%m%d")))],
+                source=PointSource.SPIN,
+                points=reward_value,
+                ref_type="spin",
             )
-            if hist is None:
-                # should never happen, but avoid crashing
-                return SpinResult(ok=False, locked=False, already=False, message="Spin error: history missing.")
-
-            hist.reward_type = reward_type
-            hist.reward_value = reward_value
-            hist.roll = f"{roll:.6f}"
-
-            if reward_type == SpinRewardType.POINTS and reward_value > 0:
-                await PointsService.add_points(
-                    session,
-                    user_id=user_id,
-                    week_start=week_start,
-                    day_utc=day_utc,
-                    source=PointSource.SPIN,
-                    points=reward_value,
-                    ref_type="spin",
-                    ref_id=int(day_utc.strftime("%Y%m%d")),
-                )
-
-        # 6) Mark daily action done (use SAVEPOINT-safe mark_done you fixed)
         await TaskProgressService.mark_done(
             session,
             user_id=user_id,
@@ -175,7 +198,18 @@ class SpinService:
             action_type=DailyActionType.SPIN,
         )
 
-        # 7) Message
+        budget_note: SpinBudgetNote | None = None
+        if cash_budget is not None and (reservation is not None or refused or downgraded):
+            usage = await get_budget_usage(session, day_utc=day_utc, week_start=week_start) if refused else None
+            budget_note = SpinBudgetNote(
+                day_utc=day_utc,
+                week_start=week_start,
+                reservation=reservation,
+                refused_usage=usage,
+                downgraded=downgraded,
+            )
+
+        # Message
         if reward_type == SpinRewardType.CASH:
             msg = "💸 <b>JACKPOT!</b>\nYou won <b>$5 cash</b>! An admin will contact you."
         elif reward_type == SpinRewardType.NONE:
@@ -190,4 +224,5 @@ class SpinService:
             message=msg,
             reward_type=reward_type,
             reward_value=reward_value,
+            budget_note=budget_note,
         )
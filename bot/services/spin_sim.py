@@ -0,0 +1,585 @@
+# bot/services/spin_sim.py
+"""
+Spin economy simulator (NumPy).
+
+SpinService rolls `Random(f"{user_id}:{day}")`: one random() for the bucket, then
+randint(POINTS_MIN, POINTS_MAX) for points. Only the seeding is per-row Python work,
+so it is done once: replay_draws() keeps the roll plus the next raw 32-bit words of
+every user-day, and evaluate() applies any SpinParams to those arrays (randint is
+re-derived from the words exactly like random._randbelow). Cash rolls then go through
+the same checks as a spin, in spin order: the per-user weekly cap, then the global
+day/week budget, a refused win being paid as points (a downgrade). Forecasts draw the
+same distributions straight from a NumPy Generator.
+
+Requires numpy (imported lazily by the bot: /spin_sim answers without it).
+"""
+from __future__ import annotations
+
+import dataclasses
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, timedelta
+from random import Random
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.models import DailyProgress, PointEvent, PointSource, SpinHistory, SpinRewardType
+from bot.services.spin import SpinService
+from bot.utils.dates import utc_today, week_start_monday
+
+WORDS = 6  # raw draws kept after the roll; randint needs a 7th with probability < 2**-6
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # a Thursday
+NONE, POINTS, CASH = 0, 1, 2
+TOP_K = 10
+
+
+@dataclass(frozen=True, slots=True)
+class SpinParams:
+    cash_chance: float
+    none_chance: float
+    points_min: int
+    points_max: int
+    cash_cents: int
+    cash_max_per_user_per_week: int  # 0 = no cap
+    cash_daily_budget_cents: int = 0  # global, 0 = no limit (SPIN_CASH_DAILY_BUDGET_CENTS)
+    cash_weekly_budget_cents: int = 0  # global, 0 = no limit (SPIN_CASH_WEEKLY_BUDGET_CENTS)
+
+    def __post_init__(self) -> None:
+        if not (0 <= self.cash_chance <= 1 and 0 <= self.none_chance <= 1):
+            raise ValueError("chances must be between 0 and 1")
+        if self.cash_chance + self.none_chance > 1:
+            raise ValueError("cash + none chance must not exceed 1")
+        if not (1 <= self.points_min <= self.points_max):
+            raise ValueError("need 1 <= points min <= points max")
+        if self.cash_cents < 0 or self.cash_max_per_user_per_week < 0:
+            raise ValueError("cash amount and cap must not be negative")
+        if self.cash_daily_budget_cents < 0 or self.cash_weekly_budget_cents < 0:
+            raise ValueError("cash budgets must not be negative")
+
+    @property
+    def has_budget(self) -> bool:
+        return self.cash_daily_budget_cents > 0 or self.cash_weekly_budget_cents > 0
+
+    @classmethod
+    def current(cls, *, daily_budget_cents: int = 0, weekly_budget_cents: int = 0) -> "SpinParams":
+        """SpinService's constants plus the configured cash budget (settings, passed by the caller)."""
+        return cls(
+            cash_chance=SpinService.CASH_CHANCE,
+            none_chance=SpinService.NONE_CHANCE,
+            points_min=SpinService.POINTS_MIN,
+            points_max=SpinService.POINTS_MAX,
+            cash_cents=SpinService.CASH_CENTS,
+            cash_max_per_user_per_week=SpinService.CASH_MAX_PER_USER_PER_WEEK,
+            cash_daily_budget_cents=daily_budget_cents,
+            cash_weekly_budget_cents=weekly_budget_cents,
+        )
+
+    def replace(self, **changes) -> "SpinParams":
+        return dataclasses.replace(self, **changes)
+
+
+# -------------------------------------------------
+# Draws (settings-independent)
+# -------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class SpinDraws:
+    """One row per spin, in spin order (the global budget is spent in that order)."""
+    user_id: np.ndarray  # int64
+    day: np.ndarray  # int64, days since 1970-01-01
+    roll: np.ndarray  # float64, the bucket roll
+    words: np.ndarray  # uint32 (n, WORDS), the raw draws randint() consumes
+    exact: bool  # True: replayed from the real seeds (fallbacks re-seed), False: Monte Carlo
+
+    def __len__(self) -> int:
+        return len(self.roll)
+
+
+def _seed(user_id: int, day: int) -> str:
+    return f"{user_id}:{date.fromordinal(EPOCH_ORDINAL + day).isoformat()}"
+
+
+def _replay_chunk(pairs: list[tuple[int, int]]) -> tuple[list[float], list[int]]:
+    rolls: list[float] = []
+    words: list[int] = []
+    for user_id, day in pairs:
+        rng = Random(_seed(user_id, day))
+        rolls.append(rng.random())
+        words.extend(rng.getrandbits(32) for _ in range(WORDS))
+    return rolls, words
+
+
+def replay_draws(user_ids: np.ndarray, days: np.ndarray, *, workers: int = 1) -> SpinDraws:
+    """
+    Exact per-seed replay (~9 µs per user-day per worker). Do it once, evaluate many times.
+    """
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    pairs = list(zip(user_ids.tolist(), days.tolist()))
+
+    if workers > 1 and len(pairs) > 50_000:
+        step = -(-len(pairs) // (workers * 4))
+        chunks = [pairs[i : i + step] for i in range(0, len(pairs), step)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_replay_chunk, chunks))
+    else:
+        parts = [_replay_chunk(pairs)]
+
+    rolls = np.fromiter((r for p in parts for r in p[0]), dtype=np.float64, count=len(pairs))
+    words = np.fromiter((w for p in parts for w in p[1]), dtype=np.uint32, count=len(pairs) * WORDS)
+    return SpinDraws(user_id=user_ids, day=days, roll=rolls, words=words.reshape(-1, WORDS), exact=True)
+
+
+_replay_cache: dict[tuple, SpinDraws] = {}
+
+
+def cached_replay(user_ids: np.ndarray, days: np.ndarray) -> SpinDraws:
+    """replay_draws() memoised for the last window (repeated /spin_sim calls only re-evaluate)."""
+    key = (len(user_ids), hash(np.asarray(user_ids).tobytes()), hash(np.asarray(days).tobytes()))
+    draws = _replay_cache.get(key)
+    if draws is None:
+        draws = replay_draws(user_ids, days)
+        _replay_cache.clear()
+        _replay_cache[key] = draws
+    return draws
+
+
+def random_draws(user_ids: np.ndarray, days: np.ndarray, rng: np.random.Generator) -> SpinDraws:
+    n = len(user_ids)
+    return SpinDraws(
+        user_id=np.asarray(user_ids, dtype=np.int64),
+        day=np.asarray(days, dtype=np.int64),
+        roll=rng.random(n),
+        words=rng.integers(0, 2**32, size=(n, WORDS), dtype=np.uint32),
+        exact=False,
+    )
+
+
+# -------------------------------------------------
+# Evaluation
+# -------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class SpinOutcome:
+    reward: np.ndarray  # int8: NONE / POINTS / CASH
+    value: np.ndarray  # int64: points, or cents for cash
+    downgraded: np.ndarray  # bool: a cash roll the budget refused, paid as points
+
+
+def _week_index(day: np.ndarray) -> np.ndarray:
+    return (day + 3) // 7  # Monday-based weeks (day 0 is a Thursday)
+
+
+def _cash_under_cap(eligible: np.ndarray, user_id: np.ndarray, day: np.ndarray, cap: int) -> np.ndarray:
+    """
+    Same as the per-spin "cash wins this week < cap" check, applied in day order.
+    """
+    week = _week_index(day)
+    order = np.lexsort((day, week, user_id))
+    e = eligible[order].astype(np.int64)
+    u, w = user_id[order], week[order]
+
+    starts = np.ones(len(e), dtype=bool)
+    starts[1:] = (u[1:] != u[:-1]) | (w[1:] != w[:-1])
+    cum = np.cumsum(e)
+    group_base = np.maximum.accumulate(np.where(starts, cum - e, 0))
+    before = cum - e - group_base  # cash wins earlier in the same user-week
+
+    out = np.empty(len(e), dtype=bool)
+    out[order] = (e == 1) & (before < cap)
+    return out
+
+
+def _cash_within_budget(
+    eligible: np.ndarray, user_id: np.ndarray, day: np.ndarray, params: SpinParams
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (cash, downgraded) for the cash rolls, replaying SpinService one spin at a time in spin
+    order: past the user's weekly cap nothing is won; otherwise the win is reserved from the
+    day/week budget (reserve_cash) or, refused, paid as points. Cash rolls are rare, so the
+    Python loop only visits those.
+    """
+    week = _week_index(day)
+    idx = np.flatnonzero(eligible)
+    idx = idx[np.argsort(day[idx], kind="stable")]
+
+    cash = np.zeros(len(eligible), dtype=bool)
+    downgraded = np.zeros(len(eligible), dtype=bool)
+    wins: dict[tuple[int, int], int] = {}
+    day_spent: dict[int, int] = {}
+    week_spent: dict[int, int] = {}
+    cap, cents = params.cash_max_per_user_per_week, params.cash_cents
+    for i in idx.tolist():
+        u, d, w = int(user_id[i]), int(day[i]), int(week[i])
+        if cap and wins.get((u, w), 0) >= cap:
+            continue
+        day_total = day_spent.get(d, 0) + cents
+        week_total = week_spent.get(w, 0) + cents
+        if (params.cash_daily_budget_cents and day_total > params.cash_daily_budget_cents) or (
+            params.cash_weekly_budget_cents and week_total > params.cash_weekly_budget_cents
+        ):
+            downgraded[i] = True
+            continue
+        cash[i] = True
+        wins[(u, w)] = wins.get((u, w), 0) + 1
+        day_spent[d], week_spent[w] = day_total, week_total
+    return cash, downgraded
+
+
+def _randint_from_words(words: np.ndarray, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray]:
+    """random.randint(lo, hi) replayed from raw getrandbits(32) draws: (values, resolved)."""
+    n = hi - lo + 1
+    k = n.bit_length()
+    r = words >> np.uint32(32 - k)
+    ok = r < n
+    first = ok.argmax(axis=1)
+    resolved = ok.any(axis=1)
+    return r[np.arange(len(r)), first].astype(np.int64) + lo, resolved
+
+
+def evaluate(draws: SpinDraws, params: SpinParams, *, rng: np.random.Generator | None = None) -> SpinOutcome:
+    cash_e = draws.roll < params.cash_chance
+    downgraded = np.zeros(len(draws), dtype=bool)
+    if params.has_budget:
+        cash, downgraded = _cash_within_budget(cash_e, draws.user_id, draws.day, params)
+    elif params.cash_max_per_user_per_week > 0:
+        cash = _cash_under_cap(cash_e, draws.user_id, draws.day, params.cash_max_per_user_per_week)
+    else:
+        cash = cash_e
+    # a downgrade re-seeds and rolls points exactly like a points spin
+    none = ~cash & ~downgraded & (draws.roll < params.cash_chance + params.none_chance)
+    pts = ~cash & ~none
+
+    value = np.zeros(len(draws), dtype=np.int64)
+    value[cash] = params.cash_cents
+
+    idx = np.flatnonzero(pts)
+    vals, resolved = _randint_from_words(draws.words[idx], params.points_min, params.points_max)
+    for j in np.flatnonzero(~resolved):  # rare: the words ran out
+        if draws.exact:
+            r = Random(_seed(int(draws.user_id[idx[j]]), int(draws.day[idx[j]])))
+            r.random()
+            vals[j] = r.randint(params.points_min, params.points_max)
+        else:
+            vals[j] = (rng or np.random.default_rng()).integers(params.points_min, params.points_max + 1)
+    value[idx] = vals
+
+    reward = np.full(len(draws), NONE, dtype=np.int8)
+    reward[pts] = POINTS
+    reward[cash] = CASH
+    return SpinOutcome(reward=reward, value=value, downgraded=downgraded)
+
+
+# -------------------------------------------------
+# Backtest + forecast
+# -------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class Backtest:
+    weeks: float
+    points_per_week: float
+    cash_cents_per_week: float
+    cash_wins: int
+    downgrades: int  # cash rolls the budget refused
+
+
+def backtest(draws: SpinDraws, outcome: SpinOutcome, *, weeks: float) -> Backtest:
+    weeks = max(weeks, 1e-9)
+    return Backtest(
+        weeks=weeks,
+        points_per_week=float(outcome.value[outcome.reward == POINTS].sum()) / weeks,
+        cash_cents_per_week=float(outcome.value[outcome.reward == CASH].sum()) / weeks,
+        cash_wins=int((outcome.reward == CASH).sum()),
+        downgrades=int(outcome.downgraded.sum()),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class Dist:
+    mean: float
+    p5: float
+    p50: float
+    p95: float
+
+    @classmethod
+    def of(cls, x: np.ndarray) -> "Dist":
+        p5, p50, p95 = np.percentile(x, [5, 50, 95]) if len(x) else (0.0, 0.0, 0.0)
+        return cls(mean=float(x.mean()) if len(x) else 0.0, p5=float(p5), p50=float(p50), p95=float(p95))
+
+
+@dataclass(frozen=True, slots=True)
+class Forecast:
+    trials: int
+    points: Dist  # points minted per week
+    cash_cents: Dist  # cash paid per week
+    downgrades: Dist  # cash rolls per week the budget paid as points
+    top_churn: Dist  # members of the top-K that spins push out of it
+    top_spin_share: Dist  # share of top-K weekly points coming from spins
+
+
+def forecast(
+    rates: np.ndarray,
+    base_points: np.ndarray,
+    params: SpinParams,
+    *,
+    trials: int = 500,
+    rng: np.random.Generator | None = None,
+    max_cells: int = 4_000_000,
+) -> Forecast:
+    """
+    One week × `trials`: each user spins on each day with their observed rate; spin points
+    are added to their usual non-spin weekly points to measure leaderboard impact.
+    With a cash budget, each day's cash rolls are served in a random order until the
+    day/week budget is spent; the rest are paid as points.
+    """
+    rng = rng or np.random.default_rng()
+    rates = np.asarray(rates, dtype=np.float64)
+    base_points = np.asarray(base_points, dtype=np.float64)
+    n_users = len(rates)
+    k = min(TOP_K, n_users)
+
+    in_base_top = np.zeros(n_users, dtype=bool)
+    if k:
+        in_base_top[np.argpartition(-base_points, k - 1)[:k]] = True
+
+    points, cash, downs, churn, share = [], [], [], [], []
+    batch = max(1, max_cells // max(1, n_users * 7))
+    for start in range(0, trials, batch):
+        b = min(batch, trials - start)
+        shape = (b, n_users, 7)
+        spun = rng.random(shape) < rates[None, :, None]
+        roll = rng.random(shape)
+
+        cash_e = spun & (roll < params.cash_chance)
+        down = np.zeros(shape, dtype=bool)
+        if params.has_budget:
+            won = _forecast_budget(cash_e, params, rng)
+            down = cash_e & ~won & _under_cap(won, cash_e, params.cash_max_per_user_per_week)
+        elif params.cash_max_per_user_per_week > 0:
+            won = cash_e & ((np.cumsum(cash_e, axis=2) - cash_e) < params.cash_max_per_user_per_week)
+        else:
+            won = cash_e
+        none = spun & ~won & ~down & (roll < params.cash_chance + params.none_chance)
+        pts_mask = spun & ~won & ~none
+        pts = np.where(pts_mask, rng.integers(params.points_min, params.points_max + 1, size=shape), 0)
+
+        user_pts = pts.sum(axis=2)  # (b, users)
+        points.append(user_pts.sum(axis=1))
+        cash.append(won.sum(axis=(1, 2)) * params.cash_cents)
+        downs.append(down.sum(axis=(1, 2)))
+
+        if k:
+            total = base_points[None, :] + user_pts
+            top = np.argpartition(-total, k - 1, axis=1)[:, :k]
+            churn.append(k - in_base_top[top].sum(axis=1))
+            top_total = np.take_along_axis(total, top, axis=1).sum(axis=1)
+            top_spin = np.take_along_axis(user_pts, top, axis=1).sum(axis=1)
+            share.append(np.divide(top_spin, top_total, out=np.zeros(b), where=top_total > 0))
+
+    cat = lambda xs: np.concatenate(xs) if xs else np.zeros(0)  # noqa: E731
+    return Forecast(
+        trials=trials,
+        points=Dist.of(cat(points)),
+        cash_cents=Dist.of(cat(cash)),
+        downgrades=Dist.of(cat(downs)),
+        top_churn=Dist.of(cat(churn)),
+        top_spin_share=Dist.of(cat(share)),
+    )
+
+
+def _under_cap(won: np.ndarray, cash_e: np.ndarray, cap: int) -> np.ndarray:
+    """Cash rolls (b, users, 7) still under the user's weekly cap, given the wins before them."""
+    if cap <= 0:
+        return cash_e
+    return cash_e & ((np.cumsum(won, axis=2) - won) < cap)
+
+
+def _forecast_budget(cash_e: np.ndarray, params: SpinParams, rng: np.random.Generator) -> np.ndarray:
+    """Cash wins (b, users, 7) under the weekly cap and the day/week budget, day by day."""
+    b, n_users, n_days = cash_e.shape
+    cents = params.cash_cents
+    won = np.zeros(cash_e.shape, dtype=bool)
+    wins = np.zeros((b, n_users), dtype=np.int64)
+    week_spent = np.zeros(b, dtype=np.int64)
+    order = rng.random(cash_e.shape)  # who spins first within the day
+
+    for d in range(n_days):
+        eligible = cash_e[:, :, d]
+        if params.cash_max_per_user_per_week > 0:
+            eligible = eligible & (wins < params.cash_max_per_user_per_week)
+        allowed = np.full(b, n_users, dtype=np.int64)
+        if cents > 0:
+            if params.cash_daily_budget_cents:
+                allowed = np.minimum(allowed, params.cash_daily_budget_cents // cents)
+            if params.cash_weekly_budget_cents:
+                allowed = np.minimum(allowed, (params.cash_weekly_budget_cents - week_spent) // cents)
+        place = np.where(eligible, order[:, :, d], np.inf).argsort(axis=1).argsort(axis=1)
+        day_won = eligible & (place < allowed[:, None])
+        won[:, :, d] = day_won
+        wins += day_won
+        week_spent += day_won.sum(axis=1) * cents
+    return won
+
+
+# -------------------------------------------------
+# Inputs from the DB
+# -------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class SimInputs:
+    since: date
+    days: int
+    spin_user_id: np.ndarray  # recorded spins
+    spin_day: np.ndarray
+    spin_reward: np.ndarray  # int8
+    spin_value: np.ndarray
+    user_ids: np.ndarray  # everyone active or with points in the window
+    rates: np.ndarray  # spins per calendar day
+    active_days: np.ndarray  # days with any task done (daily_progress)
+    base_points: np.ndarray  # non-spin points per week
+
+
+_REWARD_CODES = {SpinRewardType.NONE: NONE, SpinRewardType.POINTS: POINTS, SpinRewardType.CASH: CASH}
+
+
+async def load_sim_inputs(session: AsyncSession, *, days: int = 28, today: date | None = None) -> SimInputs:
+    """
+    Three grouped reads: spin_history rows, active days per user (daily_progress),
+    non-spin points per user (point_events), all over the last `days` days.
+    """
+    today = today or utc_today()
+    since = week_start_monday(today - timedelta(days=days))  # whole weeks: the cap and budget replay exactly
+    days = (today - since).days
+
+    res = await session.execute(
+        select(SpinHistory.user_id, SpinHistory.day_utc, SpinHistory.reward_type, SpinHistory.reward_value)
+        .where(SpinHistory.day_utc >= since, SpinHistory.day_utc < today)
+        .order_by(SpinHistory.day_utc.asc(), SpinHistory.id.asc())  # spin order, for the budget
+    )
+    spins = res.all()
+
+    res = await session.execute(
+        select(DailyProgress.user_id, func.count())
+        .where(DailyProgress.day_utc >= since, DailyProgress.day_utc < today)
+        .group_by(DailyProgress.user_id)
+    )
+    active = {int(u): int(n) for u, n in res.all()}
+
+    res = await session.execute(
+        select(PointEvent.user_id, func.sum(PointEvent.points))
+        .where(PointEvent.day_utc >= since, PointEvent.day_utc < today, PointEvent.source != PointSource.SPIN)
+        .group_by(PointEvent.user_id)
+    )
+    earned = {int(u): int(p or 0) for u, p in res.all()}
+
+    spin_user = np.array([int(r[0]) for r in spins], dtype=np.int64)
+    spin_day = np.array([r[1].toordinal() - EPOCH_ORDINAL for r in spins], dtype=np.int64)
+
+    user_ids = np.array(sorted(set(active) | set(earned) | set(spin_user.tolist())), dtype=np.int64)
+    pos = {u: i for i, u in enumerate(user_ids.tolist())}
+    spun_days = np.zeros(len(user_ids))
+    np.add.at(spun_days, [pos[u] for u in spin_user.tolist()], 1)
+    active_days = np.array([active.get(u, 0) for u in user_ids.tolist()], dtype=np.float64)
+
+    return SimInputs(
+        since=since,
+        days=days,
+        spin_user_id=spin_user,
+        spin_day=spin_day,
+        spin_reward=np.array([_REWARD_CODES[r[2]] for r in spins], dtype=np.int8),
+        spin_value=np.array([int(r[3] or 0) for r in spins], dtype=np.int64),
+        user_ids=user_ids,
+        rates=np.minimum(spun_days / days, 1.0),
+        active_days=np.maximum(active_days, spun_days),
+        base_points=np.array([earned.get(u, 0) for u in user_ids.tolist()], dtype=np.float64) / (days / 7),
+    )
+
+
+# -------------------------------------------------
+# Report
+# -------------------------------------------------
+
+def _money(cents: float) -> str:
+    return f"${cents / 100:,.2f}"
+
+
+def _params_line(p: SpinParams) -> str:
+    cap = f"{p.cash_max_per_user_per_week}/wk" if p.cash_max_per_user_per_week else "no cap"
+    limits = [
+        f"{_money(cents)}/{period}"
+        for cents, period in ((p.cash_daily_budget_cents, "day"), (p.cash_weekly_budget_cents, "wk"))
+        if cents
+    ]
+    budget = f"budget {' + '.join(limits)}" if limits else "no budget"
+    return (
+        f"cash {p.cash_chance:.2%} ({_money(p.cash_cents)}, {cap}, {budget}) • none {p.none_chance:.1%} • "
+        f"points {p.points_min}–{p.points_max}"
+    )
+
+
+def simulate_report(
+    inputs: SimInputs,
+    proposed: SpinParams,
+    *,
+    current: SpinParams | None = None,
+    trials: int = 500,
+    seed: int | None = None,
+    draws: SpinDraws | None = None,
+) -> str:
+    """
+    Current vs proposed settings: exact replay of the recorded spins, then a one-week forecast.
+    Pass `draws` to reuse an earlier replay of the same inputs.
+    """
+    t0 = time.perf_counter()
+    current = current or SpinParams.current()
+    rng = np.random.default_rng(seed)
+    weeks = inputs.days / 7
+
+    draws = draws or cached_replay(inputs.spin_user_id, inputs.spin_day)
+    cur_out = evaluate(draws, current, rng=rng)
+    new_out = evaluate(draws, proposed, rng=rng)
+    cur_bt = backtest(draws, cur_out, weeks=weeks)
+    new_bt = backtest(draws, new_out, weeks=weeks)
+    matches = (
+        float(((cur_out.reward == inputs.spin_reward) & (cur_out.value == inputs.spin_value)).mean())
+        if len(draws)
+        else 1.0
+    )
+
+    cur_fc = forecast(inputs.rates, inputs.base_points, current, trials=trials, rng=rng)
+    new_fc = forecast(inputs.rates, inputs.base_points, proposed, trials=trials, rng=rng)
+
+    spinners = int((inputs.rates > 0).sum())
+    active_total = float(inputs.active_days.sum())
+    lines = [
+        "🎰 Spin economy simulation",
+        f"Window: {inputs.since.isoformat()} + {inputs.days} days • {len(inputs.user_ids)} active users "
+        f"• {len(draws)} spins by {spinners} users ({len(draws) / active_total if active_total else 0:.0%} of active days)",
+        "",
+        f"Current:  {_params_line(current)}",
+        f"Proposed: {_params_line(proposed)}",
+        "",
+        "Replay of the real spins (exact seeds), per week:",
+        f"• points minted: {cur_bt.points_per_week:,.0f} → {new_bt.points_per_week:,.0f}",
+        f"• cash paid: {_money(cur_bt.cash_cents_per_week)} → {_money(new_bt.cash_cents_per_week)} "
+        f"({cur_bt.cash_wins} → {new_bt.cash_wins} wins in the window)",
+        f"• cash rolls paid as points (budget): {cur_bt.downgrades} → {new_bt.downgrades} in the window",
+        f"• replay matches recorded spins: {matches:.1%}",
+        "",
+        f"Forecast, one week × {trials} trials (p5 / p50 / p95), current → proposed:",
+    ]
+    for label, a, b, fmt in (
+        ("points minted", cur_fc.points, new_fc.points, lambda v: f"{v:,.0f}"),
+        ("cash paid", cur_fc.cash_cents, new_fc.cash_cents, _money),
+        ("cash rolls paid as points", cur_fc.downgrades, new_fc.downgrades, lambda v: f"{v:.1f}"),
+        (f"top-{TOP_K} pushed out by spins", cur_fc.top_churn, new_fc.top_churn, lambda v: f"{v:.1f}"),
+        (f"spin share of top-{TOP_K} points", cur_fc.top_spin_share, new_fc.top_spin_share, lambda v: f"{v:.0%}"),
+    ):
+        lines.append(
+            f"• {label}: {fmt(a.p5)} / {fmt(a.p50)} / {fmt(a.p95)} → {fmt(b.p5)} / {fmt(b.p50)} / {fmt(b.p95)}"
+        )
+    lines += ["", f"Computed in {time.perf_counter() - t0:.2f} s"]
+    return "\n".join(lines)
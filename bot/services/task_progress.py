@@ -3,11 +3,11 @@ from __future__ import annotations
 
 from datetime import date
 
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.database.models import DailyAction, DailyActionType
+from bot.database.models import DAILY_ACTION_BITS, DailyAction, DailyActionType
+from bot.database.repo.daily_progress_repo import get_progress_mask, or_progress
 
 
 def _normalize_action_type(action_type: DailyActionType | str) -> str:
@@ -16,7 +16,22 @@ def _normalize_action_type(action_type: DailyActionType | str) -> str:
     return str(action_type).strip()
 
 
+def action_bit(action_type: DailyActionType | str) -> int:
+    at = _normalize_action_type(action_type)
+    try:
+        return DAILY_ACTION_BITS[at]
+    except KeyError:
+        raise ValueError(f"Unknown daily action type: {at}") from None
+
+
+def mask_to_set(mask: int) -> set[str]:
+    return {at for at, bit in DAILY_ACTION_BITS.items() if mask & bit}
+
+
 class TaskProgressService:
+    # Migration period: keep writing daily_actions too (turned off via DAILY_ACTIONS_DUAL_WRITE=false)
+    dual_write: bool = True
+
     @staticmethod
     async def mark_done(
         session: AsyncSession,
@@ -25,23 +40,38 @@ class TaskProgressService:
         day_utc: date,
         action_type: DailyActionType | str,
     ) -> None:
-        at = _normalize_action_type(action_type)
+        await TaskProgressService.mark_done_many(session, items=[(user_id, day_utc)], action_type=action_type)
 
-        # ✅ Use a SAVEPOINT so duplicates don't rollback the whole session
-        try:
-            async with session.begin_nested():
-                session.add(DailyAction(user_id=user_id, day_utc=day_utc, action_type=at))
-                await session.flush()
-        except IntegrityError:
-            # duplicate => already done, ignore
+    @staticmethod
+    async def mark_done_many(
+        session: AsyncSession,
+        *,
+        items: list[tuple[int, date]],
+        action_type: DailyActionType | str,
+    ) -> None:
+        """
+        mark_done for many (user_id, day_utc) pairs: one OR upsert into daily_progress
+        (+ one INSERT OR IGNORE into daily_actions while dual-writing). No savepoints.
+        """
+        if not items:
             return
+        at = _normalize_action_type(action_type)
+        bit = action_bit(at)
+        pairs = set(items)
+
+        await or_progress(session, {pair: bit for pair in pairs})
+
+        if TaskProgressService.dual_write:
+            await session.execute(
+                sqlite_insert(DailyAction)
+                .values([{"user_id": uid, "day_utc": day, "action_type": at} for uid, day in pairs])
+                .on_conflict_do_nothing(index_elements=["user_id", "day_utc", "action_type"])
+            )
+
+    @staticmethod
+    async def done_mask(session: AsyncSession, *, user_id: int, day_utc: date) -> int:
+        return await get_progress_mask(session, user_id=user_id, day_utc=day_utc)
 
     @staticmethod
     async def done_set(session: AsyncSession, *, user_id: int, day_utc: date) -> set[str]:
-        res = await session.execute(
-            select(DailyAction.action_type).where(
-                DailyAction.user_id == user_id,
-                DailyAction.day_utc == day_utc,
-            )
-        )
-        return {row[0] for row in res.all()}
+        return mask_to_set(await get_progress_mask(session, user_id=user_id, day_utc=day_utc))
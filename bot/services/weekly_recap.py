@@ -0,0 +1,230 @@
+# bot/services/weekly_recap.py
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+from aiogram.types import BufferedInputFile
+
+from bot.config.settings import Settings
+from bot.database.repo.leaderboard_repo import week_start_utc
+from bot.database.repo.weekly_recap_repo import (
+    RecapRow,
+    best_days,
+    claim_chunk,
+    complete_chunk,
+    count_active_between,
+    fetch_recap_chunk,
+    finish_run,
+    get_or_create_run,
+    skip_interrupted_chunk,
+    snapshot_recap_ranks,
+)
+from bot.utils.cards.card_cache import card_key
+from bot.utils.cards.personal_card import render_weekly_recap_card
+from bot.utils.cards.render_service import CardRenderService
+from bot.utils.media_registry import MediaRegistry
+from bot.utils.outbound import SendPriority, send_priority
+
+log = logging.getLogger("bot.weekly_recap")
+
+CHUNK_SIZE = 500  # users read from the DB per round-trip
+SEND_CONCURRENCY = 16  # recaps rendering/sending at once (outbound scheduler does the rate limiting)
+SEND_BATCH = SEND_CONCURRENCY  # users sent between two cursor saves: at most this many are lost to a crash
+
+_run_lock = asyncio.Lock()
+
+
+@dataclass(frozen=True, slots=True)
+class RecapResult:
+    week_start: date
+    sent: int
+    failed: int
+    skipped: int  # cut off by a restart (not resent)
+
+
+def _display_name(username: str | None, first_name: str | None, last_name: str | None) -> str:
+    if username:
+        return f"@{username}"
+    name = " ".join([p for p in [first_name, last_name] if p])
+    return name.strip() or "User"
+
+
+def previous_week_start(today: date | None = None) -> date:
+    today = today or datetime.now(tz=ZoneInfo("UTC")).date()
+    return week_start_utc(today) - timedelta(days=7)
+
+
+async def _send_one(
+    bot: Bot,
+    renderer: CardRenderService,
+    media: MediaRegistry | None,
+    row: RecapRow,
+    *,
+    week_start: date,
+    best: tuple[date, int] | None,
+) -> bool:
+    card_kwargs = dict(
+        name=_display_name(row.username, row.first_name, row.last_name),
+        week_start=week_start,
+        week_end=week_start + timedelta(days=6),
+        points=row.points,
+        rank=row.rank,
+        streak=row.streak,
+        best_day=best[0] if best else None,
+        best_day_points=best[1] if best else 0,
+    )
+
+    async def _render() -> bytes:
+        return await renderer.render(render_weekly_recap_card, **card_kwargs)
+
+    filename = f"recap_{week_start.isoformat()}.png"
+    caption = f"📊 <b>Your week in review</b>\nFinal rank: <b>#{row.rank}</b> • <b>{row.points}</b> pts"
+    try:
+        if media is not None:
+            await media.send_photo(
+                bot,
+                chat_id=row.telegram_id,
+                key=card_key("weekly_recap", **card_kwargs),
+                render=_render,
+                filename=filename,
+                caption=caption,
+            )
+        else:
+            await bot.send_photo(
+                chat_id=row.telegram_id,
+                photo=BufferedInputFile(await _render(), filename=filename),
+                caption=caption,
+            )
+    except (TelegramForbiddenError, TelegramBadRequest) as e:
+        # never started the bot / blocked it / deleted account
+        log.debug("Recap not delivered user_id=%s: %s", row.user_id, e)
+        return False
+    return True
+
+
+async def run_weekly_recap(
+    bot: Bot,
+    db,
+    settings: Settings,
+    *,
+    week_start: date | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    media: MediaRegistry | None = None,
+) -> RecapResult | None:
+    """
+    Sends every active user (points > 0) of the finished week a private recap card.
+
+    - final ranks are snapshotted once per run (weekly_recap_ranks); users are then read
+      from it in user_id-ordered keyset chunks (bounded memory and work per chunk)
+    - cards render in a dedicated pool (CARD_RENDER_MODE; interactive renders keep their own)
+      and go out through the media registry when one is given
+    - sends go out at BROADCAST priority, so interactive replies always go first
+    - progress is kept in weekly_recap_runs after every SEND_BATCH users; re-running
+      resumes there (a crash skips at most one batch), finished weeks are no-ops
+    Returns None when the week was already done or another run is in progress.
+    """
+    if _run_lock.locked():
+        log.warning("Weekly recap already running, skipping")
+        return None
+
+    week_start = week_start or previous_week_start()
+
+    async with _run_lock:
+        async with db.session() as session:
+            run = await get_or_create_run(session, week_start=week_start)
+            await session.commit()
+
+            if run.status == "done":
+                log.info("Weekly recap for %s already finished", week_start)
+                return None
+
+            # rank once per run; chunks then page the snapshot by user_id
+            ranked = await snapshot_recap_ranks(session, week_start=week_start)
+            await session.commit()
+            if ranked:
+                log.info("Weekly recap %s: ranked %s users", week_start, ranked)
+
+            if run.claimed_user_id > run.done_user_id:
+                # restart in the middle of a send batch: part of it may already be delivered
+                skipped = await count_active_between(
+                    session,
+                    week_start=week_start,
+                    after_user_id=run.done_user_id,
+                    upto_user_id=run.claimed_user_id,
+                )
+                await skip_interrupted_chunk(session, run_id=run.id, skipped=skipped)
+                await session.commit()
+                log.warning("Weekly recap %s: skipped %s users of an interrupted batch", week_start, skipped)
+
+            run_id = run.id
+            cursor = max(run.claimed_user_id, run.done_user_id)
+
+        renderer = CardRenderService(
+            mode=settings.card_render_mode,
+            workers=settings.card_render_workers,
+            max_queue=SEND_CONCURRENCY,
+        )
+        slots = asyncio.Semaphore(SEND_CONCURRENCY)
+
+        async def _guarded(row: RecapRow, best: tuple[date, int] | None) -> bool:
+            async with slots:
+                try:
+                    return await _send_one(bot, renderer, media, row, week_start=week_start, best=best)
+                except Exception:
+                    log.exception("Recap failed user_id=%s", row.user_id)
+                    return False
+
+        total_sent = total_failed = 0
+        try:
+            with send_priority(SendPriority.BROADCAST):
+                while True:
+                    async with db.session() as session:
+                        rows = await fetch_recap_chunk(
+                            session, week_start=week_start, after_user_id=cursor, limit=chunk_size
+                        )
+                        if not rows:
+                            await finish_run(session, run_id=run_id, week_start=week_start)
+                            await session.commit()
+                            break
+
+                        best = await best_days(
+                            session, week_start=week_start, user_ids=[r.user_id for r in rows]
+                        )
+
+                    sent = failed = 0
+                    for i in range(0, len(rows), SEND_BATCH):
+                        batch = rows[i : i + SEND_BATCH]
+                        last_user_id = batch[-1].user_id
+                        async with db.session() as session:
+                            await claim_chunk(session, run_id=run_id, last_user_id=last_user_id)
+                            await session.commit()
+
+                        results = await asyncio.gather(*(_guarded(r, best.get(r.user_id)) for r in batch))
+                        ok = sum(1 for r in results if r)
+
+                        async with db.session() as session:
+                            await complete_chunk(
+                                session, run_id=run_id, last_user_id=last_user_id, sent=ok, failed=len(results) - ok
+                            )
+                            await session.commit()
+                        cursor = last_user_id
+                        sent += ok
+                        failed += len(results) - ok
+
+                    total_sent += sent
+                    total_failed += failed
+                    log.info("Weekly recap %s: +%s sent, +%s failed (cursor=%s)", week_start, sent, failed, cursor)
+        finally:
+            renderer.close()
+
+        async with db.session() as session:
+            run = await get_or_create_run(session, week_start=week_start)
+
+        log.info("Weekly recap %s finished: sent=%s failed=%s", week_start, total_sent, total_failed)
+        return RecapResult(week_start=week_start, sent=run.sent, failed=run.failed, skipped=run.skipped)
@@ -1,19 +1,232 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError
+
+from bot.database.repo.autodelete_repo import PendingRow, add_pending, load_pending, remove_pending
 
 log = logging.getLogger(__name__)
 
+# Bot API deleteMessages accepts 1..100 ids per call
+DELETE_BATCH_SIZE = 100
 
-def schedule_delete(bot, chat_id: int, message_id: int, delay_seconds: int = 60) -> None:
-    async def _job() -> None:
-        log.info("Auto-delete scheduled chat_id=%s msg_id=%s in %ss", chat_id, message_id, delay_seconds)
-        await asyncio.sleep(delay_seconds)
+# transient failures (network, 5xx, flood after the outbound retries): retry with backoff
+RETRY_BASE_SECONDS = 5.0
+RETRY_MAX_SECONDS = 600.0
+MAX_ATTEMPTS = 8
+
+
+def _utc_now_naive() -> datetime:
+    return datetime.now(tz=ZoneInfo("UTC")).replace(tzinfo=None)
+
+
+class _TimerWheel:
+    """
+    Hashed timer wheel: `slots` buckets of `tick` seconds each.
+    Delays longer than one revolution carry a `rounds` counter.
+    """
+
+    def __init__(self, slots: int = 512) -> None:
+        self._slots: list[list[list]] = [[] for _ in range(slots)]
+        self._cursor = 0
+        self.size = 0
+
+    def add(self, ticks: int, item: tuple[int, int]) -> None:
+        n = len(self._slots)
+        ticks = max(1, int(ticks))
+        idx = (self._cursor + ticks) % n
+        rounds = (ticks - 1) // n
+        self._slots[idx].append([rounds, item])
+        self.size += 1
+
+    def advance(self) -> list[tuple[int, int]]:
+        self._cursor = (self._cursor + 1) % len(self._slots)
+        slot = self._slots[self._cursor]
+        if not slot:
+            return []
+
+        due: list[tuple[int, int]] = []
+        keep: list[list] = []
+        for entry in slot:
+            if entry[0] <= 0:
+                due.append(entry[1])
+            else:
+                entry[0] -= 1
+                keep.append(entry)
+        self._slots[self._cursor] = keep
+        self.size -= len(due)
+        return due
+
+
+class AutoDeleteEngine:
+    """
+    One background task for all auto-deletes:
+    - schedule() is sync and O(1) (timer wheel insert + persistence buffer)
+    - pending deletions are persisted to `pending_deletions` and reloaded on start
+    - due messages are grouped per chat and removed with bulk deleteMessages
+    """
+
+    def __init__(self, bot, *, tick_seconds: float = 1.0, slots: int = 512) -> None:
+        self.bot = bot
+        self.tick_seconds = float(tick_seconds)
+        self._wheel = _TimerWheel(slots)
+        self._to_persist: list[PendingRow] = []
+        self._attempts: dict[tuple[int, int], int] = {}  # failed transient attempts so far
+        self._db = None
+        self._task: asyncio.Task | None = None
+
+    # ---------- lifecycle ----------
+    async def start(self, db) -> None:
+        self._db = db
+
+        async with db.session() as session:
+            rows = await load_pending(session)
+
+        now = _utc_now_naive()
+        for r in rows:
+            delay = (r.due_at_utc - now).total_seconds()
+            self._wheel.add(self._ticks_for(delay), (r.chat_id, r.message_id))
+        log.info("Auto-delete engine started (restored=%s)", len(rows))
+
+        self._task = asyncio.create_task(self._run(), name="autodelete-wheel")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+        # keep not-yet-persisted schedules for the next start
         try:
-            await bot.delete_message(chat_id=chat_id, message_id=message_id)
-            log.info("Auto-deleted chat_id=%s msg_id=%s", chat_id, message_id)
+            await self._flush_new()
         except Exception:
-            log.exception("Auto-delete failed chat_id=%s msg_id=%s", chat_id, message_id)
+            log.exception("Auto-delete: failed to persist pending deletions on shutdown")
 
-    asyncio.create_task(_job())
+    # ---------- public API ----------
+    def schedule(self, chat_id: int, message_id: int, delay_seconds: int = 60) -> None:
+        self._wheel.add(self._ticks_for(delay_seconds), (int(chat_id), int(message_id)))
+        self._to_persist.append(
+            PendingRow(
+                chat_id=int(chat_id),
+                message_id=int(message_id),
+                due_at_utc=_utc_now_naive() + timedelta(seconds=delay_seconds),
+            )
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._wheel.size
+
+    # ---------- internals ----------
+    def _ticks_for(self, delay_seconds: float) -> int:
+        return max(1, int(-(-float(delay_seconds) // self.tick_seconds)))  # ceil
+
+    async def _flush_new(self) -> None:
+        if not self._to_persist or self._db is None:
+            return
+        rows, self._to_persist = self._to_persist, []
+        async with self._db.session() as session:
+            await add_pending(session, rows)
+            await session.commit()
+
+    async def _delete_batch(self, chat_id: int, message_ids: list[int]) -> None:
+        try:
+            if len(message_ids) == 1:
+                await self.bot.delete_message(chat_id=chat_id, message_id=message_ids[0])
+            else:
+                await self.bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+            log.info("Auto-deleted chat_id=%s count=%s", chat_id, len(message_ids))
+        except (TelegramBadRequest, TelegramForbiddenError) as e:
+            # too old / already gone / no rights: permanent, drop
+            log.warning("Auto-delete dropped chat_id=%s count=%s: %s", chat_id, len(message_ids), e)
+        except Exception:
+            # network / server / flood: keep the rows and try again later
+            message_ids = self._retry_later(chat_id, message_ids)
+            if not message_ids:
+                return
+
+        for message_id in message_ids:
+            self._attempts.pop((chat_id, message_id), None)
+        if self._db is None:
+            return
+        try:
+            async with self._db.session() as session:
+                await remove_pending(session, chat_id=chat_id, message_ids=message_ids)
+                await session.commit()
+        except Exception:
+            log.exception("Auto-delete: failed to clear pending rows chat_id=%s", chat_id)
+
+    def _retry_later(self, chat_id: int, message_ids: list[int]) -> list[int]:
+        """
+        Re-arms the wheel with exponential backoff; returns the ids that ran out of
+        attempts (those are dropped by the caller). Rows stay in pending_deletions, so a
+        restart in between retries them too.
+        """
+        give_up: list[int] = []
+        delays: list[float] = []
+        for message_id in message_ids:
+            key = (chat_id, message_id)
+            attempt = self._attempts.get(key, 0) + 1
+            if attempt >= MAX_ATTEMPTS:
+                give_up.append(message_id)
+                continue
+            self._attempts[key] = attempt
+            delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempt - 1))
+            self._wheel.add(self._ticks_for(delay), key)
+            delays.append(delay)
+
+        if delays:
+            log.exception(
+                "Auto-delete failed chat_id=%s count=%s, retry in %.0fs",
+                chat_id, len(delays), min(delays),
+            )
+        if give_up:
+            log.error("Auto-delete gave up chat_id=%s count=%s after %s attempts", chat_id, len(give_up), MAX_ATTEMPTS)
+        return give_up
+
+    async def _fire(self, due: list[tuple[int, int]]) -> None:
+        per_chat: dict[int, list[int]] = defaultdict(list)
+        for chat_id, message_id in due:
+            per_chat[chat_id].append(message_id)
+
+        jobs = []
+        for chat_id, ids in per_chat.items():
+            ids = sorted(set(ids))
+            for i in range(0, len(ids), DELETE_BATCH_SIZE):
+                jobs.append(self._delete_batch(chat_id, ids[i : i + DELETE_BATCH_SIZE]))
+        await asyncio.gather(*jobs)
+
+    async def _run(self) -> None:
+        next_tick = time.monotonic() + self.tick_seconds
+        while True:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+
+            # catch up if the loop was stalled
+            due: list[tuple[int, int]] = []
+            now = time.monotonic()
+            while next_tick <= now:
+                due.extend(self._wheel.advance())
+                next_tick += self.tick_seconds
+
+            try:
+                await self._flush_new()
+                if due:
+                    await self._fire(due)
+            except Exception:
+                log.exception("Auto-delete tick failed")
+
+
+def schedule_delete(bot, chat_id: int, message_id: int, delay_seconds: int = 60) -> None:
+    engine: AutoDeleteEngine | None = getattr(bot, "autodelete", None)
+    if engine is None:
+        log.warning("Auto-delete engine missing, skip chat_id=%s msg_id=%s", chat_id, message_id)
+        return
+    engine.schedule(chat_id, message_id, delay_seconds)
@@ -4,17 +4,22 @@ from __future__ import annotations
 from typing import Any
 
 from aiogram import Bot
-from aiogram.methods import TelegramMethod
+from aiogram.methods import DeleteMessage, DeleteMessages, TelegramMethod
 from aiogram.types import Message
 
 from bot.config.settings import Settings
-from bot.utils.autodelete import schedule_delete
+from bot.utils.autodelete import AutoDeleteEngine, schedule_delete
+from bot.utils.outbound import OutboundScheduler, SendPriority, current_priority
 
 
 class AutoDeleteBot(Bot):
-    def __init__(self, *args, settings: Settings, **kwargs):
+    def __init__(self, *args, settings: Settings, outbound: OutboundScheduler | None = None, **kwargs):
         super().__init__(*args, **kwargs)
         self._settings = settings
+        # ✅ all chat-bound calls go through one rate-limited queue
+        self.outbound = outbound or OutboundScheduler()
+        # ✅ one timer wheel for all auto-deletes (persisted, started from main)
+        self.autodelete = AutoDeleteEngine(self)
 
     @staticmethod
     def _is_approved_screenshot_caption(caption: str) -> bool:
@@ -57,11 +62,29 @@ class AutoDeleteBot(Bot):
                 if self._should_autodelete_message(m):
                     schedule_delete(self, m.chat.id, m.message_id, 60)
 
+    @staticmethod
+    def _priority_for(method: TelegramMethod[Any]) -> SendPriority:
+        if isinstance(method, (DeleteMessage, DeleteMessages)):
+            return current_priority(SendPriority.DELETE)
+        return current_priority()
+
+    async def _call_direct(self, method: TelegramMethod[Any], request_timeout: int | None) -> Any:
+        return await super().__call__(method, request_timeout=request_timeout)
+
     async def __call__(
         self,
         method: TelegramMethod[Any],
         request_timeout: int | None = None,
     ) -> Any:
-        result = await super().__call__(method, request_timeout=request_timeout)
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None:
+            # getUpdates, answerCallbackQuery, getFile... are not chat rate-limited
+            result = await self._call_direct(method, request_timeout)
+        else:
+            result = await self.outbound.submit(
+                chat_id,
+                lambda: self._call_direct(method, request_timeout),
+                priority=self._priority_for(method),
+            )
         self._schedule_if_needed(result)
         return result
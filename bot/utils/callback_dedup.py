@@ -0,0 +1,65 @@
+# bot/utils/callback_dedup.py
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, Update
+
+log = logging.getLogger("bot.middleware.callback_dedup")
+
+
+class CallbackSingleFlightMiddleware(BaseMiddleware):
+    """
+    Outer update middleware (register BEFORE UserMailboxMiddleware).
+
+    Double taps on inline buttons arrive as separate callback queries with the same
+    (user, callback_data). While the first one is running - and for `linger_seconds`
+    after it finished - duplicates are answered with an empty cb.answer() right away
+    and never reach the handlers (no DB session, no second reply).
+    """
+
+    def __init__(self, linger_seconds: float = 1.0) -> None:
+        super().__init__()
+        self.linger_seconds = float(linger_seconds)
+        # (telegram user id, callback_data) -> finished_at (0.0 = still running)
+        self._flights: dict[tuple[int, str], float] = {}
+        self.coalesced = 0
+
+    def _prune(self, now: float) -> None:
+        if len(self._flights) < 1_000:
+            return
+        for key in [k for k, done in self._flights.items() if done and now - done >= self.linger_seconds]:
+            del self._flights[key]
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        cb = event.callback_query if isinstance(event, Update) else None
+        if cb is None or not cb.data or cb.from_user is None:
+            return await handler(event, data)
+
+        key = (cb.from_user.id, cb.data)
+        now = time.monotonic()
+
+        done = self._flights.get(key)
+        if done is not None and (done == 0.0 or now - done < self.linger_seconds):
+            self.coalesced += 1
+            log.debug("Coalesced duplicate callback user=%s data=%s", key[0], key[1])
+            try:
+                await cb.answer()
+            except Exception:
+                pass
+            return None
+
+        self._prune(now)
+        self._flights[key] = 0.0
+        try:
+            return await handler(event, data)
+        finally:
+            self._flights[key] = time.monotonic()
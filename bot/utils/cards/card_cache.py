@@ -0,0 +1,164 @@
+# bot/utils/cards/card_cache.py
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+log = logging.getLogger("bot.cards.cache")
+
+
+@dataclass(frozen=True, slots=True)
+class CardCacheStats:
+    memory_items: int
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    evicted: int  # files removed from disk by evict()
+
+
+def card_key(kind: str, **inputs: Any) -> str:
+    """
+    Content key for a rendered card: sha256 over the renderer name + its inputs.
+    Same inputs => same PNG, so the key also works as a MediaRegistry key.
+    """
+    payload = json.dumps({"kind": kind, **inputs}, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CardCache:
+    """
+    Rendered PNGs by content key: in-memory LRU in front of a directory on disk.
+    (Uploaded file_ids live in utils.media_registry.)
+
+    Keys change with every day / stats change, so the directory is trimmed by evict()
+    (periodic job): files unused for `max_age_days` go first, then the least recently
+    used beyond `max_files`. A disk hit refreshes the file's mtime.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_items: int = 256,
+        *,
+        max_age_days: float = 7.0,
+        max_files: int = 5000,
+    ) -> None:
+        self.directory = directory
+        self.max_items = max(1, int(max_items))
+        self.max_age_days = float(max_age_days)
+        self.max_files = max(0, int(max_files))  # 0 = no count limit
+        self._lru: OrderedDict[str, bytes] = OrderedDict()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evicted = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _remember(self, key: str, png: bytes) -> None:
+        self._lru[key] = png
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_items:
+            self._lru.popitem(last=False)
+
+    def _read_disk(self, key: str) -> bytes | None:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                png = f.read()
+        except FileNotFoundError:
+            return None
+        try:
+            os.utime(path)  # recently used: keep it through evict()
+        except OSError:
+            pass
+        return png
+
+    def _write_disk(self, key: str, png: bytes) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(png)
+        os.replace(tmp, path)  # atomic: readers never see a half-written file
+
+    def _evict_disk(self, now: float) -> int:
+        files: list[tuple[float, str]] = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".png"):
+                    continue
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    continue
+
+        files.sort()  # oldest first
+        cutoff = now - self.max_age_days * 86400
+        drop = [p for mtime, p in files if mtime < cutoff]
+        keep = len(files) - len(drop)
+        if self.max_files and keep > self.max_files:
+            drop += [p for _, p in files[len(drop) : len(drop) + keep - self.max_files]]
+
+        removed = 0
+        for path in drop:
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    async def evict(self) -> int:
+        """Trims the disk cache (age, then file count). Returns how many files were removed."""
+        try:
+            removed = await asyncio.to_thread(self._evict_disk, time.time())
+        except OSError:
+            log.exception("Card cache eviction failed dir=%s", self.directory)
+            return 0
+        self._evicted += removed
+        if removed:
+            log.info("Card cache: evicted %s file(s)", removed)
+        return removed
+
+    async def get(self, key: str) -> bytes | None:
+        png = self._lru.get(key)
+        if png is not None:
+            self._lru.move_to_end(key)
+            self._memory_hits += 1
+            return png
+
+        png = await asyncio.to_thread(self._read_disk, key)
+        if png is None:
+            self._misses += 1
+            return None
+
+        self._disk_hits += 1
+        self._remember(key, png)
+        return png
+
+    async def put(self, key: str, png: bytes) -> None:
+        self._remember(key, png)
+        try:
+            await asyncio.to_thread(self._write_disk, key, png)
+        except OSError:
+            log.exception("Failed to write card cache file key=%s", key)
+
+    def stats(self) -> CardCacheStats:
+        return CardCacheStats(
+            memory_items=len(self._lru),
+            memory_hits=self._memory_hits,
+            disk_hits=self._disk_hits,
+            misses=self._misses,
+            evicted=self._evicted,
+        )
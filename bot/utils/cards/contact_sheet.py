@@ -0,0 +1,86 @@
+# bot/utils/cards/contact_sheet.py
+from __future__ import annotations
+
+import io
+import math
+
+from PIL import Image, ImageDraw, ImageOps
+
+from bot.utils.cards.weekly_winners_card import _try_font
+
+# Tile layout: phone screenshots are tall, so tiles are portrait
+TILE_W, TILE_H = 300, 540
+GAP = 12
+LABEL_R = 30  # radius of the number badge
+MAX_COLS = 5
+
+# Photos compress far better as JPEG than PNG; Telegram recompresses anyway
+JPEG_SAVE_OPTIONS = {"format": "JPEG", "quality": 82, "optimize": False}
+
+
+def _cols_for(n: int) -> int:
+    if n <= 3:
+        return max(1, n)
+    return min(MAX_COLS, math.ceil(math.sqrt(n * 1.6)))  # prefer wide sheets (less scrolling)
+
+
+def _badge(draw: ImageDraw.ImageDraw, x: int, y: int, label: str) -> None:
+    font = _try_font(30)
+    draw.ellipse((x, y, x + 2 * LABEL_R, y + 2 * LABEL_R), fill=(20, 20, 20), outline=(255, 255, 255), width=3)
+    l, t, r, b = draw.textbbox((0, 0), label, font=font)
+    draw.text(
+        (x + LABEL_R - (r - l) // 2 - l, y + LABEL_R - (b - t) // 2 - t),
+        label,
+        font=font,
+        fill=(255, 255, 255),
+    )
+
+
+def _placeholder(label: str) -> Image.Image:
+    tile = Image.new("RGB", (TILE_W, TILE_H), (70, 70, 70))
+    draw = ImageDraw.Draw(tile)
+    font = _try_font(26)
+    draw.text((24, TILE_H // 2 - 16), label, font=font, fill=(230, 230, 230))
+    return tile
+
+
+def render_contact_sheet(images: list[bytes | None]) -> bytes:
+    """
+    Numbered grid (1..N, left-to-right, top-to-bottom) of downscaled screenshots.
+    A None entry (download failed / unreadable) becomes a grey "unavailable" tile.
+    CPU-only: safe to run in the card render pool.
+    """
+    n = len(images)
+    if n == 0:
+        raise ValueError("no images")
+
+    cols = _cols_for(n)
+    rows = math.ceil(n / cols)
+    sheet = Image.new("RGB", (cols * TILE_W + (cols + 1) * GAP, rows * TILE_H + (rows + 1) * GAP), (235, 235, 235))
+    draw = ImageDraw.Draw(sheet)
+
+    for i, raw in enumerate(images):
+        tile = None
+        if raw:
+            try:
+                with Image.open(io.BytesIO(raw)) as im:
+                    im.draft("RGB", (TILE_W, TILE_H))  # JPEG: decode at reduced scale
+                    tile = ImageOps.pad(
+                        ImageOps.exif_transpose(im).convert("RGB"),
+                        (TILE_W, TILE_H),
+                        method=Image.Resampling.BILINEAR,
+                        color=(30, 30, 30),
+                    )
+            except Exception:
+                tile = None
+        if tile is None:
+            tile = _placeholder("unavailable")
+
+        x = GAP + (i % cols) * (TILE_W + GAP)
+        y = GAP + (i // cols) * (TILE_H + GAP)
+        sheet.paste(tile, (x, y))
+        _badge(draw, x + 10, y + 10, str(i + 1))
+
+    bio = io.BytesIO()
+    sheet.save(bio, **JPEG_SAVE_OPTIONS)
+    return bio.getvalue()
@@ -0,0 +1,189 @@
+# bot/utils/cards/personal_card.py
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+from PIL import Image, ImageDraw
+
+from bot.utils.cards.weekly_winners_card import (
+    BODY_TOP,
+    H,
+    HEADER_H,
+    PAD,
+    PNG_SAVE_OPTIONS,
+    W,
+    _text,
+    _try_font,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CardTask:
+    label: str
+    done: bool
+
+
+# Stat tiles: Points | Rank | Streak
+TILE_Y = BODY_TOP + 28
+TILE_H = 170
+TILE_GAP = 24
+TILE_W = (W - 2 * PAD - 2 * 28 - 2 * TILE_GAP) // 3
+TASKS_Y = TILE_Y + TILE_H + 40
+
+
+def _tile_x(i: int) -> int:
+    return PAD + 28 + i * (TILE_W + TILE_GAP)
+
+
+@lru_cache(maxsize=1)
+def _base_card() -> Image.Image:
+    """
+    Static parts of the personal card (same frame as the winners card).
+    Rendered once per process; callers must .copy() it.
+    """
+    img = Image.new("RGB", (W, H), (248, 249, 251))
+    draw = ImageDraw.Draw(img)
+    font_small = _try_font(22)
+
+    draw.rounded_rectangle(
+        (PAD, PAD, W - PAD, PAD + HEADER_H),
+        radius=28,
+        fill=(255, 255, 255),
+        outline=(235, 236, 240),
+        width=2,
+    )
+    draw.rounded_rectangle(
+        (PAD, BODY_TOP, W - PAD, H - PAD),
+        radius=28,
+        fill=(255, 255, 255),
+        outline=(235, 236, 240),
+        width=2,
+    )
+
+    for i, label in enumerate(("Points", "Rank", "Streak")):
+        x = _tile_x(i)
+        draw.rounded_rectangle((x, TILE_Y, x + TILE_W, TILE_Y + TILE_H), radius=22, fill=(249, 250, 251))
+        _text(draw, (x + 28, TILE_Y + 24), label, font_small, fill=(107, 114, 128))
+
+    return img
+
+
+def _draw_header_and_tiles(
+    draw: ImageDraw.ImageDraw,
+    *,
+    name: str,
+    week_start: date,
+    week_end: date,
+    points: int,
+    rank: int | None,
+    streak: int,
+) -> None:
+    _text(draw, (PAD + 32, PAD + 28), name, _try_font(52), fill=(15, 23, 42))
+    _text(
+        draw,
+        (PAD + 32, PAD + 100),
+        f"Week (UTC): {week_start.isoformat()} → {week_end.isoformat()}",
+        _try_font(28),
+        fill=(55, 65, 81),
+    )
+
+    font_value = _try_font(64)
+    values = (str(points), f"#{rank}" if rank else "—", f"{streak}d")
+    for i, value in enumerate(values):
+        _text(draw, (_tile_x(i) + 28, TILE_Y + 70), value, font_value, fill=(15, 23, 42))
+
+
+def _finish(img: Image.Image, draw: ImageDraw.ImageDraw) -> bytes:
+    _text(
+        draw,
+        (PAD + 36, H - PAD - 34),
+        "Generated automatically • TG Engagement Bot",
+        _try_font(22),
+        fill=(156, 163, 175),
+    )
+
+    buf = io.BytesIO()
+    img.save(buf, **PNG_SAVE_OPTIONS)
+    return buf.getvalue()
+
+
+def render_personal_card(
+    *,
+    name: str,
+    week_start: date,
+    week_end: date,
+    points: int,
+    rank: int | None,
+    streak: int,
+    tasks: list[CardTask],
+) -> bytes:
+    """
+    Returns PNG bytes for /mycard. Same look as the weekly winners card.
+    """
+    img = _base_card().copy()
+    draw = ImageDraw.Draw(img)
+    _draw_header_and_tiles(
+        draw,
+        name=name,
+        week_start=week_start,
+        week_end=week_end,
+        points=points,
+        rank=rank,
+        streak=streak,
+    )
+
+    font_task = _try_font(26)
+    _text(draw, (PAD + 36, TASKS_Y), "Today's tasks (UTC)", _try_font(22), fill=(107, 114, 128))
+
+    # Task chips
+    x = PAD + 36
+    y = TASKS_Y + 44
+    for t in tasks:
+        label = f"{'✓' if t.done else '·'} {t.label}"
+        w = int(draw.textlength(label, font=font_task)) + 40
+        fill = (220, 252, 231) if t.done else (243, 244, 246)
+        color = (22, 101, 52) if t.done else (107, 114, 128)
+        draw.rounded_rectangle((x, y, x + w, y + 52), radius=26, fill=fill)
+        _text(draw, (x + 20, y + 10), label, font_task, fill=color)
+        x += w + 16
+
+    return _finish(img, draw)
+
+
+def render_weekly_recap_card(
+    *,
+    name: str,
+    week_start: date,
+    week_end: date,
+    points: int,
+    rank: int | None,
+    streak: int,
+    best_day: date | None,
+    best_day_points: int,
+) -> bytes:
+    """
+    Returns PNG bytes for the end-of-week private recap (final numbers + best day).
+    """
+    img = _base_card().copy()
+    draw = ImageDraw.Draw(img)
+    _draw_header_and_tiles(
+        draw,
+        name=name,
+        week_start=week_start,
+        week_end=week_end,
+        points=points,
+        rank=rank,
+        streak=streak,
+    )
+
+    _text(draw, (PAD + 36, TASKS_Y), "Best day (UTC)", _try_font(22), fill=(107, 114, 128))
+    if best_day is not None:
+        best = f"{best_day.strftime('%A')} {best_day.isoformat()}  •  +{best_day_points} pts"
+    else:
+        best = "—"
+    _text(draw, (PAD + 36, TASKS_Y + 44), best, _try_font(34), fill=(15, 23, 42))
+
+    return _finish(img, draw)
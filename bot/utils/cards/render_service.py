@@ -0,0 +1,119 @@
+# bot/utils/cards/render_service.py
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+log = logging.getLogger("bot.cards.render")
+
+
+class RenderQueueFull(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class RenderStats:
+    mode: str
+    workers: int
+    pending: int  # waiting + running
+    rendered: int
+    failed: int
+    rejected: int
+    avg_ms: float  # submit -> bytes back (queue wait included)
+    max_ms: float
+
+
+def _warm_worker() -> None:
+    # resolve fonts + static bases once per worker process
+    from bot.utils.cards import personal_card, weekly_winners_card
+
+    weekly_winners_card._base_card()
+    personal_card._base_card()
+
+
+class CardRenderService:
+    """
+    Runs synchronous Pillow card renderers outside the event loop.
+
+    mode="process": ProcessPoolExecutor (true parallelism, no GIL contention)
+    mode="thread":  ThreadPoolExecutor (cheaper, Pillow releases the GIL while encoding)
+
+    At most `max_queue` renders may be pending (queued + running); beyond that
+    render() raises RenderQueueFull instead of piling up memory; callers either tell the
+    user to retry (interactive) or render in a thread themselves (jobs that must deliver).
+    Renderer functions and their kwargs must be picklable in process mode.
+    """
+
+    def __init__(self, *, mode: str = "process", workers: int = 2, max_queue: int = 32) -> None:
+        mode = (mode or "process").strip().lower()
+        if mode not in ("process", "thread"):
+            raise ValueError("render mode must be 'process' or 'thread'")
+
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.max_queue = max(1, int(max_queue))
+        self._executor: Executor | None = None
+
+        self._pending = 0
+        self._rendered = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total = 0.0
+        self._max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="card-render")
+        return self._executor
+
+    async def render(self, fn: Callable[..., bytes], /, **kwargs: Any) -> bytes:
+        if self._pending >= self.max_queue:
+            self._rejected += 1
+            log.warning(
+                "Card render rejected fn=%s: queue full (%s pending)", getattr(fn, "__name__", fn), self._pending
+            )
+            raise RenderQueueFull(f"Card render queue is full ({self.max_queue})")
+
+        self._pending += 1
+        t0 = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            out = await loop.run_in_executor(self._get_executor(), functools.partial(fn, **kwargs))
+        except Exception:
+            self._failed += 1
+            log.exception("Card render failed fn=%s", getattr(fn, "__name__", fn))
+            raise
+        finally:
+            self._pending -= 1
+
+        elapsed = time.perf_counter() - t0
+        self._rendered += 1
+        self._total += elapsed
+        self._max = max(self._max, elapsed)
+        return out
+
+    def stats(self) -> RenderStats:
+        avg = (self._total / self._rendered) if self._rendered else 0.0
+        return RenderStats(
+            mode=self.mode,
+            workers=self.workers,
+            pending=self._pending,
+            rendered=self._rendered,
+            failed=self._failed,
+            rejected=self._rejected,
+            avg_ms=round(avg * 1000, 1),
+            max_ms=round(self._max * 1000, 1),
+        )
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
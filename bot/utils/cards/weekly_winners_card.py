@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import io
+import os
 from dataclasses import dataclass
 from datetime import date
+from functools import lru_cache
 
 from PIL import Image, ImageDraw, ImageFont
 
@@ -14,31 +16,106 @@ class CardWinner:
     points: int
 
 
+_FONT_CANDIDATES = (
+    # Windows common
+    "C:\\Windows\\Fonts\\segoeui.ttf",
+    "C:\\Windows\\Fonts\\arial.ttf",
+    # Linux common
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+)
+
+
+@lru_cache(maxsize=1)
+def _font_path() -> str | None:
+    """
+    First usable truetype file, resolved once per process.
+    """
+    for path in _FONT_CANDIDATES:
+        if not os.path.isfile(path):
+            continue
+        try:
+            ImageFont.truetype(path, size=12)
+        except OSError:
+            continue
+        return path
+    return None
+
+
+@lru_cache(maxsize=32)
 def _try_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
     """
-    Tries common fonts. Falls back to PIL default if truetype not available.
+    Cached per size. Falls back to PIL default if truetype not available.
     Works on Windows/Linux without bundling fonts.
     """
-    candidates = [
-        # Windows common
-        "C:\\Windows\\Fonts\\segoeui.ttf",
-        "C:\\Windows\\Fonts\\arial.ttf",
-        # Linux common
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-    ]
-    for path in candidates:
-        try:
-            return ImageFont.truetype(path, size=size)
-        except Exception:
-            pass
-    return ImageFont.load_default()
+    path = _font_path()
+    if path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(path, size=size)
 
 
 def _text(draw: ImageDraw.ImageDraw, xy: tuple[int, int], s: str, font, fill=(20, 20, 20)) -> None:
     draw.text(xy, s, font=font, fill=fill)
 
 
+# Layout (shared by the cached base and the dynamic pass)
+W, H = 1200, 675  # 16:9
+PAD = 48
+HEADER_H = 170
+BODY_TOP = PAD + HEADER_H + 26
+ROW_Y = BODY_TOP + 72
+ROW_H = 120
+
+# zlib level 6 without optimize=True: ~3x faster encode, same pixels, ~4% bigger file
+PNG_SAVE_OPTIONS = {"format": "PNG", "compress_level": 6}
+
+
+@lru_cache(maxsize=1)
+def _base_card() -> Image.Image:
+    """
+    Static parts only (background, cards, column headers, row stripes).
+    Rendered once per process; callers must .copy() it.
+    """
+    img = Image.new("RGB", (W, H), (248, 249, 251))
+    draw = ImageDraw.Draw(img)
+    font_small = _try_font(22)
+
+    # Header card
+    draw.rounded_rectangle(
+        (PAD, PAD, W - PAD, PAD + HEADER_H),
+        radius=28,
+        fill=(255, 255, 255),
+        outline=(235, 236, 240),
+        width=2,
+    )
+
+    # Body container
+    draw.rounded_rectangle(
+        (PAD, BODY_TOP, W - PAD, H - PAD),
+        radius=28,
+        fill=(255, 255, 255),
+        outline=(235, 236, 240),
+        width=2,
+    )
+
+    # Column headers
+    _text(draw, (PAD + 36, BODY_TOP + 28), "Rank", font_small, fill=(107, 114, 128))
+    _text(draw, (PAD + 190, BODY_TOP + 28), "User", font_small, fill=(107, 114, 128))
+    _text(draw, (W - PAD - 220, BODY_TOP + 28), "Points", font_small, fill=(107, 114, 128))
+
+    # alternating subtle row background
+    for i in range(0, 3, 2):
+        y1 = ROW_Y + i * ROW_H
+        y2 = y1 + ROW_H - 12
+        draw.rounded_rectangle(
+            (PAD + 20, y1, W - PAD - 20, y2),
+            radius=22,
+            fill=(249, 250, 251),
+        )
+
+    return img
+
+
 def render_weekly_winners_card(
     *,
     week_start: date,
@@ -48,12 +125,9 @@ def render_weekly_winners_card(
 ) -> bytes:
     """
     Returns PNG bytes. Simple clean layout, no emoji dependency.
+    Copies the cached base and draws only the dynamic text.
     """
-
-    W, H = 1200, 675  # 16:9
-    pad = 48
-
-    img = Image.new("RGB", (W, H), (248, 249, 251))
+    img = _base_card().copy()
     draw = ImageDraw.Draw(img)
 
     # Fonts
@@ -62,79 +136,42 @@ def render_weekly_winners_card(
     font_row = _try_font(34)
     font_small = _try_font(22)
 
-    # Header card
-    header_h = 170
-    draw.rounded_rectangle(
-        (pad, pad, W - pad, pad + header_h),
-        radius=28,
-        fill=(255, 255, 255),
-        outline=(235, 236, 240),
-        width=2,
-    )
-
-    _text(draw, (pad + 32, pad + 28), title, font_title, fill=(15, 23, 42))
+    _text(draw, (PAD + 32, PAD + 28), title, font_title, fill=(15, 23, 42))
     _text(
         draw,
-        (pad + 32, pad + 100),
+        (PAD + 32, PAD + 100),
         f"Week (UTC): {week_start.isoformat()} → {week_end.isoformat()}",
         font_sub,
         fill=(55, 65, 81),
     )
 
-    # Body container
-    body_top = pad + header_h + 26
-    draw.rounded_rectangle(
-        (pad, body_top, W - pad, H - pad),
-        radius=28,
-        fill=(255, 255, 255),
-        outline=(235, 236, 240),
-        width=2,
-    )
-
-    # Column headers
-    _text(draw, (pad + 36, body_top + 28), "Rank", font_small, fill=(107, 114, 128))
-    _text(draw, (pad + 190, body_top + 28), "User", font_small, fill=(107, 114, 128))
-    _text(draw, (W - pad - 220, body_top + 28), "Points", font_small, fill=(107, 114, 128))
-
     # Rows
-    row_y = body_top + 72
-    row_h = 120
-
     rank_labels = {1: "🥇 1st", 2: "🥈 2nd", 3: "🥉 3rd"}
     # (emoji may not render on some fonts; still ok – it will just show squares sometimes)
 
     for i in range(3):
-        y1 = row_y + i * row_h
-        y2 = y1 + row_h - 12
-
-        # alternating subtle background
-        if i % 2 == 0:
-            draw.rounded_rectangle(
-                (pad + 20, y1, W - pad - 20, y2),
-                radius=22,
-                fill=(249, 250, 251),
-            )
+        y1 = ROW_Y + i * ROW_H
 
         if i < len(winners):
             w = winners[i]
             rank_txt = rank_labels.get(w.rank, f"{w.rank}")
-            _text(draw, (pad + 40, y1 + 34), rank_txt, font_row, fill=(15, 23, 42))
-            _text(draw, (pad + 190, y1 + 34), w.name, font_row, fill=(15, 23, 42))
-            _text(draw, (W - pad - 220, y1 + 34), str(w.points), font_row, fill=(15, 23, 42))
+            _text(draw, (PAD + 40, y1 + 34), rank_txt, font_row, fill=(15, 23, 42))
+            _text(draw, (PAD + 190, y1 + 34), w.name, font_row, fill=(15, 23, 42))
+            _text(draw, (W - PAD - 220, y1 + 34), str(w.points), font_row, fill=(15, 23, 42))
         else:
-            _text(draw, (pad + 40, y1 + 34), "-", font_row, fill=(156, 163, 175))
-            _text(draw, (pad + 190, y1 + 34), "—", font_row, fill=(156, 163, 175))
-            _text(draw, (W - pad - 220, y1 + 34), "0", font_row, fill=(156, 163, 175))
+            _text(draw, (PAD + 40, y1 + 34), "-", font_row, fill=(156, 163, 175))
+            _text(draw, (PAD + 190, y1 + 34), "—", font_row, fill=(156, 163, 175))
+            _text(draw, (W - PAD - 220, y1 + 34), "0", font_row, fill=(156, 163, 175))
 
-    # Footer note
+    # Footer note (drawn last: it overlaps the 3rd row)
     _text(
         draw,
-        (pad + 36, H - pad - 34),
+        (PAD + 36, H - PAD - 34),
         "Generated automatically • TG Engagement Bot",
         font_small,
         fill=(156, 163, 175),
     )
 
     buf = io.BytesIO()
-    img.save(buf, format="PNG", optimize=True)
-    return buf.getvalue()
\ No newline at end of file
+    img.save(buf, **PNG_SAVE_OPTIONS)
+    return buf.getvalue()
@@ -0,0 +1,73 @@
+# bot/utils/hamming_index.py
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class HammingIndex(Generic[T]):
+    """
+    Near-duplicate lookup for 64-bit perceptual hashes (multi-index hashing).
+
+    The hash is split into `chunks` slices of 64/chunks bits. If two hashes are
+    within `radius` bits, at least one slice differs by <= radius // chunks bits
+    (pigeonhole), so a query only probes the buckets of each slice's near
+    variants and verifies those few candidates with a popcount.
+    With the defaults (4 x 16 bits, radius 7) a query is 4 x 17 dict lookups,
+    independent of how many hashes are stored.
+    """
+
+    def __init__(self, *, radius: int = 7, chunks: int = 4, bits: int = 64) -> None:
+        if bits % chunks:
+            raise ValueError("bits must be divisible by chunks")
+        self.radius = int(radius)
+        self._chunks = chunks
+        self._width = bits // chunks
+        self._mask = (1 << self._width) - 1
+
+        per_chunk = self.radius // chunks
+        self._flips = [0] + [
+            sum(1 << b for b in combo)
+            for k in range(1, per_chunk + 1)
+            for combo in combinations(range(self._width), k)
+        ]
+
+        self._tables: list[dict[int, list[int]]] = [{} for _ in range(chunks)]
+        self._hashes: list[int] = []
+        self._items: list[T] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def _slices(self, h: int) -> list[int]:
+        return [(h >> (i * self._width)) & self._mask for i in range(self._chunks)]
+
+    def add(self, h: int, item: T) -> None:
+        idx = len(self._hashes)
+        self._hashes.append(h)
+        self._items.append(item)
+        for table, part in zip(self._tables, self._slices(h)):
+            table.setdefault(part, []).append(idx)
+
+    def find(self, h: int, radius: int | None = None) -> list[tuple[int, T]]:
+        """
+        All (distance, item) within `radius` (<= the index radius) of h, closest first.
+        """
+        radius = self.radius if radius is None else min(int(radius), self.radius)
+
+        seen: set[int] = set()
+        for table, part in zip(self._tables, self._slices(h)):
+            for flip in self._flips:
+                bucket = table.get(part ^ flip)
+                if bucket:
+                    seen.update(bucket)
+
+        out = []
+        for idx in seen:
+            d = (self._hashes[idx] ^ h).bit_count()
+            if d <= radius:
+                out.append((d, self._items[idx]))
+        out.sort(key=lambda x: x[0])
+        return out
@@ -0,0 +1,41 @@
+# bot/utils/image_hash.py
+from __future__ import annotations
+
+import io
+
+from PIL import Image
+
+HASH_BITS = 64
+
+
+def dhash(raw: bytes, *, size: int = 8) -> int:
+    """
+    Difference hash: grayscale (size+1) x size thumbnail, one bit per
+    "left pixel brighter than right neighbour". Stable under rescaling,
+    recompression and small edits (status bar clock, crop by a few px).
+    CPU-only: run it in the card render pool / a thread.
+    """
+    with Image.open(io.BytesIO(raw)) as im:
+        im.draft("L", (size * 16, size * 16))  # JPEG: decode at reduced scale
+        px = im.convert("L").resize((size + 1, size), Image.Resampling.BILINEAR).tobytes()
+
+    h = 0
+    w = size + 1
+    for y in range(size):
+        row = px[y * w : (y + 1) * w]
+        for x in range(size):
+            h = (h << 1) | (row[x] > row[x + 1])
+    return h
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def to_signed64(h: int) -> int:
+    # SQLite INTEGER is signed 64-bit
+    return h - (1 << 64) if h >= (1 << 63) else h
+
+
+def from_signed64(v: int) -> int:
+    return v & ((1 << 64) - 1)
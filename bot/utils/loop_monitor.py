@@ -0,0 +1,65 @@
+# bot/utils/loop_monitor.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import time
+from dataclasses import dataclass
+
+log = logging.getLogger("bot.loop_monitor")
+
+
+@dataclass(frozen=True, slots=True)
+class LoopLagStats:
+    samples: int
+    blocked_ms_total: float  # sum of lag beyond the expected wake-up
+    max_lag_ms: float
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop blocking: sleeps `interval` and records how late it wakes up.
+    Any synchronous work on the loop (e.g. inline Pillow rendering) shows up as lag.
+    """
+
+    def __init__(self, interval: float = 0.05, warn_ms: float = 250.0) -> None:
+        self.interval = float(interval)
+        self.warn_ms = float(warn_ms)
+        self._task: asyncio.Task | None = None
+        self.reset()
+
+    def reset(self) -> None:
+        self._samples = 0
+        self._blocked = 0.0
+        self._max = 0.0
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def stats(self) -> LoopLagStats:
+        return LoopLagStats(
+            samples=self._samples,
+            blocked_ms_total=round(self._blocked * 1000, 1),
+            max_lag_ms=round(self._max * 1000, 1),
+        )
+
+    async def _run(self) -> None:
+        while True:
+            t0 = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - t0 - self.interval)
+
+            self._samples += 1
+            self._blocked += lag
+            self._max = max(self._max, lag)
+            if lag * 1000 >= self.warn_ms:
+                log.warning("Event loop blocked for %.0f ms", lag * 1000)
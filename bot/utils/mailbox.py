@@ -0,0 +1,135 @@
+# bot/utils/mailbox.py
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+log = logging.getLogger("bot.middleware.mailbox")
+
+
+@dataclass(frozen=True, slots=True)
+class DispatchStats:
+    in_flight: int
+    queued: int  # updates waiting for their user's turn or a global slot
+    active_keys: int
+    processed: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class _Mailbox:
+    __slots__ = ("lock", "refs")
+
+    def __init__(self) -> None:
+        self.lock = asyncio.Lock()  # FIFO => per-user order is preserved
+        self.refs = 0
+
+
+class UserMailboxMiddleware(BaseMiddleware):
+    """
+    Outer update middleware (runs before DbSessionMiddleware):
+    - updates from the same user are processed one at a time, in arrival order
+    - different users run in parallel, at most `max_concurrency` handlers overall
+      (so a burst can't exhaust DB connections)
+    Updates without a user (channel posts etc.) fall back to the chat id, or only
+    take a global slot.
+    """
+
+    def __init__(self, max_concurrency: int = 32) -> None:
+        super().__init__()
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._boxes: dict[Hashable, _Mailbox] = {}
+
+        self._queued = 0
+        self._in_flight = 0
+        self._processed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @staticmethod
+    def _key(data: Dict[str, Any]) -> Hashable | None:
+        user: User | None = data.get("event_from_user")
+        if user is not None:
+            return ("u", user.id)
+        chat = data.get("event_chat")
+        if chat is not None:
+            return ("c", chat.id)
+        return None
+
+    def stats(self) -> DispatchStats:
+        avg = (self._wait_total / self._processed) if self._processed else 0.0
+        return DispatchStats(
+            in_flight=self._in_flight,
+            queued=self._queued,
+            active_keys=len(self._boxes),
+            processed=self._processed,
+            avg_wait_ms=round(avg * 1000, 1),
+            max_wait_ms=round(self._wait_max * 1000, 1),
+        )
+
+    async def _run(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+        enqueued_at: float,
+    ) -> Any:
+        self._queued += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._queued -= 1
+
+        # includes time spent behind the same user's earlier updates
+        waited = time.monotonic() - enqueued_at
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        if waited > 5.0:
+            log.warning("Update waited %.1fs before its handler started", waited)
+
+        self._in_flight += 1
+        try:
+            return await handler(event, data)
+        finally:
+            self._in_flight -= 1
+            self._processed += 1
+            self._slots.release()
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        enqueued_at = time.monotonic()
+
+        key = self._key(data)
+        if key is None:
+            return await self._run(handler, event, data, enqueued_at)
+
+        box = self._boxes.get(key)
+        if box is None:
+            box = self._boxes[key] = _Mailbox()
+        box.refs += 1
+        try:
+            self._queued += 1
+            try:
+                await box.lock.acquire()
+            finally:
+                self._queued -= 1
+
+            try:
+                return await self._run(handler, event, data, enqueued_at)
+            finally:
+                box.lock.release()
+        finally:
+            box.refs -= 1
+            if box.refs == 0:
+                self._boxes.pop(key, None)
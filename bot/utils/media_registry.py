@@ -0,0 +1,157 @@
+# bot/utils/media_registry.py
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import BufferedInputFile, Message
+
+from bot.database.repo.media_repo import forget_file_id, get_media, save_file_id, touch_file_id
+
+log = logging.getLogger("bot.media")
+
+
+@dataclass(frozen=True, slots=True)
+class MediaStats:
+    hits: int  # sent by file_id
+    misses: int  # had to upload
+    stale: int  # file_id rejected by Telegram -> re-uploaded
+    known: int  # file_ids held in memory (LRU, at most max_items)
+    bytes_saved: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return (self.hits / total) if total else 0.0
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class MediaRegistry:
+    """
+    Content hash -> Telegram file_id (memory in front of the media_files table).
+
+    Every send path that uploads generated bytes goes through send_photo():
+    - known hash: send by file_id (no render, no upload)
+    - unknown or rejected file_id: upload once and remember the new file_id
+
+    `key` is any stable content hash: sha256 of the bytes, or of the renderer
+    inputs (card_key) so a hit also skips rendering.
+
+    Memory holds the `max_items` most recently used entries (per-user cards would
+    otherwise grow it forever); older ones are read back from media_files on demand.
+    """
+
+    def __init__(self, db, *, max_items: int = 2048) -> None:
+        self._db = db
+        self.max_items = max(1, int(max_items))
+        self._lru: OrderedDict[str, tuple[str, int]] = OrderedDict()  # key -> (file_id, size_bytes)
+
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._bytes_saved = 0
+
+    def _keep(self, key: str, file_id: str, size: int) -> None:
+        self._lru[key] = (file_id, size)
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_items:
+            self._lru.popitem(last=False)
+
+    async def lookup(self, key: str) -> str | None:
+        entry = self._lru.get(key)
+        if entry is not None:
+            self._lru.move_to_end(key)
+            return entry[0]
+
+        async with self._db.session() as session:
+            row = await get_media(session, content_hash=key)
+        if row is None:
+            return None
+        self._keep(key, row.file_id, row.size_bytes)
+        return row.file_id
+
+    async def _remember(self, key: str, sent: Message, size: int) -> None:
+        if not sent or not sent.photo:
+            return
+        largest = sent.photo[-1]
+        self._keep(key, largest.file_id, size)
+        async with self._db.session() as session:
+            await save_file_id(
+                session,
+                content_hash=key,
+                file_id=largest.file_id,
+                file_unique_id=largest.file_unique_id,
+                kind="photo",
+                size_bytes=size,
+            )
+            await session.commit()
+
+    async def _forget(self, key: str) -> None:
+        self._lru.pop(key, None)
+        async with self._db.session() as session:
+            await forget_file_id(session, content_hash=key)
+            await session.commit()
+
+    async def send_photo(
+        self,
+        bot: Bot,
+        *,
+        chat_id: int,
+        filename: str,
+        png: bytes | None = None,
+        render: Callable[[], Awaitable[bytes]] | None = None,
+        key: str | None = None,
+        **kwargs: Any,
+    ) -> Message:
+        if png is None and render is None:
+            raise ValueError("send_photo needs png bytes or a render callable")
+        if key is None:
+            if png is None:
+                raise ValueError("key is required when png is rendered lazily")
+            key = content_hash(png)
+
+        file_id = await self.lookup(key)
+        if file_id is not None:
+            try:
+                sent = await bot.send_photo(chat_id=chat_id, photo=file_id, **kwargs)
+            except TelegramBadRequest as e:
+                # expired / foreign file_id: drop it and upload again below
+                log.warning("Stale file_id for key=%s: %s", key, e)
+                self._stale += 1
+                await self._forget(key)
+            else:
+                self._hits += 1
+                self._bytes_saved += self._lru.get(key, (file_id, 0))[1]
+                async with self._db.session() as session:
+                    await touch_file_id(session, content_hash=key)
+                    await session.commit()
+                return sent
+
+        if png is None:
+            png = await render()
+
+        self._misses += 1
+        sent = await bot.send_photo(
+            chat_id=chat_id,
+            photo=BufferedInputFile(png, filename=filename),
+            **kwargs,
+        )
+        await self._remember(key, sent, len(png))
+        return sent
+
+    def stats(self) -> MediaStats:
+        return MediaStats(
+            hits=self._hits,
+            misses=self._misses,
+            stale=self._stale,
+            known=len(self._lru),
+            bytes_saved=self._bytes_saved,
+        )
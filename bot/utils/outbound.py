@@ -0,0 +1,408 @@
+# bot/utils/outbound.py
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import enum
+import heapq
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Iterator
+
+from aiogram.exceptions import TelegramRetryAfter
+
+log = logging.getLogger("bot.outbound")
+
+
+class SendPriority(enum.IntEnum):
+    """
+    Lower value = served first.
+    """
+    INTERACTIVE = 0  # replies to a user action (default)
+    NORMAL = 1       # scheduler posts (polls, notifications)
+    DELETE = 2       # auto-delete housekeeping
+    BROADCAST = 3    # bulk posts (weekly winners, approved screenshots)
+
+
+_current_priority: ContextVar[SendPriority | None] = ContextVar("outbound_priority", default=None)
+
+
+@contextlib.contextmanager
+def send_priority(priority: SendPriority) -> Iterator[None]:
+    """
+    Marks every Bot API call made inside the block with `priority`:
+
+        with send_priority(SendPriority.BROADCAST):
+            await bot.send_photo(...)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def set_task_priority(priority: SendPriority) -> None:
+    """
+    For long-running background tasks (loops): the ContextVar is task-local,
+    so this only affects the calling task.
+    """
+    _current_priority.set(priority)
+
+
+def current_priority(default: SendPriority = SendPriority.INTERACTIVE) -> SendPriority:
+    p = _current_priority.get()
+    return default if p is None else p
+
+
+class _TokenBucket:
+    """
+    Classic token bucket. acquire() waits FIFO (asyncio.Lock is fair); per-chat buckets
+    are polled instead (wait_time / try_take) so no worker ever sleeps on one chat.
+    `blocked_until` is set from Telegram's retry_after.
+    """
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until", "lock")
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def block_for(self, seconds: float) -> None:
+        self.blocked_until = max(self.blocked_until, time.monotonic() + max(0.0, float(seconds)))
+        self.tokens = 0.0
+
+    def is_idle(self) -> bool:
+        self._refill(time.monotonic())
+        return (
+            not self.lock.locked()
+            and self.tokens >= self.capacity
+            and self.blocked_until <= time.monotonic()
+        )
+
+    def wait_time(self, now: float, *, need_token: bool = True) -> float:
+        """Seconds until try_take() can succeed (0 = now)."""
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if not need_token:
+            return 0.0
+        self._refill(now)
+        if self.tokens >= 1.0:
+            return 0.0
+        return (1.0 - self.tokens) / self.rate
+
+    def try_take(self, now: float, *, need_token: bool = True) -> bool:
+        if self.wait_time(now, need_token=need_token) > 0:
+            return False
+        if need_token:
+            self.tokens -= 1.0
+        return True
+
+    def refund(self) -> None:
+        self.tokens = min(self.capacity, self.tokens + 1.0)
+
+    async def acquire(self) -> None:
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+@dataclass(slots=True)
+class _Job:
+    chat_id: int | str
+    priority: SendPriority
+    call: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.monotonic)
+    attempt: int = 0
+
+
+@dataclass(slots=True)
+class _ChatLane:
+    """One chat's waiting jobs (heap by priority, then arrival) + its rate limit."""
+    bucket: _TokenBucket
+    jobs: list[tuple[int, int, _Job]] = field(default_factory=list)
+    version: int = 0  # bumps on every ready push; older ready entries are stale
+    timer: asyncio.TimerHandle | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class OutboundStats:
+    queued: dict[str, int]  # priority name -> waiting jobs
+    in_flight: int
+    sent: int
+    failed: int
+    retries: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+
+class OutboundScheduler:
+    """
+    Central outbound queue for chat-bound Bot API calls.
+
+    - global token bucket (Telegram: ~30 msg/s per bot)
+    - per-chat token buckets (private: ~1 msg/s, groups: ~20 msg/min)
+    - priority classes (see SendPriority), FIFO within a class
+    - TelegramRetryAfter => chat bucket is paused for retry_after and the call is retried
+
+    Each chat has its own lane; a lane is offered to the workers (ready heap, best head
+    job first) only once its bucket has a token, otherwise a timer re-offers it when the
+    next token is due. Workers therefore only ever take sendable jobs: a busy group
+    chat waits on its own timer instead of parking workers in front of other chats.
+    """
+    def __init__(
+        self,
+        *,
+        global_rate: float = 30.0,
+        global_burst: float = 30.0,
+        private_rate: float = 1.0,
+        private_burst: float = 3.0,
+        group_rate: float = 20.0 / 60.0,
+        group_burst: float = 5.0,
+        workers: int = 8,
+        max_retries: int = 3,
+    ) -> None:
+        self.private_rate = private_rate
+        self.private_burst = private_burst
+        self.group_rate = group_rate
+        self.group_burst = group_burst
+        self.workers = max(1, int(workers))
+        self.max_retries = max(0, int(max_retries))
+
+        self._global = _TokenBucket(global_rate, global_burst)
+        self._chats: dict[int | str, _ChatLane] = {}
+
+        self._ready: list[tuple[int, int, int, _ChatLane]] = []  # (priority, seq, version, lane)
+        self._wake = asyncio.Event()
+        self._seq = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+
+        # metrics
+        self._queued = {p.name.lower(): 0 for p in SendPriority}
+        self._in_flight = 0
+        self._sent = 0
+        self._failed = 0
+        self._retries = 0
+        self._wait_total = 0.0
+        self._wait_count = 0
+        self._wait_max = 0.0
+
+    # ---------- lifecycle ----------
+    def _ensure_started(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._worker(), name=f"outbound-worker-{i}")
+                for i in range(self.workers)
+            ]
+
+    async def close(self) -> None:
+        tasks, self._tasks = self._tasks, []
+        for t in tasks:
+            t.cancel()
+        for t in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await t
+
+        # fail whatever is still waiting so callers don't hang forever
+        self._ready.clear()
+        for lane in self._chats.values():
+            if lane.timer is not None:
+                lane.timer.cancel()
+                lane.timer = None
+            for _, _, job in lane.jobs:
+                if not job.future.done():
+                    job.future.set_exception(RuntimeError("Outbound scheduler closed"))
+            lane.jobs.clear()
+
+    # ---------- public API ----------
+    async def submit(
+        self,
+        chat_id: int | str,
+        call: Callable[[], Awaitable[Any]],
+        *,
+        priority: SendPriority | None = None,
+    ) -> Any:
+        """
+        Queues `call` (zero-arg coroutine factory) for `chat_id` and waits for its result.
+        """
+        self._ensure_started()
+        prio = priority if priority is not None else current_priority()
+
+        job = _Job(
+            chat_id=chat_id,
+            priority=prio,
+            call=call,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queued[prio.name.lower()] += 1
+        self._push(self._lane(chat_id), (int(prio), next(self._seq), job))
+        return await job.future
+
+    def stats(self) -> OutboundStats:
+        avg = (self._wait_total / self._wait_count) if self._wait_count else 0.0
+        return OutboundStats(
+            queued=dict(self._queued),
+            in_flight=self._in_flight,
+            sent=self._sent,
+            failed=self._failed,
+            retries=self._retries,
+            avg_wait_ms=round(avg * 1000, 1),
+            max_wait_ms=round(self._wait_max * 1000, 1),
+        )
+
+    # ---------- internals ----------
+    def _lane(self, chat_id: int | str) -> _ChatLane:
+        lane = self._chats.get(chat_id)
+        if lane is not None:
+            return lane
+
+        if len(self._chats) > 10_000:
+            for key in [k for k, ln in self._chats.items() if not ln.jobs and ln.bucket.is_idle()]:
+                del self._chats[key]
+
+        # Telegram: negative ids / @channel usernames are groups & channels
+        is_group = isinstance(chat_id, str) or int(chat_id) < 0
+        if is_group:
+            bucket = _TokenBucket(self.group_rate, self.group_burst)
+        else:
+            bucket = _TokenBucket(self.private_rate, self.private_burst)
+        lane = _ChatLane(bucket=bucket)
+        self._chats[chat_id] = lane
+        return lane
+
+    @staticmethod
+    def _needs_token(job: _Job) -> bool:
+        # deletes (bulk deleteMessages) don't count against per-chat send limits
+        return job.priority is not SendPriority.DELETE
+
+    def _push(self, lane: _ChatLane, entry: tuple[int, int, _Job]) -> None:
+        heapq.heappush(lane.jobs, entry)
+        if lane.jobs[0] is entry:  # new head (better priority): re-offer the lane
+            self._offer(lane)
+
+    def _offer(self, lane: _ChatLane) -> None:
+        """Puts the lane on the ready heap if its head job can go now, else arms a timer."""
+        if lane.timer is not None:
+            lane.timer.cancel()
+            lane.timer = None
+        if not lane.jobs:
+            return
+        prio, seq, job = lane.jobs[0]
+        wait = lane.bucket.wait_time(time.monotonic(), need_token=self._needs_token(job))
+        if wait > 0:
+            lane.timer = asyncio.get_running_loop().call_later(wait, self._offer, lane)
+            return
+        lane.version += 1
+        heapq.heappush(self._ready, (prio, seq, lane.version, lane))
+        self._wake.set()
+
+    def _take(self) -> _Job | None:
+        """Best sendable job (chat token taken), or None."""
+        while self._ready:
+            _, _, version, lane = heapq.heappop(self._ready)
+            if version != lane.version or not lane.jobs:
+                continue  # stale entry: the lane was re-offered since
+            job = lane.jobs[0][2]
+            if job.future.done():  # caller went away
+                heapq.heappop(lane.jobs)
+                self._queued[job.priority.name.lower()] -= 1
+                self._offer(lane)
+                continue
+            if not lane.bucket.try_take(time.monotonic(), need_token=self._needs_token(job)):
+                self._offer(lane)  # blocked by a retry_after meanwhile
+                continue
+            heapq.heappop(lane.jobs)
+            self._queued[job.priority.name.lower()] -= 1
+            self._offer(lane)  # next job of this chat, once its token is due
+            return job
+        return None
+
+    def _record_wait(self, job: _Job) -> None:
+        waited = time.monotonic() - job.enqueued_at
+        self._wait_total += waited
+        self._wait_count += 1
+        self._wait_max = max(self._wait_max, waited)
+        if waited > 5.0:
+            log.warning(
+                "Outbound wait %.1fs chat_id=%s priority=%s",
+                waited,
+                job.chat_id,
+                job.priority.name,
+            )
+
+    async def _next_job(self) -> _Job:
+        while True:
+            while not self._ready:
+                self._wake.clear()
+                await self._wake.wait()
+            await self._global.acquire()
+            job = self._take()
+            if job is not None:
+                return job
+            self._global.refund()  # another worker took it while we waited for the global token
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._next_job()
+            if job.attempt == 0:
+                self._record_wait(job)
+
+            self._in_flight += 1
+            try:
+                result = await job.call()
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()
+                raise
+            except TelegramRetryAfter as e:
+                job.attempt += 1
+                self._retries += 1
+                log.warning(
+                    "Flood limit chat_id=%s retry_after=%ss attempt=%s",
+                    job.chat_id,
+                    e.retry_after,
+                    job.attempt,
+                )
+                if job.attempt > self.max_retries:
+                    self._failed += 1
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                else:
+                    # back to the front of its lane; the chat is paused, workers move on
+                    lane = self._lane(job.chat_id)
+                    lane.bucket.block_for(e.retry_after)
+                    self._queued[job.priority.name.lower()] += 1
+                    self._push(lane, (int(job.priority), -next(self._seq), job))
+            except Exception as e:
+                self._failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+            else:
+                self._sent += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._in_flight -= 1
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import csv
+import json
 import re
 from dataclasses import dataclass
+from datetime import date
+from typing import Iterable, Iterator
 
 
 @dataclass(frozen=True, slots=True)
@@ -34,7 +38,14 @@ def parse_quiz_set(text: str) -> ParsedQuiz:
     payload = raw[len("/quiz_set") :].strip()
     if not payload:
         raise ValueError('Missing quiz content. Example: /quiz_set "Q" | "A" | "B" | correct=1 | points=10')
+    return parse_quiz_line(payload)
 
+
+def parse_quiz_line(payload: str) -> ParsedQuiz:
+    """
+    One question without the command prefix:
+      "Question" | "A" | "B" | "C" | correct=2 | points=10
+    """
     parts = [p.strip() for p in payload.split("|")]
     parts = [p for p in parts if p]  # drop empties
 
@@ -74,6 +85,16 @@ def parse_quiz_set(text: str) -> ParsedQuiz:
             if opt:
                 options.append(opt)
 
+    return validate_quiz(question=question, options=options, correct_index=correct_index, points=points)
+
+
+def validate_quiz(*, question: str, options: list[str], correct_index: int | None, points: int) -> ParsedQuiz:
+    """
+    Rules shared by /quiz_set and bulk import.
+    """
+    if not question:
+        raise ValueError("Question cannot be empty")
+
     if len(options) < 2:
         raise ValueError("You must provide at least 2 options")
 
@@ -87,3 +108,113 @@ def parse_quiz_set(text: str) -> ParsedQuiz:
         raise ValueError("points out of allowed range")
 
     return ParsedQuiz(question=question, options=options, correct_index=correct_index, points=points)
+
+
+# -------------------------------------------------
+# Bulk import (CSV / JSONL)
+# -------------------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class ImportedQuiz:
+    line: int
+    day_utc: date
+    quiz: ParsedQuiz
+
+
+@dataclass(frozen=True, slots=True)
+class ImportLineError:
+    line: int
+    message: str
+
+
+def _to_int_field(value, name: str, *, default: int | None = None) -> int | None:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    try:
+        return int(str(value).strip())
+    except ValueError as e:
+        raise ValueError(f"{name} must be an integer") from e
+
+
+def _row_to_quiz(day_raw, question, options, correct, points) -> tuple[date, ParsedQuiz]:
+    try:
+        day_utc = date.fromisoformat(str(day_raw or "").strip())
+    except ValueError as e:
+        raise ValueError("day must be YYYY-MM-DD") from e
+
+    opts = [str(o).strip() for o in (options or []) if o is not None and str(o).strip()]
+    quiz = validate_quiz(
+        question=str(question or "").strip(),
+        options=opts,
+        correct_index=_to_int_field(correct, "correct"),
+        points=_to_int_field(points, "points", default=10),
+    )
+    return day_utc, quiz
+
+
+def iter_quiz_jsonl(lines: Iterable[str]) -> Iterator[ImportedQuiz | ImportLineError]:
+    """
+    One object per line:
+      {"day": "2026-03-01", "question": "Q", "options": ["A", "B"], "correct": 2, "points": 10}
+    Blank lines are skipped.
+    """
+    for n, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+            if not isinstance(obj, dict):
+                raise ValueError("line must be a JSON object")
+            options = obj.get("options")
+            if not isinstance(options, list):
+                raise ValueError("options must be a list")
+            day_utc, quiz = _row_to_quiz(
+                obj.get("day"), obj.get("question"), options, obj.get("correct"), obj.get("points")
+            )
+        except json.JSONDecodeError as e:
+            yield ImportLineError(line=n, message=f"invalid JSON ({e.msg})")
+        except ValueError as e:
+            yield ImportLineError(line=n, message=str(e))
+        else:
+            yield ImportedQuiz(line=n, day_utc=day_utc, quiz=quiz)
+
+
+def iter_quiz_csv(lines: Iterable[str]) -> Iterator[ImportedQuiz | ImportLineError]:
+    """
+    Header row, then one quiz per row:
+      day,question,correct,points,option1,option2,option3,...
+    `points` may be empty (default 10); unused option columns may be empty.
+    """
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+
+    cols = [h.strip().lower() for h in header]
+    missing = {"day", "question", "correct"} - set(cols)
+    if missing:
+        yield ImportLineError(line=1, message=f"missing column(s): {', '.join(sorted(missing))}")
+        return
+    option_cols = [i for i, c in enumerate(cols) if c.startswith("option")]
+    if len(option_cols) < 2:
+        yield ImportLineError(line=1, message="need at least option1 and option2 columns")
+        return
+    at = {c: i for i, c in enumerate(cols)}
+
+    for row in reader:
+        n = reader.line_num
+        if not any(cell.strip() for cell in row):
+            continue
+        row = row + [""] * (len(cols) - len(row))
+        try:
+            day_utc, quiz = _row_to_quiz(
+                row[at["day"]],
+                row[at["question"]],
+                [row[i] for i in option_cols],
+                row[at["correct"]],
+                row[at["points"]] if "points" in at else None,
+            )
+        except ValueError as e:
+            yield ImportLineError(line=n, message=str(e))
+        else:
+            yield ImportedQuiz(line=n, day_utc=day_utc, quiz=quiz)
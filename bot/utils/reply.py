@@ -1,6 +1,7 @@
 # bot/utils/reply.py
 from __future__ import annotations
 
+from aiogram.methods import SendMessage
 from aiogram.types import Message
 
 from bot.keyboards.main import main_menu_kb
@@ -19,3 +20,20 @@ async def reply_safe(message: Message, text: str, **kwargs) -> None:
         kwargs.setdefault("reply_markup", None)
 
     await message.answer(text, **kwargs)
+
+
+async def answer_fast(message: Message, text: str, **kwargs) -> SendMessage | None:
+    """
+    Same rules as reply_safe, but in private chat the SendMessage is RETURNED
+    instead of awaited. Handlers do `return await answer_fast(...)`:
+    - webhook mode: the method goes back in the HTTP response (no extra API call)
+    - polling: aiogram executes the returned method as usual
+    In groups we still send right away (auto-delete needs the message_id).
+    """
+    if message.chat.type == "private":
+        kwargs.setdefault("reply_markup", main_menu_kb())
+        return message.answer(text, **kwargs)
+
+    kwargs.setdefault("reply_markup", None)
+    await message.answer(text, **kwargs)
+    return None
@@ -0,0 +1,61 @@
+# bot/utils/webhook.py
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from bot.config.settings import Settings
+
+log = logging.getLogger("bot.webhook")
+
+
+def build_webhook_app(dp: Dispatcher, bot: Bot, settings: Settings) -> web.Application:
+    """
+    aiohttp app serving Telegram webhook updates on settings.webhook_path.
+
+    handle_in_background=False: the update is processed inside the request, so a
+    handler that *returns* a TelegramMethod (see utils.reply.answer_fast) is sent
+    back as the HTTP response body instead of a separate outbound API call.
+    Refuses to build without settings.webhook_secret: aiogram skips the
+    X-Telegram-Bot-Api-Secret-Token check when no token is configured.
+    """
+    if not settings.webhook_secret:
+        raise RuntimeError("WEBHOOK_SECRET is required in webhook mode")
+
+    app = web.Application()
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=settings.webhook_secret,
+        handle_in_background=False,
+    ).register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def run_webhook(dp: Dispatcher, bot: Bot, settings: Settings) -> None:
+    if not settings.webhook_url:
+        raise RuntimeError("WEBHOOK_URL is not set")
+
+    app = build_webhook_app(dp, bot, settings)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    log.info("Webhook server listening on %s:%s%s", settings.webhook_host, settings.webhook_port, settings.webhook_path)
+
+    await bot.set_webhook(
+        url=settings.webhook_url + settings.webhook_path,
+        secret_token=settings.webhook_secret,
+        allowed_updates=dp.resolve_used_update_types(),
+    )
+    log.info("Webhook set: %s%s", settings.webhook_url, settings.webhook_path)
+
+    try:
+        await asyncio.Event().wait()  # until cancelled
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,20 @@
+# tests/conftest.py
+from __future__ import annotations
+
+import os
+
+# bot.config builds a module-level Settings on import
+os.environ.setdefault("BOT_TOKEN", "123456:TEST")
+os.environ.setdefault("BOT_USERNAME", "test_bot")
+
+import pytest  # noqa: E402
+
+from bot.database.session import Database  # noqa: E402
+
+
+@pytest.fixture
+async def db(tmp_path):
+    database = Database(f"sqlite+aiosqlite:///{tmp_path / 'test.db'}")
+    await database.init_models()
+    yield database
+    await database.close()
@@ -0,0 +1,66 @@
+# tests/test_autodelete.py
+from __future__ import annotations
+
+from aiogram.exceptions import TelegramBadRequest, TelegramNetworkError
+
+from bot.database.repo.autodelete_repo import load_pending
+from bot.utils import autodelete
+from bot.utils.autodelete import AutoDeleteEngine
+
+
+class FakeBot:
+    def __init__(self, *errors: Exception) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def delete_messages(self, *, chat_id, message_ids):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return True
+
+    async def delete_message(self, *, chat_id, message_id):
+        return await self.delete_messages(chat_id=chat_id, message_ids=[message_id])
+
+
+async def _engine(db, bot) -> AutoDeleteEngine:
+    engine = AutoDeleteEngine(bot)
+    engine._db = db  # persistence only, no wheel task
+    engine.schedule(-100, 1, delay_seconds=60)
+    engine.schedule(-100, 2, delay_seconds=60)
+    await engine._flush_new()
+    return engine
+
+
+async def _pending(db) -> list[tuple[int, int]]:
+    async with db.session() as session:
+        return [(r.chat_id, r.message_id) for r in await load_pending(session)]
+
+
+async def test_transient_failure_keeps_rows_and_retries(db):
+    engine = await _engine(db, FakeBot(TelegramNetworkError(method=None, message="timeout")))
+    await engine._delete_batch(-100, [1, 2])
+
+    assert await _pending(db) == [(-100, 1), (-100, 2)]
+    assert engine.pending == 4  # two originals + two re-armed retries
+    assert engine._attempts == {(-100, 1): 1, (-100, 2): 1}
+
+    await engine._delete_batch(-100, [1, 2])  # the retry succeeds
+    assert await _pending(db) == []
+    assert engine._attempts == {}
+
+
+async def test_permanent_bad_request_drops_rows(db):
+    engine = await _engine(db, FakeBot(TelegramBadRequest(method=None, message="message can't be deleted")))
+    await engine._delete_batch(-100, [1, 2])
+    assert await _pending(db) == []
+
+
+async def test_gives_up_after_max_attempts(db, monkeypatch):
+    monkeypatch.setattr(autodelete, "MAX_ATTEMPTS", 2)
+    errors = [TelegramNetworkError(method=None, message="down") for _ in range(2)]
+    engine = await _engine(db, FakeBot(*errors))
+    await engine._delete_batch(-100, [1])
+    assert await _pending(db) == [(-100, 1), (-100, 2)]
+    await engine._delete_batch(-100, [1])
+    assert await _pending(db) == [(-100, 2)]
@@ -0,0 +1,38 @@
+# tests/test_card_cache.py
+from __future__ import annotations
+
+import os
+import time
+
+from bot.utils.cards.card_cache import CardCache
+
+
+def _age(cache: CardCache, key: str, days: float) -> None:
+    t = time.time() - days * 86400
+    os.utime(cache._path(key), (t, t))
+
+
+async def test_evict_removes_files_past_max_age(tmp_path):
+    cache = CardCache(str(tmp_path), max_age_days=7, max_files=0)
+    for key in ("old", "fresh"):
+        await cache.put(key, b"png-" + key.encode())
+    _age(cache, "old", 8)
+    _age(cache, "fresh", 6)
+
+    assert await cache.evict() == 1
+    assert sorted(os.listdir(tmp_path)) == ["fresh.png"]
+    assert cache.stats().evicted == 1
+
+
+async def test_evict_keeps_the_most_recently_used_files_under_max_files(tmp_path):
+    cache = CardCache(str(tmp_path), max_items=1, max_age_days=30, max_files=2)
+    for i, key in enumerate(("a", "b", "c", "d")):
+        await cache.put(key, key.encode())
+        _age(cache, key, 4 - i)  # a oldest ... d newest
+
+    await cache.put("e", b"e")  # evicts "a" from the memory LRU
+    assert await cache.get("a") == b"a"  # disk hit refreshes its mtime
+
+    assert await cache.evict() == 3
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "e.png"]
+    assert await cache.get("b") is None
@@ -0,0 +1,39 @@
+# tests/test_media_registry.py
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from bot.utils.media_registry import MediaRegistry
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.sent: list[object] = []  # photo argument of each send
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        self.sent.append(photo)
+        n = len(self.sent)
+        return SimpleNamespace(photo=[SimpleNamespace(file_id=f"fid-{n}", file_unique_id=f"u-{n}")])
+
+
+async def test_memory_is_bounded_and_misses_fall_back_to_the_db(db):
+    registry = MediaRegistry(db, max_items=2)
+    bot = FakeBot()
+    renders = 0
+
+    async def render() -> bytes:
+        nonlocal renders
+        renders += 1
+        return b"png"
+
+    for key in ("k1", "k2", "k3"):
+        await registry.send_photo(bot, chat_id=1, key=key, render=render, filename="x.png")
+    assert registry.stats().known == 2
+    assert renders == 3
+
+    # k1 fell out of memory but media_files still has it: sent by file_id, no render
+    await registry.send_photo(bot, chat_id=1, key="k1", render=render, filename="x.png")
+    assert bot.sent[-1] == "fid-1"
+    assert renders == 3
+    st = registry.stats()
+    assert st.known == 2 and st.hits == 1 and st.misses == 3
@@ -0,0 +1,63 @@
+# tests/test_outbound.py
+from __future__ import annotations
+
+import asyncio
+import time
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from bot.utils.outbound import OutboundScheduler, SendPriority
+
+
+def _timer():
+    t0 = time.monotonic()
+
+    async def call() -> float:
+        return time.monotonic() - t0
+
+    return call
+
+
+async def test_busy_group_does_not_hold_up_other_chats():
+    out = OutboundScheduler(workers=2)
+    call = _timer()
+    group = [asyncio.create_task(out.submit(-100, call, priority=SendPriority.BROADCAST)) for _ in range(20)]
+    await asyncio.sleep(0.01)  # group burst is spent, the rest waits for 20/min tokens
+
+    served_at = await asyncio.wait_for(out.submit(42, call), timeout=1.0)
+    assert served_at < 0.5
+    assert out.stats().queued["broadcast"] == 20 - out.group_burst
+
+    for t in group:
+        t.cancel()
+    await out.close()
+
+
+async def test_chat_rate_limit_still_applies():
+    out = OutboundScheduler(private_rate=20.0, private_burst=2.0)
+    call = _timer()
+    times = await asyncio.gather(*(out.submit(7, call) for _ in range(4)))
+    assert times[1] < 0.04  # burst
+    assert times[3] >= 0.09  # then 20/s
+    await out.close()
+
+
+async def test_retry_after_pauses_only_that_chat():
+    out = OutboundScheduler()
+    calls = 0
+    t0 = time.monotonic()
+
+    async def flaky() -> float:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise TelegramRetryAfter(method=None, message="Too Many Requests", retry_after=1)
+        return time.monotonic() - t0
+
+    flaky_task = asyncio.create_task(out.submit(9, flaky))
+    await asyncio.sleep(0.05)
+    assert await asyncio.wait_for(out.submit(10, _timer()), timeout=0.2) < 0.1  # other chat unaffected
+
+    assert await flaky_task >= 1.0
+    assert out.stats().retries == 1
+    await out.close()
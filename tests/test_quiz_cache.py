@@ -0,0 +1,37 @@
+# tests/test_quiz_cache.py
+from __future__ import annotations
+
+import asyncio
+from datetime import date
+
+from bot.database.models import Quiz, QuizOption
+from bot.services.quiz_cache import QuizCache
+
+DAY = date(2026, 10, 19)
+
+
+async def _seed_out_of_band(db) -> None:
+    # plain ORM write, like bot/scripts/seed_today_quiz.py: no cache listener fires
+    async with db.session() as session:
+        quiz = Quiz(day_utc=DAY, question="2 + 2?", correct_option_index=1, points_correct=10, points_wrong=0)
+        session.add(quiz)
+        await session.flush()
+        session.add_all([QuizOption(quiz_id=quiz.id, index=i, text=t) for i, t in enumerate(["3", "4"])])
+        await session.commit()
+
+
+async def test_no_quiz_is_only_cached_for_the_ttl(db):
+    cache = QuizCache(db, no_quiz_ttl=0.2)
+    assert await cache.get(DAY) is None
+
+    await _seed_out_of_band(db)
+    assert await cache.get(DAY) is None  # still within the TTL
+    assert cache.misses == 1
+
+    await asyncio.sleep(0.25)
+    quiz = await cache.get(DAY)
+    assert quiz is not None and quiz.options == ("3", "4") and quiz.correct_index == 1
+
+    await asyncio.sleep(0.25)
+    assert await cache.get(DAY) is quiz  # a real quiz stays cached for the day
+    assert cache.misses == 2
@@ -0,0 +1,58 @@
+# tests/test_referral_joins.py
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from sqlalchemy import insert, select
+
+from bot.database.models import User
+from bot.database.repo.referral_repo import get_referral_counts
+from bot.services.referral_joins import ReferralJoinProcessor
+
+GROUP_ID = -100123
+
+
+class FakeBot:
+    def __init__(self, members: set[int]) -> None:
+        self.members = members
+        self.checked: list[int] = []
+        self.sent: list[int] = []
+
+    async def get_chat_member(self, chat_id, user_id):
+        assert chat_id == GROUP_ID
+        self.checked.append(user_id)
+        return SimpleNamespace(status="member" if user_id in self.members else "left")
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.sent.append(chat_id)
+
+
+async def test_startup_reconcile_recovers_joins_lost_from_the_buffer(db):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 1}])
+        referrer = await session.scalar(select(User.id).where(User.telegram_id == 1))
+        await session.execute(
+            insert(User),
+            [
+                {"telegram_id": 2, "referred_by_user_id": referrer, "created_at": now},  # joined while down
+                {"telegram_id": 3, "referred_by_user_id": referrer, "created_at": now},  # never joined
+                {"telegram_id": 4, "referred_by_user_id": referrer, "created_at": now - timedelta(days=30)},
+                {"telegram_id": 5, "referred_by_user_id": referrer, "created_at": now, "referral_processed": True},
+            ],
+        )
+        await session.commit()
+
+    bot = FakeBot(members={2, 4, 5})
+    proc = ReferralJoinProcessor(db, bot, group_id=GROUP_ID)
+    assert await proc.reconcile() == 1
+    assert sorted(bot.checked) == [2, 3]  # too old / already processed: not asked
+    await proc.flush()
+    await proc.close()
+
+    async with db.session() as session:
+        counts = await get_referral_counts(session, user_id=referrer)
+    assert counts.successful == 1
+    assert proc.stats().reconciled == 1 and proc.stats().awarded == 1
+    assert bot.sent == [1]
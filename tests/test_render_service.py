@@ -0,0 +1,32 @@
+# tests/test_render_service.py
+import asyncio
+import threading
+
+import pytest
+
+from bot.utils.cards.render_service import CardRenderService, RenderQueueFull
+
+
+def _blocking(*, gate: threading.Event) -> bytes:
+    gate.wait(5)
+    return b"png"
+
+
+async def test_full_queue_rejects_and_frees_up_again(caplog):
+    svc = CardRenderService(mode="thread", workers=1, max_queue=1)
+    gate = threading.Event()
+    try:
+        first = asyncio.create_task(svc.render(_blocking, gate=gate))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(RenderQueueFull):
+            await svc.render(_blocking, gate=gate)
+        assert "queue full" in caplog.text
+        assert svc.stats().rejected == 1
+
+        gate.set()
+        assert await first == b"png"
+        assert await svc.render(_blocking, gate=gate) == b"png"
+    finally:
+        gate.set()
+        svc.close()
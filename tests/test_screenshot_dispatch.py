@@ -0,0 +1,48 @@
+# tests/test_screenshot_dispatch.py
+from __future__ import annotations
+
+import asyncio
+
+from bot.config import settings
+from bot.services.screenshot_dispatch import ScreenshotDispatcher
+
+
+class SlowFillDispatcher(ScreenshotDispatcher):
+    def __init__(self) -> None:
+        super().__init__(bot=None, db=None, settings=settings)
+        self.gate = asyncio.Event()
+        self.running = 0
+        self.max_running = 0
+        self.passes = 0
+
+    async def fill(self, *, limit: int = 50) -> int:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.gate.wait()
+            self.passes += 1
+            return 0
+        finally:
+            self.running -= 1
+
+
+async def test_request_fill_returns_at_once_and_runs_one_fill_at_a_time():
+    d = SlowFillDispatcher()
+    try:
+        for _ in range(5):
+            d.request_fill()  # handlers never wait on the fill itself
+        await asyncio.sleep(0.01)
+        assert d.running == 1 and d.passes == 0
+
+        d.gate.set()
+        await asyncio.sleep(0.01)
+        # the four requests made during the first pass fold into a single extra pass
+        assert d.passes == 2
+        assert d.max_running == 1
+        assert d._fill_task.done()
+
+        d.request_fill()
+        await asyncio.sleep(0.01)
+        assert d.passes == 3
+    finally:
+        await d.close()
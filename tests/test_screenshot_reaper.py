@@ -0,0 +1,28 @@
+# tests/test_screenshot_reaper.py
+from __future__ import annotations
+
+from datetime import timedelta
+
+from bot.config import settings
+from bot.services.screenshot_reaper import ScreenshotClaimReaper, _utc_now_naive
+
+
+async def test_reap_keeps_a_nudged_deadline_the_db_does_not_show_yet(db):
+    reaper = ScreenshotClaimReaper(bot=None, db=db, settings=settings)
+    deadline = _utc_now_naive() + timedelta(minutes=10)
+
+    # claim_submission fires the hook before its caller commits: the DB has no pending claim yet
+    reaper.nudge(deadline)
+    await reaper._reap()
+    assert reaper.next_due == deadline
+
+    await reaper._reap()
+    assert reaper.next_due == deadline
+
+
+async def test_reap_drops_a_nudged_deadline_once_it_passed(db):
+    reaper = ScreenshotClaimReaper(bot=None, db=db, settings=settings)
+
+    reaper.nudge(_utc_now_naive() - timedelta(seconds=1))  # rolled back, or reaped by this pass
+    await reaper._reap()
+    assert reaper.next_due is None
@@ -0,0 +1,205 @@
+# tests/test_spin.py
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from datetime import date
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.exc import OperationalError
+
+from bot.database.models import (
+    DAILY_ACTION_BITS,
+    DailyAction,
+    DailyProgress,
+    PointEvent,
+    PointSource,
+    SpinHistory,
+    SpinRewardType,
+    User,
+    WeeklyUserStats,
+)
+from bot.database.session import run_retrying_busy
+from bot.services.cash_budget import CashBudget
+from bot.services.spin import SpinService
+
+DAY = date(2026, 10, 19)
+ALL_TASKS = sum(DAILY_ACTION_BITS[t] for t in ("checkin", "quiz", "screenshot"))
+SPIN_BIT = DAILY_ACTION_BITS["spin"]
+
+
+async def _users(db, n: int, *, mask: int = ALL_TASKS) -> list[int]:
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 10_000 + i} for i in range(n)])
+        ids = list((await session.execute(select(User.id).order_by(User.id))).scalars().all())
+        if mask:
+            await session.execute(
+                insert(DailyProgress), [{"user_id": uid, "day_utc": DAY, "mask": mask} for uid in ids]
+            )
+        await session.commit()
+    return ids
+
+
+async def _spin(db, user_id: int, budget: CashBudget | None = None):
+    async with db.session() as session:
+        res = await run_retrying_busy(
+            session,
+            lambda: SpinService.spin(session, user_id=user_id, day_utc=DAY, require_poll=False, cash_budget=budget),
+        )
+    if budget is not None and res.budget_note is not None:
+        res.budget_note.apply(budget)
+    return res
+
+
+def _points_user(ids: list[int]) -> int:
+    return next(u for u in ids if SpinService.draw(user_id=u, day_utc=DAY).reward_type == SpinRewardType.POINTS)
+
+
+async def _totals(db) -> tuple[int, int, int]:
+    async with db.session() as session:
+        history = await session.scalar(
+            select(func.coalesce(func.sum(SpinHistory.reward_value), 0)).where(
+                SpinHistory.reward_type == SpinRewardType.POINTS
+            )
+        )
+        ledger = await session.scalar(
+            select(func.coalesce(func.sum(PointEvent.points), 0)).where(PointEvent.source == PointSource.SPIN)
+        )
+        weekly = await session.scalar(select(func.coalesce(func.sum(WeeklyUserStats.points), 0)))
+    return int(history), int(ledger), int(weekly)
+
+
+async def test_points_spin_writes_everything_in_one_transaction(db):
+    uid = _points_user(await _users(db, 50))
+    statements: list[str] = []
+    listener = lambda *a: statements.append(a[2])  # noqa: E731
+    event.listen(db.engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        res = await _spin(db, uid)
+    finally:
+        event.remove(db.engine.sync_engine, "before_cursor_execute", listener)
+
+    assert res.ok and res.reward_type == SpinRewardType.POINTS and res.reward_value > 0
+    # gated insert, ledger row, weekly total, progress bit, legacy row (dual write): one commit
+    assert len(statements) == 5
+
+    history, ledger, weekly = await _totals(db)
+    assert history == ledger == weekly == res.reward_value
+    async with db.session() as session:
+        mask = await session.scalar(select(DailyProgress.mask).where(DailyProgress.user_id == uid))
+        legacy = await session.scalar(select(func.count()).select_from(DailyAction).where(DailyAction.user_id == uid))
+    assert mask == ALL_TASKS | SPIN_BIT
+    assert legacy == 1
+
+
+async def test_second_spin_and_locked_spin_write_nothing(db):
+    ids = await _users(db, 50)
+    uid = _points_user(ids)
+    first = await _spin(db, uid)
+    again = await _spin(db, uid)
+    assert again.already and not again.locked
+    assert await _totals(db) == (first.reward_value,) * 3
+
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 1}])
+        await session.commit()
+        newcomer = await session.scalar(select(User.id).where(User.telegram_id == 1))
+    locked = await _spin(db, newcomer)
+    assert locked.locked and not locked.ok
+    async with db.session() as session:
+        for model in (SpinHistory, DailyProgress):
+            n = await session.scalar(select(func.count()).select_from(model).where(model.user_id == newcomer))
+            assert n == 0, model.__tablename__
+
+
+async def test_cash_refused_by_the_budget_is_paid_as_points(db, monkeypatch):
+    monkeypatch.setattr(SpinService, "CASH_CHANCE", 1.0)
+    a, b = await _users(db, 2)
+
+    won = await _spin(db, a, CashBudget(daily_limit_cents=SpinService.CASH_CENTS))
+    # a second process-local budget that hasn't seen the win: the DB guard refuses it
+    refused = await _spin(db, b, CashBudget(daily_limit_cents=SpinService.CASH_CENTS))
+
+    assert won.reward_type == SpinRewardType.CASH
+    assert refused.reward_type == SpinRewardType.POINTS and refused.reward_value > 0
+    assert await _totals(db) == (refused.reward_value,) * 3
+
+
+async def test_rolled_back_cash_win_leaves_the_budget_cache_alone(db, monkeypatch):
+    monkeypatch.setattr(SpinService, "CASH_CHANCE", 1.0)
+    (uid,) = await _users(db, 1)
+    budget = CashBudget(daily_limit_cents=SpinService.CASH_CENTS)
+
+    async with db.session() as session:
+        res = await SpinService.spin(session, user_id=uid, day_utc=DAY, require_poll=False, cash_budget=budget)
+        await session.rollback()
+
+    assert res.reward_type == SpinRewardType.CASH and res.budget_note.reservation is not None
+    assert budget.reserved == 0  # nothing noted before the commit
+    assert budget.can_cover(day_utc=DAY, week_start=res.budget_note.week_start, cents=SpinService.CASH_CENTS)
+
+    again = await _spin(db, uid, budget)  # the rolled-back reservation is gone, so this one wins
+    assert again.reward_type == SpinRewardType.CASH and budget.reserved == 1
+
+
+async def test_concurrent_spins_record_one_spin_per_user_per_day(db):
+    attempts = 4
+    ids = await _users(db, 60)
+    gate = asyncio.Semaphore(32)
+    budget = CashBudget(daily_limit_cents=SpinService.CASH_CENTS * 2)
+
+    async def attempt(uid: int):
+        async with gate:
+            return await _spin(db, uid, budget)
+
+    results = await asyncio.gather(*(attempt(u) for _ in range(attempts) for u in ids), return_exceptions=True)
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    assert not errors, errors[:1]  # busy write locks are retried, never surfaced
+    assert sum(1 for r in results if not r.already) == len(ids)
+
+    async with db.session() as session:
+        per_user = dict(
+            (await session.execute(select(SpinHistory.user_id, func.count()).group_by(SpinHistory.user_id))).all()
+        )
+        masks = (await session.execute(select(DailyProgress.mask))).scalars().all()
+    assert per_user == {u: 1 for u in ids}
+    assert all(m & SPIN_BIT for m in masks)
+    history, ledger, weekly = await _totals(db)
+    assert history == ledger == weekly
+
+
+async def test_busy_write_lock_is_rolled_back_and_retried(db):
+    uid = _points_user(await _users(db, 50))
+    calls = 0
+
+    async with db.session() as session:
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            res = await SpinService.spin(session, user_id=uid, day_utc=DAY, require_poll=False)
+            if calls == 1:  # as if the first attempt's write had timed out on the lock
+                raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+            return res
+
+        res = await run_retrying_busy(session, flaky, base_delay=0.001)
+
+    assert calls == 2 and not res.already  # the first attempt left nothing behind
+    assert await _totals(db) == (res.reward_value,) * 3
+
+
+async def test_init_models_drops_spin_triggers_of_an_earlier_build(db):
+    async with db.engine.begin() as conn:
+        await conn.exec_driver_sql(
+            "CREATE TRIGGER trg_spin_history_award AFTER INSERT ON spin_history "
+            "BEGIN UPDATE users SET username = 'paid twice' WHERE id = NEW.user_id; END"
+        )
+    await db.init_models()
+
+    uid = _points_user(await _users(db, 50))
+    res = await _spin(db, uid)
+    async with db.session() as session:
+        username = await session.scalar(select(User.username).where(User.id == uid))
+    assert username is None
+    assert await _totals(db) == (res.reward_value,) * 3
@@ -0,0 +1,74 @@
+# tests/test_spin_sim.py
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from bot.database.models import DAILY_ACTION_BITS, DailyProgress, SpinCashLedger, User
+from bot.database.session import run_retrying_busy
+from bot.services.cash_budget import CashBudget
+from bot.services.spin import SpinService
+
+np = pytest.importorskip("numpy")
+spin_sim = pytest.importorskip("bot.services.spin_sim")
+
+START = date(2026, 10, 5)  # a Monday
+DAYS = 10
+USERS = 40
+ALL_TASKS = sum(DAILY_ACTION_BITS[t] for t in ("checkin", "quiz", "screenshot"))
+DAILY_BUDGET = SpinService.CASH_CENTS * 2
+WEEKLY_BUDGET = SpinService.CASH_CENTS * 9
+
+
+async def test_replay_matches_spins_refused_by_the_budget(db, monkeypatch):
+    monkeypatch.setattr(SpinService, "CASH_CHANCE", 0.2)  # enough cash rolls to hit both limits
+    days = [START + timedelta(days=i) for i in range(DAYS)]
+    budget = CashBudget(daily_limit_cents=DAILY_BUDGET, weekly_limit_cents=WEEKLY_BUDGET)
+
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 10_000 + i} for i in range(USERS)])
+        ids = list((await session.execute(select(User.id).order_by(User.id))).scalars().all())
+        await session.execute(
+            insert(DailyProgress), [{"user_id": u, "day_utc": d, "mask": ALL_TASKS} for d in days for u in ids]
+        )
+        await session.commit()
+
+    for day in days:
+        for uid in ids:
+            async with db.session() as session:
+                res = await run_retrying_busy(
+                    session,
+                    lambda: SpinService.spin(
+                        session, user_id=uid, day_utc=day, require_poll=False, cash_budget=budget
+                    ),
+                )
+            if res.budget_note is not None:
+                res.budget_note.apply(budget)
+
+    async with db.session() as session:
+        inputs = await spin_sim.load_sim_inputs(session, days=DAYS, today=days[-1] + timedelta(days=1))
+        downgraded = await session.scalar(select(func.sum(SpinCashLedger.downgraded)))
+
+    params = spin_sim.SpinParams.current(daily_budget_cents=DAILY_BUDGET, weekly_budget_cents=WEEKLY_BUDGET)
+    draws = spin_sim.replay_draws(inputs.spin_user_id, inputs.spin_day)
+    out = spin_sim.evaluate(draws, params)
+
+    assert downgraded > 0
+    assert np.array_equal(out.reward, inputs.spin_reward)
+    assert np.array_equal(out.value, inputs.spin_value)
+    assert int(out.downgraded.sum()) == downgraded
+
+    unlimited = spin_sim.evaluate(draws, params.replace(cash_daily_budget_cents=0, cash_weekly_budget_cents=0))
+    assert not unlimited.downgraded.any()
+    assert (unlimited.reward == spin_sim.CASH).sum() > (out.reward == spin_sim.CASH).sum()
+
+
+def test_forecast_never_pays_past_the_budget():
+    params = spin_sim.SpinParams.current(weekly_budget_cents=WEEKLY_BUDGET).replace(cash_chance=0.2)
+    rates = np.full(200, 0.8)
+    fc = spin_sim.forecast(rates, np.zeros(200), params, trials=50, rng=np.random.default_rng(7))
+
+    assert fc.cash_cents.p95 <= WEEKLY_BUDGET
+    assert fc.downgrades.p5 > 0
@@ -0,0 +1,113 @@
+# tests/test_webhook.py
+from __future__ import annotations
+
+import time
+from typing import Any
+
+import pytest
+from aiogram import Dispatcher, F
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import TelegramMethod
+from aiogram.types import Message
+from aiohttp.test_utils import TestClient, TestServer
+
+from bot.config.settings import Settings
+from bot.utils.autodelete_bot import AutoDeleteBot
+from bot.utils.reply import answer_fast
+from bot.utils.webhook import build_webhook_app
+
+SECRET = "test-secret"
+PATH = "/webhook"
+
+
+class RecordingSession(BaseSession):
+    """No network: records Bot API calls made outside the HTTP response."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.methods: list[TelegramMethod] = []
+
+    async def close(self) -> None:
+        pass
+
+    async def make_request(self, bot, method: TelegramMethod[Any], timeout: int | None = None) -> Any:
+        self.methods.append(method)
+        return True
+
+    async def stream_content(self, *args: Any, **kwargs: Any):  # pragma: no cover
+        yield b""
+
+
+def _update(chat_id: int, text: str = "/ping") -> dict:
+    return {
+        "update_id": chat_id,
+        "message": {
+            "message_id": 1,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "Test"},
+            "text": text,
+        },
+    }
+
+
+@pytest.fixture
+async def client():
+    session = RecordingSession()
+    settings = Settings(bot_token="123456:TEST", bot_username="test_bot", webhook_secret=SECRET, webhook_path=PATH)
+    bot = AutoDeleteBot(token=settings.bot_token, settings=settings, session=session)
+    dp = Dispatcher()
+
+    @dp.message(F.text == "/ping")
+    async def ping(message: Message):
+        return await answer_fast(message, "pong")
+
+    async with TestClient(TestServer(build_webhook_app(dp, bot, settings))) as c:
+        c.api_calls = session.methods
+        yield c
+    await bot.outbound.close()
+
+
+async def test_unsigned_update_is_rejected(client):
+    resp = await client.post(PATH, json=_update(1))
+    assert resp.status == 401
+    assert client.api_calls == []
+
+
+async def test_wrong_secret_is_rejected(client):
+    resp = await client.post(PATH, json=_update(1), headers={"X-Telegram-Bot-Api-Secret-Token": "nope"})
+    assert resp.status == 401
+
+
+async def test_signed_update_gets_reply_in_response_body(client):
+    resp = await client.post(PATH, json=_update(42), headers={"X-Telegram-Bot-Api-Secret-Token": SECRET})
+    assert resp.status == 200
+
+    # the SendMessage went back inline (multipart body), not as a separate API call
+    body = await resp.read()
+    assert b"sendMessage" in body
+    assert b"pong" in body
+    assert b"42" in body
+    assert client.api_calls == []
+
+
+async def test_signed_update_without_handler_is_acknowledged(client):
+    resp = await client.post(PATH, json=_update(7, "hello"), headers={"X-Telegram-Bot-Api-Secret-Token": SECRET})
+    assert resp.status == 200
+    assert b"sendMessage" not in await resp.read()
+
+
+def test_webhook_app_refuses_to_start_without_secret():
+    settings = Settings(bot_token="123456:TEST", bot_username="test_bot", webhook_url="https://bot.example.com")
+    with pytest.raises(RuntimeError, match="WEBHOOK_SECRET"):
+        build_webhook_app(Dispatcher(), None, settings)
+
+
+def test_settings_require_secret_with_webhook_url(monkeypatch):
+    monkeypatch.setenv("WEBHOOK_URL", "https://bot.example.com")
+    monkeypatch.delenv("WEBHOOK_SECRET", raising=False)
+    with pytest.raises(RuntimeError, match="WEBHOOK_SECRET"):
+        Settings.load()
+
+    monkeypatch.setenv("WEBHOOK_SECRET", SECRET)
+    assert Settings.load().webhook_secret == SECRET
@@ -0,0 +1,90 @@
+# tests/test_weekly_recap.py
+from __future__ import annotations
+
+import dataclasses
+from datetime import date
+
+import pytest
+from sqlalchemy import insert, select
+
+from bot.config import settings as base_settings
+from bot.database.models import User, WeeklyRecapRank, WeeklyRecapRun, WeeklyUserStats
+from bot.database.repo.weekly_recap_repo import fetch_recap_chunk, snapshot_recap_ranks
+from bot.services.weekly_recap import SEND_BATCH, run_weekly_recap
+
+WEEK = date(2026, 10, 5)
+USERS = 45
+
+
+class Crash(BaseException):
+    """Stands in for the process dying mid-send (not caught like a failed send)."""
+
+
+class FakeBot:
+    def __init__(self, crash_after: int | None = None) -> None:
+        self.crash_after = crash_after
+        self.delivered: list[int] = []
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        if self.crash_after is not None and len(self.delivered) >= self.crash_after:
+            raise Crash()
+        self.delivered.append(chat_id)
+
+
+@pytest.fixture
+def settings():
+    return dataclasses.replace(base_settings, card_render_mode="thread", card_render_workers=1)
+
+
+async def _seed(db) -> None:
+    async with db.session() as session:
+        await session.execute(insert(User), [{"telegram_id": 1000 + i} for i in range(USERS)])
+        ids = (await session.execute(select(User.id).order_by(User.id))).scalars().all()
+        await session.execute(
+            insert(WeeklyUserStats), [{"week_start": WEEK, "user_id": uid, "points": 10 + uid} for uid in ids]
+        )
+        await session.commit()
+
+
+async def test_restart_skips_at_most_one_send_batch(db, settings):
+    await _seed(db)
+
+    crashed = FakeBot(crash_after=SEND_BATCH * 2 + 3)  # dies inside the third batch of the first chunk
+    with pytest.raises(Crash):
+        await run_weekly_recap(crashed, db, settings, week_start=WEEK, chunk_size=40)
+
+    resumed = FakeBot()
+    res = await run_weekly_recap(resumed, db, settings, week_start=WEEK, chunk_size=40)
+
+    assert res is not None
+    assert 0 < res.skipped <= SEND_BATCH
+    assert res.sent == SEND_BATCH * 2 + len(resumed.delivered)
+    assert res.sent + res.skipped == USERS
+    assert not set(crashed.delivered) & set(resumed.delivered)  # nobody got it twice
+
+    async with db.session() as session:
+        run = await session.scalar(select(WeeklyRecapRun).where(WeeklyRecapRun.week_start == WEEK))
+        leftover = await session.scalar(select(WeeklyRecapRank).where(WeeklyRecapRank.week_start == WEEK))
+    assert run.status == "done"
+    assert leftover is None  # snapshot dropped with the finished run
+    assert await run_weekly_recap(FakeBot(), db, settings, week_start=WEEK) is None
+
+
+async def test_ranks_are_snapshotted_once_and_paged_by_user_id(db):
+    await _seed(db)
+
+    async with db.session() as session:
+        assert await snapshot_recap_ranks(session, week_start=WEEK) == USERS
+        # later point changes don't move a run that already started
+        await session.execute(WeeklyUserStats.__table__.update().values(points=1))
+        assert await snapshot_recap_ranks(session, week_start=WEEK) == 0
+
+        rows, cursor = [], 0
+        while chunk := await fetch_recap_chunk(session, week_start=WEEK, after_user_id=cursor, limit=7):
+            rows += chunk
+            cursor = chunk[-1].user_id
+
+    assert [r.user_id for r in rows] == sorted(r.user_id for r in rows)
+    by_rank = sorted(rows, key=lambda r: r.rank)
+    assert [r.rank for r in by_rank] == list(range(1, USERS + 1))
+    assert [r.points for r in by_rank] == sorted((r.points for r in rows), reverse=True)
@@ -0,0 +1,48 @@
+# tests/test_weekly_winners_card.py
+"""
+Golden images of the weekly winners card (captured from the pre-cache renderer).
+Text rendering depends on the font, so the goldens only apply with DejaVuSans;
+regenerate with UPDATE_GOLDEN=1 after an intentional layout change.
+"""
+from __future__ import annotations
+
+import io
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops
+
+from bot.utils.cards.weekly_winners_card import CardWinner, _font_path, render_weekly_winners_card
+
+GOLDEN_DIR = Path(__file__).parent / "golden"
+GOLDEN_FONT = "DejaVuSans.ttf"
+
+WINNERS = [
+    CardWinner(rank=1, name="alice", points=42),
+    CardWinner(rank=2, name="Bob B.", points=17),
+    CardWinner(rank=3, name="@charlie_long_name", points=3),
+]
+
+
+@pytest.mark.parametrize("count", [0, 1, 3])
+def test_matches_golden(count: int):
+    font = _font_path()
+    if font is None or os.path.basename(font) != GOLDEN_FONT:
+        pytest.skip(f"goldens were rendered with {GOLDEN_FONT}, this machine uses {font}")
+
+    png = render_weekly_winners_card(
+        week_start=date(2026, 1, 5),
+        week_end=date(2026, 1, 11),
+        winners=WINNERS[:count],
+    )
+    img = Image.open(io.BytesIO(png)).convert("RGB")
+    golden_path = GOLDEN_DIR / f"weekly_winners_{count}.png"
+
+    if os.environ.get("UPDATE_GOLDEN"):
+        img.save(golden_path, optimize=True)
+
+    golden = Image.open(golden_path).convert("RGB")
+    assert img.size == golden.size
+    assert ImageChops.difference(img, golden).getbbox() is None, f"differs from {golden_path.name}"